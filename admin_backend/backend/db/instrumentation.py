@@ -0,0 +1,170 @@
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+from backend.metrics import observe_pool_wait, observe_remote_call
+
+INSTRUMENTATION_ENV = 'SQL_INSTRUMENTATION'
+SLOW_QUERY_MS_ENV = 'SQL_SLOW_QUERY_MS'
+DEFAULT_SLOW_QUERY_MS = 500.0
+STATEMENT_PREVIEW_CHARS = 300
+
+slow_query_logger = logging.getLogger('backend.sql.slow')
+
+_current_stats = ContextVar('sql_request_stats', default=None)
+
+_STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_RE = re.compile(r'%\(\w+\)s|:\w+|%s|\?')
+_IN_LIST_RE = re.compile(r'\bIN\s*\((?:\s*\?\s*,?)+\)', re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def instrumentation_enabled():
+    return os.environ.get(INSTRUMENTATION_ENV, '1').strip().lower() not in {'0', 'false', 'no', 'off'}
+
+
+def slow_query_ms():
+    try:
+        return float(os.environ.get(SLOW_QUERY_MS_ENV, DEFAULT_SLOW_QUERY_MS))
+    except ValueError:
+        return DEFAULT_SLOW_QUERY_MS
+
+
+def normalize_statement(statement):
+    """Collapse literals, bind markers and IN-lists so repeated statements group together."""
+    normalized = _STRING_LITERAL_RE.sub('?', str(statement or ''))
+    normalized = _PLACEHOLDER_RE.sub('?', normalized)
+    normalized = _NUMBER_LITERAL_RE.sub('?', normalized)
+    normalized = _IN_LIST_RE.sub('IN (...)', normalized)
+    normalized = _WHITESPACE_RE.sub(' ', normalized).strip()
+    if len(normalized) > STATEMENT_PREVIEW_CHARS:
+        normalized = f"{normalized[:STATEMENT_PREVIEW_CHARS]}..."
+    return normalized
+
+
+def new_request_stats():
+    return {
+        'statement_count': 0,
+        'db_ms': 0.0,
+        'rows': 0,
+        'remote_ms': 0.0,
+        'remote_calls': [],
+        'engines': {},
+        'statements': {},
+    }
+
+
+def start_request_stats():
+    """Begin collecting for the current context; returns the token for `stop_request_stats`."""
+    stats = new_request_stats()
+    return stats, _current_stats.set(stats)
+
+
+def stop_request_stats(token):
+    _current_stats.reset(token)
+
+
+def current_request_stats():
+    return _current_stats.get()
+
+
+def _record_statement(stats, engine_label, statement, elapsed_ms, rowcount):
+    stats['statement_count'] += 1
+    stats['db_ms'] += elapsed_ms
+    if rowcount and rowcount > 0:
+        stats['rows'] += rowcount
+
+    engine_stats = stats['engines'].setdefault(engine_label, {'statement_count': 0, 'db_ms': 0.0})
+    engine_stats['statement_count'] += 1
+    engine_stats['db_ms'] += elapsed_ms
+
+    key = normalize_statement(statement)
+    entry = stats['statements'].setdefault(key, {
+        'statement': key,
+        'engine': engine_label,
+        'count': 0,
+        'total_ms': 0.0,
+        'max_ms': 0.0,
+        'rows': 0,
+    })
+    entry['count'] += 1
+    entry['total_ms'] += elapsed_ms
+    entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+    if rowcount and rowcount > 0:
+        entry['rows'] += rowcount
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+
+def _make_after_cursor_execute(engine_label):
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get('query_start_time')
+        if not started:
+            return
+        elapsed_ms = (time.perf_counter() - started.pop()) * 1000
+
+        if elapsed_ms >= slow_query_ms():
+            slow_query_logger.warning(
+                "Slow query on %s (%.1f ms): %s", engine_label, elapsed_ms, normalize_statement(statement)
+            )
+
+        stats = _current_stats.get()
+        if stats is not None:
+            rowcount = getattr(cursor, 'rowcount', -1)
+            _record_statement(stats, engine_label, statement, elapsed_ms, rowcount)
+
+    return _after_cursor_execute
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited for a connection."""
+
+    metrics_label = 'main'
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            observe_pool_wait(self.metrics_label, time.perf_counter() - started)
+
+
+def instrument_engine(engine, label='main'):
+    """Attach timing hooks to `engine`; statements are attributed to the active request, if any."""
+    if engine is None or not instrumentation_enabled():
+        return engine
+    if event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        return engine
+    if isinstance(engine.pool, TimedQueuePool):
+        engine.pool.metrics_label = label
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _make_after_cursor_execute(label))
+    return engine
+
+
+@contextmanager
+def track_remote_call(resource_name):
+    """Time an outbound API call against the active request."""
+    started = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except Exception:
+        failed = True
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        observe_remote_call(resource_name, elapsed, error=failed)
+        stats = _current_stats.get()
+        if stats is not None:
+            stats['remote_ms'] += elapsed * 1000
+            stats['remote_calls'].append({'resource': resource_name, 'ms': round(elapsed * 1000, 2)})
@@ -1,10 +1,14 @@
 from sqlalchemy import text
 
+_schema_version_listeners = []
 
-def get_table_columns(conn, table_name, allowed_tables=None):
-    if allowed_tables is not None and table_name not in allowed_tables:
-        return set()
+# Column sets per (engine, table), filled on first lookup so feature checks and optional-column
+# probes cost one metadata query per process instead of one per call. Migrations clear it through
+# the schema-version event below; code that runs its own DDL calls forget_table_columns().
+_table_columns_cache = {}
 
+
+def _query_table_columns(conn, table_name):
     if conn.dialect.name == 'sqlite':
         rows = conn.execute(text(f"PRAGMA table_info({table_name})")).fetchall()
         return {str(row[1]) for row in rows}
@@ -16,3 +20,43 @@ def get_table_columns(conn, table_name, allowed_tables=None):
           AND TABLE_NAME = :table_name
     """), {'table_name': table_name}).fetchall()
     return {str(row[0]) for row in rows}
+
+
+def get_table_columns(conn, table_name, allowed_tables=None):
+    if allowed_tables is not None and table_name not in allowed_tables:
+        return set()
+
+    key = (conn.engine, table_name)
+    columns = _table_columns_cache.get(key)
+    if columns is None:
+        columns = frozenset(_query_table_columns(conn, table_name))
+        _table_columns_cache[key] = columns
+    return set(columns)
+
+
+def forget_table_columns(table_name=None):
+    """Drop cached columns of `table_name` (every table when None) after DDL outside migrations."""
+    if table_name is None:
+        _table_columns_cache.clear()
+        return
+    for key in [key for key in _table_columns_cache if key[1] == table_name]:
+        _table_columns_cache.pop(key, None)
+
+
+def on_schema_version_change(callback):
+    """
+    Register `callback(version)` to run after migrations change the schema in this process.
+    Caches derived from table metadata subscribe here to drop stale entries.
+    """
+    _schema_version_listeners.append(callback)
+    return callback
+
+
+def publish_schema_version(version):
+    for callback in list(_schema_version_listeners):
+        callback(version)
+
+
+@on_schema_version_change
+def _clear_table_columns(version):
+    forget_table_columns()
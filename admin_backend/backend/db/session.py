@@ -1,9 +1,12 @@
 import os
 import logging
+import time
 from pathlib import Path
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from dotenv import load_dotenv
 
+from backend.db.instrumentation import TimedQueuePool, instrument_engine
+
 BASE_DIR = Path(__file__).resolve().parents[2]
 load_dotenv(BASE_DIR / ".env")
 logger = logging.getLogger(__name__)
@@ -23,19 +26,56 @@ SAGANSA_DB_NAME = os.environ.get('SAGANSA_DB_NAME', 'sagansa')
 
 DB_URL = f"mysql+pymysql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 SAGANSA_DB_URL = f"mysql+pymysql://{SAGANSA_DB_USER}:{SAGANSA_DB_PASS}@{SAGANSA_DB_HOST}:{SAGANSA_DB_PORT}/{SAGANSA_DB_NAME}"
+# Optional read replica for heavy report reads; without it reports get their own pool on the primary.
+REPORTING_DB_URL = os.environ.get('REPORTING_DB_URL', '')
+REPORTING_RETRY_SECONDS = 60
 # Base URL without database name to allow creating the database
 DB_BASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}"
 _db_engine = None
 _db_last_error = None
 _sagansa_engine = None
 _sagansa_last_error = None
+_reporting_engine = None
+_reporting_retry_at = 0.0
+
+POOL_DEFAULTS = {
+    'POOL_SIZE': 5,
+    'MAX_OVERFLOW': 10,
+    'POOL_TIMEOUT': 30,
+    'POOL_RECYCLE': 1800,
+}
+
+
+def _pool_setting(prefix, name, cast=int):
+    """`<prefix>_<name>` overrides the shared `DB_<name>`, which overrides the default."""
+    raw = os.environ.get(f'{prefix}_{name}') or os.environ.get(f'DB_{name}')
+    if raw is None:
+        return POOL_DEFAULTS[name]
+    try:
+        return cast(raw)
+    except ValueError:
+        logger.warning("Ignoring invalid %s_%s=%r", prefix, name, raw)
+        return POOL_DEFAULTS[name]
+
+
+def pool_options(prefix='DB'):
+    pre_ping = os.environ.get(f'{prefix}_POOL_PRE_PING') or os.environ.get('DB_POOL_PRE_PING', '1')
+    return {
+        'poolclass': TimedQueuePool,
+        'pool_size': _pool_setting(prefix, 'POOL_SIZE'),
+        'max_overflow': _pool_setting(prefix, 'MAX_OVERFLOW'),
+        'pool_timeout': _pool_setting(prefix, 'POOL_TIMEOUT', float),
+        'pool_recycle': _pool_setting(prefix, 'POOL_RECYCLE'),
+        'pool_pre_ping': pre_ping.strip().lower() not in {'0', 'false', 'no', 'off'},
+    }
+
 
 def get_db_engine():
     global _db_engine, _db_last_error
     if _db_engine is None:
         try:
             # First, try to connect to the specific database
-            _db_engine = create_engine(DB_URL)
+            _db_engine = instrument_engine(create_engine(DB_URL, **pool_options('DB')))
             # Test connection
             with _db_engine.connect() as conn:
                 conn.execute(text("SELECT 1"))
@@ -50,7 +90,7 @@ def get_db_engine():
                         conn.execute(text(f"CREATE DATABASE IF NOT EXISTS {DB_NAME}"))
                         conn.commit()
                     # Now try connecting again
-                    _db_engine = create_engine(DB_URL)
+                    _db_engine = instrument_engine(create_engine(DB_URL, **pool_options('DB')))
                     _db_last_error = None
                 except Exception as create_err:
                     _db_last_error = f"Database creation failed: {str(create_err)}"
@@ -69,7 +109,10 @@ def get_sagansa_engine():
     global _sagansa_engine, _sagansa_last_error
     if _sagansa_engine is None:
         try:
-            _sagansa_engine = create_engine(SAGANSA_DB_URL)
+            _sagansa_engine = instrument_engine(
+                create_engine(SAGANSA_DB_URL, **pool_options('SAGANSA_DB')),
+                label='sagansa',
+            )
             with _sagansa_engine.connect() as conn:
                 conn.execute(text("SELECT 1"))
             _sagansa_last_error = None
@@ -77,3 +120,57 @@ def get_sagansa_engine():
             _sagansa_last_error = f"Sagansa DB connection failed: {str(e)}"
             _sagansa_engine = None
     return _sagansa_engine, _sagansa_last_error
+
+
+def _set_read_only(engine):
+    if engine.dialect.name != 'mysql':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def _read_only_session(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("SET SESSION TRANSACTION READ ONLY")
+        cursor.close()
+
+
+def get_reporting_engine():
+    """
+    Read-only engine for report reads.
+    Uses REPORTING_DB_URL (a replica) when set, otherwise a separate pool on the primary so
+    long reports cannot exhaust the connections writes need. Falls back to the primary engine
+    while the replica is unreachable, retrying after REPORTING_RETRY_SECONDS.
+    """
+    global _reporting_engine, _reporting_retry_at
+    if _reporting_engine is not None:
+        return _reporting_engine, None
+
+    primary, primary_error = get_db_engine()
+    if primary is None or time.monotonic() < _reporting_retry_at:
+        return primary, primary_error
+    if not REPORTING_DB_URL and not isinstance(primary.pool, TimedQueuePool):
+        # Injected or single-connection engines (e.g. in-memory SQLite) cannot be re-pooled.
+        return primary, None
+
+    url = REPORTING_DB_URL or primary.url
+    try:
+        engine = instrument_engine(create_engine(url, **pool_options('REPORTING_DB')), label='reporting')
+        _set_read_only(engine)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except Exception as e:
+        logger.warning("Reporting database unavailable, using primary: %s", e)
+        _reporting_retry_at = time.monotonic() + REPORTING_RETRY_SECONDS
+        return primary, None
+
+    _reporting_engine = engine
+    return _reporting_engine, None
+
+
+def dispose_engines():
+    """
+    Forget pooled connections inherited from a parent process (gunicorn preload_app).
+    Each worker then opens its own; the parent's sockets are left untouched.
+    """
+    for engine in (_db_engine, _sagansa_engine, _reporting_engine):
+        if engine is not None:
+            engine.dispose(close=False)
@@ -0,0 +1,144 @@
+import os
+import time
+
+from flask import g, request
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        REGISTRY,
+        CollectorRegistry,
+        Counter,
+        Histogram,
+        generate_latest,
+        multiprocess,
+    )
+except ImportError:  # pragma: no cover - depends on runtime environment
+    CONTENT_TYPE_LATEST = 'text/plain; version=0.0.4; charset=utf-8'
+    Counter = Histogram = None
+
+# Set by gunicorn.conf.py so every worker writes to a shared directory the scrape aggregates.
+MULTIPROC_DIR_ENV = 'PROMETHEUS_MULTIPROC_DIR'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)
+
+
+def metrics_available():
+    return Counter is not None
+
+
+if metrics_available():
+    HTTP_REQUEST_SECONDS = Histogram(
+        'http_request_duration_seconds', 'Request latency by blueprint and route',
+        ['blueprint', 'route', 'method'], buckets=LATENCY_BUCKETS,
+    )
+    HTTP_REQUESTS = Counter(
+        'http_requests_total', 'Requests by blueprint, route and status',
+        ['blueprint', 'route', 'method', 'status'],
+    )
+    HTTP_ERRORS = Counter(
+        'http_request_errors_total', 'Requests that ended in a 5xx or an unhandled exception',
+        ['blueprint', 'route', 'method'],
+    )
+    PARSER_SECONDS = Histogram(
+        'bank_parser_duration_seconds', 'Statement parse time per bank key',
+        ['bank_key'], buckets=LATENCY_BUCKETS,
+    )
+    PARSER_ERRORS = Counter('bank_parser_errors_total', 'Statement parses that raised', ['bank_key'])
+    IMPORT_ROWS_PARSED = Counter('import_rows_parsed_total', 'Rows parsed from uploaded statements', ['bank_code'])
+    IMPORT_ROWS_INSERTED = Counter('import_rows_inserted_total', 'Rows inserted from uploaded statements', ['bank_code'])
+    REMOTE_SECONDS = Histogram(
+        'remote_api_duration_seconds', 'Outbound API latency per resource',
+        ['resource'], buckets=LATENCY_BUCKETS,
+    )
+    REMOTE_ERRORS = Counter('remote_api_errors_total', 'Outbound API calls that failed', ['resource'])
+    POOL_WAIT_SECONDS = Histogram(
+        'db_pool_checkout_wait_seconds', 'Time spent waiting for a pooled DB connection',
+        ['engine'], buckets=POOL_WAIT_BUCKETS,
+    )
+    CACHE_LOOKUPS = Counter('cache_lookups_total', 'Cache lookups by cache and result', ['cache', 'result'])
+
+
+def observe_request(blueprint, route, method, status, seconds):
+    if not metrics_available():
+        return
+    HTTP_REQUEST_SECONDS.labels(blueprint, route, method).observe(seconds)
+    HTTP_REQUESTS.labels(blueprint, route, method, str(status)).inc()
+    if status >= 500:
+        HTTP_ERRORS.labels(blueprint, route, method).inc()
+
+
+def observe_parser(bank_key, seconds, error=False):
+    if not metrics_available():
+        return
+    PARSER_SECONDS.labels(bank_key or 'unknown').observe(seconds)
+    if error:
+        PARSER_ERRORS.labels(bank_key or 'unknown').inc()
+
+
+def count_import_rows(bank_code, parsed=0, inserted=0):
+    if not metrics_available():
+        return
+    if parsed:
+        IMPORT_ROWS_PARSED.labels(bank_code or 'unknown').inc(parsed)
+    if inserted:
+        IMPORT_ROWS_INSERTED.labels(bank_code or 'unknown').inc(inserted)
+
+
+def observe_remote_call(resource, seconds, error=False):
+    if not metrics_available():
+        return
+    REMOTE_SECONDS.labels(resource).observe(seconds)
+    if error:
+        REMOTE_ERRORS.labels(resource).inc()
+
+
+def observe_pool_wait(engine_label, seconds):
+    if metrics_available():
+        POOL_WAIT_SECONDS.labels(engine_label).observe(seconds)
+
+
+def count_cache_lookup(cache, hit):
+    if metrics_available():
+        CACHE_LOOKUPS.labels(cache, 'hit' if hit else 'miss').inc()
+
+
+def render_metrics():
+    """Exposition text for all workers (multi-process directory) or this process."""
+    if not metrics_available():
+        return b'', CONTENT_TYPE_LATEST
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def _route_labels():
+    blueprint = request.blueprint or 'app'
+    route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    return blueprint, route, request.method
+
+
+def register_metrics(app):
+    if not metrics_available():
+        return
+
+    @app.before_request
+    def start_metrics_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        started = g.pop('metrics_started', None)
+        if started is not None and request.endpoint != 'metrics.get_metrics':
+            observe_request(*_route_labels(), response.status_code, time.perf_counter() - started)
+        return response
+
+    @app.teardown_request
+    def record_unhandled_error(error=None):
+        # after_request already counted the 500 produced by the error handler.
+        if error is not None and g.pop('metrics_started', None) is not None:
+            HTTP_ERRORS.labels(*_route_labels()).inc()
@@ -0,0 +1,278 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from urllib.parse import urlencode
+
+from flask import g, request
+
+# Comma-separated secrets; profiling is never wired up when this is empty.
+PROFILING_TOKENS_ENV = 'PROFILING_TOKENS'
+# Optional comma-separated path prefixes that may be profiled.
+PROFILING_PATHS_ENV = 'PROFILING_PATHS'
+PROFILING_DIR_ENV = 'PROFILING_DIR'
+PROFILING_KEEP_ENV = 'PROFILING_KEEP'
+PROFILE_HEADER = 'X-Profile-Token'
+PROFILE_QUERY_ARG = '_profile'
+PROFILE_MODE_QUERY_ARG = '_profile_mode'
+PROFILE_MODES = ('sample', 'cprofile')
+DEFAULT_SAMPLE_INTERVAL = 0.005
+DEFAULT_KEEP = 20
+TOP_FUNCTIONS = 25
+
+_PROFILE_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+_SOURCE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _env_list(name):
+    return [item.strip() for item in os.environ.get(name, '').split(',') if item.strip()]
+
+
+def profiling_configured():
+    return bool(_env_list(PROFILING_TOKENS_ENV))
+
+
+def profiling_token_allowed(token):
+    return bool(token) and token in _env_list(PROFILING_TOKENS_ENV)
+
+
+def profiling_dir():
+    path = os.environ.get(PROFILING_DIR_ENV) or os.path.join(tempfile.gettempdir(), 'bank_converter_profiles')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _display_path(filename):
+    if filename.startswith(_SOURCE_ROOT):
+        return os.path.relpath(filename, _SOURCE_ROOT)
+    return filename
+
+
+def _frame_label(code):
+    return f"{code.co_name} ({_display_path(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _stack_labels(frame):
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+class StackSampler:
+    """Samples one thread's Python stack on a timer and counts identical stacks."""
+
+    def __init__(self, thread_id, interval=DEFAULT_SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[';'.join(_stack_labels(frame))] += 1
+
+
+def collapsed_stacks(stacks):
+    """Brendan Gregg's collapsed format, accepted by flamegraph.pl and speedscope."""
+    return ''.join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def top_functions_from_samples(stacks, interval, limit=TOP_FUNCTIONS):
+    inclusive = Counter()
+    own = Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(';')
+        for label in set(frames):
+            inclusive[label] += count
+        own[frames[-1]] += count
+    # Every frame of a single hot stack ties on inclusive samples; self time breaks the tie.
+    ranked = sorted(inclusive.items(), key=lambda item: (item[1], own[item[0]]), reverse=True)
+    return [
+        {
+            'function': label,
+            'cumulative_ms': round(count * interval * 1000, 1),
+            'self_ms': round(own[label] * interval * 1000, 1),
+            'samples': count,
+        }
+        for label, count in ranked[:limit]
+    ]
+
+
+def top_functions_from_cprofile(profiler, limit=TOP_FUNCTIONS):
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = []
+    for (filename, line, name), (_, calls, own_time, cumulative, _) in stats.stats.items():
+        rows.append({
+            'function': f"{name} ({_display_path(filename)}:{line})",
+            'cumulative_ms': round(cumulative * 1000, 1),
+            'self_ms': round(own_time * 1000, 1),
+            'calls': calls,
+        })
+    rows.sort(key=lambda row: row['cumulative_ms'], reverse=True)
+    return rows[:limit]
+
+
+def _profile_path(profile_id, suffix):
+    return os.path.join(profiling_dir(), f"{profile_id}{suffix}")
+
+
+def _prune_profiles():
+    try:
+        keep = max(1, int(os.environ.get(PROFILING_KEEP_ENV, DEFAULT_KEEP)))
+    except ValueError:
+        keep = DEFAULT_KEEP
+    directory = profiling_dir()
+    metas = sorted(
+        (name for name in os.listdir(directory) if name.endswith('.json')),
+        key=lambda name: os.path.getmtime(os.path.join(directory, name)),
+        reverse=True,
+    )
+    for name in metas[keep:]:
+        profile_id = name[:-len('.json')]
+        for suffix in ('.json', '.collapsed', '.prof'):
+            try:
+                os.remove(os.path.join(directory, f"{profile_id}{suffix}"))
+            except OSError:
+                pass
+
+
+def save_profile(meta, collapsed=None, profiler=None):
+    profile_id = meta['id']
+    if collapsed is not None:
+        with open(_profile_path(profile_id, '.collapsed'), 'w', encoding='utf-8') as handle:
+            handle.write(collapsed)
+    if profiler is not None:
+        profiler.dump_stats(_profile_path(profile_id, '.prof'))
+    with open(_profile_path(profile_id, '.json'), 'w', encoding='utf-8') as handle:
+        json.dump(meta, handle)
+    _prune_profiles()
+
+
+def list_profiles():
+    directory = profiling_dir()
+    profiles = []
+    for name in os.listdir(directory):
+        if name.endswith('.json'):
+            with open(os.path.join(directory, name), encoding='utf-8') as handle:
+                meta = json.load(handle)
+            meta.pop('top_functions', None)
+            profiles.append(meta)
+    profiles.sort(key=lambda meta: meta['started_at'], reverse=True)
+    return profiles
+
+
+def load_profile(profile_id):
+    if not _PROFILE_ID_RE.match(profile_id or ''):
+        return None
+    path = _profile_path(profile_id, '.json')
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def profile_file_path(profile_id, kind):
+    suffix = {'collapsed': '.collapsed', 'prof': '.prof'}.get(kind)
+    if suffix is None or not _PROFILE_ID_RE.match(profile_id or ''):
+        return None
+    path = _profile_path(profile_id, suffix)
+    return path if os.path.exists(path) else None
+
+
+def _requested_profile_mode():
+    token = request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_QUERY_ARG)
+    if not profiling_token_allowed(token):
+        return None
+    allowed_paths = _env_list(PROFILING_PATHS_ENV)
+    if allowed_paths and not any(request.path.startswith(prefix) for prefix in allowed_paths):
+        return None
+    mode = request.args.get(PROFILE_MODE_QUERY_ARG, 'sample')
+    return mode if mode in PROFILE_MODES else 'sample'
+
+
+def _profiled_path():
+    """Request path and query string without the profiling token, safe to store and list."""
+    args = [(key, value) for key, value in request.args.items(multi=True) if key != PROFILE_QUERY_ARG]
+    return f"{request.path}?{urlencode(args)}" if args else request.path
+
+
+def register_profiling(app):
+    """Wire request profiling only when tokens are configured; otherwise no hooks are added."""
+    if not profiling_configured():
+        return
+
+    @app.before_request
+    def start_profiling():
+        if request.path.startswith('/api/debug/profiles'):
+            return
+        mode = _requested_profile_mode()
+        if mode is None:
+            return
+        g.profile = {
+            'id': uuid.uuid4().hex,
+            'mode': mode,
+            'started': time.perf_counter(),
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        if mode == 'cprofile':
+            g.profile['profiler'] = cProfile.Profile()
+            g.profile['profiler'].enable()
+        else:
+            g.profile['sampler'] = StackSampler(threading.get_ident())
+            g.profile['sampler'].start()
+
+    @app.after_request
+    def finish_profiling(response):
+        profile = g.pop('profile', None)
+        if profile is None:
+            return response
+
+        profiler = profile.get('profiler')
+        sampler = profile.get('sampler')
+        if profiler is not None:
+            profiler.disable()
+        if sampler is not None:
+            sampler.stop()
+
+        meta = {
+            'id': profile['id'],
+            'mode': profile['mode'],
+            'method': request.method,
+            'path': _profiled_path(),
+            'status': response.status_code,
+            'started_at': profile['started_at'],
+            'duration_ms': round((time.perf_counter() - profile['started']) * 1000, 1),
+        }
+        if sampler is not None:
+            meta['samples'] = sum(sampler.stacks.values())
+            meta['sample_interval_ms'] = sampler.interval * 1000
+            meta['top_functions'] = top_functions_from_samples(sampler.stacks, sampler.interval)
+            save_profile(meta, collapsed=collapsed_stacks(sampler.stacks))
+        else:
+            meta['top_functions'] = top_functions_from_cprofile(profiler)
+            save_profile(meta, profiler=profiler)
+
+        response.headers['X-Profile-Id'] = profile['id']
+        return response
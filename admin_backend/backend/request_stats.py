@@ -0,0 +1,155 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from flask import g, request
+
+from backend.db.instrumentation import (
+    instrumentation_enabled,
+    start_request_stats,
+    stop_request_stats,
+)
+
+HISTORY_SIZE_ENV = 'REQUEST_STATS_HISTORY'
+SLOW_REQUEST_DB_MS_ENV = 'SQL_SLOW_REQUEST_MS'
+SLOW_REQUEST_STATEMENTS_ENV = 'SQL_SLOW_REQUEST_STATEMENTS'
+DEFAULT_HISTORY_SIZE = 100
+DEFAULT_SLOW_REQUEST_DB_MS = 1000.0
+DEFAULT_SLOW_REQUEST_STATEMENTS = 200
+# A normalized statement repeated this often within one request is reported as a likely N+1.
+REPEATED_STATEMENT_THRESHOLD = 20
+TOP_STATEMENTS = 5
+
+slow_query_logger = logging.getLogger('backend.sql.slow')
+
+_history_lock = threading.Lock()
+_history = deque(maxlen=DEFAULT_HISTORY_SIZE)
+
+
+def _env_number(name, default, cast=float):
+    try:
+        return cast(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _round_ms(value):
+    return round(value, 2)
+
+
+def summarize_request_stats(stats, total_ms):
+    statements = sorted(stats['statements'].values(), key=lambda item: item['total_ms'], reverse=True)
+    db_ms = stats['db_ms']
+    remote_ms = stats['remote_ms']
+    return {
+        'total_ms': _round_ms(total_ms),
+        'db_ms': _round_ms(db_ms),
+        'remote_ms': _round_ms(remote_ms),
+        'python_ms': _round_ms(max(0.0, total_ms - db_ms - remote_ms)),
+        'statement_count': stats['statement_count'],
+        'distinct_statements': len(statements),
+        'rows': stats['rows'],
+        'engines': {
+            label: {'statement_count': item['statement_count'], 'db_ms': _round_ms(item['db_ms'])}
+            for label, item in stats['engines'].items()
+        },
+        'remote_calls': stats['remote_calls'],
+        'slowest_statements': [
+            {
+                **item,
+                'total_ms': _round_ms(item['total_ms']),
+                'max_ms': _round_ms(item['max_ms']),
+            }
+            for item in statements[:TOP_STATEMENTS]
+        ],
+        'repeated_statements': [
+            {'statement': item['statement'], 'count': item['count'], 'total_ms': _round_ms(item['total_ms'])}
+            for item in sorted(statements, key=lambda item: item['count'], reverse=True)
+            if item['count'] >= REPEATED_STATEMENT_THRESHOLD
+        ],
+    }
+
+
+def server_timing_header(summary):
+    return ', '.join([
+        f'db;dur={summary["db_ms"]};desc="{summary["statement_count"]} queries"',
+        f'remote;dur={summary["remote_ms"]}',
+        f'app;dur={summary["python_ms"]}',
+        f'total;dur={summary["total_ms"]}',
+    ])
+
+
+def recent_request_stats(limit=None):
+    with _history_lock:
+        entries = list(_history)
+    entries.reverse()
+    return entries[:limit] if limit else entries
+
+
+def _record_history(entry):
+    global _history
+    size = max(1, _env_number(HISTORY_SIZE_ENV, DEFAULT_HISTORY_SIZE, int))
+    with _history_lock:
+        if _history.maxlen != size:
+            _history = deque(_history, maxlen=size)
+        _history.append(entry)
+
+
+def _log_slow_request(entry):
+    slow_db_ms = _env_number(SLOW_REQUEST_DB_MS_ENV, DEFAULT_SLOW_REQUEST_DB_MS)
+    slow_statements = _env_number(SLOW_REQUEST_STATEMENTS_ENV, DEFAULT_SLOW_REQUEST_STATEMENTS, int)
+    if entry['db_ms'] < slow_db_ms and entry['statement_count'] < slow_statements and not entry['repeated_statements']:
+        return
+    slow_query_logger.warning(
+        "Slow request %s %s: %d statements, db=%.1fms remote=%.1fms total=%.1fms; top: %s",
+        entry['method'],
+        entry['path'],
+        entry['statement_count'],
+        entry['db_ms'],
+        entry['remote_ms'],
+        entry['total_ms'],
+        '; '.join(
+            f"{item['count']}x {item['total_ms']}ms {item['statement']}"
+            for item in entry['slowest_statements'][:3]
+        ),
+    )
+
+
+def register_request_stats(app):
+    if not instrumentation_enabled():
+        return
+
+    @app.before_request
+    def start_request_timing():
+        g.request_started = time.perf_counter()
+        g.request_stats, g.request_stats_token = start_request_stats()
+
+    @app.after_request
+    def add_server_timing(response):
+        stats = g.pop('request_stats', None)
+        if stats is None:
+            return response
+        summary = summarize_request_stats(stats, (time.perf_counter() - g.request_started) * 1000)
+        response.headers['Server-Timing'] = server_timing_header(summary)
+
+        if request.endpoint != 'debug.get_request_stats':
+            entry = {
+                'method': request.method,
+                'path': request.path,
+                'endpoint': request.endpoint,
+                'status': response.status_code,
+                'finished_at': datetime.now().isoformat(timespec='seconds'),
+                **summary,
+            }
+            _record_history(entry)
+            _log_slow_request(entry)
+        return response
+
+    @app.teardown_request
+    def stop_request_timing(error=None):
+        token = g.pop('request_stats_token', None)
+        if token is not None:
+            stop_request_stats(token)
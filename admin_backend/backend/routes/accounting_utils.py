@@ -4,8 +4,9 @@ from decimal import Decimal
 from sqlalchemy import text
 
 from backend.db.schema import get_table_columns
-from backend.db.session import get_db_engine
+from backend.db.session import get_db_engine, get_reporting_engine
 from backend.errors import ApiError
+from backend.services.transactions.split_flags import IS_SPLIT_CONTAINER
 
 
 def require_db_engine():
@@ -15,6 +16,14 @@ def require_db_engine():
     return engine
 
 
+def require_reporting_engine():
+    """Engine for read-only report queries (replica or dedicated pool, else the primary)."""
+    engine, error_msg = get_reporting_engine()
+    if engine is None:
+        raise ApiError(error_msg or 'Database connection failed', status_code=500, code='db_unavailable')
+    return engine
+
+
 def current_timestamp_expression(conn):
     return "CURRENT_TIMESTAMP" if conn.dialect.name == 'sqlite' else "NOW()"
 
@@ -38,6 +47,8 @@ def split_parent_exclusion_clause(conn, alias='t'):
     if 'parent_id' not in txn_columns:
         return ''
     # Exclude parent if it has children (children will be included individually)
+    if IS_SPLIT_CONTAINER in txn_columns:
+        return f" AND {alias}.{IS_SPLIT_CONTAINER} = 0"
     return f" AND NOT EXISTS (SELECT 1 FROM transactions t_child WHERE t_child.parent_id = {alias}.id)"
 
 
@@ -4,6 +4,7 @@ from datetime import date
 from backend.errors import BadRequestError, NotFoundError
 from backend.routes.accounting_utils import require_db_engine, serialize_row_values
 from backend.routes.amortization.amortization_queries import (
+    amortization_asset_scope_query,
     delete_amortization_asset_query,
     insert_amortization_asset_query,
     pending_amortization_transactions_query,
@@ -12,9 +13,18 @@ from backend.routes.amortization.amortization_queries import (
     update_amortization_asset_query,
     update_transactions_asset_link_query,
 )
+from backend.services.reporting import data_changes
+from backend.services.reporting.data_changes import record_data_change
+from backend.services.reporting.report_value_utils import _year_date_bounds as year_date_bounds
 
 amortization_asset_bp = Blueprint('amortization_asset_bp', __name__)
 
+
+def _record_asset_change(conn, asset_id):
+    row = conn.execute(amortization_asset_scope_query(), {'asset_id': asset_id}).fetchone()
+    if row:
+        record_data_change(conn, data_changes.AMORTIZATION, row.company_id, row.acquisition_date)
+
 @amortization_asset_bp.route('/api/reports/pending-amortization', methods=['GET'])
 def get_pending_amortization_transactions():
     """Retrieve transactions marked as assets that are not yet linked to an amortization_assets record"""
@@ -36,7 +46,7 @@ def get_pending_amortization_transactions():
     with engine.connect() as conn:
         params = {'company_id': company_id}
         if year_int:
-            params['year'] = year_int
+            params['next_year_start'] = year_date_bounds(year_int)[1]
         if current_asset_id:
             params['current_asset_id'] = current_asset_id
 
@@ -91,6 +101,7 @@ def create_amortization_asset():
             **params,
             'asset_id': asset_id,
         })
+        record_data_change(conn, data_changes.AMORTIZATION, company_id, acquisition_date)
 
     return jsonify({
         'message': 'Amortization asset created successfully',
@@ -112,6 +123,7 @@ def update_amortization_asset(asset_id):
 
     engine = require_db_engine()
     with engine.begin() as conn:
+        _record_asset_change(conn, asset_id)
         set_fields = ["asset_name = :asset_name"]
         params = {'asset_id': asset_id, 'asset_name': asset_name}
 
@@ -146,6 +158,7 @@ def update_amortization_asset(asset_id):
             params['acquisition_cost'] = new_cost
 
         result = conn.execute(update_amortization_asset_query(', '.join(set_fields)), params)
+        _record_asset_change(conn, asset_id)
 
     if result.rowcount == 0:
         raise NotFoundError('Asset not found')
@@ -156,6 +169,7 @@ def delete_amortization_asset(asset_id):
     """Delete an amortization asset and unlink its transactions"""
     engine = require_db_engine()
     with engine.begin() as conn:
+        _record_asset_change(conn, asset_id)
         conn.execute(unlink_transactions_by_asset_query(), {'asset_id': asset_id})
 
         result = conn.execute(delete_amortization_asset_query(), {'asset_id': asset_id})
@@ -24,6 +24,8 @@ from backend.routes.amortization.amortization_config_queries import (
     update_amortization_settings_query,
     update_mark_amortization_mapping_query,
 )
+from backend.services.reporting import data_changes
+from backend.services.reporting.data_changes import record_data_change
 
 amortization_config_bp = Blueprint('amortization_config_bp', __name__)
 
@@ -79,6 +81,7 @@ def create_amortization_asset_group():
                 'useful_life_years': data.get('useful_life_years')
             }
         )
+        record_data_change(conn, data_changes.AMORTIZATION, data.get('company_id'))
 
     return jsonify({**data, 'id': group_id}), 201
 
@@ -97,6 +100,7 @@ def update_amortization_asset_group(group_id):
             'tarif_half_rate': data.get('tarif_half_rate'),
             'useful_life_years': data.get('useful_life_years')
         })
+        record_data_change(conn, data_changes.AMORTIZATION)
 
     if result.rowcount == 0:
         raise NotFoundError('Amortization asset group not found')
@@ -166,6 +170,7 @@ def save_amortization_settings():
                         'typ': typ
                     }
                 )
+        record_data_change(conn, data_changes.AMORTIZATION, company_id)
     return jsonify({'success': True})
 
 @amortization_config_bp.route('/api/mark-amortization-mappings', methods=['GET'])
@@ -200,6 +205,7 @@ def create_mark_amortization_mapping():
                 'is_deductible_50_percent': data.get('is_deductible_50_percent', False)
             }
         )
+        record_data_change(conn, data_changes.AMORTIZATION)
 
     return jsonify({**data, 'id': mapping_id}), 201
 
@@ -218,6 +224,7 @@ def update_mark_amortization_mapping(mapping_id):
             'asset_group_id': data.get('asset_group_id'),
             'is_deductible_50_percent': data.get('is_deductible_50_percent')
         })
+        record_data_change(conn, data_changes.AMORTIZATION)
 
     if result.rowcount == 0:
         raise NotFoundError('Mark amortization mapping not found')
@@ -229,6 +236,7 @@ def delete_mark_amortization_mapping(mapping_id):
     engine = require_db_engine()
     with engine.begin() as conn:
         result = conn.execute(delete_mark_amortization_mapping_query(), {'id': mapping_id})
+        record_data_change(conn, data_changes.AMORTIZATION)
 
     if result.rowcount == 0:
         raise NotFoundError('Mark amortization mapping not found')
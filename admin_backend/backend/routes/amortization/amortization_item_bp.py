@@ -5,6 +5,7 @@ from sqlalchemy import text
 from backend.errors import BadRequestError, ConflictError, NotFoundError
 from backend.routes.accounting_utils import require_db_engine
 from backend.routes.amortization.amortization_queries import (
+    amortization_item_scope_query,
     coa_id_by_code_query,
     existing_manual_journal_query,
     first_company_query,
@@ -18,9 +19,22 @@ from backend.routes.amortization.amortization_queries import (
 )
 from backend.routes.reporting.report_helpers import serialize_row_values
 from backend.services.reporting.amortization_report_service import fetch_amortization_report_data
+from backend.services.reporting import data_changes
+from backend.services.reporting.data_changes import record_data_change
+from backend.services.reporting.report_value_utils import _year_date_bounds as year_date_bounds
+from backend.services.transactions.import_batches import refresh_import_batches
+from backend.services.transactions.mark_stats import refresh_mark_stats_for
+from backend.services.transactions.payroll_aggregates import refresh_payroll_aggregates
+from backend.services.transactions.transaction_search import refresh_search_index
 
 amortization_item_bp = Blueprint('amortization_item_bp', __name__)
 
+
+def _record_item_change(conn, item_id):
+    row = conn.execute(amortization_item_scope_query(), {'id': item_id}).fetchone()
+    if row:
+        record_data_change(conn, data_changes.AMORTIZATION, row.company_id, f"{row.year}-01-01")
+
 @amortization_item_bp.route('/api/reports/amortization-items', methods=['GET'])
 @amortization_item_bp.route('/api/amortization-items', methods=['GET'])
 def get_amortization_items():
@@ -81,9 +95,9 @@ def export_amortization_items_pdf():
         report_data['company_name'] = company_name
         report_data['year'] = int(year)
 
-        pdf_path = generate_amortization_pdf(report_data)
+        pdf_buffer = generate_amortization_pdf(report_data)
         return send_file(
-            pdf_path,
+            pdf_buffer,
             as_attachment=True,
             download_name=f"Amortization_{company_name.replace(' ', '_')}_{year}.pdf",
             mimetype='application/pdf'
@@ -107,9 +121,11 @@ def generate_manual_amortization_journal():
             'year': year
         }).fetchall()
 
+        year_start, next_year_start = year_date_bounds(year)
         existing_result = conn.execute(existing_manual_journal_query(), {
             'company_id': company_id,
-            'year': year
+            'year_start': year_start,
+            'next_year_start': next_year_start,
         }).fetchone()
 
         if existing_result and existing_result.count > 0:
@@ -137,6 +153,7 @@ def generate_manual_amortization_journal():
                 coa_ids[asset_type] = coa_result[0]
 
         journal_count = 0
+        journal_txn_ids = []
         for row in manual_rows:
             d = row._mapping
             amount = float(d['amount'])
@@ -177,6 +194,7 @@ def generate_manual_amortization_journal():
             description = f"Manual Amortization - {d['description']}"
 
             debit_txn_id = str(uuid.uuid4())
+            journal_txn_ids.append(debit_txn_id)
             conn.execute(insert_transaction_query(), {
                 'id': debit_txn_id,
                 'date': txn_date,
@@ -190,6 +208,7 @@ def generate_manual_amortization_journal():
 
             if asset_type in coa_ids:
                 credit_txn_id = str(uuid.uuid4())
+                journal_txn_ids.append(credit_txn_id)
                 conn.execute(insert_transaction_query(), {
                     'id': credit_txn_id,
                     'date': txn_date,
@@ -203,6 +222,12 @@ def generate_manual_amortization_journal():
 
             journal_count += 1
 
+        if journal_count:
+            record_data_change(conn, data_changes.AMORTIZATION, company_id, year_start, f"{year}-12-31")
+            refresh_import_batches(conn, [('manual_amortization_journal', None)])
+            refresh_search_index(conn, journal_txn_ids)
+            refresh_payroll_aggregates(conn, refresh_mark_stats_for(conn, journal_txn_ids))
+
         return jsonify({
             'message': f'Successfully generated {journal_count} journal entries',
             'journal_count': journal_count,
@@ -233,6 +258,7 @@ def create_amortization_item():
             'notes': data.get('notes'),
             'is_manual': data.get('is_manual', True)
         })
+        record_data_change(conn, data_changes.AMORTIZATION, data.get('company_id'), f"{data.get('year')}-01-01")
 
     return jsonify({**data, 'id': item_id}), 201
 
@@ -242,6 +268,7 @@ def update_amortization_item(item_id):
     data = request.json or {}
     engine = require_db_engine()
     with engine.begin() as conn:
+        _record_item_change(conn, item_id)
         result = conn.execute(update_amortization_item_query(), {
             'id': item_id,
             'mark_id': data.get('mark_id'),
@@ -262,6 +289,7 @@ def delete_amortization_item(item_id):
     """Delete an amortization item"""
     engine = require_db_engine()
     with engine.begin() as conn:
+        _record_item_change(conn, item_id)
         result = conn.execute(delete_amortization_item_query(), {'id': item_id})
 
     if result.rowcount == 0:
@@ -69,7 +69,8 @@ def existing_manual_journal_query():
         INNER JOIN marks m ON t.mark_id = m.id
         WHERE m.personal_use LIKE 'Manual Amortization-%'
         AND t.company_id = :company_id
-        AND YEAR(t.txn_date) = :year
+        AND t.txn_date >= :year_start
+        AND t.txn_date < :next_year_start
     """)
 
 
@@ -133,8 +134,12 @@ def delete_amortization_item_query():
     return text("DELETE FROM amortization_items WHERE id = :id")
 
 
+def amortization_item_scope_query():
+    return text("SELECT company_id, year FROM amortization_items WHERE id = :id")
+
+
 def pending_amortization_transactions_query(include_year=False, include_current_asset=False):
-    year_filter = "AND YEAR(t.txn_date) <= :year" if include_year else ""
+    year_filter = "AND t.txn_date < :next_year_start" if include_year else ""
     asset_filter = "AND t.amortization_asset_id IS NULL"
     if include_current_asset:
         asset_filter = "AND (t.amortization_asset_id IS NULL OR t.amortization_asset_id = :current_asset_id)"
@@ -209,3 +214,7 @@ def update_amortization_asset_query(set_clause):
 
 def delete_amortization_asset_query():
     return text("DELETE FROM amortization_assets WHERE id = :asset_id")
+
+
+def amortization_asset_scope_query():
+    return text("SELECT company_id, acquisition_date FROM amortization_assets WHERE id = :asset_id")
@@ -0,0 +1,75 @@
+import os
+
+from flask import Blueprint, current_app, jsonify, request, send_file
+
+from backend.errors import NotFoundError
+from backend.profiling import (
+    PROFILE_HEADER,
+    PROFILE_QUERY_ARG,
+    list_profiles,
+    load_profile,
+    profile_file_path,
+    profiling_token_allowed,
+)
+from backend.request_stats import recent_request_stats
+
+debug_bp = Blueprint('debug', __name__)
+
+DEBUG_ENDPOINTS_ENV = 'DEBUG_ENDPOINTS'
+
+
+def debug_endpoints_enabled():
+    flag = os.environ.get(DEBUG_ENDPOINTS_ENV, '').strip().lower()
+    return current_app.debug or flag in {'1', 'true', 'yes', 'on'}
+
+
+def _require_profile_access():
+    token = request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_QUERY_ARG)
+    if not (debug_endpoints_enabled() or profiling_token_allowed(token)):
+        raise NotFoundError('Debug endpoints are disabled')
+
+
+@debug_bp.route('/api/debug/request-stats', methods=['GET'])
+def get_request_stats():
+    if not debug_endpoints_enabled():
+        raise NotFoundError('Debug endpoints are disabled')
+
+    try:
+        limit = max(1, int(request.args.get('limit', 20)))
+    except (TypeError, ValueError):
+        limit = 20
+
+    requests = recent_request_stats(limit)
+    path = request.args.get('path')
+    if path:
+        requests = [entry for entry in requests if entry['path'].startswith(path)]
+    return jsonify({'success': True, 'data': requests})
+
+
+@debug_bp.route('/api/debug/profiles', methods=['GET'])
+def get_profiles():
+    _require_profile_access()
+    return jsonify({'success': True, 'data': list_profiles()})
+
+
+@debug_bp.route('/api/debug/profiles/<profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    _require_profile_access()
+    profile = load_profile(profile_id)
+    if profile is None:
+        raise NotFoundError('Profile not found')
+    return jsonify({'success': True, 'data': profile})
+
+
+@debug_bp.route('/api/debug/profiles/<profile_id>/<kind>', methods=['GET'])
+def download_profile(profile_id, kind):
+    _require_profile_access()
+    path = profile_file_path(profile_id, kind)
+    if path is None:
+        raise NotFoundError('Profile file not found')
+    return send_file(
+        path,
+        as_attachment=True,
+        download_name=os.path.basename(path),
+        mimetype='text/plain' if kind == 'collapsed' else 'application/octet-stream',
+    )
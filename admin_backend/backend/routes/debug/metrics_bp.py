@@ -0,0 +1,11 @@
+from flask import Blueprint, Response
+
+from backend.metrics import render_metrics
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    body, content_type = render_metrics()
+    return Response(body, content_type=content_type)
@@ -10,27 +10,32 @@ from backend.db.schema import get_table_columns
 from backend.errors import BadRequestError, NotFoundError, ServiceUnavailableError
 from backend.routes.accounting_utils import serialize_result_rows, serialize_row_values
 from backend.routes.inventory.hpp_helpers import (
+    diff_batch_products,
     normalize_product_payload,
     require_db_engine,
 )
 from backend.routes.route_utils import _fetch_remote_json
 from backend.routes.inventory.hpp_queries import (
     delete_batch_by_id as q_delete_batch_by_id,
-    delete_batch_products as q_delete_batch_products,
-    delete_batch_transactions as q_delete_batch_transactions,
+    delete_batch_products_by_ids as q_delete_batch_products_by_ids,
+    delete_batch_transaction_links as q_delete_batch_transaction_links,
     get_batch_by_id as q_get_batch_by_id,
+    get_batch_product_rows as q_get_batch_product_rows,
     get_batch_products as q_get_batch_products,
+    get_batch_transaction_ids as q_get_batch_transaction_ids,
     get_batch_transactions as q_get_batch_transactions,
     get_batch_unit_prices as q_get_batch_unit_prices,
     get_batches as q_get_batches,
-    get_earliest_transaction_date as q_get_earliest_transaction_date,
     get_linkable_transactions as q_get_linkable_transactions,
-    get_total_transaction_amount as q_get_total_transaction_amount,
+    get_transaction_totals as q_get_transaction_totals,
     insert_batch as q_insert_batch,
     insert_batch_product as q_insert_batch_product,
     insert_batch_transaction as q_insert_batch_transaction,
     update_batch as q_update_batch,
+    update_batch_product as q_update_batch_product,
 )
+from backend.services.inventory.hpp_price_timeline import invalidate_hpp_price_timelines
+from backend.services.transactions.transaction_search import search_join
 
 hpp_bp = Blueprint('hpp_bp', __name__)
 logger = logging.getLogger(__name__)
@@ -241,7 +246,7 @@ def save_batch():
     company_id = data.get('company_id')
     memo = data.get('memo', '')
     batch_date = data.get('batch_date')
-    transaction_ids = data.get('transaction_ids') or []
+    transaction_ids = [str(txn_id) for txn_id in dict.fromkeys(data.get('transaction_ids') or []) if txn_id]
     raw_items = data.get('items')
     if raw_items is None:
         raw_items = data.get('products') or []
@@ -262,23 +267,17 @@ def save_batch():
     if any(not item.get('stock_monitoring_id') for item in items):
         raise BadRequestError('Each batch item must include stock_monitoring_id')
 
-    if not batch_date:
-        logger.debug("[COGS Batch] No batch_date provided, calculating from selected transactions")
-        with engine.connect() as conn:
-            earliest_date = q_get_earliest_transaction_date(conn, transaction_ids)
-        if earliest_date:
-            batch_date = earliest_date.strftime('%Y-%m-%d')
-            logger.debug("[COGS Batch] Calculated batch_date=%s", batch_date)
-
-    if not batch_date:
-        batch_date = datetime.now().strftime('%Y-%m-%d')
-        logger.debug("[COGS Batch] Falling back to current date batch_date=%s", batch_date)
-
-    logger.debug("[COGS Batch] Final batch_date=%s", batch_date)
-
     with engine.begin() as conn:
-        total_idr_amount = q_get_total_transaction_amount(conn, transaction_ids)
-        total_foreign_value = sum(item['quantity'] * item['foreign_price'] for item in items)
+        total_idr_amount, earliest_date = q_get_transaction_totals(conn, transaction_ids)
+        if not batch_date and earliest_date:
+            batch_date = (
+                earliest_date.strftime('%Y-%m-%d') if hasattr(earliest_date, 'strftime') else str(earliest_date)[:10]
+            )
+            logger.debug("[COGS Batch] Calculated batch_date=%s from selected transactions", batch_date)
+        if not batch_date:
+            batch_date = datetime.now().strftime('%Y-%m-%d')
+            logger.debug("[COGS Batch] Falling back to current date batch_date=%s", batch_date)
+
         hpp_batch_product_columns = get_table_columns(conn, 'hpp_batch_products')
         if 'stock_monitoring_id' not in hpp_batch_product_columns:
             raise BadRequestError(
@@ -308,11 +307,20 @@ def save_batch():
             if result.rowcount == 0:
                 raise NotFoundError('Batch not found')
 
-        conn.execute(q_delete_batch_transactions(), {'batch_id': batch_id})
-        for transaction_id in transaction_ids:
-            conn.execute(q_insert_batch_transaction(), {'batch_id': batch_id, 'txn_id': transaction_id})
+        # Diff against what the batch already holds and apply each side as one executemany
+        # (the MySQL driver sends those INSERTs as multi-row statements).
+        linked_ids = set() if is_new else q_get_batch_transaction_ids(conn, batch_id)
+        added_txn_ids = [txn_id for txn_id in transaction_ids if txn_id not in linked_ids]
+        removed_txn_ids = sorted(linked_ids - set(transaction_ids))
+        if removed_txn_ids:
+            conn.execute(q_delete_batch_transaction_links(), {'batch_id': batch_id, 'txn_ids': removed_txn_ids})
+        if added_txn_ids:
+            conn.execute(q_insert_batch_transaction(), [
+                {'batch_id': batch_id, 'txn_id': txn_id} for txn_id in added_txn_ids
+            ])
 
-        conn.execute(q_delete_batch_products(), {'batch_id': batch_id})
+        total_foreign_value = sum(item['quantity'] * item['foreign_price'] for item in items)
+        product_rows = []
         for item in items:
             item_foreign_value = item['quantity'] * item['foreign_price']
             calculated_total_idr = (
@@ -323,21 +331,44 @@ def save_batch():
                 calculated_total_idr / item['quantity']
                 if item['quantity'] > 0 else 0.0
             )
-            conn.execute(q_insert_batch_product(conn), {
-                'id': str(uuid.uuid4()),
+            product_rows.append({
                 'batch_id': batch_id,
-                'stock_monitoring_id': item['stock_monitoring_id'],
+                'stock_monitoring_id': str(item['stock_monitoring_id']),
                 'qty': item['quantity'],
                 'currency': item['foreign_currency'],
                 'price': item['foreign_price'],
                 'total_idr': calculated_total_idr,
                 'unit_idr': calculated_unit_idr,
             })
+        stored_rows = [] if is_new else q_get_batch_product_rows(conn, batch_id)
+        product_inserts, product_updates, deleted_product_ids, unchanged_products = diff_batch_products(
+            stored_rows, product_rows
+        )
+        if deleted_product_ids:
+            conn.execute(q_delete_batch_products_by_ids(), {'batch_id': batch_id, 'ids': deleted_product_ids})
+        if product_updates:
+            conn.execute(q_update_batch_product(), product_updates)
+        if product_inserts:
+            conn.execute(q_insert_batch_product(conn), product_inserts)
+    invalidate_hpp_price_timelines()
 
     return jsonify({
         'message': 'Batch saved successfully',
         'batch_id': batch_id,
         'total_amount': total_idr_amount,
+        'diff': {
+            'transactions': {
+                'added': added_txn_ids,
+                'removed': removed_txn_ids,
+                'unchanged_count': len(transaction_ids) - len(added_txn_ids),
+            },
+            'products': {
+                'added_count': len(product_inserts),
+                'updated_count': len(product_updates),
+                'removed_count': len(deleted_product_ids),
+                'unchanged_count': unchanged_products,
+            },
+        },
     })
 
 @hpp_bp.route('/api/hpp-batches/<batch_id>', methods=['DELETE'])
@@ -347,20 +378,25 @@ def delete_batch(batch_id):
         result = conn.execute(q_delete_batch_by_id(), {'id': batch_id})
         if result.rowcount == 0:
             raise NotFoundError('Batch not found')
+    invalidate_hpp_price_timelines()
     return jsonify({'message': 'Batch deleted successfully'})
 
 @hpp_bp.route('/api/transactions/linkable-to-hpp', methods=['GET'])
 def get_linkable_transactions():
     """
     Returns transactions that can be linked to a batch (possibly excluding already linked ones if strict).
-    Currently returns transactions for the chosen company/dates.
+    Currently returns transactions for the chosen company/dates, optionally narrowed by `search`.
     """
     engine = require_db_engine()
     company_id = request.args.get('company_id')
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
+    search = request.args.get('search', '').strip()
     with engine.connect() as conn:
-        result = conn.execute(*q_get_linkable_transactions(company_id, start_date, end_date))
+        search_join_sql, search_params = search_join(conn, search, 't')
+        result = conn.execute(*q_get_linkable_transactions(
+            company_id, start_date, end_date, search_join_sql, search_params
+        ))
         return jsonify({
             'transactions': serialize_result_rows(result, datetime_format='%Y-%m-%d')
         })
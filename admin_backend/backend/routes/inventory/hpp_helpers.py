@@ -1,3 +1,6 @@
+import uuid
+from decimal import ROUND_HALF_UP, Decimal
+
 from backend.routes.accounting_utils import (
     require_db_engine,
 )
@@ -16,3 +19,56 @@ def normalize_product_payload(item):
         'foreign_currency': item.get('foreign_currency') or 'USD',
         'foreign_price': _to_float(item.get('foreign_price')),
     }
+
+
+# hpp_batch_products value fields -> decimal places of their column (None: compared as-is).
+# Quantities keep 4 decimals; prices and IDR amounts are DECIMAL(15,2).
+BATCH_PRODUCT_FIELD_SCALES = {
+    'qty': 4,
+    'currency': None,
+    'price': 2,
+    'total_idr': 2,
+    'unit_idr': 2,
+}
+BATCH_PRODUCT_VALUE_FIELDS = tuple(BATCH_PRODUCT_FIELD_SCALES)
+
+
+def _column_value(value, scale):
+    """`value` as the column would store it: a Decimal rounded half-up to `scale` places."""
+    return Decimal(str(_to_float(value))).quantize(Decimal(1).scaleb(-scale), rounding=ROUND_HALF_UP)
+
+
+def _same_batch_product(stored, requested):
+    for field, scale in BATCH_PRODUCT_FIELD_SCALES.items():
+        left, right = stored.get(field), requested.get(field)
+        if scale is not None:
+            if _column_value(left, scale) != _column_value(right, scale):
+                return False
+        elif left != right:
+            return False
+    return True
+
+
+def diff_batch_products(stored_rows, requested_rows):
+    """
+    Pair requested product rows with a batch's stored rows by stock_monitoring_id (repeated items
+    pair up in order). Returns (inserts, updates, deleted_ids, unchanged_count); paired rows keep
+    their stored id.
+    """
+    stored_by_reference = {}
+    for row in stored_rows:
+        stored_by_reference.setdefault(str(row['stock_monitoring_id']), []).append(row)
+
+    inserts, updates, unchanged_count = [], [], 0
+    for row in requested_rows:
+        candidates = stored_by_reference.get(str(row['stock_monitoring_id']))
+        if not candidates:
+            inserts.append({**row, 'id': str(uuid.uuid4())})
+            continue
+        stored = candidates.pop(0)
+        if _same_batch_product(stored, row):
+            unchanged_count += 1
+        else:
+            updates.append({**row, 'id': stored['id']})
+    deleted_ids = [row['id'] for rows in stored_by_reference.values() for row in rows]
+    return inserts, updates, deleted_ids, unchanged_count
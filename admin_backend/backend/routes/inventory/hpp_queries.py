@@ -148,28 +148,19 @@ def get_batch_products(conn, batch_id):
     """), {'batch_id': batch_id}
 
 
-def get_earliest_transaction_date(conn, transaction_ids):
+def get_transaction_totals(conn, transaction_ids):
+    """(total absolute amount, earliest txn_date) of `transaction_ids` in one pass."""
     result = conn.execute(
         text("""
-            SELECT MIN(txn_date) AS earliest_date
+            SELECT SUM(ABS(amount)) AS total, MIN(txn_date) AS earliest_date
             FROM transactions
             WHERE id IN :transaction_ids
         """).bindparams(bindparam('transaction_ids', expanding=True)),
         {'transaction_ids': transaction_ids},
     ).fetchone()
-    return result[0] if result else None
-
-
-def get_total_transaction_amount(conn, transaction_ids):
-    result = conn.execute(
-        text("""
-            SELECT SUM(ABS(amount)) AS total
-            FROM transactions
-            WHERE id IN :transaction_ids
-        """).bindparams(bindparam('transaction_ids', expanding=True)),
-        {'transaction_ids': transaction_ids},
-    ).fetchone()
-    return float(result[0] or 0.0) if result else 0.0
+    if not result:
+        return 0.0, None
+    return float(result.total or 0.0), result.earliest_date
 
 
 def insert_batch(conn):
@@ -207,8 +198,19 @@ def update_batch(conn):
     """)
 
 
-def delete_batch_transactions():
-    return text("DELETE FROM hpp_batch_transactions WHERE batch_id = :batch_id")
+def get_batch_transaction_ids(conn, batch_id):
+    result = conn.execute(
+        text("SELECT transaction_id FROM hpp_batch_transactions WHERE batch_id = :batch_id"),
+        {'batch_id': batch_id},
+    )
+    return {str(row.transaction_id) for row in result}
+
+
+def delete_batch_transaction_links():
+    return text("""
+        DELETE FROM hpp_batch_transactions
+        WHERE batch_id = :batch_id AND transaction_id IN :txn_ids
+    """).bindparams(bindparam('txn_ids', expanding=True))
 
 
 def insert_batch_transaction():
@@ -218,8 +220,46 @@ def insert_batch_transaction():
     """)
 
 
-def delete_batch_products():
-    return text("DELETE FROM hpp_batch_products WHERE batch_id = :batch_id")
+def get_batch_product_rows(conn, batch_id):
+    """Stored product rows of `batch_id`, keyed like the insert_batch_product parameters."""
+    result = conn.execute(text("""
+        SELECT id, stock_monitoring_id, quantity, foreign_currency, foreign_price,
+               calculated_total_idr, calculated_unit_idr_hpp
+        FROM hpp_batch_products
+        WHERE batch_id = :batch_id
+        ORDER BY id
+    """), {'batch_id': batch_id})
+    return [
+        {
+            'id': str(row.id),
+            'stock_monitoring_id': str(row.stock_monitoring_id or ''),
+            'qty': float(row.quantity or 0.0),
+            'currency': row.foreign_currency,
+            'price': float(row.foreign_price or 0.0),
+            'total_idr': float(row.calculated_total_idr or 0.0),
+            'unit_idr': float(row.calculated_unit_idr_hpp or 0.0),
+        }
+        for row in result
+    ]
+
+
+def delete_batch_products_by_ids():
+    return text("""
+        DELETE FROM hpp_batch_products
+        WHERE batch_id = :batch_id AND id IN :ids
+    """).bindparams(bindparam('ids', expanding=True))
+
+
+def update_batch_product():
+    return text("""
+        UPDATE hpp_batch_products
+        SET quantity = :qty,
+            foreign_currency = :currency,
+            foreign_price = :price,
+            calculated_total_idr = :total_idr,
+            calculated_unit_idr_hpp = :unit_idr
+        WHERE id = :id
+    """)
 
 
 def insert_batch_product(conn):
@@ -259,8 +299,8 @@ def delete_batch_by_id():
     return text("DELETE FROM hpp_batches WHERE id = :id")
 
 
-def get_linkable_transactions(company_id=None, start_date=None, end_date=None):
-    query = """
+def get_linkable_transactions(company_id=None, start_date=None, end_date=None, search_join_sql='', search_params=None):
+    query = f"""
         SELECT t.id,
                t.txn_date,
                COALESCE(t.description, parent.description, '') AS description,
@@ -269,13 +309,14 @@ def get_linkable_transactions(company_id=None, start_date=None, end_date=None):
                COALESCE(ts_mark.personal_use, m.personal_use, t.mark, '') AS mark,
                (SELECT 1 FROM hpp_batch_transactions bt WHERE bt.transaction_id = t.id LIMIT 1) AS is_linked
         FROM transactions t
+        {search_join_sql}
         LEFT JOIN transactions parent ON t.parent_id = parent.id
         LEFT JOIN marks m ON t.mark_id = m.id
         LEFT JOIN transaction_splits ts ON ts.transaction_id = t.id
         LEFT JOIN marks ts_mark ON ts.mark_id = ts_mark.id
         WHERE 1=1
     """
-    params = {}
+    params = dict(search_params or {})
     if company_id:
         query += " AND t.company_id = :company_id"
         params['company_id'] = company_id
@@ -285,5 +326,8 @@ def get_linkable_transactions(company_id=None, start_date=None, end_date=None):
     if end_date:
         query += " AND t.txn_date <= :end_date"
         params['end_date'] = end_date
-    query += " ORDER BY t.txn_date DESC, t.id"
+    if search_join_sql:
+        query += " ORDER BY search_hits.search_rank DESC, t.txn_date DESC, t.id"
+    else:
+        query += " ORDER BY t.txn_date DESC, t.id"
     return text(query), params
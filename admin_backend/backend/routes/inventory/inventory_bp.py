@@ -7,7 +7,7 @@ from sqlalchemy import text
 
 from backend.db.schema import get_table_columns
 from backend.db.session import get_sagansa_engine
-from backend.errors import BadRequestError
+from backend.errors import BadRequestError, NotFoundError
 from backend.routes.accounting_utils import (
     build_inventory_balance_with_carry,
     require_db_engine,
@@ -30,6 +30,15 @@ from backend.routes.inventory.remaining_storage_helpers import (
 )
 from backend.routes.inventory.remaining_storage_queries import build_monitoring_definition_query
 from backend.routes.route_utils import _fetch_remote_json, _safe_int
+from backend.services.inventory.hpp_price_timeline import load_hpp_price_timeline, normalize_product_key
+from backend.services.inventory.inventory_snapshots import (
+    MAX_BUILD_MONTHS,
+    build_inventory_snapshots,
+    inventory_snapshots_available,
+    list_inventory_snapshot_items,
+    list_inventory_snapshots,
+    month_range,
+)
 
 inventory_bp = Blueprint('inventory_bp', __name__)
 
@@ -56,6 +65,19 @@ def _require_remaining_storage_token(token):
         raise BadRequestError('Remaining storage API token is required')
 
 
+def _remaining_storage_credentials(source):
+    api_url = str(source.get('api_url') or DEFAULT_REMAINING_STORAGE_API_URL).strip()
+    token = str(
+        source.get('token')
+        or source.get('access_token')
+        or source.get('api_token')
+        or DEFAULT_REMAINING_STORAGE_API_TOKEN
+        or ''
+    ).strip()
+    _require_remaining_storage_token(token)
+    return api_url, token
+
+
 def _require_sagansa_engine():
     engine, error_msg = get_sagansa_engine()
     if engine is None:
@@ -63,13 +85,6 @@ def _require_sagansa_engine():
     return engine
 
 
-def _normalize_product_key(value):
-    raw = str(value or '').strip().lower()
-    if not raw:
-        return ''
-    return ' '.join(raw.replace('_', ' ').replace('-', ' ').split())
-
-
 def _fetch_stock_monitoring_index():
     token = str(DEFAULT_STOCK_MONITORING_API_TOKEN or '').strip()
     api_url = str(DEFAULT_STOCK_MONITORING_API_URL or '').strip()
@@ -247,7 +262,7 @@ def _build_quantity_map(rows):
         for detail in row.get('details') or []:
             product_id = detail.get('product_id')
             product_name = detail.get('product_name')
-            name_key = _normalize_product_key(product_name)
+            name_key = normalize_product_key(product_name)
             if product_id in (None, '') and not name_key:
                 continue
 
@@ -272,137 +287,6 @@ def _build_quantity_map(rows):
     return product_map
 
 
-def _fetch_hpp_price_references(conn, company_id, snapshot_date, monitoring_index=None):
-    hpp_batch_product_columns = get_table_columns(conn, 'hpp_batch_products')
-    if 'stock_monitoring_id' in hpp_batch_product_columns and 'product_id' in hpp_batch_product_columns:
-        reference_expr = "COALESCE(bp.stock_monitoring_id, bp.product_id)"
-    elif 'stock_monitoring_id' in hpp_batch_product_columns:
-        reference_expr = "bp.stock_monitoring_id"
-    else:
-        reference_expr = "bp.product_id"
-
-    has_products = bool(get_table_columns(conn, 'products'))
-    product_join = "LEFT JOIN products p ON p.id = {reference_expr}".format(reference_expr=reference_expr) if has_products else ""
-    local_name_expr = "COALESCE(p.name, CAST({reference_expr} AS CHAR))".format(reference_expr=reference_expr) if has_products else f"CAST({reference_expr} AS CHAR)"
-    monitoring_index = monitoring_index or {}
-
-    rows = conn.execute(text(f"""
-        SELECT
-            CAST(bp.id AS CHAR) AS reference_id,
-            CAST({reference_expr} AS CHAR) AS product_id,
-            {local_name_expr} AS product_name,
-            bp.calculated_unit_idr_hpp AS unit_price,
-            CAST(b.id AS CHAR) AS batch_id,
-            b.memo AS batch_memo,
-            COALESCE(b.batch_date, DATE(b.created_at)) AS effective_date
-        FROM hpp_batch_products bp
-        JOIN hpp_batches b ON b.id = bp.batch_id
-        {product_join}
-        WHERE b.company_id = :company_id
-          AND COALESCE(b.batch_date, DATE(b.created_at)) <= :snapshot_date
-        ORDER BY {reference_expr} ASC, COALESCE(b.batch_date, DATE(b.created_at)) DESC, b.created_at DESC, bp.id DESC
-    """), {
-        'company_id': company_id,
-        'snapshot_date': snapshot_date,
-    }).fetchall()
-
-    return [
-        {
-            'reference_id': str(row.reference_id),
-            'batch_id': str(row.batch_id),
-            'product_id': str(row.product_id),
-            'product_name': (
-                monitoring_index.get(str(row.product_id), {}).get('name')
-                or row.product_name
-            ),
-            'unit_price': float(row.unit_price or 0.0),
-            'effective_date': str(row.effective_date)[:10] if row.effective_date else None,
-            'batch_memo': row.batch_memo or '',
-        }
-        for row in rows
-    ]
-
-
-def _price_reference_sort_key(row):
-    effective_date = str(row.get('effective_date') or '')
-    batch_id = str(row.get('batch_id') or '')
-    reference_id = str(row.get('reference_id') or '')
-    return (
-        effective_date,
-        batch_id,
-        reference_id,
-    )
-
-
-def _build_hpp_price_map(price_references):
-    price_map = {}
-    sorted_references = sorted(
-        price_references,
-        key=_price_reference_sort_key,
-        reverse=True,
-    )
-    for row in sorted_references:
-        product_id = str(row['product_id'])
-        if product_id in price_map:
-            continue
-        price_map[product_id] = {
-            'product_id': product_id,
-            'product_name': row.get('product_name'),
-            'unit_price': float(row.get('unit_price') or 0.0),
-            'effective_date': row.get('effective_date'),
-            'batch_id': row.get('batch_id'),
-            'batch_memo': row.get('batch_memo'),
-            'reference_id': row.get('reference_id'),
-        }
-    return price_map
-
-
-def _group_hpp_price_references(price_references):
-    grouped = {}
-    sorted_references = sorted(
-        price_references,
-        key=_price_reference_sort_key,
-        reverse=True,
-    )
-    for row in sorted_references:
-        product_id = str(row.get('product_id') or '')
-        if not product_id:
-            continue
-        grouped.setdefault(product_id, []).append({
-            'reference_id': row.get('reference_id'),
-            'batch_id': row.get('batch_id'),
-            'batch_memo': row.get('batch_memo'),
-            'effective_date': row.get('effective_date'),
-            'unit_price': float(row.get('unit_price') or 0.0),
-            'product_id': product_id,
-            'product_name': row.get('product_name') or product_id,
-        })
-    return grouped
-
-
-def _build_hpp_price_name_map(price_references):
-    grouped = {}
-    sorted_references = sorted(
-        price_references,
-        key=_price_reference_sort_key,
-        reverse=True,
-    )
-    for row in sorted_references:
-        name_key = _normalize_product_key(row.get('product_name'))
-        if not name_key:
-            continue
-        grouped.setdefault(name_key, []).append({
-            'reference_id': row.get('reference_id'),
-            'batch_id': row.get('batch_id'),
-            'batch_memo': row.get('batch_memo'),
-            'effective_date': row.get('effective_date'),
-            'unit_price': float(row.get('unit_price') or 0.0),
-            'product_id': str(row.get('product_id') or ''),
-            'product_name': row.get('product_name') or '',
-        })
-    return grouped
-
-
 def _fetch_monitoring_product_coefficients():
     engine = _require_sagansa_engine()
 
@@ -457,7 +341,7 @@ def _fetch_monitoring_product_coefficients():
         if not product_id and not product_name:
             continue
 
-        key = product_id or f"name:{_normalize_product_key(product_name)}"
+        key = product_id or f"name:{normalize_product_key(product_name)}"
         current = coefficient_map.get(key)
         coefficient_value = to_float(row.coefficient_value, 1.0)
 
@@ -465,7 +349,7 @@ def _fetch_monitoring_product_coefficients():
             coefficient_map[key] = {
                 'product_id': product_id or None,
                 'product_name': product_name or None,
-                'normalized_name': _normalize_product_key(product_name),
+                'normalized_name': normalize_product_key(product_name),
                 'coefficient': coefficient_value or 1.0,
                 'monitoring_names': [row.monitoring_name] if row.monitoring_name else [],
             }
@@ -557,12 +441,12 @@ def _fetch_monitoring_quantity_map(api_url, token, snapshot_date):
         if not monitoring_id and not monitoring_name:
             continue
 
-        monitoring_key = monitoring_id or f"name:{_normalize_product_key(monitoring_name)}"
+        monitoring_key = monitoring_id or f"name:{normalize_product_key(monitoring_name)}"
         if monitoring_key not in grouped:
             grouped[monitoring_key] = {
                 'monitoring_id': monitoring_id or None,
                 'monitoring_name': monitoring_name,
-                'normalized_name': _normalize_product_key(monitoring_name),
+                'normalized_name': normalize_product_key(monitoring_name),
                 'quantity': 0.0,
                 'unit_name': str(detail.get('product_unit_name') or '').strip(),
                 'component_count': 0,
@@ -643,13 +527,13 @@ def _fetch_inventory_monitorings():
         if not monitoring_id and not monitoring_name:
             continue
 
-        key = monitoring_id or f"name:{_normalize_product_key(monitoring_name)}"
+        key = monitoring_id or f"name:{normalize_product_key(monitoring_name)}"
         current = grouped.get(key)
         if current is None:
             grouped[key] = {
                 'product_id': monitoring_id or key,
                 'product_name': monitoring_name or monitoring_id or key,
-                'normalized_name': _normalize_product_key(monitoring_name),
+                'normalized_name': normalize_product_key(monitoring_name),
                 'unit_name': str(detail.get('product_unit_name') or '').strip(),
                 'monitoring_names': [monitoring_name] if monitoring_name else [],
                 'coefficient': 1.0,
@@ -688,7 +572,7 @@ def _fetch_inventory_products(conn, company_id, coefficient_map=None):
     for row in rows:
         product_id = str(row.product_id)
         product_name = row.product_name or str(row.product_id)
-        normalized_name = _normalize_product_key(product_name)
+        normalized_name = normalize_product_key(product_name)
         coefficient_info = (
             coefficient_map.get(product_id)
             or coefficient_map.get(f"name:{normalized_name}")
@@ -706,13 +590,10 @@ def _fetch_inventory_products(conn, company_id, coefficient_map=None):
     return inventory_products
 
 
-def _calculate_inventory_snapshot(conn, company_id, year, api_url, token, inventory_products, monitoring_index=None):
-    snapshot_date = f"{int(year)}-12-31"
+def _calculate_inventory_snapshot(year, api_url, token, inventory_products, price_timeline, snapshot_date=None):
+    snapshot_date = snapshot_date or f"{int(year)}-12-31"
     monitoring_quantity_map, as_of_date, snapshot_source = _fetch_monitoring_quantity_map(api_url, token, snapshot_date)
-    price_references = _fetch_hpp_price_references(conn, company_id, snapshot_date, monitoring_index=monitoring_index)
-    price_map = _build_hpp_price_map(price_references)
-    price_options_by_product = _group_hpp_price_references(price_references)
-    price_options_by_name = _build_hpp_price_name_map(price_references)
+    price_map = price_timeline.latest_prices(snapshot_date)
 
     line_items = []
     total_quantity = 0.0
@@ -721,7 +602,7 @@ def _calculate_inventory_snapshot(conn, company_id, year, api_url, token, invent
 
     for inventory_product in inventory_products:
         product_id = str(inventory_product.get('product_id') or '')
-        product_name_key = _normalize_product_key(inventory_product.get('product_name'))
+        product_name_key = normalize_product_key(inventory_product.get('product_name'))
         monitoring_quantity = (
             monitoring_quantity_map.get(product_id)
             or monitoring_quantity_map.get(f"name:{product_name_key}")
@@ -733,8 +614,7 @@ def _calculate_inventory_snapshot(conn, company_id, year, api_url, token, invent
 
         price_info = price_map.get(product_id)
         if price_info is None and product_name_key:
-            name_options = price_options_by_name.get(product_name_key) or []
-            price_info = name_options[0] if name_options else None
+            price_info = price_timeline.latest_by_name(product_name_key, snapshot_date)
         unit_price = to_float(price_info.get('unit_price'), 0.0) if price_info else 0.0
         total_value = quantity * unit_price if price_info else 0.0
         total_amount += total_value
@@ -764,8 +644,8 @@ def _calculate_inventory_snapshot(conn, company_id, year, api_url, token, invent
             'price_batch_memo': price_info.get('batch_memo') if price_info else None,
             'price_reference_id': price_info.get('reference_id') if price_info else None,
             'price_options': (
-                price_options_by_product.get(product_id)
-                or price_options_by_name.get(product_name_key, [])
+                price_timeline.options(product_id, snapshot_date)
+                or price_timeline.options_by_name(product_name_key, snapshot_date)
             ),
             'has_price': bool(price_info),
         })
@@ -843,20 +723,13 @@ def get_inventory_auto_balances():
     if not company_id:
         raise BadRequestError('company_id is required')
 
-    api_url = str(request.args.get('api_url') or DEFAULT_REMAINING_STORAGE_API_URL).strip()
-    token = str(
-        request.args.get('token')
-        or request.args.get('access_token')
-        or request.args.get('api_token')
-        or DEFAULT_REMAINING_STORAGE_API_TOKEN
-        or ''
-    ).strip()
-    _require_remaining_storage_token(token)
+    api_url, token = _remaining_storage_credentials(request.args)
+    inventory_products = _fetch_inventory_monitorings()
+    monitoring_index = _fetch_stock_monitoring_index()
     with engine.connect() as conn:
-        inventory_products = _fetch_inventory_monitorings()
-        monitoring_index = _fetch_stock_monitoring_index()
-        beginning = _calculate_inventory_snapshot(conn, company_id, year - 1, api_url, token, inventory_products, monitoring_index=monitoring_index)
-        ending = _calculate_inventory_snapshot(conn, company_id, year, api_url, token, inventory_products, monitoring_index=monitoring_index)
+        price_timeline = load_hpp_price_timeline(conn, company_id, monitoring_index=monitoring_index)
+    beginning = _calculate_inventory_snapshot(year - 1, api_url, token, inventory_products, price_timeline)
+    ending = _calculate_inventory_snapshot(year, api_url, token, inventory_products, price_timeline)
 
     return jsonify({
         'success': True,
@@ -945,3 +818,98 @@ def save_inventory_balances():
         'message': 'Inventory balance saved successfully',
         'balance': balance
     })
+
+
+def build_month_end_valuer(engine, company_id, api_url, token):
+    """`value_month_end(snapshot_date)` for the snapshot builder, sharing one product list and price timeline."""
+    inventory_products = _fetch_inventory_monitorings()
+    monitoring_index = _fetch_stock_monitoring_index()
+    with engine.connect() as conn:
+        price_timeline = load_hpp_price_timeline(conn, company_id, monitoring_index=monitoring_index)
+
+    def value_month_end(snapshot_date):
+        return _calculate_inventory_snapshot(
+            int(snapshot_date[:4]), api_url, token, inventory_products, price_timeline, snapshot_date=snapshot_date
+        )
+
+    return value_month_end
+
+
+def _require_inventory_snapshots(conn):
+    if not inventory_snapshots_available(conn):
+        raise BadRequestError('inventory_snapshots table is missing. Run migration 078 first.')
+
+
+def _snapshot_month_range(start_month, end_month):
+    if not start_month:
+        raise BadRequestError('start_month is required')
+    try:
+        months = month_range(start_month, end_month or start_month)
+    except ValueError:
+        raise BadRequestError('start_month and end_month must be YYYY-MM, with end_month not before start_month')
+    if len(months) > MAX_BUILD_MONTHS:
+        raise BadRequestError(f'At most {MAX_BUILD_MONTHS} months can be requested at once')
+    return months
+
+
+@inventory_bp.route('/api/inventory-snapshots', methods=['GET'])
+def get_inventory_snapshots():
+    engine = require_db_engine()
+
+    company_id = request.args.get('company_id')
+    if not company_id:
+        raise BadRequestError('company_id is required')
+    current_year = datetime.now().year
+    start_month = request.args.get('start_month') or f'{current_year}-01'
+    end_month = request.args.get('end_month') or f'{current_year}-12'
+    _snapshot_month_range(start_month, end_month)
+
+    with engine.connect() as conn:
+        _require_inventory_snapshots(conn)
+        snapshots = list_inventory_snapshots(conn, company_id, start_month, end_month)
+
+    return jsonify({'snapshots': snapshots})
+
+
+@inventory_bp.route('/api/inventory-snapshots/<int:year>/<int:month>', methods=['GET'])
+def get_inventory_snapshot(year, month):
+    engine = require_db_engine()
+
+    company_id = request.args.get('company_id')
+    if not company_id:
+        raise BadRequestError('company_id is required')
+    if not 1 <= month <= 12:
+        raise BadRequestError('month must be between 1 and 12')
+    period = f'{year:04d}-{month:02d}'
+
+    with engine.connect() as conn:
+        _require_inventory_snapshots(conn)
+        snapshots = list_inventory_snapshots(conn, company_id, period, period)
+        if not snapshots:
+            raise NotFoundError(f'No inventory snapshot for {period}')
+        items = list_inventory_snapshot_items(conn, company_id, year, month)
+
+    return jsonify({'snapshot': snapshots[0], 'items': items})
+
+
+@inventory_bp.route('/api/inventory-snapshots/build', methods=['POST'])
+def build_inventory_snapshots_route():
+    engine = require_db_engine()
+
+    payload = request.json or {}
+    company_id = payload.get('company_id')
+    if not company_id:
+        raise BadRequestError('company_id is required')
+    months = _snapshot_month_range(payload.get('start_month'), payload.get('end_month'))
+    api_url, token = _remaining_storage_credentials(payload)
+
+    with engine.connect() as conn:
+        _require_inventory_snapshots(conn)
+    value_month_end = build_month_end_valuer(engine, company_id, api_url, token)
+    snapshots = build_inventory_snapshots(engine, company_id, months, value_month_end)
+
+    return jsonify({
+        'success': True,
+        'message': f'Built {len(snapshots)} inventory snapshot(s)',
+        'snapshots': snapshots,
+    })
@@ -19,6 +19,7 @@ from backend.routes.master_data.company_queries import (
     update_company_query,
     upsert_view_filters_query,
 )
+from backend.services.transactions.import_batches import batch_keys_for_company, refresh_import_batches
 
 company_bp = Blueprint('company_bp', __name__)
 
@@ -55,7 +56,9 @@ def manage_company(company_id):
     engine = require_db_engine()
     if request.method == 'DELETE':
         with engine.begin() as conn:
+            batch_keys = batch_keys_for_company(conn, company_id)
             conn.execute(clear_company_transactions_query(), {'cid': company_id})
+            refresh_import_batches(conn, batch_keys)
             result = conn.execute(delete_company_query(), {'id': company_id})
             if result.rowcount == 0:
                 raise NotFoundError('Company not found')
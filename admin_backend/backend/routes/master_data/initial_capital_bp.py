@@ -16,6 +16,8 @@ from backend.routes.master_data.initial_capital_queries import (
     insert_initial_capital_query,
     update_initial_capital_query,
 )
+from backend.services.reporting import data_changes
+from backend.services.reporting.data_changes import record_data_change
 
 initial_capital_bp = Blueprint('initial_capital', __name__)
 
@@ -95,6 +97,7 @@ def save_initial_capital():
                 'id': str(uuid.uuid4()),
                 **params,
             })
+        record_data_change(conn, data_changes.INITIAL_CAPITAL, company_id)
 
     return jsonify({'message': 'Initial capital setting saved successfully', 'success': True})
 
@@ -109,4 +112,5 @@ def delete_initial_capital():
             delete_initial_capital_by_company_query(),
             {'company_id': company_id, 'report_type': report_type}
         )
+        record_data_change(conn, data_changes.INITIAL_CAPITAL, company_id)
     return jsonify({'message': 'Initial capital setting deleted successfully'})
@@ -9,6 +9,23 @@ from backend.db.schema import get_table_columns
 from backend.errors import BadRequestError, ConflictError, NotFoundError
 from backend.routes.accounting_utils import require_db_engine, serialize_result_rows
 from backend.routes.route_utils import _parse_bool
+from backend.services.rental.rental_schedule import refresh_rental_schedule, rental_contract_ids_for
+from backend.services.reporting import data_changes
+from backend.services.reporting.data_changes import record_mark_changes
+from backend.services.transactions.mark_stats import (
+    MARK_STATS_TABLE,
+    list_mark_years,
+    mark_ids_for,
+    mark_stats_available,
+    refresh_mark_stats,
+)
+from backend.services.transactions.payroll_aggregates import refresh_payroll_aggregates
+from backend.services.transactions.split_flags import refresh_split_flags, split_parent_ids_for_marks
+from backend.services.transactions.transaction_search import (
+    MARK_NAME_COLUMNS,
+    refresh_search_index,
+    transaction_ids_for_marks,
+)
 
 mark_bp = Blueprint('mark_bp', __name__)
 
@@ -26,14 +43,28 @@ def _normalize_mapping_report_type(value, allow_all=False):
 def get_marks():
     engine = require_db_engine()
     include_system = _parse_bool(request.args.get('include_system'))
+    sort_by_usage = str(request.args.get('sort') or '').strip().lower() == 'usage'
 
     with engine.connect() as conn:
         mark_columns = get_table_columns(conn, 'marks')
         where_sql = ""
         params = {}
         if 'is_system_generated' in mark_columns and not include_system:
-            where_sql = "WHERE COALESCE(is_system_generated, 0) = 0"
-        result = conn.execute(text(f"SELECT * FROM marks {where_sql} ORDER BY personal_use ASC"), params)
+            where_sql = "WHERE COALESCE(marks.is_system_generated, 0) = 0"
+        if mark_stats_available(conn):
+            stats_select_sql = ", COALESCE(ms.transaction_count, 0) AS transaction_count, ms.last_used_date"
+            stats_join_sql = f"LEFT JOIN {MARK_STATS_TABLE} ms ON ms.mark_id = marks.id"
+            usage_order_sql = "COALESCE(ms.transaction_count, 0) DESC, "
+        else:
+            stats_select_sql = stats_join_sql = usage_order_sql = ""
+        order_sql = f"{usage_order_sql if sort_by_usage else ''}marks.personal_use ASC"
+        result = conn.execute(text(f"""
+            SELECT marks.*{stats_select_sql}
+            FROM marks
+            {stats_join_sql}
+            {where_sql}
+            ORDER BY {order_sql}
+        """), params)
         marks = serialize_result_rows(result)
         marks_dict = {}
         for d in marks:
@@ -136,7 +167,15 @@ def update_or_delete_mark(mark_id):
 
     if request.method == 'DELETE':
         with engine.begin() as conn:
+            record_mark_changes(conn, data_changes.MARK, [mark_id])
+            split_parents = split_parent_ids_for_marks(conn, [mark_id])
+            marked_ids = transaction_ids_for_marks(conn, [mark_id])
             conn.execute(text("UPDATE transactions SET mark_id = NULL WHERE mark_id = :id"), {'id': mark_id})
+            refresh_split_flags(conn, split_parents)
+            refresh_search_index(conn, marked_ids)
+            refresh_mark_stats(conn, [mark_id])
+            refresh_payroll_aggregates(conn, mark_ids_for(conn, split_parents) | {mark_id})
+            refresh_rental_schedule(conn, rental_contract_ids_for(conn, split_parents))
             result = conn.execute(text("DELETE FROM marks WHERE id = :id"), {'id': mark_id})
             if result.rowcount == 0:
                 raise NotFoundError('Mark not found')
@@ -190,9 +229,35 @@ def update_or_delete_mark(mark_id):
             SET {', '.join(set_fields)}
             WHERE id = :id
         """), params)
+        if any(column in data for column in MARK_NAME_COLUMNS):
+            refresh_search_index(conn, transaction_ids_for_marks(conn, [mark_id]))
+        if 'is_salary_component' in data:
+            refresh_payroll_aggregates(conn, [mark_id])
+        record_mark_changes(conn, data_changes.MARK, [mark_id])
     return jsonify({'message': 'Mark updated successfully'})
 
 
+@mark_bp.route('/api/marks/<mark_id>/stats', methods=['GET'])
+def get_mark_stats(mark_id):
+    engine = require_db_engine()
+
+    with engine.connect() as conn:
+        if not mark_stats_available(conn):
+            raise BadRequestError('Tabel mark_stats belum tersedia. Jalankan migrasi terbaru.')
+        exists = conn.execute(text("SELECT 1 FROM marks WHERE id = :id"), {'id': mark_id}).fetchone()
+        if not exists:
+            raise NotFoundError('Mark not found')
+        row = conn.execute(text(f"""
+            SELECT transaction_count, debit_count, credit_count, last_used_date
+            FROM {MARK_STATS_TABLE}
+            WHERE mark_id = :mark_id
+        """), {'mark_id': mark_id}).fetchone()
+        summary = serialize_result_rows([row])[0] if row else {
+            'transaction_count': 0, 'debit_count': 0, 'credit_count': 0, 'last_used_date': None,
+        }
+        return jsonify({'mark_id': mark_id, **summary, 'years': list_mark_years(conn, mark_id)})
+
+
 @mark_bp.route('/api/marks/<mark_id>/coa-mappings', methods=['GET'])
 def get_mark_coa_mappings(mark_id):
     engine = require_db_engine()
@@ -266,6 +331,8 @@ def create_mark_coa_mapping(mark_id):
                 INSERT INTO mark_coa_mapping ({columns_sql})
                 VALUES ({values_sql})
             """), mapping_payload)
+            refresh_payroll_aggregates(conn, [mark_id])
+            record_mark_changes(conn, data_changes.MARK, [mark_id])
         return jsonify({
             'message': 'Mapping created successfully',
             'id': mapping_id,
@@ -282,7 +349,12 @@ def delete_mark_coa_mapping(mapping_id):
     engine = require_db_engine()
 
     with engine.begin() as conn:
+        mapping = conn.execute(
+            text("SELECT mark_id FROM mark_coa_mapping WHERE id = :id"), {'id': mapping_id}
+        ).fetchone()
         result = conn.execute(text("DELETE FROM mark_coa_mapping WHERE id = :id"), {'id': mapping_id})
         if result.rowcount == 0:
             raise NotFoundError('Mapping not found')
+        refresh_payroll_aggregates(conn, [mapping.mark_id])
+        record_mark_changes(conn, data_changes.MARK, [mapping.mark_id])
     return jsonify({'message': 'Mapping deleted successfully'})
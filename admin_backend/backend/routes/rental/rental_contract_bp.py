@@ -20,14 +20,28 @@ from backend.routes.rental.rental_queries import (
     build_filter_rent_transaction_ids_query,
     build_linkable_transactions_query,
 )
+from backend.services.rental.rental_schedule import refresh_rental_schedule, rental_contract_ids_for
 from backend.services.rental.rental_service import (
     create_or_update_prepaid_from_contract,
     generate_contract_journal_preview,
 )
+from backend.services.reporting import data_changes
+from backend.services.reporting.data_changes import record_data_change
+from backend.services.transactions.transaction_search import search_join
 
 rental_contract_bp = Blueprint('rental_contract_bp', __name__)
 
 
+def _record_contract_change(conn, contract_id):
+    contract = conn.execute(text("""
+        SELECT company_id, start_date, end_date
+        FROM rental_contracts
+        WHERE id = :id
+    """), {'id': contract_id}).fetchone()
+    if contract:
+        record_data_change(conn, data_changes.RENTAL, contract.company_id, contract.start_date, contract.end_date)
+
+
 def _filter_rent_transaction_ids(conn, transaction_ids, company_id):
     if not transaction_ids:
         return []
@@ -177,6 +191,8 @@ def create_contract():
             VALUES ({values_sql})
         """), insert_payload)
 
+        # Linking moves transactions away from any contract they were linked to before.
+        previous_contract_ids = rental_contract_ids_for(conn, allowed_txn_ids)
         if allowed_txn_ids:
             update_query = text("""
                 UPDATE transactions
@@ -187,6 +203,8 @@ def create_contract():
                 'contract_id': contract_id,
                 'txn_ids': allowed_txn_ids
             })
+        refresh_rental_schedule(conn, previous_contract_ids | {contract_id})
+        _record_contract_change(conn, contract_id)
 
         accounting_payload = {
             'calculation_method': data.get('calculation_method'),
@@ -232,6 +250,7 @@ def update_contract(contract_id):
         """), {'id': contract_id}).fetchone()
         if not current:
             raise NotFoundError('Contract not found')
+        _record_contract_change(conn, contract_id)
 
         company_id = data.get('company_id') or current.company_id
         allowed_txn_ids = _filter_rent_transaction_ids(conn, linked_ids, company_id)
@@ -280,6 +299,7 @@ def update_contract(contract_id):
                 WHERE id = :id
             """), update_payload)
 
+        previous_contract_ids = rental_contract_ids_for(conn, allowed_txn_ids)
         conn.execute(text("""
             UPDATE transactions
             SET rental_contract_id = NULL
@@ -296,6 +316,8 @@ def update_contract(contract_id):
                 'contract_id': contract_id,
                 'txn_ids': allowed_txn_ids
             })
+        refresh_rental_schedule(conn, previous_contract_ids | {contract_id})
+        _record_contract_change(conn, contract_id)
 
         accounting_payload = {
             'calculation_method': data.get('calculation_method'),
@@ -327,6 +349,7 @@ def delete_contract(contract_id):
         """), {'id': contract_id}).fetchone()
         if not contract:
             raise NotFoundError('Contract not found')
+        _record_contract_change(conn, contract_id)
 
         conn.execute(text("""
             UPDATE transactions
@@ -335,6 +358,7 @@ def delete_contract(contract_id):
         """), {'contract_id': contract_id})
 
         conn.execute(text("DELETE FROM rental_contracts WHERE id = :id"), {'id': contract_id})
+        refresh_rental_schedule(conn, [contract_id])
     return jsonify({'message': 'Contract deleted successfully'})
 
 
@@ -368,6 +392,7 @@ def link_transaction(contract_id):
         if not allowed_ids:
             raise BadRequestError('Transaction is not eligible (must be marked as sewa tempat)')
 
+        previous_contract_ids = rental_contract_ids_for(conn, [txn_id])
         conn.execute(text("""
             UPDATE transactions
             SET rental_contract_id = :contract_id
@@ -376,6 +401,8 @@ def link_transaction(contract_id):
             'contract_id': contract_id,
             'txn_id': txn_id
         })
+        refresh_rental_schedule(conn, previous_contract_ids | {contract_id})
+        _record_contract_change(conn, contract_id)
 
     prepaid_info = create_or_update_prepaid_from_contract(contract_id, contract.company_id)
     return jsonify({
@@ -406,6 +433,8 @@ def unlink_transaction(contract_id, transaction_id):
             'transaction_id': transaction_id,
             'contract_id': contract_id
         })
+        refresh_rental_schedule(conn, [contract_id])
+        _record_contract_change(conn, contract_id)
 
     prepaid_info = create_or_update_prepaid_from_contract(contract_id, contract.company_id)
     return jsonify({
@@ -418,11 +447,14 @@ def unlink_transaction(contract_id, transaction_id):
 def get_linkable_transactions():
     company_id = request.args.get('company_id')
     current_contract_id = request.args.get('current_contract_id')
+    search = request.args.get('search', '').strip()
     engine = require_db_engine()
     with engine.connect() as conn:
-        result = conn.execute(build_linkable_transactions_query(), {
+        search_join_sql, search_params = search_join(conn, search, 't')
+        result = conn.execute(build_linkable_transactions_query(search_join_sql), {
             'company_id': company_id,
-            'current_contract_id': current_contract_id
+            'current_contract_id': current_contract_id,
+            **search_params,
         })
         transactions = serialize_result_rows(result, datetime_format='%Y-%m-%dT%H:%M:%S')
 
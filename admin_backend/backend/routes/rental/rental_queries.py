@@ -126,8 +126,9 @@ def build_contract_transactions_query():
     """)
 
 
-def build_linkable_transactions_query():
+def build_linkable_transactions_query(search_join_sql=''):
     rental_mark_predicate = _rental_mark_predicate()
+    order_sql = "search_hits.search_rank DESC, t.txn_date DESC" if search_join_sql else "t.txn_date DESC"
     return text(f"""
         SELECT
             t.*,
@@ -135,6 +136,7 @@ def build_linkable_transactions_query():
             m.internal_report,
             m.tax_report
         FROM transactions t
+        {search_join_sql}
         LEFT JOIN marks m ON t.mark_id = m.id
         WHERE (
               :company_id IS NULL
@@ -146,5 +148,5 @@ def build_linkable_transactions_query():
               t.rental_contract_id = :current_contract_id
               OR ({rental_mark_predicate})
           )
-        ORDER BY t.txn_date DESC, t.created_at DESC
+        ORDER BY {order_sql}, t.created_at DESC
     """)
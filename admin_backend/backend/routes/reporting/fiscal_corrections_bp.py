@@ -2,6 +2,8 @@ import uuid
 from flask import Blueprint, request, jsonify
 from sqlalchemy import text
 from backend.db.session import get_db_engine
+from backend.services.reporting import data_changes
+from backend.services.reporting.data_changes import record_data_change
 
 fiscal_corrections_bp = Blueprint('fiscal_corrections_bp', __name__, url_prefix='/api/fiscal-corrections')
 
@@ -89,6 +91,9 @@ def create_correction():
                 'amount': float(data['amount']),
                 'reason': data.get('reason', '')
             })
+            record_data_change(
+                conn, data_changes.FISCAL_CORRECTION, data['company_id'], data['period_date'], data['period_date']
+            )
             
             return jsonify({
                 'message': 'Fiscal correction created successfully',
@@ -106,6 +111,15 @@ def delete_correction(correction_id):
         
     try:
         with engine.begin() as conn:
+            correction = conn.execute(
+                text("SELECT company_id, period_date FROM fiscal_corrections WHERE id = :id"),
+                {'id': correction_id}
+            ).fetchone()
+            if correction:
+                record_data_change(
+                    conn, data_changes.FISCAL_CORRECTION,
+                    correction.company_id, correction.period_date, correction.period_date
+                )
             result = conn.execute(
                 text("DELETE FROM fiscal_corrections WHERE id = :id"),
                 {'id': correction_id}
@@ -1,122 +1,204 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 
 from backend.errors import ApiError, BadRequestError
-from backend.routes.accounting_utils import require_db_engine, serialize_result_rows
+from backend.routes.accounting_utils import require_reporting_engine, serialize_result_rows
 from backend.routes.reporting.general_ledger_helpers import (
-    build_ledger_groups,
+    LEDGER_STREAM_BUFFER_ROWS,
+    attach_ledger_pages,
+    build_ledger_accounts,
     coretax_filter_clause,
     export_ledger_to_excel,
+    iter_ledger_csv,
+    iter_ledger_ndjson,
+    ledger_balance_params,
+    ledger_export_filename,
     mark_coa_join_clause,
+    parse_ledger_page_args,
 )
 from backend.routes.reporting.general_ledger_queries import (
+    build_general_ledger_account_balances_query,
     build_general_ledger_entries_query,
+    build_general_ledger_page_query,
     build_general_ledger_summary_query,
+    build_general_ledger_transaction_count_query,
 )
 
 general_ledger_bp = Blueprint('general_ledger', __name__)
 
+LEDGER_STREAM_FORMATS = {
+    'csv': (iter_ledger_csv, 'text/csv', 'csv'),
+    'ndjson': (iter_ledger_ndjson, 'application/x-ndjson', 'ndjson'),
+}
+
+
+def _ledger_request_args(require_coa=False):
+    args = {
+        'company_id': request.args.get('company_id'),
+        'start_date': request.args.get('start_date'),
+        'end_date': request.args.get('end_date'),
+        'coa_code': request.args.get('coa_code'),
+        'report_type': request.args.get('report_type', 'real'),
+    }
+    if not args['start_date'] or not args['end_date']:
+        raise BadRequestError('start_date and end_date are required')
+    if require_coa and not args['coa_code']:
+        raise BadRequestError('coa_code is required')
+    return args
+
+
+def _ledger_query_parts(conn, args):
+    params = {'start_date': args['start_date'], 'end_date': args['end_date']}
+    company_filter = ""
+    coa_filter = ""
+    if args['company_id']:
+        company_filter = "AND t.company_id = :company_id"
+        params['company_id'] = args['company_id']
+    if args['coa_code']:
+        coa_filter = "AND coa.code = :coa_code"
+        params['coa_code'] = args['coa_code']
+
+    report_type = args['report_type']
+    query_kwargs = {
+        'conn': conn,
+        'mark_coa_join': mark_coa_join_clause(conn, report_type, mark_ref='m.id', mapping_alias='mcm', join_type='LEFT'),
+        'company_filter': company_filter,
+        'coretax_filter': coretax_filter_clause(conn, report_type, 'm'),
+        'coa_filter': coa_filter,
+        'report_type': report_type,
+    }
+    return params, query_kwargs
+
+
+def _fetch_ledger_accounts(conn, args, params, query_kwargs):
+    balance_params = dict(params)
+    has_opening_floor = ledger_balance_params(
+        conn, balance_params, args['start_date'], args['company_id'], args['report_type']
+    )
+    result = conn.execute(
+        build_general_ledger_account_balances_query(has_opening_floor=has_opening_floor, **query_kwargs),
+        balance_params,
+    )
+    return build_ledger_accounts(result)
+
+
 @general_ledger_bp.route('/api/reports/general-ledger', methods=['GET'])
 def get_general_ledger():
     """
     Get General Ledger (Buku Besar) for a company and date range.
-    Shows all transactions with debit and credit entries (double-entry).
-    Each transaction shows both COA entries together.
+    Every account carries its opening balance and period totals; entries are
+    returned one page per account (`offset`/`limit`) with SQL-computed
+    running balances. Further pages come from /general-ledger/entries.
     """
-    engine = require_db_engine()
-    company_id = request.args.get('company_id')
-    start_date = request.args.get('start_date')
-    end_date = request.args.get('end_date')
-    coa_code = request.args.get('coa_code')
-    report_type = request.args.get('report_type', 'real')
-
-    if not start_date or not end_date:
-        raise BadRequestError('start_date and end_date are required')
+    engine = require_reporting_engine()
+    args = _ledger_request_args()
+    offset, limit = parse_ledger_page_args(request.args)
 
     with engine.connect() as conn:
-        params = {'start_date': start_date, 'end_date': end_date}
-        company_filter = ""
-        coa_filter = ""
-        if company_id:
-            company_filter = "AND t.company_id = :company_id"
-            params['company_id'] = company_id
-        if coa_code:
-            coa_filter = "AND coa.code = :coa_code"
-            params['coa_code'] = coa_code
-
-        result = conn.execute(
-            build_general_ledger_entries_query(
-                conn=conn,
-                mark_coa_join=mark_coa_join_clause(conn, report_type, mark_ref='m.id', mapping_alias='mcm', join_type='LEFT'),
-                company_filter=company_filter,
-                coretax_filter=coretax_filter_clause(conn, report_type, 'm'),
-                coa_filter=coa_filter,
-                report_type=report_type,
-            ),
-            params
+        params, query_kwargs = _ledger_query_parts(conn, args)
+        accounts = _fetch_ledger_accounts(conn, args, params, query_kwargs)
+        page_rows = conn.execute(
+            build_general_ledger_page_query(**query_kwargs),
+            {**params, 'offset': offset, 'limit': limit},
         )
-        grouped = build_ledger_groups(result)
+        attach_ledger_pages(accounts, page_rows, offset, limit)
+        transaction_count = conn.execute(
+            build_general_ledger_transaction_count_query(**query_kwargs),
+            params,
+        ).scalar()
 
+    grand_total_debit = sum(account['total_debit'] for account in accounts)
+    grand_total_credit = sum(account['total_credit'] for account in accounts)
     return jsonify({
         'success': True,
         'data': {
-            'company_id': company_id,
-            'start_date': start_date,
-            'end_date': end_date,
-            'report_type': report_type,
-            'coa_groups': grouped['coa_groups_list'],
-            'total_accounts': len(grouped['coa_groups_list']),
-            'total_transactions': len(grouped['transactions']),
-            'grand_total_debit': grouped['grand_total_debit'],
-            'grand_total_credit': grouped['grand_total_credit'],
-            'is_balanced': abs(grouped['grand_total_debit'] - grouped['grand_total_credit']) < 0.01,
+            'company_id': args['company_id'],
+            'start_date': args['start_date'],
+            'end_date': args['end_date'],
+            'report_type': args['report_type'],
+            'coa_groups': accounts,
+            'total_accounts': len(accounts),
+            'total_transactions': int(transaction_count or 0),
+            'grand_total_debit': grand_total_debit,
+            'grand_total_credit': grand_total_credit,
+            'is_balanced': abs(grand_total_debit - grand_total_credit) < 0.01,
         }
     })
 
 
+@general_ledger_bp.route('/api/reports/general-ledger/entries', methods=['GET'])
+def get_general_ledger_entries():
+    """
+    Get one page of General Ledger entries for a single account.
+    """
+    engine = require_reporting_engine()
+    args = _ledger_request_args(require_coa=True)
+    offset, limit = parse_ledger_page_args(request.args)
+
+    with engine.connect() as conn:
+        params, query_kwargs = _ledger_query_parts(conn, args)
+        accounts = _fetch_ledger_accounts(conn, args, params, query_kwargs)
+        if not accounts:
+            return jsonify({'success': True, 'data': None})
+        page_rows = conn.execute(
+            build_general_ledger_page_query(**query_kwargs),
+            {**params, 'offset': offset, 'limit': limit},
+        )
+        attach_ledger_pages(accounts, page_rows, offset, limit)
+
+    return jsonify({'success': True, 'data': accounts[0]})
+
+
+def _execute_ledger_export_query(conn, params, query_kwargs):
+    stream_conn = conn.execution_options(stream_results=True, max_row_buffer=LEDGER_STREAM_BUFFER_ROWS)
+    return stream_conn.execute(
+        build_general_ledger_entries_query(order_by_account=True, **query_kwargs),
+        params
+    )
+
+
 @general_ledger_bp.route('/api/reports/general-ledger/export', methods=['GET'])
 def export_general_ledger():
     """
-    Export General Ledger to Excel or PDF format.
+    Export General Ledger to Excel, CSV or NDJSON.
+    Rows are read through a server-side cursor ordered by account; CSV and
+    NDJSON are streamed to the client as they are produced.
     """
-    engine = require_db_engine()
-    company_id = request.args.get('company_id')
-    start_date = request.args.get('start_date')
-    end_date = request.args.get('end_date')
-    coa_code = request.args.get('coa_code')
+    engine = require_reporting_engine()
+    args = _ledger_request_args()
     format_type = request.args.get('format', 'excel')
-    report_type = request.args.get('report_type', 'real')
+    if format_type not in LEDGER_STREAM_FORMATS and format_type != 'excel':
+        raise BadRequestError(f'Unsupported export format: {format_type}')
+    company_label = args['company_id'] or 'all'
 
-    if not start_date or not end_date:
-        raise BadRequestError('start_date and end_date are required')
+    def opening_balances(conn, params, query_kwargs):
+        return {
+            account['coa_code']: account['opening_balance']
+            for account in _fetch_ledger_accounts(conn, args, params, query_kwargs)
+        }
 
-    with engine.connect() as conn:
-        params = {'start_date': start_date, 'end_date': end_date}
-        company_filter = ""
-        coa_filter = ""
-        if company_id:
-            company_filter = "AND t.company_id = :company_id"
-            params['company_id'] = company_id
-        if coa_code:
-            coa_filter = "AND coa.code = :coa_code"
-            params['coa_code'] = coa_code
+    if format_type in LEDGER_STREAM_FORMATS:
+        stream_rows, mimetype, extension = LEDGER_STREAM_FORMATS[format_type]
 
-        result = conn.execute(
-            build_general_ledger_entries_query(
-                conn=conn,
-                mark_coa_join=mark_coa_join_clause(conn, report_type, mark_ref='m.id', mapping_alias='mcm', join_type='LEFT'),
-                company_filter=company_filter,
-                coretax_filter=coretax_filter_clause(conn, report_type, 'm'),
-                coa_filter=coa_filter,
-                report_type=report_type,
-            ),
-            params
+        def generate():
+            with engine.connect() as conn:
+                params, query_kwargs = _ledger_query_parts(conn, args)
+                openings = opening_balances(conn, params, query_kwargs)
+                result = _execute_ledger_export_query(conn, params, query_kwargs)
+                yield from stream_rows(result, openings)
+
+        filename = ledger_export_filename(company_label, args['start_date'], args['end_date'], extension)
+        return Response(
+            stream_with_context(generate()),
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'attachment; filename={filename}'},
         )
-        grouped = build_ledger_groups(result)
 
-    if format_type != 'excel':
-        raise BadRequestError('PDF export not yet implemented')
     try:
-        return export_ledger_to_excel(grouped['coa_groups'], company_id or 'all', start_date, end_date)
+        with engine.connect() as conn:
+            params, query_kwargs = _ledger_query_parts(conn, args)
+            openings = opening_balances(conn, params, query_kwargs)
+            result = _execute_ledger_export_query(conn, params, query_kwargs)
+            return export_ledger_to_excel(result, company_label, args['start_date'], args['end_date'], openings)
     except Exception as exc:
         raise ApiError(f'Failed to create Excel file: {exc}', status_code=500, code='excel_export_failed')
 
@@ -126,7 +208,7 @@ def get_general_ledger_summary():
     """
     Get General Ledger Summary - COA balances for a period.
     """
-    engine = require_db_engine()
+    engine = require_reporting_engine()
     company_id = request.args.get('company_id')
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
@@ -1,6 +1,8 @@
+import csv
 import io
+import json
+import tempfile
 
-import pandas as pd
 from flask import make_response, send_file
 
 from backend.db.schema import get_table_columns
@@ -9,158 +11,243 @@ from backend.routes.accounting_utils import serialize_row_values
 # This ensures consistent behavior between general ledger and other reports
 from backend.services.reporting.report_sql_fragments import (
     _coretax_filter_clause as coretax_filter_clause,
+    _get_reporting_start_date,
     _mark_coa_join_clause as mark_coa_join_clause,
 )
 
 
-def build_ledger_groups(rows):
-    transactions = {}
-    coa_groups = {}
+DEFAULT_LEDGER_PAGE_SIZE = 50
+MAX_LEDGER_PAGE_SIZE = 1000
 
-    for row in rows:
-        data = serialize_row_values(row._mapping, datetime_format='%Y-%m-%d')
-        txn_id = data['transaction_id']
-
-        if txn_id not in transactions:
-            transactions[txn_id] = {
-                'transaction_id': txn_id,
-                'txn_date': str(data['txn_date']),
-                'description': data['description'] or '',
-                'mark_name': data['mark_name'] or '',
-                'amount': float(data['amount'] or 0),
-                'db_cr': data['db_cr'],
-                'entries': [],
-            }
 
-        coa_code = data['coa_code']
-        signed_amount = float(data['signed_amount'] or 0)
-        transactions[txn_id]['entries'].append({
-            'coa_code': coa_code,
+def ledger_balance_params(conn, params, start_date, company_id, report_type):
+    """Add the opening-balance bounds to `params`; returns whether a floor date applies."""
+    params['fiscal_year_start'] = f"{str(start_date)[:4]}-01-01"
+    opening_floor = _get_reporting_start_date(conn, company_id, report_type)
+    if opening_floor:
+        params['opening_floor'] = opening_floor
+    return bool(opening_floor)
+
+
+def parse_ledger_page_args(args):
+    try:
+        limit = int(args.get('limit', DEFAULT_LEDGER_PAGE_SIZE))
+        offset = int(args.get('offset', 0))
+    except (TypeError, ValueError):
+        limit, offset = DEFAULT_LEDGER_PAGE_SIZE, 0
+    return max(0, offset), min(max(1, limit), MAX_LEDGER_PAGE_SIZE)
+
+
+def build_ledger_accounts(balance_rows):
+    accounts = []
+    for row in balance_rows:
+        data = serialize_row_values(row._mapping)
+        opening_balance = float(data['opening_balance'] or 0)
+        total_debit = float(data['total_debit'] or 0)
+        total_credit = float(data['total_credit'] or 0)
+        accounts.append({
+            'coa_code': data['coa_code'],
             'coa_name': data['coa_name'],
             'coa_category': data['coa_category'],
+            'opening_balance': opening_balance,
+            'total_debit': total_debit,
+            'total_credit': total_credit,
+            'ending_balance': opening_balance + total_debit - total_credit,
+            'entry_count': int(data['entry_count'] or 0),
+            'transaction_count': int(data['transaction_count'] or 0),
+            'transactions': [],
+        })
+    return accounts
+
+
+def attach_ledger_pages(accounts, page_rows, offset, limit):
+    """Attach each account's page of entries, with running balances offset by the opening balance."""
+    accounts_by_code = {account['coa_code']: account for account in accounts}
+    for row in page_rows:
+        data = serialize_row_values(row._mapping, datetime_format='%Y-%m-%d')
+        account = accounts_by_code.get(data['coa_code'])
+        if account is None:
+            continue
+        signed_amount = float(data['signed_amount'] or 0)
+        account['transactions'].append({
+            'transaction_id': data['transaction_id'],
+            'txn_date': str(data['txn_date']),
+            'description': data['description'] or '',
+            'mark_name': data['mark_name'] or '',
+            'amount': float(data['amount'] or 0),
+            'db_cr': data['db_cr'],
             'mapping_type': data['mapping_type'],
             'debit': signed_amount if signed_amount > 0 else 0,
             'credit': abs(signed_amount) if signed_amount < 0 else 0,
-            'signed_amount': signed_amount,
+            'running_balance': account['opening_balance'] + float(data['period_running_balance'] or 0),
         })
 
-    for txn in transactions.values():
-        for entry in txn['entries']:
-            coa_code = entry['coa_code']
-            if coa_code not in coa_groups:
-                coa_groups[coa_code] = {
-                    'coa_code': coa_code,
-                    'coa_name': entry['coa_name'],
-                    'coa_category': entry['coa_category'],
-                    'transactions': [],
-                    'total_debit': 0,
-                    'total_credit': 0,
-                    'ending_balance': 0,
-                    'running_balance': 0,
-                }
-
-            coa_groups[coa_code]['running_balance'] += entry['signed_amount']
-            coa_groups[coa_code]['transactions'].append({
-                'transaction_id': txn['transaction_id'],
-                'txn_date': txn['txn_date'],
-                'description': txn['description'],
-                'mark_name': txn['mark_name'],
-                'amount': txn['amount'],
-                'db_cr': txn['db_cr'],
-                'entries': txn['entries'],
-                'current_entry': {
-                    'coa_code': entry['coa_code'],
-                    'debit': entry['debit'],
-                    'credit': entry['credit'],
-                    'running_balance': coa_groups[coa_code]['running_balance'],
-                },
-            })
-            coa_groups[coa_code]['total_debit'] += entry['debit']
-            coa_groups[coa_code]['total_credit'] += entry['credit']
-            coa_groups[coa_code]['ending_balance'] = coa_groups[coa_code]['running_balance']
-
-    coa_groups_list = []
-    for coa_code, group in coa_groups.items():
-        formatted_transactions = []
-        seen_txns = set()
-        for txn in group['transactions']:
-            if txn['transaction_id'] in seen_txns:
-                continue
-            seen_txns.add(txn['transaction_id'])
-            formatted_transactions.append({
-                'transaction_id': txn['transaction_id'],
-                'txn_date': txn['txn_date'],
-                'description': txn['description'],
-                'mark_name': txn['mark_name'],
-                'amount': txn['amount'],
-                'db_cr': txn['db_cr'],
-                'entries': txn['entries'],
-                'current_entry': txn['current_entry'],
-            })
-
-        coa_groups_list.append({
-            'coa_code': group['coa_code'],
-            'coa_name': group['coa_name'],
-            'coa_category': group['coa_category'],
-            'transactions': formatted_transactions,
-            'total_debit': group['total_debit'],
-            'total_credit': group['total_credit'],
-            'ending_balance': group['ending_balance'],
-        })
+    for account in accounts:
+        loaded = offset + len(account['transactions'])
+        account['offset'] = offset
+        account['limit'] = limit
+        account['has_more'] = loaded < account['entry_count']
+        account['next_offset'] = loaded if account['has_more'] else None
+    return accounts
+
+
+LEDGER_EXPORT_COLUMNS = ['Tanggal', 'Deskripsi', 'Mark', 'COA', 'Debit', 'Kredit', 'Saldo']
+LEDGER_SUMMARY_COLUMNS = ['COA Code', 'COA Name', 'Category', 'Opening Balance', 'Total Debit', 'Total Credit', 'Ending Balance']
+LEDGER_STREAM_BUFFER_ROWS = 1000
 
-    grand_total_debit = sum(group['total_debit'] for group in coa_groups_list)
-    grand_total_credit = sum(group['total_credit'] for group in coa_groups_list)
-
-    return {
-        'transactions': transactions,
-        'coa_groups': coa_groups,
-        'coa_groups_list': coa_groups_list,
-        'grand_total_debit': grand_total_debit,
-        'grand_total_credit': grand_total_credit,
-    }
-
-
-def export_ledger_to_excel(coa_groups, company_id, start_date, end_date):
-    output = io.BytesIO()
-
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        summary_data = []
-        for coa_code, group in coa_groups.items():
-            summary_data.append({
-                'COA Code': group['coa_code'],
-                'COA Name': group['coa_name'],
-                'Category': group['coa_category'],
-                'Total Debit': group['total_debit'],
-                'Total Credit': group['total_credit'],
-                'Ending Balance': group['ending_balance'],
-            })
-
-        pd.DataFrame(summary_data).to_excel(writer, sheet_name='Summary', index=False)
-
-        for coa_code, group in coa_groups.items():
-            detailed_data = []
-            for txn in group['transactions']:
-                for entry in txn['entries']:
-                    if entry['coa_code'] != coa_code:
-                        continue
-                    detailed_data.append({
-                        'Tanggal': txn['txn_date'],
-                        'Deskripsi': txn['description'],
-                        'Mark': txn['mark_name'],
-                        'COA': entry['coa_code'],
-                        'Debit': entry['debit'] if entry['debit'] > 0 else 0,
-                        'Kredit': entry['credit'] if entry['credit'] > 0 else 0,
-                        'Saldo': entry['current_entry']['running_balance'] if entry['current_entry'] else 0,
-                    })
-
-            if detailed_data:
-                sheet_name = f"{coa_code}_{group['coa_name']}"[:31].replace('/', '_').replace('\\', '_')
-                pd.DataFrame(detailed_data).to_excel(writer, sheet_name=sheet_name, index=False)
 
+def iter_ledger_export_rows(rows, opening_balances=None):
+    """
+    Walk ledger rows ordered by account and yield one dict per entry.
+
+    Only the current account's totals are held in memory; the running balance
+    restarts from the account's opening balance whenever the COA code changes.
+    Each dict carries `account_end` on the last entry of an account so writers
+    can close that account.
+    """
+    opening_balances = opening_balances or {}
+    pending = None
+    account = None
+    for row in rows:
+        data = serialize_row_values(row._mapping, datetime_format='%Y-%m-%d')
+        coa_code = data['coa_code']
+        if account is None or account['coa_code'] != coa_code:
+            if pending is not None:
+                pending['account_end'] = account
+                yield pending
+                pending = None
+            opening_balance = float(opening_balances.get(coa_code) or 0)
+            account = {
+                'coa_code': coa_code,
+                'coa_name': data['coa_name'],
+                'coa_category': data['coa_category'],
+                'opening_balance': opening_balance,
+                'total_debit': 0.0,
+                'total_credit': 0.0,
+                'ending_balance': opening_balance,
+            }
+
+        signed_amount = float(data['signed_amount'] or 0)
+        debit = signed_amount if signed_amount > 0 else 0
+        credit = abs(signed_amount) if signed_amount < 0 else 0
+        account['total_debit'] += debit
+        account['total_credit'] += credit
+        account['ending_balance'] += signed_amount
+
+        if pending is not None:
+            yield pending
+        pending = {
+            'transaction_id': data['transaction_id'],
+            'txn_date': str(data['txn_date']),
+            'description': data['description'] or '',
+            'mark_name': data['mark_name'] or '',
+            'coa_code': coa_code,
+            'coa_name': data['coa_name'],
+            'debit': debit,
+            'credit': credit,
+            'running_balance': account['ending_balance'],
+            'account_end': None,
+        }
+
+    if pending is not None:
+        pending['account_end'] = account
+        yield pending
+
+
+def _ledger_export_values(entry):
+    return [
+        entry['txn_date'],
+        entry['description'],
+        entry['mark_name'],
+        entry['coa_code'],
+        entry['debit'],
+        entry['credit'],
+        entry['running_balance'],
+    ]
+
+
+def _ledger_sheet_name(coa_code, coa_name, used_names):
+    base = f"{coa_code}_{coa_name}"
+    for char in '[]:*?/\\':
+        base = base.replace(char, '_')
+    name = base[:31]
+    suffix = 1
+    while name.lower() in used_names:
+        suffix += 1
+        tag = f"~{suffix}"
+        name = f"{base[:31 - len(tag)]}{tag}"
+    used_names.add(name.lower())
+    return name
+
+
+def write_ledger_workbook(rows, output, opening_balances=None):
+    """Write ledger rows into a write-only workbook: a summary sheet plus one sheet per COA."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    summary_sheet = workbook.create_sheet('Summary')
+    summary_sheet.append(LEDGER_SUMMARY_COLUMNS)
+    used_names = {'summary'}
+    account_sheet = None
+
+    for entry in iter_ledger_export_rows(rows, opening_balances):
+        if account_sheet is None:
+            account_sheet = workbook.create_sheet(
+                _ledger_sheet_name(entry['coa_code'], entry['coa_name'], used_names)
+            )
+            account_sheet.append(LEDGER_EXPORT_COLUMNS)
+        account_sheet.append(_ledger_export_values(entry))
+
+        account = entry['account_end']
+        if account is not None:
+            summary_sheet.append([
+                account['coa_code'],
+                account['coa_name'],
+                account['coa_category'],
+                account['opening_balance'],
+                account['total_debit'],
+                account['total_credit'],
+                account['ending_balance'],
+            ])
+            account_sheet = None
+
+    workbook.save(output)
+    return output
+
+
+def iter_ledger_csv(rows, opening_balances=None):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(LEDGER_EXPORT_COLUMNS)
+    for entry in iter_ledger_export_rows(rows, opening_balances):
+        writer.writerow(_ledger_export_values(entry))
+        if buffer.tell() >= 64 * 1024:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def iter_ledger_ndjson(rows, opening_balances=None):
+    for entry in iter_ledger_export_rows(rows, opening_balances):
+        account = entry.pop('account_end')
+        yield json.dumps({'type': 'entry', **entry}) + '\n'
+        if account is not None:
+            yield json.dumps({'type': 'account_summary', **account}) + '\n'
+
+
+def ledger_export_filename(company_id, start_date, end_date, extension):
+    return f'general_ledger_{company_id}_{start_date}_to_{end_date}.{extension}'
+
+
+def export_ledger_to_excel(rows, company_id, start_date, end_date, opening_balances=None):
+    # Spooled to disk past a few MB so the finished workbook never sits fully in memory.
+    output = tempfile.SpooledTemporaryFile(max_size=4 * 1024 * 1024)
+    write_ledger_workbook(rows, output, opening_balances)
     output.seek(0)
     return make_response(send_file(
         output,
         as_attachment=True,
-        download_name=f'general_ledger_{company_id}_{start_date}_to_{end_date}.xlsx',
+        download_name=ledger_export_filename(company_id, start_date, end_date, 'xlsx'),
         mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
     ))
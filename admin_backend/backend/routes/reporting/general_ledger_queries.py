@@ -6,11 +6,11 @@ from backend.services.reporting.report_sql_fragments import (
 )
 
 
-def build_general_ledger_entries_query(conn, mark_coa_join, company_filter="", coretax_filter="", coa_filter="", report_type='real'):
+def _general_ledger_entry_select(conn, mark_coa_join, date_filter, company_filter="", coretax_filter="", coa_filter="", report_type='real'):
     effective_coa_id = _effective_coa_id_expr(conn, report_type, txn_alias='t', mapping_alias='mcm')
     effective_mapping_type = _effective_mapping_type_expr(conn, report_type, txn_alias='t', mapping_alias='mcm')
     effective_natural_direction = _effective_natural_direction_expr(conn, report_type, txn_alias='t', mark_alias='m')
-    return text(f"""
+    return f"""
         SELECT
             t.id AS transaction_id,
             t.txn_date,
@@ -42,11 +42,140 @@ def build_general_ledger_entries_query(conn, mark_coa_join, company_filter="", c
         INNER JOIN marks m ON t.mark_id = m.id
         {mark_coa_join}
         INNER JOIN chart_of_accounts coa ON {effective_coa_id} = coa.id
-        WHERE t.txn_date BETWEEN :start_date AND :end_date
+        WHERE {date_filter}
           {company_filter}
           {coretax_filter}
           {coa_filter}
-        ORDER BY t.txn_date, t.id, {effective_mapping_type}
+    """
+
+
+def build_general_ledger_entries_query(
+    conn,
+    mark_coa_join,
+    company_filter="",
+    coretax_filter="",
+    coa_filter="",
+    report_type='real',
+    order_by_account=False,
+):
+    entry_select = _general_ledger_entry_select(
+        conn,
+        mark_coa_join,
+        "t.txn_date BETWEEN :start_date AND :end_date",
+        company_filter=company_filter,
+        coretax_filter=coretax_filter,
+        coa_filter=coa_filter,
+        report_type=report_type,
+    )
+    return text(f"""
+        SELECT le.*
+        FROM ({entry_select}) le
+        ORDER BY {'le.coa_code, ' if order_by_account else ''}le.txn_date, le.transaction_id, le.mapping_type
+    """)
+
+
+def build_general_ledger_account_balances_query(
+    conn,
+    mark_coa_join,
+    company_filter="",
+    coretax_filter="",
+    coa_filter="",
+    report_type='real',
+    has_opening_floor=False,
+):
+    """
+    Per-account opening balance plus period totals in one aggregate.
+
+    Balance sheet accounts carry everything before :start_date (from
+    :opening_floor when a reporting start date is configured); revenue and
+    expense accounts only carry the current fiscal year from :fiscal_year_start.
+    """
+    date_filter = "t.txn_date <= :end_date"
+    if has_opening_floor:
+        date_filter += " AND t.txn_date >= :opening_floor"
+    entry_select = _general_ledger_entry_select(
+        conn,
+        mark_coa_join,
+        date_filter,
+        company_filter=company_filter,
+        coretax_filter=coretax_filter,
+        coa_filter=coa_filter,
+        report_type=report_type,
+    )
+    return text(f"""
+        SELECT
+            le.coa_code,
+            le.coa_name,
+            le.coa_category,
+            SUM(CASE
+                WHEN le.txn_date < :start_date
+                     AND (le.coa_category NOT IN ('REVENUE', 'EXPENSE') OR le.txn_date >= :fiscal_year_start)
+                THEN le.signed_amount ELSE 0
+            END) AS opening_balance,
+            SUM(CASE WHEN le.txn_date >= :start_date AND le.signed_amount > 0 THEN le.signed_amount ELSE 0 END) AS total_debit,
+            SUM(CASE WHEN le.txn_date >= :start_date AND le.signed_amount < 0 THEN -le.signed_amount ELSE 0 END) AS total_credit,
+            SUM(CASE WHEN le.txn_date >= :start_date THEN 1 ELSE 0 END) AS entry_count,
+            COUNT(DISTINCT CASE WHEN le.txn_date >= :start_date THEN le.transaction_id END) AS transaction_count
+        FROM ({entry_select}) le
+        GROUP BY le.coa_code, le.coa_name, le.coa_category
+        HAVING SUM(CASE WHEN le.txn_date >= :start_date THEN 1 ELSE 0 END) > 0
+            OR ABS(SUM(CASE
+                WHEN le.txn_date < :start_date
+                     AND (le.coa_category NOT IN ('REVENUE', 'EXPENSE') OR le.txn_date >= :fiscal_year_start)
+                THEN le.signed_amount ELSE 0
+            END)) >= 0.005
+        ORDER BY le.coa_code
+    """)
+
+
+def build_general_ledger_transaction_count_query(conn, mark_coa_join, company_filter="", coretax_filter="", coa_filter="", report_type='real'):
+    entry_select = _general_ledger_entry_select(
+        conn,
+        mark_coa_join,
+        "t.txn_date BETWEEN :start_date AND :end_date",
+        company_filter=company_filter,
+        coretax_filter=coretax_filter,
+        coa_filter=coa_filter,
+        report_type=report_type,
+    )
+    return text(f"SELECT COUNT(DISTINCT le.transaction_id) AS transaction_count FROM ({entry_select}) le")
+
+
+def build_general_ledger_page_query(conn, mark_coa_join, company_filter="", coretax_filter="", coa_filter="", report_type='real'):
+    """
+    Period entries with a window running balance, cut to rows
+    (:offset, :offset + :limit] of every account.
+
+    The running balance is relative to the period start; callers add the
+    account's opening balance.
+    """
+    entry_select = _general_ledger_entry_select(
+        conn,
+        mark_coa_join,
+        "t.txn_date BETWEEN :start_date AND :end_date",
+        company_filter=company_filter,
+        coretax_filter=coretax_filter,
+        coa_filter=coa_filter,
+        report_type=report_type,
+    )
+    return text(f"""
+        SELECT ranked.*
+        FROM (
+            SELECT
+                le.*,
+                ROW_NUMBER() OVER (
+                    PARTITION BY le.coa_code
+                    ORDER BY le.txn_date, le.transaction_id, le.mapping_type
+                ) AS row_num,
+                SUM(le.signed_amount) OVER (
+                    PARTITION BY le.coa_code
+                    ORDER BY le.txn_date, le.transaction_id, le.mapping_type
+                    ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+                ) AS period_running_balance
+            FROM ({entry_select}) le
+        ) ranked
+        WHERE ranked.row_num > :offset AND ranked.row_num <= :offset + :limit
+        ORDER BY ranked.coa_code, ranked.row_num
     """)
 
 
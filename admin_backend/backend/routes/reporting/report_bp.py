@@ -8,9 +8,11 @@ from backend.db.schema import get_table_columns
 from backend.errors import BadRequestError
 from backend.routes.accounting_utils import (
     require_db_engine,
+    require_reporting_engine,
     serialize_result_rows,
     split_parent_exclusion_clause,
 )
+from backend.routes.reporting.report_cache_helpers import cached_report_response
 from backend.routes.reporting.report_helpers import (
     apply_service_tax_adjustment,
     calculate_coa_effective_amount,
@@ -82,7 +84,7 @@ def _load_company_name(conn, company_id):
 
 @report_bp.route('/api/reports/income-statement', methods=['GET'])
 def get_income_statement():
-    engine = require_db_engine()
+    engine = require_reporting_engine()
 
     start_date, end_date = default_report_period(
         request.args.get('start_date'),
@@ -92,29 +94,39 @@ def get_income_statement():
     report_type = request.args.get('report_type', 'real')
     comparative = request.args.get('comparative', 'false').lower() == 'true'
 
-    with engine.connect() as conn:
+    def build_report():
         data = fetch_income_statement_data(conn, start_date, end_date, company_id, report_type, comparative=comparative)
         data['period'] = {'start_date': start_date, 'end_date': end_date}
         data['comparative'] = comparative
-        return jsonify(data)
+        return data
+
+    with engine.connect() as conn:
+        return cached_report_response(conn, 'income-statement', company_id, {
+            'start_date': start_date,
+            'end_date': end_date,
+            'report_type': report_type,
+            'comparative': comparative,
+        }, build_report)
 
 
 @report_bp.route('/api/reports/balance-sheet', methods=['GET'])
 def get_balance_sheet():
-    engine = require_db_engine()
+    engine = require_reporting_engine()
 
     as_of_date = request.args.get('date') or request.args.get('as_of_date') or datetime.now().strftime('%Y-%m-%d')
     company_id = request.args.get('company_id')
     report_type = request.args.get('report_type', 'real')
 
     with engine.connect() as conn:
-        data = fetch_balance_sheet_data(conn, as_of_date, company_id, report_type)
-        return jsonify(data)
+        return cached_report_response(conn, 'balance-sheet', company_id, {
+            'as_of_date': as_of_date,
+            'report_type': report_type,
+        }, lambda: fetch_balance_sheet_data(conn, as_of_date, company_id, report_type))
 
 
 @report_bp.route('/api/reports/monthly-revenue', methods=['GET'])
 def get_monthly_revenue():
-    engine = require_db_engine()
+    engine = require_reporting_engine()
 
     year = parse_year_or_default(request.args.get('year'))
     company_id = request.args.get('company_id')
@@ -132,7 +144,7 @@ def get_monthly_revenue():
 
 @report_bp.route('/api/reports/cash-flow', methods=['GET'])
 def get_cash_flow():
-    engine = require_db_engine()
+    engine = require_reporting_engine()
 
     start_date, end_date = default_report_period(
         request.args.get('start_date'),
@@ -142,13 +154,16 @@ def get_cash_flow():
     report_type = request.args.get('report_type', 'real')
 
     with engine.connect() as conn:
-        data = fetch_cash_flow_data(conn, start_date, end_date, company_id, report_type)
-        return jsonify(data)
+        return cached_report_response(conn, 'cash-flow', company_id, {
+            'start_date': start_date,
+            'end_date': end_date,
+            'report_type': report_type,
+        }, lambda: fetch_cash_flow_data(conn, start_date, end_date, company_id, report_type))
 
 
 @report_bp.route('/api/reports/payroll-salary-summary', methods=['GET'])
 def get_payroll_salary_summary():
-    engine = require_db_engine()
+    engine = require_reporting_engine()
 
     start_date, end_date = default_report_period(
         request.args.get('start_date'),
@@ -164,7 +179,7 @@ def get_payroll_salary_summary():
 
 @report_bp.route('/api/reports/available-years', methods=['GET'])
 def get_available_report_years():
-    engine = require_db_engine()
+    engine = require_reporting_engine()
     company_id = request.args.get('company_id')
 
     with engine.connect() as conn:
@@ -188,7 +203,7 @@ def get_available_report_years():
 
 @report_bp.route('/api/reports/coa-detail', methods=['GET'])
 def get_coa_detail_report():
-    engine = require_db_engine()
+    engine = require_reporting_engine()
 
     coa_id = request.args.get('coa_id')
     as_of_date = request.args.get('as_of_date')
@@ -258,7 +273,7 @@ def get_coa_detail_report():
 
 @report_bp.route('/api/reports/marks-summary', methods=['GET'])
 def get_marks_summary():
-    engine = require_db_engine()
+    engine = require_reporting_engine()
 
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
@@ -267,8 +282,8 @@ def get_marks_summary():
     if not start_date or not end_date:
         raise BadRequestError('start_date and end_date are required')
 
-    with engine.connect() as conn:
-        result = conn.execute(build_marks_summary_query(report_type), {
+    def build_report():
+        result = conn.execute(build_marks_summary_query(conn, report_type), {
             'start_date': start_date,
             'end_date': end_date,
             'company_id': company_id
@@ -291,7 +306,7 @@ def get_marks_summary():
                 'transaction_count': data['transaction_count']
             })
 
-        return jsonify({
+        return {
             'marks': marks,
             'summary': {
                 'total_debit': total_debit_all,
@@ -299,7 +314,14 @@ def get_marks_summary():
                 'net_difference': total_debit_all - total_credit_all,
                 'total_marks': len(marks)
             }
-        })
+        }
+
+    with engine.connect() as conn:
+        return cached_report_response(conn, 'marks-summary', company_id, {
+            'start_date': start_date,
+            'end_date': end_date,
+            'report_type': report_type,
+        }, build_report)
 
 
 @report_bp.route('/api/reports/prepaid-expenses', methods=['GET'])
@@ -403,7 +425,7 @@ def save_report_settings():
 
 @report_bp.route('/api/reports/export', methods=['POST'])
 def export_report():
-    engine = require_db_engine()
+    engine = require_reporting_engine()
     data = request.json or {}
     report_type = data.get('report_type')  # 'income-statement', 'balance-sheet', etc.
     format_type = data.get('format')  # 'excel', 'pdf', 'xml'
@@ -457,14 +479,13 @@ def export_report():
             amortization_data['year'] = year
 
             try:
-                pdf_path = generate_coretax_combined_pdf(
+                pdf_buffer = generate_coretax_combined_pdf(
                     income_statement_data,
                     balance_sheet_data,
                     amortization_data,
-                    report_filename=f"coretax_financial_statements_{year}.pdf",
                 )
                 return send_file(
-                    pdf_path,
+                    pdf_buffer,
                     as_attachment=True,
                     download_name=f"CoreTax_Financial_Statements_{company_name.replace(' ', '_')}_{year}.pdf",
                     mimetype='application/pdf'
@@ -494,9 +515,9 @@ def export_report():
             
             # Generate PDF
             try:
-                pdf_path = generate_income_statement_pdf(report_data)
+                pdf_buffer = generate_income_statement_pdf(report_data)
                 return send_file(
-                    pdf_path,
+                    pdf_buffer,
                     as_attachment=True,
                     download_name=f"Income_Statement_{report_data['company_name'].replace(' ', '_')}_{start_date}.pdf",
                     mimetype='application/pdf'
@@ -523,9 +544,9 @@ def export_report():
             report_data['company_name'] = _load_company_name(conn, company_id)
 
             try:
-                pdf_path = generate_balance_sheet_pdf(report_data)
+                pdf_buffer = generate_balance_sheet_pdf(report_data)
                 return send_file(
-                    pdf_path,
+                    pdf_buffer,
                     as_attachment=True,
                     download_name=f"Balance_Sheet_{report_data['company_name'].replace(' ', '_')}_{as_of_date}.pdf",
                     mimetype='application/pdf'
@@ -0,0 +1,33 @@
+from flask import current_app, jsonify, request
+
+from backend.services.reporting.report_cache import (
+    report_cache_get,
+    report_cache_key,
+    report_cache_put,
+    report_data_version,
+)
+
+
+def cached_report_response(conn, kind, company_id, params, build_report):
+    """
+    Serve `build_report()` through the versioned report cache.
+    The ETag is derived from the report parameters and the data version, so a matching
+    If-None-Match is answered with 304 before anything is computed.
+    """
+    version = report_data_version(conn, company_id)
+    if version is None:
+        return jsonify(build_report())
+
+    etag = report_cache_key(kind, {**params, 'company_id': company_id}, version)
+    if etag in request.if_none_match:
+        response = current_app.response_class(status=304)
+    else:
+        body = report_cache_get(etag)
+        if body is None:
+            body = current_app.json.dumps(build_report())
+            report_cache_put(etag, body)
+        response = current_app.response_class(body, mimetype='application/json')
+
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
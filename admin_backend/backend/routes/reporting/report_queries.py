@@ -44,7 +44,7 @@ def build_coa_detail_query(conn, npwp_expr, method_expr, split_exclusion, report
     """)
 
 
-def build_marks_summary_query(report_type='real'):
+def build_marks_summary_query(conn, report_type='real'):
     """
     Build marks summary query with split exclusion and coretax filtering.
 
@@ -56,25 +56,21 @@ def build_marks_summary_query(report_type='real'):
     joining with mark_coa_mapping.
 
     Args:
+        conn: Database connection
         report_type: 'real' or 'coretax' - determines which marks to include
 
     Returns:
         SQLAlchemy text query object
     """
     # Split exclusion: exclude parent transactions that have children with marks
-    split_exclusion = """
-    AND NOT EXISTS (
-        SELECT 1 FROM transactions t_child
-        WHERE t_child.parent_id = t.id
-        AND t_child.mark_id IS NOT NULL
-    )
-    """
+    split_exclusion = _split_parent_exclusion_clause(conn, 't')
 
     # For coretax, filter by marks.is_coretax flag
-    # This avoids duplication while still filtering marks correctly
+    # This avoids duplication while still filtering marks correctly.
+    # Compared directly (NULL never equals 1) so idx_marks_coretax can drive the query.
     coretax_filter = ""
     if report_type == 'coretax':
-        coretax_filter = "AND COALESCE(m.is_coretax, 0) = 1"
+        coretax_filter = "AND m.is_coretax = 1"
 
     return text(f"""
         SELECT
@@ -4,6 +4,7 @@ from urllib import error as urlerror
 from urllib import parse as urlparse
 from urllib import request as urlrequest
 
+from backend.db.instrumentation import track_remote_call
 from backend.routes.accounting_utils import normalize_iso_date_value
 
 
@@ -71,7 +72,7 @@ def _fetch_remote_json(api_url, token, query_params=None, resource_name='API'):
 
     req = urlrequest.Request(url, headers=headers, method='GET')
     try:
-        with urlrequest.urlopen(req, timeout=60) as resp:
+        with track_remote_call(resource_name), urlrequest.urlopen(req, timeout=60) as resp:
             raw_body = resp.read().decode('utf-8')
         return json.loads(raw_body)
     except urlerror.HTTPError as e:
@@ -6,12 +6,53 @@ from sqlalchemy import bindparam, text
 
 from backend.errors import BadRequestError, NotFoundError
 from backend.db.schema import get_table_columns
-from backend.routes.accounting_utils import require_db_engine, serialize_result_rows, serialize_row_values
+from backend.routes.accounting_utils import (
+    require_db_engine,
+    serialize_result_rows,
+    serialize_row_values,
+    split_parent_exclusion_clause,
+)
 from backend.routes.route_utils import (
     _normalize_db_cr,
     _normalize_iso_date,
     _parse_bool,
 )
+from backend.services.rental.rental_schedule import refresh_rental_schedule, rental_contract_ids_for
+from backend.services.reporting import data_changes
+from backend.services.reporting.data_changes import record_data_change, record_transaction_changes
+from backend.services.reporting.report_value_utils import _year_date_bounds as year_date_bounds
+from backend.services.transactions.bulk_operations import (
+    COMPANY,
+    DELETE,
+    MARK,
+    SKIP_LINKED_TO_MANUAL,
+    SKIP_SPLIT_PARENT,
+    bulk_jobs_available,
+    bulk_selection_size,
+    delete_orphan_marks,
+    get_bulk_job,
+    parse_bulk_filters,
+    run_bulk_operation,
+    should_run_async,
+    start_bulk_job,
+)
+from backend.services.transactions.import_batches import (
+    batch_keys_for,
+    import_batches_available,
+    list_import_batches,
+    list_month_coverage,
+    refresh_import_batches,
+    refresh_import_batches_for,
+)
+from backend.services.transactions.mark_stats import (
+    mark_years_for,
+    natural_direction_fallback_sql,
+    refresh_mark_stats_for,
+    refresh_mark_years,
+)
+from backend.services.transactions.payroll_aggregates import refresh_payroll_aggregates, salary_mark_ids_for
+from backend.services.transactions.split_flags import refresh_split_flags, refresh_split_flags_for, split_parent_ids
+from backend.services.transactions.transaction_search import refresh_search_index, search_join
 
 history_bp = Blueprint('history_bp', __name__)
 
@@ -34,25 +75,13 @@ def _fetch_marks_lookup(conn, mark_ids):
         return {}
 
     rows = conn.execute(
-        text("""
+        text(f"""
             SELECT
                 m.id,
                 m.internal_report,
                 m.personal_use,
                 m.tax_report,
-                COALESCE(
-                    m.natural_direction,
-                    (
-                        SELECT CASE
-                            WHEN SUM(CASE WHEN UPPER(TRIM(COALESCE(t.db_cr, ''))) IN ('DB', 'DEBIT', 'D', 'DE') THEN 1 ELSE 0 END) >=
-                                 SUM(CASE WHEN UPPER(TRIM(COALESCE(t.db_cr, ''))) IN ('CR', 'CREDIT', 'K', 'KREDIT') THEN 1 ELSE 0 END)
-                            THEN 'DB'
-                            ELSE 'CR'
-                        END
-                        FROM transactions t
-                        WHERE t.mark_id = m.id
-                    )
-                ) AS natural_direction
+                COALESCE(m.natural_direction, {natural_direction_fallback_sql(conn, 'm')}) AS natural_direction
             FROM marks m
             WHERE id IN :ids
         """).bindparams(bindparam('ids', expanding=True)),
@@ -205,37 +234,7 @@ def _insert_manual_journal_lines(conn, parent_id, prepared_entry, txn_columns, n
         child_cols_sql = ', '.join(child_insert_cols)
         child_vals_sql = ', '.join(f":{column}" for column in child_insert_cols)
         conn.execute(text(f"INSERT INTO transactions ({child_cols_sql}) VALUES ({child_vals_sql})"), child_data)
-
-def _delete_orphan_marks(conn, mark_ids):
-    normalized_ids = sorted({str(mark_id).strip() for mark_id in (mark_ids or []) if str(mark_id or '').strip()})
-    if not normalized_ids:
-        return
-
-    used_rows = conn.execute(
-        text("SELECT DISTINCT mark_id FROM transactions WHERE mark_id IN :mids")
-        .bindparams(bindparam('mids', expanding=True)),
-        {'mids': normalized_ids}
-    ).fetchall()
-    used_mark_ids = {
-        str(row.mark_id).strip()
-        for row in used_rows
-        if getattr(row, 'mark_id', None)
-    }
-    marks_to_delete = [mark_id for mark_id in normalized_ids if mark_id not in used_mark_ids]
-    if not marks_to_delete:
-        return
-
-    conn.execute(
-        text("DELETE FROM mark_coa_mapping WHERE mark_id IN :mids")
-        .bindparams(bindparam('mids', expanding=True)),
-        {'mids': marks_to_delete}
-    )
-    conn.execute(
-        text("DELETE FROM marks WHERE id IN :mids")
-        .bindparams(bindparam('mids', expanding=True)),
-        {'mids': marks_to_delete}
-    )
-
+    refresh_split_flags(conn, [parent_id])
 
 @history_bp.route('/api/transactions/manual', methods=['POST'])
 def create_manual_transaction():
@@ -267,6 +266,10 @@ def create_manual_transaction():
         vals_sql = ', '.join(f":{c}" for c in insert_cols)
         conn.execute(text(f"INSERT INTO transactions ({cols_sql}) VALUES ({vals_sql})"), transaction_data)
         _insert_manual_journal_lines(conn, txn_id, prepared_entry, txn_columns, now)
+        refresh_import_batches_for(conn, [txn_id])
+        refresh_search_index(conn, [txn_id])
+        refresh_payroll_aggregates(conn, refresh_mark_stats_for(conn, [txn_id]))
+        record_transaction_changes(conn, data_changes.MANUAL_JOURNAL, [txn_id])
 
         if prepared_entry['linked_transaction_ids']:
             for linked_id in prepared_entry['linked_transaction_ids']:
@@ -405,8 +408,10 @@ def update_manual_journal(parent_id):
         p_row = conn.execute(text("SELECT id, mark_id FROM transactions WHERE id = :id AND bank_code = 'MANUAL'"), {'id': parent_id}).fetchone()
         if not p_row:
             raise NotFoundError('Manual journal not found')
+        record_transaction_changes(conn, data_changes.MANUAL_JOURNAL, [parent_id])
 
         # 2. Get old children and their marks to cleanup
+        previous_mark_years = mark_years_for(conn, [parent_id])
         old_rows = conn.execute(text("SELECT id, mark_id FROM transactions WHERE parent_id = :pid"), {'pid': parent_id}).fetchall()
         old_child_ids = [r.id for r in old_rows]
         old_mark_ids = [r.mark_id for r in old_rows if r.mark_id]
@@ -446,6 +451,10 @@ def update_manual_journal(parent_id):
             WHERE id = :id
         """), update_fields)
         _insert_manual_journal_lines(conn, parent_id, prepared_entry, txn_columns, now)
+        refresh_import_batches_for(conn, [parent_id])
+        refresh_search_index(conn, [parent_id])
+        refresh_payroll_aggregates(conn, refresh_mark_stats_for(conn, [parent_id], previous_mark_years))
+        record_transaction_changes(conn, data_changes.MANUAL_JOURNAL, [parent_id])
 
         if prepared_entry['linked_transaction_ids']:
             for linked_id in prepared_entry['linked_transaction_ids']:
@@ -459,7 +468,7 @@ def update_manual_journal(parent_id):
                     'now': now
                 })
 
-        _delete_orphan_marks(conn, old_mark_ids)
+        delete_orphan_marks(conn, old_mark_ids)
 
     return jsonify({'message': 'Manual journal updated successfully'})
 
@@ -504,7 +513,6 @@ def get_linkable_transactions():
 
     where_clauses = [
         "(t.source_file IS NULL OR t.source_file != 'MANUAL')",
-        "NOT EXISTS (SELECT 1 FROM transactions t_child WHERE t_child.parent_id = t.id)",
     ]
     params = {}
 
@@ -512,10 +520,6 @@ def get_linkable_transactions():
         where_clauses.append("t.company_id = :company_id")
         params['company_id'] = company_id
 
-    if search:
-        where_clauses.append("t.description LIKE :search")
-        params['search'] = f'%{search}%'
-
     if start_date:
         where_clauses.append("t.txn_date >= :start_date")
         params['start_date'] = start_date
@@ -537,6 +541,10 @@ def get_linkable_transactions():
     where_sql = ' AND '.join(where_clauses)
 
     with engine.connect() as conn:
+        where_sql += split_parent_exclusion_clause(conn, 't')
+        search_join_sql, search_params = search_join(conn, search, 't')
+        params.update(search_params)
+        order_sql = "search_hits.search_rank DESC, t.txn_date DESC" if search_join_sql else "t.txn_date DESC"
         rows = conn.execute(text(f"""
             SELECT t.id, t.txn_date, t.description, t.amount, t.db_cr,
                    t.bank_code, t.parent_id,
@@ -544,11 +552,12 @@ def get_linkable_transactions():
                    m.internal_report as mark_name,
                    c.name as company_name
             FROM transactions t
+            {search_join_sql}
             LEFT JOIN transactions pt ON t.parent_id = pt.id
             LEFT JOIN marks m ON t.mark_id = m.id
             LEFT JOIN companies c ON t.company_id = c.id
             WHERE {where_sql}
-            ORDER BY t.txn_date DESC, t.created_at DESC
+            ORDER BY {order_sql}, t.created_at DESC
             LIMIT 50
         """), params).fetchall()
 
@@ -565,22 +574,26 @@ def get_linkable_transactions():
 @history_bp.route('/api/transactions', methods=['GET'])
 def get_transactions():
     engine = require_db_engine()
+    search = request.args.get('search', '').strip()
 
     with engine.connect() as conn:
-        result = conn.execute(text("""
+        search_join_sql, search_params = search_join(conn, search, 't')
+        order_sql = "search_hits.search_rank DESC, t.txn_date DESC" if search_join_sql else "t.txn_date DESC"
+        result = conn.execute(text(f"""
             SELECT t.*, m.internal_report, m.personal_use, m.tax_report,
                    c.name as company_name, c.short_name as company_short_name,
                    mjl.manual_txn_id as linked_manual_id,
                    mt.mark_id as manual_mark_id,
                    mm.internal_report as manual_mark_name
             FROM transactions t
+            {search_join_sql}
             LEFT JOIN marks m ON t.mark_id = m.id
             LEFT JOIN companies c ON t.company_id = c.id
             LEFT JOIN manual_journal_links mjl ON t.id = mjl.linked_txn_id
             LEFT JOIN transactions mt ON mjl.manual_txn_id = mt.id
             LEFT JOIN marks mm ON mt.mark_id = mm.id
-            ORDER BY t.txn_date DESC, t.created_at DESC
-        """))
+            ORDER BY {order_sql}, t.created_at DESC
+        """), search_params)
         transactions = serialize_result_rows(result)
         for d in transactions:
             d['db_cr'] = _normalize_db_cr(d.get('db_cr'))
@@ -593,44 +606,52 @@ def get_transactions():
         return jsonify({'transactions': transactions})
 
 
+def _live_upload_summary(conn):
+    """Upload summary grouped straight from transactions, for databases without migration 074."""
+    transaction_columns = get_table_columns(conn, 'transactions')
+    has_bank_account_number = 'bank_account_number' in transaction_columns
+    bank_account_number_expr = (
+        "MAX(NULLIF(TRIM(t.bank_account_number), ''))"
+        if has_bank_account_number else
+        "NULL"
+    )
+    account_variant_count_expr = (
+        "COUNT(DISTINCT COALESCE(NULLIF(TRIM(t.bank_account_number), ''), '__EMPTY__'))"
+        if has_bank_account_number else
+        "0"
+    )
+    result = conn.execute(text("""
+        SELECT t.source_file,
+               COUNT(*) as transaction_count,
+               MIN(t.txn_date) as start_date,
+               MAX(t.txn_date) as end_date,
+               t.bank_code,
+               {bank_account_number_expr} as bank_account_number,
+               {account_variant_count_expr} as account_variant_count,
+               COUNT(DISTINCT t.company_id) as company_count,
+               SUM(CASE WHEN t.db_cr = 'DB' THEN t.amount ELSE 0 END) as total_debit,
+               SUM(CASE WHEN t.db_cr = 'CR' THEN t.amount ELSE 0 END) as total_credit,
+               MAX(t.created_at) as last_upload
+        FROM transactions t
+        GROUP BY t.source_file, t.bank_code
+        ORDER BY last_upload DESC
+    """.format(
+        bank_account_number_expr=bank_account_number_expr,
+        account_variant_count_expr=account_variant_count_expr,
+    )))
+    return serialize_result_rows(result)
+
+
 @history_bp.route('/api/transactions/upload-summary', methods=['GET'])
 def get_upload_summary():
     engine = require_db_engine()
 
     with engine.connect() as conn:
-        transaction_columns = get_table_columns(conn, 'transactions')
         definition_columns = get_table_columns(conn, 'bank_account_definitions')
-        has_bank_account_number = 'bank_account_number' in transaction_columns
-        bank_account_number_expr = (
-            "MAX(NULLIF(TRIM(t.bank_account_number), ''))"
-            if has_bank_account_number else
-            "NULL"
-        )
-        account_variant_count_expr = (
-            "COUNT(DISTINCT COALESCE(NULLIF(TRIM(t.bank_account_number), ''), '__EMPTY__'))"
-            if has_bank_account_number else
-            "0"
-        )
-        result = conn.execute(text("""
-            SELECT t.source_file,
-                   COUNT(*) as transaction_count,
-                   MIN(t.txn_date) as start_date,
-                   MAX(t.txn_date) as end_date,
-                   t.bank_code,
-                   {bank_account_number_expr} as bank_account_number,
-                   {account_variant_count_expr} as account_variant_count,
-                   COUNT(DISTINCT t.company_id) as company_count,
-                   SUM(CASE WHEN t.db_cr = 'DB' THEN t.amount ELSE 0 END) as total_debit,
-                   SUM(CASE WHEN t.db_cr = 'CR' THEN t.amount ELSE 0 END) as total_credit,
-                   MAX(t.created_at) as last_upload
-            FROM transactions t
-            GROUP BY t.source_file, t.bank_code
-            ORDER BY last_upload DESC
-        """.format(
-            bank_account_number_expr=bank_account_number_expr,
-            account_variant_count_expr=account_variant_count_expr,
-        )))
-        summary = serialize_result_rows(result)
+        if import_batches_available(conn):
+            summary = serialize_result_rows(list_import_batches(conn))
+        else:
+            summary = _live_upload_summary(conn)
 
         definition_map = {}
         if definition_columns:
@@ -967,6 +988,7 @@ def assign_bank_account_to_uploaded_file():
 
         if result.rowcount == 0:
             raise NotFoundError('No uploaded transactions found for the selected source file and bank')
+        refresh_import_batches(conn, [(source_file, bank_code)])
 
     return jsonify({
         'success': True,
@@ -995,6 +1017,58 @@ def delete_bank_account_definition(definition_id):
     return jsonify({'success': True})
 
 
+def _live_checklist_rows(conn, year, has_definition_table):
+    """Checklist cells grouped straight from transactions, for databases without migration 074."""
+    transaction_columns = get_table_columns(conn, 'transactions')
+    has_bank_account_number = 'bank_account_number' in transaction_columns
+
+    bank_account_number_expr = (
+        "NULLIF(TRIM(t.bank_account_number), '')"
+        if has_bank_account_number else
+        "NULL"
+    )
+    definition_name_expr = (
+        "NULLIF(TRIM(bad.display_name), '')"
+        if has_definition_table and has_bank_account_number else
+        "NULL"
+    )
+    definition_join_sql = (
+        """
+        LEFT JOIN bank_account_definitions bad
+          ON bad.bank_code = t.bank_code
+         AND bad.account_number = t.bank_account_number
+        """
+        if has_definition_table and has_bank_account_number else
+        ""
+    )
+
+    year_start, next_year_start = year_date_bounds(year)
+    rows = conn.execute(text(f"""
+        SELECT
+            MONTH(t.txn_date)                                        AS txn_month,
+            t.bank_code,
+            {bank_account_number_expr}                               AS bank_account_number,
+            {definition_name_expr}                                   AS account_definition_name,
+            GROUP_CONCAT(DISTINCT t.source_file ORDER BY t.source_file SEPARATOR '||') AS source_files,
+            COUNT(*)                                                  AS transaction_count,
+            SUM(CASE WHEN t.db_cr = 'DB' THEN t.amount ELSE 0 END)  AS total_debit,
+            SUM(CASE WHEN t.db_cr = 'CR' THEN t.amount ELSE 0 END)  AS total_credit,
+            MAX(t.created_at)                                         AS last_upload
+        FROM transactions t
+        {definition_join_sql}
+        WHERE t.txn_date >= :year_start
+          AND t.txn_date < :next_year_start
+          AND (t.bank_code IS NULL OR t.bank_code != 'MANUAL')
+          AND (t.parent_id IS NULL OR t.parent_id = '')
+        GROUP BY MONTH(t.txn_date), t.bank_code, bank_account_number, account_definition_name
+        ORDER BY txn_month ASC, t.bank_code ASC, account_definition_name ASC, bank_account_number ASC
+    """), {'year_start': year_start, 'next_year_start': next_year_start}).fetchall()
+    return [
+        {**row._mapping, 'source_files': [f for f in str(row.source_files or '').split('||') if f]}
+        for row in rows
+    ]
+
+
 @history_bp.route('/api/transactions/upload-checklist', methods=['GET'])
 def get_upload_checklist():
     """Return a per-month × per-bank-account upload checklist for a given year.
@@ -1034,51 +1108,26 @@ def get_upload_checklist():
         year = current_year
 
     with engine.connect() as conn:
-        transaction_columns = get_table_columns(conn, 'transactions')
         definition_columns = get_table_columns(conn, 'bank_account_definitions')
-        has_bank_account_number = 'bank_account_number' in transaction_columns
         has_definition_table = bool(definition_columns)
         has_definition_active_period = 'active_from' in definition_columns and 'active_until' in definition_columns
 
-        bank_account_number_expr = (
-            "NULLIF(TRIM(t.bank_account_number), '')"
-            if has_bank_account_number else
-            "NULL"
-        )
-        definition_name_expr = (
-            "NULLIF(TRIM(bad.display_name), '')"
-            if has_definition_table and has_bank_account_number else
-            "NULL"
-        )
-        definition_join_sql = (
-            """
-            LEFT JOIN bank_account_definitions bad
-              ON bad.bank_code = t.bank_code
-             AND bad.account_number = t.bank_account_number
-            """
-            if has_definition_table and has_bank_account_number else
-            ""
-        )
-
-        rows = conn.execute(text(f"""
-            SELECT
-                MONTH(t.txn_date)                                        AS txn_month,
-                t.bank_code,
-                {bank_account_number_expr}                               AS bank_account_number,
-                {definition_name_expr}                                   AS account_definition_name,
-                GROUP_CONCAT(DISTINCT t.source_file ORDER BY t.source_file SEPARATOR '||') AS source_files,
-                COUNT(*)                                                  AS transaction_count,
-                SUM(CASE WHEN t.db_cr = 'DB' THEN t.amount ELSE 0 END)  AS total_debit,
-                SUM(CASE WHEN t.db_cr = 'CR' THEN t.amount ELSE 0 END)  AS total_credit,
-                MAX(t.created_at)                                         AS last_upload
-            FROM transactions t
-            {definition_join_sql}
-            WHERE YEAR(t.txn_date) = :year
-              AND (t.bank_code IS NULL OR t.bank_code != 'MANUAL')
-              AND (t.parent_id IS NULL OR t.parent_id = '')
-            GROUP BY MONTH(t.txn_date), t.bank_code, bank_account_number, account_definition_name
-            ORDER BY txn_month ASC, t.bank_code ASC, account_definition_name ASC, bank_account_number ASC
-        """), {'year': year}).fetchall()
+        if import_batches_available(conn):
+            rows = list_month_coverage(conn, year)
+            if has_definition_table:
+                definition_names = {
+                    (str(row.bank_code or ''), str(row.account_number or '')): str(row.display_name or '').strip()
+                    for row in conn.execute(text("""
+                        SELECT bank_code, account_number, display_name
+                        FROM bank_account_definitions
+                    """))
+                }
+                for row in rows:
+                    row['account_definition_name'] = definition_names.get(
+                        (row['bank_code'], row['bank_account_number'] or '')
+                    ) or None
+        else:
+            rows = _live_checklist_rows(conn, year, has_definition_table)
 
         definitions = []
         if has_definition_table:
@@ -1114,26 +1163,25 @@ def get_upload_checklist():
 
     cell_map = {}
     for row in rows:
-        month = int(row.txn_month or 0)
-        bank = str(row.bank_code or '')
-        account_number = _normalize_bank_account_number(getattr(row, 'bank_account_number', ''))
-        display_name = str(getattr(row, 'account_definition_name', '') or '').strip()
+        month = int(row.get('txn_month') or 0)
+        bank = str(row.get('bank_code') or '')
+        account_number = _normalize_bank_account_number(row.get('bank_account_number'))
+        display_name = str(row.get('account_definition_name') or '').strip()
         if not month or not bank:
             continue
 
         column = _build_checklist_column(bank, account_number, display_name)
         columns_map.setdefault(column['key'], column)
 
-        raw_files = str(row.source_files or '')
-        source_files = [f for f in raw_files.split('||') if f and f != 'MANUAL']
-        last_upload_raw = row.last_upload
+        source_files = [f for f in row.get('source_files') or [] if f and f != 'MANUAL']
+        last_upload_raw = row.get('last_upload')
         last_upload_str = str(last_upload_raw)[:10] if last_upload_raw else None
         cell_map[(month, column['key'])] = {
             'uploaded': True,
             'source_files': source_files,
-            'transaction_count': int(row.transaction_count or 0),
-            'total_debit': float(row.total_debit or 0),
-            'total_credit': float(row.total_credit or 0),
+            'transaction_count': int(row.get('transaction_count') or 0),
+            'total_debit': float(row.get('total_debit') or 0),
+            'total_credit': float(row.get('total_credit') or 0),
             'last_upload': last_upload_str,
         }
 
@@ -1177,93 +1225,50 @@ def get_upload_checklist():
     })
 
 
+def _dispatch_bulk(engine, operation, data, **options):
+    """
+    Run a bulk operation on `transaction_ids` or a `filter` selection from the request body.
+    Large selections (or `"async": true`) become a background job; returns (result_or_job, is_async).
+    """
+    raw_filters = data.get('filter')
+    transaction_ids = None
+    filters = None
+    if raw_filters is not None:
+        filters = parse_bulk_filters(raw_filters)
+    else:
+        transaction_ids = data.get('transaction_ids', [])
+        if not transaction_ids:
+            raise BadRequestError('No transaction IDs provided')
+
+    requested_async = _parse_bool(data['async']) if 'async' in data else None
+    with engine.connect() as conn:
+        selection_size = bulk_selection_size(conn, transaction_ids, filters)
+        run_async = should_run_async(conn, selection_size, requested_async)
+    if run_async:
+        job = start_bulk_job(engine, operation, transaction_ids, filters, total_count=selection_size, **options)
+        return job, True
+    return run_bulk_operation(engine, operation, transaction_ids, filters, **options), False
+
+
 @history_bp.route('/api/transactions/delete-by-source', methods=['POST'])
 def delete_by_source():
     engine = require_db_engine()
 
     data = request.json or {}
     source_file = data.get('source_file')
-    bank_code = data.get('bank_code')
-    company_id = data.get('company_id')
-
     if not source_file:
         raise BadRequestError('source_file is required')
 
-    with engine.begin() as conn:
-        where_clauses = ["source_file = :source_file"]
-        params = {'source_file': source_file}
-
-        if bank_code:
-            where_clauses.append("bank_code = :bank_code")
-            params['bank_code'] = bank_code
-        if company_id:
-            where_clauses.append("company_id = :company_id")
-            params['company_id'] = company_id
-            
-        where_sql = ' AND '.join(where_clauses)
-        
-        # Get parent/top-level IDs and marks before deletion
-        ids_result = conn.execute(text(f"SELECT id, mark_id FROM transactions WHERE {where_sql}"), params).fetchall()
-        if not ids_result:
-            return jsonify({'message': 'Deleted 0 transactions'})
-            
-        txn_ids = [r.id for r in ids_result]
-        mark_ids = [r.mark_id for r in ids_result if r.mark_id]
-        
-        # Fetch children (splits) that belong to these parents, since they don't have source_file set
-        child_ids_result = conn.execute(
-            text("SELECT id, mark_id FROM transactions WHERE parent_id IN :pids").bindparams(bindparam('pids', expanding=True)),
-            {'pids': txn_ids}
-        ).fetchall()
-        
-        child_ids = [r.id for r in child_ids_result]
-        child_mark_ids = [r.mark_id for r in child_ids_result if r.mark_id]
-        
-        all_txn_ids = list(set(txn_ids + child_ids))
-        all_mark_ids = list(set(mark_ids + child_mark_ids))
-        
-        # 1. Clean up manual journal links first
-        if all_txn_ids:
-            conn.execute(
-                text("DELETE FROM manual_journal_links WHERE manual_txn_id IN :ids OR linked_txn_id IN :ids OR child_txn_id IN :ids")
-                .bindparams(bindparam('ids', expanding=True)),
-                {'ids': all_txn_ids}
-            )
-
-        # 2. Delete child transactions first to satisfy `fk_transactions_parent_id` constraint
-        if child_ids:
-            conn.execute(
-                text("DELETE FROM transactions WHERE id IN :child_ids")
-                .bindparams(bindparam('child_ids', expanding=True)),
-                {'child_ids': child_ids}
-            )
-        
-        # 3. Delete parent (or all remaining) transactions
-        result = conn.execute(text(f"DELETE FROM transactions WHERE {where_sql}"), params)
-        
-        # 4. Clean up orphaned marks securely
-        if all_mark_ids:
-            used_marks = conn.execute(
-                text("SELECT DISTINCT mark_id FROM transactions WHERE mark_id IN :mids")
-                .bindparams(bindparam('mids', expanding=True)),
-                {'mids': all_mark_ids}
-            ).fetchall()
-            used_mark_ids = {r.mark_id for r in used_marks if r.mark_id}
-            
-            marks_to_delete = list(set(all_mark_ids) - used_mark_ids)
-            if marks_to_delete:
-                conn.execute(
-                    text("DELETE FROM mark_coa_mapping WHERE mark_id IN :mids")
-                    .bindparams(bindparam('mids', expanding=True)),
-                    {'mids': marks_to_delete}
-                )
-                conn.execute(
-                    text("DELETE FROM marks WHERE id IN :mids")
-                    .bindparams(bindparam('mids', expanding=True)),
-                    {'mids': marks_to_delete}
-                )
-
-        return jsonify({'message': f'Deleted {len(all_txn_ids)} transactions'})
+    filters = parse_bulk_filters({
+        'source_file': source_file,
+        'bank_code': data.get('bank_code'),
+        'company_id': data.get('company_id'),
+    })
+    # Split children carry no source_file; the delete operation removes them with their parents.
+    result, is_async = _dispatch_bulk(engine, DELETE, {**data, 'filter': filters}, delete_orphan_marks=True)
+    if is_async:
+        return jsonify({**result, 'message': f"Deleting {result['total_count']} transactions in the background"}), 202
+    return jsonify({'message': f"Deleted {result['updated_count']} transactions", 'chunks': result['chunks']})
 
 
 @history_bp.route('/api/transactions/<txn_id>/assign-mark', methods=['POST'])
@@ -1298,12 +1303,18 @@ def assign_mark_transaction(txn_id):
                     'Transaksi ini sudah memiliki multi mark (split). Ubah mark pada split, bukan parent.'
                 )
 
+        previous_mark_years = mark_years_for(conn, [txn_id])
         result = conn.execute(
             text("UPDATE transactions SET mark_id = :mark_id, updated_at = :updated_at WHERE id = :id"),
             {'id': txn_id, 'mark_id': mark_id, 'updated_at': now}
         )
         if int(result.rowcount or 0) == 0:
             raise NotFoundError('Transaction not found')
+        refresh_split_flags_for(conn, [txn_id])
+        refresh_search_index(conn, [txn_id])
+        refresh_payroll_aggregates(conn, refresh_mark_stats_for(conn, [txn_id], previous_mark_years))
+        refresh_rental_schedule(conn, rental_contract_ids_for(conn, [txn_id]))
+        record_transaction_changes(conn, data_changes.TRANSACTIONS, [txn_id])
         return jsonify({'message': 'Transaction marked successfully'})
 
 
@@ -1372,6 +1383,7 @@ def update_transaction_amortization_group(txn_id):
         """), params)
         if int(result.rowcount or 0) == 0:
             raise NotFoundError('Transaction not found')
+        record_transaction_changes(conn, data_changes.AMORTIZATION, [txn_id], open_ended=True)
 
     return jsonify({
         'message': 'Transaction amortization group updated successfully',
@@ -1393,6 +1405,7 @@ def assign_company_transaction(txn_id):
     company_id = data.get('company_id')
     now = datetime.now()
     with engine.begin() as conn:
+        record_transaction_changes(conn, data_changes.TRANSACTIONS, [txn_id])
         txn_columns = get_table_columns(conn, 'transactions')
         update_fields = ["company_id = :company_id"]
         params = {'company_id': company_id, 'updated_at': now, 'txn_id': txn_id}
@@ -1428,6 +1441,10 @@ def assign_company_transaction(txn_id):
             )
             if int(result.rowcount or 0) == 0:
                 raise NotFoundError('Transaction not found')
+        refresh_import_batches_for(conn, [txn_id, params.get('parent_id')])
+        refresh_payroll_aggregates(conn, salary_mark_ids_for(conn, [txn_id, params.get('parent_id')]))
+        refresh_rental_schedule(conn, rental_contract_ids_for(conn, [txn_id]))
+        record_transaction_changes(conn, data_changes.TRANSACTIONS, [txn_id])
     return jsonify({'message': 'Company assigned successfully'})
 
 
@@ -1436,60 +1453,22 @@ def bulk_mark_transactions():
     engine = require_db_engine()
 
     data = request.json or {}
-    txn_ids = data.get('transaction_ids', [])
     mark_id = data.get('mark_id') or None
+    result, is_async = _dispatch_bulk(engine, MARK, data, mark_id=mark_id)
+    if is_async:
+        return jsonify({**result, 'message': f"Marking {result['total_count']} transactions in the background"}), 202
 
-    if not txn_ids:
-        raise BadRequestError('No transaction IDs provided')
-
-    now = datetime.now()
-    with engine.begin() as conn:
-        txn_columns = get_table_columns(conn, 'transactions')
-        blocked_ids = []
-        updatable_ids = list(txn_ids)
-
-        linked_rows = conn.execute(text("""
-            SELECT DISTINCT linked_txn_id
-            FROM manual_journal_links
-            WHERE linked_txn_id IN :ids
-        """).bindparams(bindparam('ids', expanding=True)), {'ids': updatable_ids}).fetchall()
-        linked_ids = [str(row.linked_txn_id) for row in linked_rows if getattr(row, 'linked_txn_id', None)]
-        if linked_ids:
-            linked_set = set(linked_ids)
-            blocked_ids.extend(linked_ids)
-            updatable_ids = [current_id for current_id in updatable_ids if str(current_id) not in linked_set]
-
-        if mark_id and 'parent_id' in txn_columns:
-            blocked_rows = conn.execute(text("""
-                SELECT t.id
-                FROM transactions t
-                WHERE t.id IN :ids
-                  AND EXISTS (
-                    SELECT 1
-                    FROM transactions c
-                    WHERE c.parent_id = t.id
-                  )
-            """).bindparams(bindparam('ids', expanding=True)), {'ids': updatable_ids}).fetchall()
-            blocked_ids = [str(row.id) for row in blocked_rows]
-            blocked_set = set(blocked_ids)
-            updatable_ids = [current_id for current_id in updatable_ids if str(current_id) not in blocked_set]
-
-        if updatable_ids:
-            conn.execute(text("""
-                UPDATE transactions
-                SET mark_id = :mark_id, updated_at = :updated_at
-                WHERE id IN :ids
-            """).bindparams(bindparam('ids', expanding=True)), {
-                'ids': updatable_ids,
-                'mark_id': mark_id,
-                'updated_at': now
-            })
-
-        return jsonify({
-            'message': f'{len(updatable_ids)} transactions updated successfully',
-            'updated_count': len(updatable_ids),
-            'skipped_split_parent_ids': blocked_ids
-        })
+    skipped = result['skipped']
+    # Legacy field: the split parents left alone when marking, the manual-journal-linked rows when unmarking.
+    legacy_skip_reason = SKIP_SPLIT_PARENT if mark_id else SKIP_LINKED_TO_MANUAL
+    return jsonify({
+        'message': f"{result['updated_count']} transactions updated successfully",
+        'updated_count': result['updated_count'],
+        'skipped_split_parent_ids': skipped.get(legacy_skip_reason, []),
+        'skipped': skipped,
+        'skipped_counts': result['skipped_counts'],
+        'chunks': result['chunks'],
+    })
 
 
 @history_bp.route('/api/transactions/bulk-assign-company', methods=['POST'])
@@ -1497,57 +1476,25 @@ def bulk_assign_company_transactions():
     engine = require_db_engine()
 
     data = request.json or {}
-    txn_ids = data.get('transaction_ids', [])
     company_id = data.get('company_id') or None
-
-    if not txn_ids:
-        raise BadRequestError('No transaction IDs provided')
-
-    now = datetime.now()
-    with engine.begin() as conn:
-        txn_columns = get_table_columns(conn, 'transactions')
-        update_fields = ["company_id = :company_id"]
-        params = {'company_id': company_id, 'updated_at': now}
-        if 'updated_at' in txn_columns:
-            update_fields.append("updated_at = :updated_at")
-
-        update_ids = set(txn_ids)
-        if 'parent_id' in txn_columns and txn_ids:
-            rows = conn.execute(
-                text("SELECT id, parent_id FROM transactions WHERE id IN :ids")
-                .bindparams(bindparam('ids', expanding=True)),
-                {'ids': list(update_ids)}
-            ).fetchall()
-            parent_ids = set()
-            for row in rows:
-                parent_ids.add(str(row.parent_id) if row.parent_id else str(row.id))
-
-            if parent_ids:
-                children = conn.execute(
-                    text("SELECT id FROM transactions WHERE parent_id IN :parent_ids")
-                    .bindparams(bindparam('parent_ids', expanding=True)),
-                    {'parent_ids': list(parent_ids)}
-                ).fetchall()
-                update_ids.update(parent_ids)
-                update_ids.update(str(row.id) for row in children)
-
-        if update_ids:
-            params['ids'] = list(update_ids)
-            conn.execute(
-                text(f"""
-                    UPDATE transactions
-                    SET {', '.join(update_fields)}
-                    WHERE id IN :ids
-                """).bindparams(bindparam('ids', expanding=True)),
-                params
-            )
-    return jsonify({'message': f'{len(txn_ids)} transactions updated successfully'})
+    result, is_async = _dispatch_bulk(engine, COMPANY, data, company_id=company_id)
+    if is_async:
+        return jsonify({**result, 'message': f"Updating {result['total_count']} transactions in the background"}), 202
+    return jsonify({
+        'message': f"{result['total_count']} transactions updated successfully",
+        'chunks': result['chunks'],
+    })
 
 @history_bp.route('/api/transactions/<txn_id>', methods=['DELETE'])
 def delete_transaction(txn_id):
     engine = require_db_engine()
 
     with engine.begin() as conn:
+        record_transaction_changes(conn, data_changes.TRANSACTIONS, [txn_id])
+        parent_ids = split_parent_ids(conn, [txn_id])
+        batch_keys = batch_keys_for(conn, [txn_id])
+        mark_years = mark_years_for(conn, [txn_id])
+        contract_ids = rental_contract_ids_for(conn, [txn_id])
         # 1. Collect child transactions / marks if this is a parent (manual journal or split)
         child_rows = conn.execute(
             text("SELECT id, mark_id FROM transactions WHERE parent_id = :id"),
@@ -1581,8 +1528,13 @@ def delete_transaction(txn_id):
         result = conn.execute(text("DELETE FROM transactions WHERE id = :id"), {'id': txn_id})
         if int(result.rowcount or 0) == 0:
             raise NotFoundError('Transaction not found')
+        refresh_split_flags(conn, parent_ids)
+        refresh_import_batches(conn, batch_keys)
+        refresh_search_index(conn, manual_link_ids)
+        refresh_payroll_aggregates(conn, refresh_mark_years(conn, mark_years))
+        refresh_rental_schedule(conn, contract_ids)
 
-        _delete_orphan_marks(conn, child_mark_ids)
+        delete_orphan_marks(conn, child_mark_ids)
 
     return jsonify({'message': 'Transaction and all related records deleted successfully'})
 
@@ -1592,15 +1544,24 @@ def bulk_delete_transactions():
     engine = require_db_engine()
 
     data = request.json or {}
-    txn_ids = data.get('transaction_ids', [])
-    if not txn_ids:
-        raise BadRequestError('No transaction IDs provided')
+    result, is_async = _dispatch_bulk(engine, DELETE, data)
+    if is_async:
+        return jsonify({**result, 'message': f"Deleting {result['total_count']} transactions in the background"}), 202
+    return jsonify({
+        'message': f"{result['total_count']} transactions deleted successfully",
+        'chunks': result['chunks'],
+    })
+
+
+@history_bp.route('/api/transactions/bulk-jobs/<job_id>', methods=['GET'])
+def get_bulk_job_status(job_id):
+    engine = require_db_engine()
+
     with engine.begin() as conn:
-        conn.execute(
-            text("DELETE FROM transactions WHERE id IN :ids").bindparams(bindparam('ids', expanding=True)),
-            {'ids': txn_ids}
-        )
-    return jsonify({'message': f'{len(txn_ids)} transactions deleted successfully'})
+        job = bulk_jobs_available(conn) and get_bulk_job(conn, job_id)
+        if not job:
+            raise NotFoundError('Bulk job not found')
+    return jsonify(serialize_row_values(job))
 
 
 @history_bp.route('/api/transactions/<transaction_id>/notes', methods=['PUT'])
@@ -1672,6 +1633,11 @@ def save_transaction_splits(txn_id):
             raise NotFoundError('Transaction not found')
 
         parent_data = dict(parent_result._mapping)
+        record_data_change(
+            conn, data_changes.SPLIT, parent_data['company_id'], parent_data['txn_date'], parent_data['txn_date']
+        )
+        previous_mark_years = mark_years_for(conn, [txn_id])
+        contract_ids = rental_contract_ids_for(conn, [txn_id])
         conn.execute(text("DELETE FROM transactions WHERE parent_id = :txn_id"), {'txn_id': txn_id})
 
         if splits and 'mark_id' in txn_columns:
@@ -1732,5 +1698,9 @@ def save_transaction_splits(txn_id):
                 'created_at': now,
                 'updated_at': now
             })
+        refresh_split_flags(conn, [txn_id])
+        refresh_search_index(conn, [txn_id])
+        refresh_payroll_aggregates(conn, refresh_mark_stats_for(conn, [txn_id], previous_mark_years))
+        refresh_rental_schedule(conn, contract_ids | rental_contract_ids_for(conn, [txn_id]))
 
         return jsonify({'message': 'Splits saved successfully', 'splits_count': len(splits)})
@@ -1,3 +1,4 @@
+import calendar
 import json
 import os
 from datetime import datetime
@@ -32,6 +33,13 @@ from backend.routes.route_utils import (
     _parse_bool,
     _safe_int,
 )
+from backend.services.transactions.payroll_aggregates import (
+    fetch_payroll_aggregate_rows,
+    payroll_aggregates_available,
+    refresh_payroll_aggregates,
+    salary_mark_ids_for,
+)
+from backend.services.transactions.presence_aggregates import fetch_presence_summary, refresh_presence_aggregates
 
 payroll_bp = Blueprint('payroll_bp', __name__)
 
@@ -87,6 +95,7 @@ def sync_payroll_presences():
     inserted = 0
     updated = 0
     skipped = 0
+    touched_dates = set()
 
     with engine.begin() as conn:
         _ensure_payroll_presences_table(conn)
@@ -163,7 +172,7 @@ def sync_payroll_presences():
                 continue
 
             existing = conn.execute(text("""
-                SELECT id
+                SELECT id, presence_date
                 FROM payroll_presences
                 WHERE source_key = :source_key
                 LIMIT 1
@@ -196,11 +205,15 @@ def sync_payroll_presences():
             }
 
             conn.execute(upsert_query, params)
+            touched_dates.add(normalized['presence_date'])
             if existing:
+                touched_dates.add(existing.presence_date)
                 updated += 1
             else:
                 inserted += 1
 
+        refresh_presence_aggregates(conn, touched_dates)
+
     return jsonify({
         'message': 'Payroll presences synced successfully',
         'fetched': len(records),
@@ -348,6 +361,64 @@ def get_payroll_presences():
         })
 
 
+@payroll_bp.route('/api/payroll/presences/summary', methods=['GET'])
+def get_payroll_presence_summary():
+    """
+    Worked minutes, shifts and late / early counts between two dates (or for a year / month,
+    the current year by default), grouped by `group_by`: a comma-separated list of company, user, store, day and month.
+    """
+    engine = require_db_engine()
+
+    company_id = str(request.args.get('company_id') or '').strip() or None
+    user_id = str(request.args.get('user_id') or '').strip() or None
+    store_name = request.args.get('store')
+    year = _normalize_year(request.args.get('year'))
+    month = _normalize_month(request.args.get('month'))
+    date_start = _normalize_iso_date(request.args.get('date_start') or request.args.get('start_date'))
+    date_end = _normalize_iso_date(request.args.get('date_end') or request.args.get('end_date'))
+    group_by = [key.strip() for key in str(request.args.get('group_by') or 'user').split(',') if key.strip()]
+
+    if request.args.get('year') not in (None, '') and year is None:
+        raise BadRequestError('year must be numeric (1900-3000)')
+    if request.args.get('month') not in (None, '') and month is None:
+        raise BadRequestError('month must be numeric (1-12)')
+    if (request.args.get('date_start') or request.args.get('start_date')) and not date_start:
+        raise BadRequestError('date_start/start_date must be YYYY-MM-DD')
+    if (request.args.get('date_end') or request.args.get('end_date')) and not date_end:
+        raise BadRequestError('date_end/end_date must be YYYY-MM-DD')
+
+    if date_start or date_end:
+        if not date_start or not date_end:
+            raise BadRequestError('date_start and date_end must be given together')
+    else:
+        first_month, last_month = (month, month) if month is not None else (1, 12)
+        date_start = f"{year:04d}-{first_month:02d}-01"
+        date_end = f"{year:04d}-{last_month:02d}-{calendar.monthrange(year, last_month)[1]:02d}"
+    if date_end < date_start:
+        raise BadRequestError('date_end must not be before date_start')
+
+    with engine.begin() as conn:
+        _ensure_payroll_presences_table(conn)
+        try:
+            summary = fetch_presence_summary(
+                conn,
+                date_start,
+                date_end,
+                group_by=group_by,
+                company_id=company_id,
+                user_id=user_id,
+                store_name=store_name.strip() if store_name is not None else None,
+            )
+        except ValueError as e:
+            raise BadRequestError(str(e))
+
+    return jsonify({
+        'date_start': date_start,
+        'date_end': date_end,
+        **summary,
+    })
+
+
 @payroll_bp.route('/api/payroll/users', methods=['GET'])
 def get_payroll_users():
     engine = require_db_engine()
@@ -544,6 +615,7 @@ def assign_payroll_user(txn_id):
         """), {'sagansa_user_id': user_id, 'updated_at': datetime.now(), 'txn_id': txn_id})
         if int(result.rowcount or 0) == 0:
             raise NotFoundError('Transaction not found')
+        refresh_payroll_aggregates(conn, salary_mark_ids_for(conn, [txn_id]))
 
     user_map = _get_sagansa_user_map() if user_id else {}
     return jsonify({
@@ -578,6 +650,7 @@ def update_payroll_transaction_period_month(txn_id):
         """), {'payroll_period_month': month_value, 'updated_at': datetime.now(), 'txn_id': txn_id})
         if int(result.rowcount or 0) == 0:
             raise NotFoundError('Transaction not found')
+        refresh_payroll_aggregates(conn, salary_mark_ids_for(conn, [txn_id]))
 
     effective_period = (month_value or '')[:7] if month_value else None
     return jsonify({
@@ -632,6 +705,7 @@ def bulk_assign_payroll_user():
             'updated_at': datetime.now(),
             'ids': txn_ids
         })
+        refresh_payroll_aggregates(conn, salary_mark_ids_for(conn, txn_ids))
 
     user_map = _get_sagansa_user_map() if user_id else {}
     return jsonify({
@@ -642,6 +716,51 @@ def bulk_assign_payroll_user():
     })
 
 
+def _fetch_live_payroll_entries(conn, txn_columns, split_exclusion, company_id, year, month, report_type):
+    """(user_id, component_name, 1, amount) per salary transaction, for schemas without payroll_aggregates."""
+    user_col_expr = "t.sagansa_user_id" if 'sagansa_user_id' in txn_columns else "NULL"
+    effective_date_expr = "COALESCE(t.payroll_period_month, t.txn_date)" if 'payroll_period_month' in txn_columns else "t.txn_date"
+    if conn.dialect.name == 'sqlite':
+        period_clause = f"strftime('%Y', {effective_date_expr}) = :year_str"
+        if month:
+            period_clause += f" AND strftime('%m', {effective_date_expr}) = :month_str"
+        params = {'company_id': company_id, 'year_str': f"{year:04d}", 'month_str': f"{month:02d}" if month else None, 'report_type': report_type}
+    else:
+        period_clause = f"YEAR({effective_date_expr}) = :year"
+        if month:
+            period_clause += f" AND MONTH({effective_date_expr}) = :month"
+        params = {'company_id': company_id, 'year': year, 'month': month, 'report_type': report_type}
+
+    result = conn.execute(text(f"""
+        SELECT
+            t.id,
+            t.amount,
+            {user_col_expr} AS sagansa_user_id,
+            m.personal_use,
+            m.internal_report,
+            m.tax_report
+        FROM transactions t
+        INNER JOIN marks m ON t.mark_id = m.id
+        WHERE COALESCE(m.is_salary_component, 0) = 1
+          AND EXISTS (
+              SELECT 1 FROM mark_coa_mapping mcm
+              WHERE mcm.mark_id = m.id AND mcm.report_type = :report_type
+          )
+          AND {period_clause}
+          AND (:company_id IS NULL OR t.company_id = :company_id)
+          {split_exclusion}
+    """), params)
+    return [
+        (
+            str(row.sagansa_user_id or '').strip() or None,
+            row.personal_use or row.internal_report or row.tax_report or '(Unnamed Salary Component)',
+            1,
+            abs(float(row.amount or 0.0)),
+        )
+        for row in result
+    ]
+
+
 @payroll_bp.route('/api/payroll/monthly-summary', methods=['GET'])
 def get_payroll_monthly_summary():
     engine = require_db_engine()
@@ -674,50 +793,29 @@ def get_payroll_monthly_summary():
                 'message': 'Kolom is_salary_component belum tersedia. Jalankan migrasi terbaru.'
             })
 
-        user_col_expr = "t.sagansa_user_id" if 'sagansa_user_id' in txn_columns else "NULL"
-        effective_date_expr = "COALESCE(t.payroll_period_month, t.txn_date)" if 'payroll_period_month' in txn_columns else "t.txn_date"
-        if conn.dialect.name == 'sqlite':
-            period_clause = f"strftime('%Y', {effective_date_expr}) = :year_str"
-            if month:
-                period_clause += f" AND strftime('%m', {effective_date_expr}) = :month_str"
-            params = {'company_id': company_id, 'year_str': f"{year:04d}", 'month_str': f"{month:02d}", 'report_type': report_type}
+        user_map = _get_sagansa_user_map()
+        if payroll_aggregates_available(conn):
+            start_month = f"{year:04d}-{month:02d}" if month else f"{year:04d}-01"
+            end_month = f"{year:04d}-{month:02d}" if month else f"{year:04d}-12"
+            entries = [
+                (row['sagansa_user_id'], row['component_name'], row['transaction_count'], row['total_amount'])
+                for row in fetch_payroll_aggregate_rows(
+                    conn, start_month, end_month, company_id, report_type, include_unmarked_split_parents=False,
+                )
+            ]
         else:
-            period_clause = f"YEAR({effective_date_expr}) = :year"
-            if month:
-                period_clause += f" AND MONTH({effective_date_expr}) = :month"
-            params = {'company_id': company_id, 'year': year, 'month': month, 'report_type': report_type}
+            entries = _fetch_live_payroll_entries(
+                conn, txn_columns, split_exclusion, company_id, year, month, report_type
+            )
 
-        result = conn.execute(text(f"""
-            SELECT
-                t.id,
-                t.amount,
-                {user_col_expr} AS sagansa_user_id,
-                m.personal_use,
-                m.internal_report,
-                m.tax_report
-            FROM transactions t
-            INNER JOIN marks m ON t.mark_id = m.id
-            WHERE COALESCE(m.is_salary_component, 0) = 1
-              AND EXISTS (
-                  SELECT 1 FROM mark_coa_mapping mcm
-                  WHERE mcm.mark_id = m.id AND mcm.report_type = :report_type
-              )
-              AND {period_clause}
-              AND (:company_id IS NULL OR t.company_id = :company_id)
-              {split_exclusion}
-        """), params)
-
-        user_map = _get_sagansa_user_map()
         grouped = {}
         component_totals = {}
         total_transactions = 0
         total_salary_amount = 0.0
-        for row in result:
-            total_transactions += 1
-            amount = abs(float(row.amount or 0.0))
+        for user_id, component_name, transaction_count, amount in entries:
+            total_transactions += transaction_count
             total_salary_amount += amount
 
-            user_id = str(row.sagansa_user_id or '').strip() or None
             group_key = user_id or '__unassigned__'
             if group_key not in grouped:
                 grouped[group_key] = {
@@ -728,9 +826,8 @@ def get_payroll_monthly_summary():
                     'components': {}
                 }
 
-            component_name = row.personal_use or row.internal_report or row.tax_report or '(Unnamed Salary Component)'
             grouped[group_key]['total_amount'] += amount
-            grouped[group_key]['transaction_count'] += 1
+            grouped[group_key]['transaction_count'] += transaction_count
             grouped[group_key]['components'][component_name] = grouped[group_key]['components'].get(component_name, 0.0) + amount
             component_totals[component_name] = component_totals.get(component_name, 0.0) + amount
 
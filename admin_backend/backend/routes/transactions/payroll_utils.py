@@ -6,10 +6,11 @@ from datetime import date, datetime
 
 from sqlalchemy import text
 
-from backend.db.schema import get_table_columns
+from backend.db.schema import forget_table_columns, get_table_columns
 from backend.db.session import get_sagansa_engine
 from backend.routes.accounting_utils import serialize_db_value
 from backend.routes.route_utils import _normalize_iso_date, _parse_bool, _safe_int
+from backend.services.transactions.split_flags import IS_SPLIT_CONTAINER
 
 
 def _safe_identifier(value, fallback):
@@ -114,6 +115,7 @@ def _ensure_payroll_employee_flags_table(conn):
                 updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
             )
         """))
+    forget_table_columns('payroll_employee_flags')
 
 
 def _get_payroll_employee_ids(conn):
@@ -478,6 +480,7 @@ def _ensure_payroll_presences_table(conn):
             )
         """))
 
+    forget_table_columns('payroll_presences')
     existing_columns = get_table_columns(conn, 'payroll_presences')
     if conn.dialect.name == 'sqlite':
         missing_defs = {
@@ -500,9 +503,11 @@ def _ensure_payroll_presences_table(conn):
             'source_created_at': "ALTER TABLE payroll_presences ADD COLUMN source_created_at DATETIME NULL"
         }
 
-    for column_name, alter_sql in missing_defs.items():
-        if column_name not in existing_columns:
-            conn.execute(text(alter_sql))
+    missing_columns = [column_name for column_name in missing_defs if column_name not in existing_columns]
+    for column_name in missing_columns:
+        conn.execute(text(missing_defs[column_name]))
+    if missing_columns:
+        forget_table_columns('payroll_presences')
 
 
 def _split_parent_exclusion_clause(conn, alias='t'):
@@ -524,6 +529,8 @@ def _split_parent_exclusion_clause(conn, alias='t'):
     if 'parent_id' not in txn_columns:
         return ''
     # Exclude parent if it has children (children will be included individually)
+    if IS_SPLIT_CONTAINER in txn_columns:
+        return f" AND {alias}.{IS_SPLIT_CONTAINER} = 0"
     return f" AND NOT EXISTS (SELECT 1 FROM transactions t_child WHERE t_child.parent_id = {alias}.id)"
 
 
@@ -14,6 +14,7 @@ from backend.routes.route_utils import (
     _normalize_iso_date,
     _parse_bool,
 )
+from backend.services.reporting.report_value_utils import _year_date_bounds as year_date_bounds
 
 service_bp = Blueprint('service_bp', __name__)
 VALID_SERVICE_CALCULATION_METHODS = {'BRUTO', 'NETTO', 'NONE'}
@@ -65,18 +66,13 @@ def get_service_marks():
         asset_expr = "COALESCE(m.is_asset, FALSE)" if 'is_asset' in mark_columns else "FALSE"
         split_exclusion = split_parent_exclusion_clause(conn, 't')
 
-        if conn.dialect.name == 'sqlite':
-            year_filter = "(:year_str IS NULL OR strftime('%Y', t.txn_date) = :year_str)"
-            params = {
-                'company_id': company_id,
-                'year_str': str(year_int) if year_int is not None else None
-            }
-        else:
-            year_filter = "(:year IS NULL OR YEAR(t.txn_date) = :year)"
-            params = {
-                'company_id': company_id,
-                'year': year_int
-            }
+        year_start, next_year_start = year_date_bounds(year_int) if year_int is not None else (None, None)
+        year_filter = "(:year_start IS NULL OR (t.txn_date >= :year_start AND t.txn_date < :next_year_start))"
+        params = {
+            'company_id': company_id,
+            'year_start': year_start,
+            'next_year_start': next_year_start,
+        }
 
         result = conn.execute(text(f"""
             SELECT
@@ -166,20 +162,14 @@ def get_service_transactions():
         method_expr = "COALESCE(t.service_calculation_method, 'BRUTO')" if 'service_calculation_method' in txn_columns else "'BRUTO'"
         timing_expr = "COALESCE(t.service_tax_payment_timing, 'same_period')" if 'service_tax_payment_timing' in txn_columns else "'same_period'"
         payment_date_expr = "t.service_tax_payment_date" if 'service_tax_payment_date' in txn_columns else "NULL"
-        if conn.dialect.name == 'sqlite':
-            year_filter = "(:year_str IS NULL OR strftime('%Y', t.txn_date) = :year_str)"
-            params = {
-                'company_id': company_id,
-                'search': f"%{search}%" if search else None,
-                'year_str': str(year_int) if year_int is not None else None
-            }
-        else:
-            year_filter = "(:year IS NULL OR YEAR(t.txn_date) = :year)"
-            params = {
-                'company_id': company_id,
-                'search': f"%{search}%" if search else None,
-                'year': year_int
-            }
+        year_start, next_year_start = year_date_bounds(year_int) if year_int is not None else (None, None)
+        year_filter = "(:year_start IS NULL OR (t.txn_date >= :year_start AND t.txn_date < :next_year_start))"
+        params = {
+            'company_id': company_id,
+            'search': f"%{search}%" if search else None,
+            'year_start': year_start,
+            'next_year_start': next_year_start,
+        }
 
         result = conn.execute(text(f"""
             SELECT
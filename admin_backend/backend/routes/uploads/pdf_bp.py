@@ -2,13 +2,11 @@ import os
 import hashlib
 from flask import Blueprint, current_app as app, jsonify, request, send_file
 
-import pandas as pd
-
 from backend.routes.accounting_utils import require_db_engine
 from backend.routes.uploads.pdf_helpers import (
-    PdfReadError,
     dataframe_bank_code,
     dataframe_preview_records,
+    detect_bank_key,
     detect_pdf_password_requirement,
     infer_statement_year,
     normalize_company_id,
@@ -23,6 +21,7 @@ from backend.routes.uploads.pdf_queries import (
     find_transaction_by_file_hash_query,
 )
 from backend.services.transactions.transaction_service import save_transactions_to_db
+from bank_parsers.statement_detector import detect_statement
 
 pdf_bp = Blueprint('pdf_bp', __name__)
 BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -92,6 +91,8 @@ def _check_duplicate_file_hash(file_hash):
 
 
 def _resolve_processing_pdf_path(original_pdf_path, password):
+    from backend.utils.pdf_unlock import PdfReadError
+
     try:
         pdf_path, requires_password = resolve_pdf_access_path(original_pdf_path, password=password)
     except PdfReadError:
@@ -133,6 +134,8 @@ def check_password():
     if error_response:
         return error_response
 
+    from backend.utils.pdf_unlock import PdfReadError
+
     _, pdf_path = save_uploaded_file(app.config['UPLOAD_FOLDER'], file)
     try:
         try:
@@ -143,6 +146,37 @@ def check_password():
         _remove_file_if_exists(pdf_path)
 
 
+@pdf_bp.route('/api/detect-statement', methods=['POST', 'OPTIONS'])
+def detect_statement_type():
+    if request.method == 'OPTIONS':
+        return _empty_options_response()
+
+    file, error_response = _uploaded_file_from_request()
+    if error_response:
+        return error_response
+
+    is_csv, is_pdf, error_response = _validate_upload_type(file)
+    if error_response:
+        return error_response
+
+    password = (request.form.get('password') or '').strip() or None
+    _, original_path = save_uploaded_file(app.config['UPLOAD_FOLDER'], file)
+    file_path = original_path
+    try:
+        if is_pdf:
+            file_path, error_response = _resolve_processing_pdf_path(original_path, password)
+            if error_response:
+                return error_response
+        try:
+            detection = detect_statement(file_path, password=password, is_csv=is_csv)
+        except ValueError as exc:
+            return _error_response(str(exc), 400)
+        return jsonify(detection)
+    finally:
+        for path in {p for p in (file_path, original_path) if p}:
+            _remove_file_if_exists(path)
+
+
 @pdf_bp.route('/check_upload_name', methods=['POST', 'OPTIONS'])
 @pdf_bp.route('/api/check-upload-name', methods=['POST', 'OPTIONS'])
 def check_upload_name():
@@ -191,7 +225,7 @@ def convert_pdf():
     if error_response:
         return error_response
 
-    bank_type = request.form.get('bank_type', 'bca')
+    bank_type = (request.form.get('bank_type') or '').strip()
     company_id = normalize_company_id(request.form.get('company_id'))
     filename, original_pdf_path = save_uploaded_file(app.config['UPLOAD_FOLDER'], file)
     file.seek(0)
@@ -207,7 +241,17 @@ def convert_pdf():
             if error_response:
                 return error_response
 
-        inferred_year = infer_statement_year(pdf_path, original_pdf_path, is_pdf)
+        detected_year = None
+        if not bank_type:
+            try:
+                bank_type, detection = detect_bank_key(pdf_path, password=password, is_csv=is_csv)
+            except ValueError as exc:
+                return _error_response(str(exc), 400)
+            detected_year = (detection.get('period') or {}).get('year')
+
+        inferred_year = detected_year or infer_statement_year(
+            pdf_path, original_pdf_path, is_pdf, bank_key=bank_type.lower()
+        )
         statement_year_raw = request.form.get('statement_year')
         if statement_year_raw and statement_year_raw.isdigit():
             inferred_year = int(statement_year_raw)
@@ -260,6 +304,8 @@ def convert_pdf():
             output_path = os.path.join(output_dir, f'{base_name}{file_extension}')
 
             if output_format == 'csv':
+                import pandas as pd
+
                 df_to_save = df.copy()
                 if bank_key not in {'dbs'}:
                     datetime_cols = [col for col in df_to_save.columns if pd.api.types.is_datetime64_any_dtype(df_to_save[col])]
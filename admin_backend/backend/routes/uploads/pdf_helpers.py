@@ -1,23 +1,14 @@
 import os
 import re
+import time
 
-import pandas as pd
-import PyPDF2
 from werkzeug.utils import secure_filename
 
-from backend.utils.date_helpers import normalize_date_columns, standardize_statement_dates
-from backend.utils.pdf_year_utils import infer_year_from_filename, infer_year_from_pdf
-from bank_parsers import bca, bca_cc, blu, bri, dbs, mandiri, mandiri_cc, mandiri_email, saqu
-from backend.utils.pdf_unlock import unlock_pdf
+from backend.metrics import count_import_rows, observe_parser
+from bank_parsers.registry import get_parser
 
-try:
-    from PyPDF2.errors import PdfReadError
-except (ImportError, AttributeError):
-    try:
-        from PyPDF2.utils import PdfReadError
-    except (ImportError, AttributeError):
-        class PdfReadError(Exception):
-            pass
+# pandas, PyPDF2 and the bank parsers are imported on first use so that workers
+# serving only accounting/report routes never load them.
 
 
 def normalize_company_id(value):
@@ -43,6 +34,8 @@ def save_uploaded_file(upload_folder, file_storage):
 
 
 def detect_pdf_password_requirement(pdf_path):
+    import PyPDF2
+
     with open(pdf_path, 'rb') as pdf_file:
         reader = PyPDF2.PdfReader(pdf_file)
         is_protected = reader.is_encrypted
@@ -56,6 +49,10 @@ def detect_pdf_password_requirement(pdf_path):
 
 
 def resolve_pdf_access_path(original_pdf_path, password=None):
+    import PyPDF2
+
+    from backend.utils.pdf_unlock import PdfReadError, unlock_pdf
+
     requires_password = False
     pdf_path = original_pdf_path
 
@@ -80,37 +77,51 @@ def resolve_pdf_access_path(original_pdf_path, password=None):
     return pdf_path, requires_password
 
 
-def infer_statement_year(file_path, original_file_path, is_pdf):
+def infer_statement_year(file_path, original_file_path, is_pdf, bank_key=None):
+    from backend.utils.pdf_year_utils import infer_year_from_filename, infer_year_from_pdf
+
     if is_pdf:
-        return infer_year_from_pdf(file_path) or infer_year_from_filename(original_file_path)
+        return infer_year_from_pdf(file_path, bank_key=bank_key) or infer_year_from_filename(original_file_path)
     return infer_year_from_filename(original_file_path)
 
 
+def detect_bank_key(file_path, password=None, is_csv=False):
+    from bank_parsers.statement_detector import detect_statement
+
+    detection = detect_statement(file_path, password=password, is_csv=is_csv)
+    if not detection.get('bank_key'):
+        raise ValueError('Could not detect the statement type. Please choose the bank manually.')
+    return detection['bank_key'], detection
+
+
 def parse_statement(bank_key, file_path, inferred_year=None, password=None, is_csv=False):
-    if bank_key == 'bri' and not is_csv:
+    if not bank_key:
+        bank_key, _ = detect_bank_key(file_path, password=password, is_csv=is_csv)
+
+    started = time.perf_counter()
+    try:
+        df = _parse_statement_for_bank(bank_key, file_path, inferred_year, password, is_csv)
+    except Exception:
+        observe_parser(bank_key, time.perf_counter() - started, error=True)
+        raise
+    observe_parser(bank_key, time.perf_counter() - started)
+    count_import_rows(dataframe_bank_code(bank_key), parsed=len(df))
+    return df
+
+
+def _parse_statement_for_bank(bank_key, file_path, inferred_year, password, is_csv):
+    parser = get_parser(bank_key)
+    if parser.file_format == 'csv' and not is_csv:
         raise ValueError('BRI statements must be in CSV format.')
-    if bank_key != 'bri' and is_csv:
+    if parser.file_format != 'csv' and is_csv:
         raise ValueError('CSV files are only supported for BRI bank.')
 
-    if bank_key == 'mandiri':
-        return mandiri.parse_statement(file_path)
-    if bank_key == 'mandiri_email':
-        return mandiri_email.parse_statement(file_path)
-    if bank_key == 'dbs':
-        return dbs.parse_statement(file_path, target_year=inferred_year)
-    if bank_key == 'ccbca':
-        return bca_cc.parse_statement(file_path, inferred_year)
-    if bank_key == 'ccmandiri':
-        return mandiri_cc.parse_statement(file_path, password=password)
-    if bank_key == 'bri':
-        return bri.parse_statement(file_path)
-    if bank_key == 'saqu':
-        return saqu.parse_statement(file_path, password=password)
-    if bank_key == 'blu':
-        return blu.parse_statement(file_path)
-
-    df = bca.parse_statement(file_path)
-    return standardize_statement_dates(df, 'Tanggal', 'dd/mm', inferred_year)
+    df = parser.parse(file_path, inferred_year=inferred_year, password=password)
+    if parser.bank_key == 'bca':
+        from backend.utils.date_helpers import standardize_statement_dates
+
+        df = standardize_statement_dates(df, 'Tanggal', 'dd/mm', inferred_year)
+    return df
 
 
 def normalize_statement_dataframe(
@@ -125,6 +136,8 @@ def normalize_statement_dataframe(
         df['source_file'] = original_name
 
     if bank_key not in {'dbs'}:
+        from backend.utils.date_helpers import normalize_date_columns
+
         df = normalize_date_columns(df, inferred_year)
 
     if 'bank_account_number' not in df.columns:
@@ -143,6 +156,8 @@ def normalize_statement_dataframe(
 
 
 def dataframe_preview_records(df):
+    import pandas as pd
+
     preview_df = df.copy()
     for col in preview_df.columns:
         if pd.api.types.is_datetime64_any_dtype(preview_df[col]):
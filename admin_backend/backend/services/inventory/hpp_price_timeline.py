@@ -0,0 +1,174 @@
+import threading
+from bisect import bisect_right
+
+from sqlalchemy import text
+
+from backend.db.schema import get_table_columns, on_schema_version_change
+from backend.metrics import count_cache_lookup
+from backend.services.reporting.report_cache import report_data_version
+
+# Per-company history of HPP unit prices. Each product's batch prices are kept in ascending
+# (effective_date, batch_id, reference_id) order, by product id and by normalized product name,
+# so the price in force at any date is a binary search instead of a re-sort of every batch
+# product. Timelines are cached per company and dropped when HPP batches are saved or deleted
+# (or when the report data version moves, which covers writes made by other processes).
+
+_timelines = {}
+_timelines_lock = threading.Lock()
+_generation = 0
+
+
+def normalize_product_key(value):
+    raw = str(value or '').strip().lower()
+    if not raw:
+        return ''
+    return ' '.join(raw.replace('_', ' ').replace('-', ' ').split())
+
+
+def _reference_sort_key(reference):
+    return (
+        str(reference.get('effective_date') or ''),
+        str(reference.get('batch_id') or ''),
+        str(reference.get('reference_id') or ''),
+    )
+
+
+class HppPriceTimeline:
+    """As-of price lookups over one company's HPP batch products."""
+
+    def __init__(self, references):
+        self._by_product = {}
+        self._by_name = {}
+        for reference in sorted(references, key=_reference_sort_key):
+            if not reference.get('effective_date'):
+                continue
+            product_id = str(reference.get('product_id') or '')
+            if product_id:
+                self._by_product.setdefault(product_id, []).append(reference)
+            name_key = normalize_product_key(reference.get('product_name'))
+            if name_key:
+                self._by_name.setdefault(name_key, []).append(reference)
+        self._product_dates = {key: [ref['effective_date'] for ref in refs] for key, refs in self._by_product.items()}
+        self._name_dates = {key: [ref['effective_date'] for ref in refs] for key, refs in self._by_name.items()}
+
+    @staticmethod
+    def _known_count(dates, as_of_date):
+        return bisect_right(dates, str(as_of_date)) if dates else 0
+
+    def _latest(self, index, dates, key, as_of_date):
+        count = self._known_count(dates.get(key), as_of_date)
+        return index[key][count - 1] if count else None
+
+    def _options(self, index, dates, key, as_of_date):
+        count = self._known_count(dates.get(key), as_of_date)
+        return index[key][count - 1::-1] if count else []
+
+    def latest(self, product_id, as_of_date):
+        """The newest price reference of `product_id` effective on or before `as_of_date`, or None."""
+        return self._latest(self._by_product, self._product_dates, str(product_id or ''), as_of_date)
+
+    def latest_by_name(self, product_name, as_of_date):
+        return self._latest(self._by_name, self._name_dates, normalize_product_key(product_name), as_of_date)
+
+    def options(self, product_id, as_of_date):
+        """Price references of `product_id` effective by `as_of_date`, newest first."""
+        return self._options(self._by_product, self._product_dates, str(product_id or ''), as_of_date)
+
+    def options_by_name(self, product_name, as_of_date):
+        return self._options(self._by_name, self._name_dates, normalize_product_key(product_name), as_of_date)
+
+    def latest_prices(self, as_of_date):
+        """{product_id: newest reference effective by `as_of_date`} for every priced product."""
+        prices = {}
+        for product_id in self._by_product:
+            reference = self.latest(product_id, as_of_date)
+            if reference is not None:
+                prices[product_id] = reference
+        return prices
+
+
+def fetch_hpp_price_references(conn, company_id, monitoring_index=None):
+    """Every HPP batch product price of `company_id`, named from `monitoring_index` when possible."""
+    hpp_batch_product_columns = get_table_columns(conn, 'hpp_batch_products')
+    if 'stock_monitoring_id' in hpp_batch_product_columns and 'product_id' in hpp_batch_product_columns:
+        reference_expr = "COALESCE(bp.stock_monitoring_id, bp.product_id)"
+    elif 'stock_monitoring_id' in hpp_batch_product_columns:
+        reference_expr = "bp.stock_monitoring_id"
+    else:
+        reference_expr = "bp.product_id"
+
+    has_products = bool(get_table_columns(conn, 'products'))
+    product_join = f"LEFT JOIN products p ON p.id = {reference_expr}" if has_products else ""
+    local_name_expr = (
+        f"COALESCE(p.name, CAST({reference_expr} AS CHAR))" if has_products else f"CAST({reference_expr} AS CHAR)"
+    )
+    monitoring_index = monitoring_index or {}
+
+    rows = conn.execute(text(f"""
+        SELECT
+            CAST(bp.id AS CHAR) AS reference_id,
+            CAST({reference_expr} AS CHAR) AS product_id,
+            {local_name_expr} AS product_name,
+            bp.calculated_unit_idr_hpp AS unit_price,
+            CAST(b.id AS CHAR) AS batch_id,
+            b.memo AS batch_memo,
+            COALESCE(b.batch_date, DATE(b.created_at)) AS effective_date
+        FROM hpp_batch_products bp
+        JOIN hpp_batches b ON b.id = bp.batch_id
+        {product_join}
+        WHERE b.company_id = :company_id
+    """), {'company_id': company_id}).fetchall()
+
+    return [
+        {
+            'reference_id': str(row.reference_id),
+            'batch_id': str(row.batch_id),
+            'product_id': str(row.product_id),
+            'product_name': (
+                monitoring_index.get(str(row.product_id), {}).get('name')
+                or row.product_name
+                or str(row.product_id)
+            ),
+            'unit_price': float(row.unit_price or 0.0),
+            'effective_date': str(row.effective_date)[:10] if row.effective_date else None,
+            'batch_memo': row.batch_memo or '',
+        }
+        for row in rows
+    ]
+
+
+def _monitoring_fingerprint(monitoring_index):
+    return tuple(sorted(
+        (str(key), str((value or {}).get('name') or ''))
+        for key, value in (monitoring_index or {}).items()
+    ))
+
+
+def load_hpp_price_timeline(conn, company_id, monitoring_index=None):
+    """The cached timeline of `company_id`, rebuilt when batches or monitoring names changed."""
+    cache_key = str(company_id)
+    version = report_data_version(conn, company_id)
+    fingerprint = _monitoring_fingerprint(monitoring_index)
+    with _timelines_lock:
+        entry = _timelines.get(cache_key)
+        generation = _generation
+    hit = entry is not None and entry['version'] == version and entry['fingerprint'] == fingerprint
+    count_cache_lookup('hpp_price_timeline', hit)
+    if hit:
+        return entry['timeline']
+
+    timeline = HppPriceTimeline(fetch_hpp_price_references(conn, company_id, monitoring_index))
+    with _timelines_lock:
+        # An invalidation while we were loading means the rows may predate it; serve them once uncached.
+        if generation == _generation:
+            _timelines[cache_key] = {'version': version, 'fingerprint': fingerprint, 'timeline': timeline}
+    return timeline
+
+
+@on_schema_version_change
+def invalidate_hpp_price_timelines(version=None):
+    """Drop every cached timeline; call after HPP batches are written."""
+    global _generation
+    with _timelines_lock:
+        _timelines.clear()
+        _generation += 1
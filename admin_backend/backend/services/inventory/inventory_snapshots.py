@@ -0,0 +1,236 @@
+import calendar
+from datetime import datetime
+
+from sqlalchemy import text
+
+from backend.db.schema import get_table_columns
+from backend.services.reporting import data_changes
+
+# Month-end inventory valuations per company (migration 078). The builder values each requested
+# month-end with the same stock quantities and HPP prices as the year-end valuation and stores the
+# totals plus the valued lines, so month-close COGS and the income statement read one row per
+# month instead of calling the stock API.
+SNAPSHOTS_TABLE = 'inventory_snapshots'
+SNAPSHOT_ITEMS_TABLE = 'inventory_snapshot_items'
+MAX_BUILD_MONTHS = 36
+
+
+def inventory_snapshots_available(conn):
+    return bool(get_table_columns(conn, SNAPSHOTS_TABLE)) and bool(get_table_columns(conn, SNAPSHOT_ITEMS_TABLE))
+
+
+def month_end_date(year, month):
+    return f"{int(year):04d}-{int(month):02d}-{calendar.monthrange(int(year), int(month))[1]:02d}"
+
+
+def _shift_month(year, month, delta):
+    index = int(year) * 12 + int(month) - 1 + delta
+    return index // 12, index % 12 + 1
+
+
+def parse_month(value):
+    """(year, month) of a 'YYYY-MM' or 'YYYY-MM-DD' string; raises ValueError otherwise."""
+    parsed = datetime.strptime(str(value or '').strip()[:7], '%Y-%m')
+    return parsed.year, parsed.month
+
+
+def month_range(start_month, end_month):
+    """[(year, month), ...] from `start_month` through `end_month`, both 'YYYY-MM'."""
+    start = parse_month(start_month)
+    end = parse_month(end_month)
+    if end < start:
+        raise ValueError('end_month must not be before start_month')
+    months = [start]
+    while months[-1] < end:
+        months.append(_shift_month(*months[-1], 1))
+    return months
+
+
+def save_inventory_snapshot(conn, company_id, year, month, valuation):
+    """Replace the stored snapshot of `company_id` for the month with `valuation`."""
+    key = {'company_id': company_id, 'period_year': int(year), 'period_month': int(month)}
+    for table in (SNAPSHOT_ITEMS_TABLE, SNAPSHOTS_TABLE):
+        conn.execute(text(f"""
+            DELETE FROM {table}
+            WHERE company_id = :company_id AND period_year = :period_year AND period_month = :period_month
+        """), key)
+
+    conn.execute(text(f"""
+        INSERT INTO {SNAPSHOTS_TABLE} (
+            company_id, period_year, period_month, snapshot_date, as_of_date, snapshot_source,
+            quantity, amount, line_count, missing_price_count, built_at
+        ) VALUES (
+            :company_id, :period_year, :period_month, :snapshot_date, :as_of_date, :snapshot_source,
+            :quantity, :amount, :line_count, :missing_price_count, :built_at
+        )
+    """), {
+        **key,
+        'snapshot_date': valuation['snapshot_date'],
+        'as_of_date': valuation.get('as_of_date'),
+        'snapshot_source': valuation.get('snapshot_source'),
+        'quantity': float(valuation.get('quantity') or 0.0),
+        'amount': float(valuation.get('amount') or 0.0),
+        'line_count': int(valuation.get('line_count') or 0),
+        'missing_price_count': int(valuation.get('missing_price_count') or 0),
+        'built_at': datetime.now(),
+    })
+
+    item_rows = [
+        {
+            **key,
+            'product_id': str(item.get('product_id') or ''),
+            'product_name': item.get('product_name'),
+            'unit_name': item.get('unit_name') or None,
+            'quantity': float(item.get('quantity') or 0.0),
+            'unit_price': item.get('unit_price'),
+            'total_value': item.get('total_value'),
+            'price_effective_date': item.get('price_effective_date'),
+            'price_batch_id': item.get('price_batch_id'),
+        }
+        for item in valuation.get('items') or []
+        if item.get('product_id')
+    ]
+    if item_rows:
+        conn.execute(text(f"""
+            INSERT INTO {SNAPSHOT_ITEMS_TABLE} (
+                company_id, period_year, period_month, product_id, product_name, unit_name,
+                quantity, unit_price, total_value, price_effective_date, price_batch_id
+            ) VALUES (
+                :company_id, :period_year, :period_month, :product_id, :product_name, :unit_name,
+                :quantity, :unit_price, :total_value, :price_effective_date, :price_batch_id
+            )
+        """), item_rows)
+
+    # The month's closing value is also the next month's opening value.
+    next_year, next_month = _shift_month(year, month, 1)
+    data_changes.record_data_change(
+        conn,
+        data_changes.INVENTORY,
+        company_id,
+        f"{int(year):04d}-{int(month):02d}-01",
+        month_end_date(next_year, next_month),
+    )
+
+
+def build_inventory_snapshots(engine, company_id, months, value_month_end):
+    """
+    Value and store each (year, month) of `months` for `company_id`.
+    `value_month_end(snapshot_date)` returns the valuation of one month-end (see
+    `_calculate_inventory_snapshot` in the inventory blueprint). Each month commits on its own,
+    so a failure part-way keeps the months already built.
+    """
+    built = []
+    for year, month in months:
+        valuation = value_month_end(month_end_date(year, month))
+        with engine.begin() as conn:
+            save_inventory_snapshot(conn, company_id, year, month, valuation)
+        built.append(_snapshot_summary(company_id, year, month, valuation))
+    return built
+
+
+def _snapshot_summary(company_id, year, month, row):
+    return {
+        'company_id': company_id,
+        'year': int(year),
+        'month': int(month),
+        'snapshot_date': str(row['snapshot_date'])[:10],
+        'as_of_date': str(row['as_of_date'])[:10] if row.get('as_of_date') else None,
+        'snapshot_source': row.get('snapshot_source'),
+        'quantity': float(row.get('quantity') or 0.0),
+        'amount': float(row.get('amount') or 0.0),
+        'line_count': int(row.get('line_count') or 0),
+        'missing_price_count': int(row.get('missing_price_count') or 0),
+    }
+
+
+def list_inventory_snapshots(conn, company_id, start_month, end_month):
+    """Stored snapshots of `company_id` between two 'YYYY-MM' months, oldest first."""
+    start_year, start_month_number = parse_month(start_month)
+    end_year, end_month_number = parse_month(end_month)
+    rows = conn.execute(text(f"""
+        SELECT period_year, period_month, snapshot_date, as_of_date, snapshot_source,
+               quantity, amount, line_count, missing_price_count, built_at
+        FROM {SNAPSHOTS_TABLE}
+        WHERE company_id = :company_id
+          AND period_year * 100 + period_month BETWEEN :start_key AND :end_key
+        ORDER BY period_year ASC, period_month ASC
+    """), {
+        'company_id': company_id,
+        'start_key': start_year * 100 + start_month_number,
+        'end_key': end_year * 100 + end_month_number,
+    })
+    snapshots = []
+    for row in rows:
+        values = dict(row._mapping)
+        summary = _snapshot_summary(company_id, row.period_year, row.period_month, values)
+        summary['built_at'] = str(row.built_at) if row.built_at else None
+        snapshots.append(summary)
+    return snapshots
+
+
+def list_inventory_snapshot_items(conn, company_id, year, month):
+    rows = conn.execute(text(f"""
+        SELECT product_id, product_name, unit_name, quantity, unit_price, total_value,
+               price_effective_date, price_batch_id
+        FROM {SNAPSHOT_ITEMS_TABLE}
+        WHERE company_id = :company_id AND period_year = :period_year AND period_month = :period_month
+        ORDER BY product_name ASC, product_id ASC
+    """), {'company_id': company_id, 'period_year': int(year), 'period_month': int(month)})
+    return [
+        {
+            'product_id': row.product_id,
+            'product_name': row.product_name,
+            'unit_name': row.unit_name or '',
+            'quantity': float(row.quantity or 0.0),
+            'unit_price': float(row.unit_price) if row.unit_price is not None else None,
+            'total_value': float(row.total_value) if row.total_value is not None else None,
+            'price_effective_date': str(row.price_effective_date)[:10] if row.price_effective_date else None,
+            'price_batch_id': row.price_batch_id,
+            'has_price': row.unit_price is not None,
+        }
+        for row in rows
+    ]
+
+
+def _is_month_aligned(start_date, end_date):
+    start_date = str(start_date)[:10]
+    end_date = str(end_date)[:10]
+    if not start_date.endswith('-01'):
+        return False
+    try:
+        end_year, end_month = parse_month(end_date)
+    except ValueError:
+        return False
+    return end_date == month_end_date(end_year, end_month)
+
+
+def period_inventory_from_snapshots(conn, start_date, end_date, company_id):
+    """
+    Beginning (previous month-end) and ending inventory of a month-aligned period, shaped like
+    `_get_inventory_balance_with_carry`; None unless both month-ends have stored snapshots.
+    """
+    if not company_id or not _is_month_aligned(start_date, end_date) or not inventory_snapshots_available(conn):
+        return None
+    beginning_key = _shift_month(*parse_month(start_date), -1)
+    ending_key = parse_month(end_date)
+    rows = conn.execute(text(f"""
+        SELECT period_year, period_month, quantity, amount
+        FROM {SNAPSHOTS_TABLE}
+        WHERE company_id = :company_id
+          AND period_year * 100 + period_month IN (:beginning_key, :ending_key)
+    """), {
+        'company_id': company_id,
+        'beginning_key': beginning_key[0] * 100 + beginning_key[1],
+        'ending_key': ending_key[0] * 100 + ending_key[1],
+    })
+    by_month = {(int(row.period_year), int(row.period_month)): row for row in rows}
+    beginning = by_month.get(beginning_key)
+    ending = by_month.get(ending_key)
+    if beginning is None or ending is None:
+        return None
+    return {
+        'beginning_inventory_amount': float(beginning.amount or 0.0),
+        'beginning_inventory_qty': float(beginning.quantity or 0.0),
+        'ending_inventory_amount': float(ending.amount or 0.0),
+        'ending_inventory_qty': float(ending.quantity or 0.0),
+    }
@@ -0,0 +1,248 @@
+import calendar
+
+from sqlalchemy import bindparam, text
+
+from backend.db.schema import get_table_columns
+from backend.services.reporting.report_sql_fragments import _split_parent_exclusion_clause
+from backend.services.reporting.report_value_utils import _parse_date, _to_float
+
+# Monthly schedule per rental contract (migration 081): the rent expense each month of the
+# contract recognizes and the linked payments dated in each month, split by the company of the
+# payments. Rows are rebuilt per contract inside the writing transaction (contract and link
+# endpoints, and the transaction writes that change linked payments), so the income statement
+# and balance sheet bridges read range sums instead of aggregating linked transactions per report.
+RENTAL_SCHEDULE_TABLE = 'rental_contract_schedule'
+REFRESH_CHUNK_SIZE = 500
+
+
+def rental_schedule_available(conn):
+    return bool(get_table_columns(conn, RENTAL_SCHEDULE_TABLE))
+
+
+def _normalize_contract_ids(contract_ids):
+    return sorted({str(contract_id).strip() for contract_id in (contract_ids or []) if str(contract_id or '').strip()})
+
+
+def month_key(value):
+    """'YYYY-MM' of a date or ISO string; None when it does not parse."""
+    value = _parse_date(value)
+    return f"{value.year:04d}-{value.month:02d}" if value else None
+
+
+def _contract_months(start, end):
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def is_month_end(value):
+    value = _parse_date(value)
+    return bool(value) and value.day == calendar.monthrange(value.year, value.month)[1]
+
+
+def rental_contract_ids_for(conn, transaction_ids):
+    """
+    Contracts linked to `transaction_ids`, their split children or their split parents;
+    collect before deleting them and after changing them.
+    """
+    transaction_ids = [str(txn_id) for txn_id in (transaction_ids or []) if txn_id]
+    if not transaction_ids or not rental_schedule_available(conn):
+        return set()
+    txn_columns = get_table_columns(conn, 'transactions')
+    if 'rental_contract_id' not in txn_columns:
+        return set()
+    where_sql = "id IN :ids"
+    if 'parent_id' in txn_columns:
+        where_sql = "(id IN :ids OR parent_id IN :ids OR id IN (SELECT parent_id FROM transactions WHERE id IN :ids))"
+    rows = conn.execute(text(f"""
+        SELECT DISTINCT rental_contract_id
+        FROM transactions
+        WHERE {where_sql} AND rental_contract_id IS NOT NULL
+    """).bindparams(bindparam('ids', expanding=True)), {'ids': transaction_ids})
+    return {str(row.rental_contract_id) for row in rows}
+
+
+def _payment_month_expr(conn):
+    if conn.dialect.name == 'sqlite':
+        return "strftime('%Y-%m', tpay.txn_date)"
+    return "DATE_FORMAT(tpay.txn_date, '%Y-%m')"
+
+
+def _build_schedule_rows(contract, payments):
+    """
+    Schedule rows of one contract from its linked payments, {(txn_company_id, month or None): amount}.
+    Each payment company's total is spread evenly over the calendar months the contract spans,
+    like the income statement has always prorated it.
+    """
+    contract_start = _parse_date(contract.start_date)
+    contract_end = _parse_date(contract.end_date) or contract_start
+    if contract_start and contract_end < contract_start:
+        contract_end = contract_start
+    months = _contract_months(contract_start, contract_end) if contract_start else []
+
+    rows = {}
+
+    def row_for(txn_company_id, period_month):
+        return rows.setdefault((txn_company_id, period_month), {
+            'contract_id': str(contract.id),
+            'txn_company_id': txn_company_id,
+            'period_month': period_month,
+            'rent_expense': 0.0,
+            'linked_payments': 0.0,
+            'start_day': 0,
+        })
+
+    linked_totals = {}
+    for (txn_company_id, payment_month), amount in payments.items():
+        linked_totals[txn_company_id] = linked_totals.get(txn_company_id, 0.0) + amount
+        if payment_month and amount:
+            row_for(txn_company_id, payment_month)['linked_payments'] += amount
+
+    for txn_company_id, linked_total in linked_totals.items():
+        if linked_total <= 0 or not months:
+            continue
+        monthly_amount = linked_total / len(months)
+        for year, month in months:
+            row = row_for(txn_company_id, f"{year:04d}-{month:02d}")
+            row['rent_expense'] = monthly_amount
+            # The start month of each contract year only counts once its start day is reached.
+            if month == contract_start.month:
+                row['start_day'] = contract_start.day
+    return list(rows.values())
+
+
+def refresh_rental_schedule(conn, contract_ids):
+    """
+    Rebuild the schedule of `contract_ids` from the contracts and their linked transactions.
+    Call inside the writing transaction; deleted contracts simply lose their rows.
+    """
+    contract_ids = _normalize_contract_ids(contract_ids)
+    if not contract_ids or not rental_schedule_available(conn):
+        return
+    contract_columns = get_table_columns(conn, 'rental_contracts')
+    txn_columns = get_table_columns(conn, 'transactions')
+    can_build = 'rental_contract_id' in txn_columns and 'start_date' in contract_columns
+    end_date_sql = "c.end_date" if 'end_date' in contract_columns else "NULL"
+
+    for start in range(0, len(contract_ids), REFRESH_CHUNK_SIZE):
+        params = {'contract_ids': contract_ids[start:start + REFRESH_CHUNK_SIZE]}
+        conn.execute(text(
+            f"DELETE FROM {RENTAL_SCHEDULE_TABLE} WHERE contract_id IN :contract_ids"
+        ).bindparams(bindparam('contract_ids', expanding=True)), params)
+        if not can_build:
+            continue
+
+        contracts = conn.execute(text(f"""
+            SELECT c.id, c.start_date, {end_date_sql} AS end_date
+            FROM rental_contracts c
+            WHERE c.id IN :contract_ids
+        """).bindparams(bindparam('contract_ids', expanding=True)), params).fetchall()
+        payments_by_contract = {}
+        payment_rows = conn.execute(text(f"""
+            SELECT
+                tpay.rental_contract_id,
+                COALESCE(tpay.company_id, '') AS txn_company_id,
+                {_payment_month_expr(conn)} AS payment_month,
+                COALESCE(SUM(ABS(tpay.amount)), 0) AS amount
+            FROM transactions tpay
+            WHERE tpay.rental_contract_id IN :contract_ids
+              {_split_parent_exclusion_clause(conn, 'tpay')}
+            GROUP BY tpay.rental_contract_id, COALESCE(tpay.company_id, ''), {_payment_month_expr(conn)}
+        """).bindparams(bindparam('contract_ids', expanding=True)), params)
+        for row in payment_rows:
+            payments = payments_by_contract.setdefault(str(row.rental_contract_id), {})
+            payments[(str(row.txn_company_id), row.payment_month)] = _to_float(row.amount, 0.0)
+
+        schedule_rows = []
+        for contract in contracts:
+            schedule_rows.extend(_build_schedule_rows(contract, payments_by_contract.get(str(contract.id), {})))
+        if schedule_rows:
+            conn.execute(text(f"""
+                INSERT INTO {RENTAL_SCHEDULE_TABLE} (
+                    contract_id, txn_company_id, period_month, rent_expense, linked_payments, start_day
+                ) VALUES (
+                    :contract_id, :txn_company_id, :period_month, :rent_expense, :linked_payments, :start_day
+                )
+            """), schedule_rows)
+
+
+# Company reports count a contract's own payments only, as the live linked-total subqueries do.
+_COMPANY_FILTER_SQL = "AND (:company_id IS NULL OR (c.company_id = :company_id AND s.txn_company_id = :company_id))"
+
+
+def scheduled_rent_expense(conn, start_date, end_date, company_id=None):
+    """Contract rent expense recognized between two dates, summed from the schedule months they cover."""
+    value = conn.execute(text(f"""
+        SELECT COALESCE(SUM(s.rent_expense), 0)
+        FROM {RENTAL_SCHEDULE_TABLE} s
+        INNER JOIN rental_contracts c ON c.id = s.contract_id
+        WHERE s.period_month BETWEEN :start_month AND :end_month
+          AND c.start_date <= :report_end
+          AND c.end_date >= :report_start
+          {_COMPANY_FILTER_SQL}
+    """), {
+        'start_month': month_key(start_date),
+        'end_month': month_key(end_date),
+        'report_start': start_date,
+        'report_end': end_date,
+        'company_id': company_id,
+    }).scalar()
+    return _to_float(value, 0.0)
+
+
+def scheduled_cumulative_amortization(conn, as_of_date, company_id=None):
+    """Contract rent expense recognized from each contract's start through `as_of_date`."""
+    as_of = _parse_date(as_of_date)
+    value = conn.execute(text(f"""
+        SELECT COALESCE(SUM(
+            CASE
+                WHEN s.period_month = :as_of_month
+                     AND s.start_day > :as_of_day
+                     AND c.end_date > :as_of_date THEN 0
+                ELSE s.rent_expense
+            END
+        ), 0)
+        FROM {RENTAL_SCHEDULE_TABLE} s
+        INNER JOIN rental_contracts c ON c.id = s.contract_id
+        WHERE s.period_month <= :as_of_month
+          AND c.start_date <= :as_of_date
+          {_COMPANY_FILTER_SQL}
+    """), {
+        'as_of_month': month_key(as_of),
+        'as_of_day': as_of.day,
+        'as_of_date': as_of_date,
+        'company_id': company_id,
+    }).scalar()
+    return _to_float(value, 0.0)
+
+
+def scheduled_linked_payments_sql():
+    """
+    Subquery of linked payments per contract dated up to :as_of_month, shaped like the live
+    linked-total subquery of the rental tax query; only exact for month-end as-of dates.
+    """
+    return f"""
+        SELECT
+            s.contract_id AS rental_contract_id,
+            COALESCE(SUM(s.linked_payments), 0) AS linked_total
+        FROM {RENTAL_SCHEDULE_TABLE} s
+        WHERE s.period_month <= :as_of_month
+          AND (:company_id IS NULL OR s.txn_company_id = :company_id)
+        GROUP BY s.contract_id
+    """
+
+
+def repair_rental_schedule(conn):
+    """Rebuild the schedule of every contract; returns the number of schedule rows."""
+    if not rental_schedule_available(conn):
+        return 0
+    contract_ids = {str(row.id) for row in conn.execute(text("SELECT id FROM rental_contracts"))}
+    contract_ids |= {
+        str(row.contract_id)
+        for row in conn.execute(text(f"SELECT DISTINCT contract_id FROM {RENTAL_SCHEDULE_TABLE}"))
+    }
+    refresh_rental_schedule(conn, contract_ids)
+    return int(conn.execute(text(f"SELECT COUNT(*) FROM {RENTAL_SCHEDULE_TABLE}")).scalar() or 0)
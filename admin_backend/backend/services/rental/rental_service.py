@@ -2,6 +2,8 @@ import uuid
 import datetime
 
 from backend.db.session import get_db_engine
+from backend.services.reporting import data_changes
+from backend.services.reporting.data_changes import record_data_change
 from backend.services.rental.rental_accounting_helpers import (
     get_supported_table_columns,
     resolve_cash_account,
@@ -235,6 +237,7 @@ def create_or_update_prepaid_from_contract(contract_id, company_id, accounting_o
             if update_fields:
                 update_sql = ', '.join(update_fields)
                 conn.execute(build_update_contract_query(update_sql), contract_updates)
+            record_data_change(conn, data_changes.RENTAL, company_id, start_date, end_date)
 
         coa_map = {
             'prepaid': prepaid_coa,
@@ -0,0 +1,192 @@
+import logging
+from datetime import datetime
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.exc import DBAPIError
+
+from backend.services.reporting.report_cache import bump_data_version
+
+logger = logging.getLogger(__name__)
+
+# Entity kinds recorded in data_change_log.entity_kind
+TRANSACTIONS = 'transactions'
+MANUAL_JOURNAL = 'manual_journal'
+SPLIT = 'split'
+MARK = 'mark'
+AMORTIZATION = 'amortization'
+RENTAL = 'rental'
+FISCAL_CORRECTION = 'fiscal_correction'
+INITIAL_CAPITAL = 'initial_capital'
+INVENTORY = 'inventory'
+
+
+def change_date(value):
+    """'YYYY-MM-DD' for dates, datetimes, timestamps and ISO strings."""
+    if value is None:
+        return None
+    if hasattr(value, 'strftime'):
+        return value.strftime('%Y-%m-%d')
+    return str(value)[:10]
+
+
+def record_data_changes(conn, entity_kind, ranges):
+    """
+    Record that `entity_kind` data changed for each (company_id, min_date, max_date) in `ranges`.
+    A None bound is open-ended: (c, '2025-03-01', None) means "from March 2025 onwards".
+    Runs on the caller's connection so the log row commits or rolls back with the write itself,
+    and bumps the report data version for the affected companies.
+    """
+    rows = [
+        {
+            'entity_kind': entity_kind,
+            'company_id': company_id,
+            'min_date': change_date(min_date),
+            'max_date': change_date(max_date),
+            'created_at': datetime.now(),
+        }
+        for company_id, min_date, max_date in ranges
+    ]
+    if not rows:
+        return
+    try:
+        conn.execute(text("""
+            INSERT INTO data_change_log (entity_kind, company_id, min_date, max_date, created_at)
+            VALUES (:entity_kind, :company_id, :min_date, :max_date, :created_at)
+        """), rows)
+    except DBAPIError as exc:
+        # Migration 072 not applied yet; report caches are still invalidated below.
+        logger.warning("Could not record data change for %s: %s", entity_kind, exc)
+    bump_data_version(conn, [row['company_id'] for row in rows])
+
+
+def record_data_change(conn, entity_kind, company_id=None, min_date=None, max_date=None):
+    record_data_changes(conn, entity_kind, [(company_id, min_date, max_date)])
+
+
+def _transaction_ranges(conn, where_sql, params, expanding=()):
+    query = text(f"""
+        SELECT company_id, MIN(txn_date) AS min_date, MAX(txn_date) AS max_date
+        FROM transactions
+        WHERE {where_sql}
+        GROUP BY company_id
+    """)
+    if expanding:
+        query = query.bindparams(*(bindparam(name, expanding=True) for name in expanding))
+    return [(row.company_id, row.min_date, row.max_date) for row in conn.execute(query, params)]
+
+
+def record_transaction_changes(conn, entity_kind, transaction_ids, open_ended=False):
+    """
+    Record the company/date ranges covered by `transaction_ids` and their split children.
+    Call before a delete and after an insert; for updates that move dates or companies call both.
+    `open_ended` marks everything after the range as affected (e.g. amortization schedules).
+    """
+    transaction_ids = [txn_id for txn_id in transaction_ids if txn_id]
+    if not transaction_ids:
+        return
+    ranges = _transaction_ranges(
+        conn,
+        "id IN :ids OR parent_id IN :ids",
+        {'ids': transaction_ids},
+        expanding=('ids',),
+    )
+    if open_ended:
+        ranges = [(company_id, min_date, None) for company_id, min_date, _ in ranges]
+    record_data_changes(conn, entity_kind, ranges)
+
+
+def record_mark_changes(conn, entity_kind, mark_ids):
+    """Record every company/date range whose transactions carry one of `mark_ids`."""
+    mark_ids = [mark_id for mark_id in mark_ids if mark_id]
+    if not mark_ids:
+        return
+    ranges = _transaction_ranges(conn, "mark_id IN :mark_ids", {'mark_ids': mark_ids}, expanding=('mark_ids',))
+    record_data_changes(conn, entity_kind, ranges)
+
+
+def fetch_data_changes(conn, after_id=0, limit=1000, up_to_id=None):
+    """Pending changes in log order; consumers keep the last `id` they processed as their cursor."""
+    params = {'after_id': after_id}
+    upper_sql = ''
+    if up_to_id is not None:
+        upper_sql = 'AND id <= :up_to_id'
+        params['up_to_id'] = up_to_id
+    limit_sql = ''
+    if limit is not None:
+        limit_sql = 'LIMIT :limit'
+        params['limit'] = limit
+    rows = conn.execute(text(f"""
+        SELECT id, entity_kind, company_id, min_date, max_date, created_at
+        FROM data_change_log
+        WHERE id > :after_id {upper_sql}
+        ORDER BY id
+        {limit_sql}
+    """), params)
+    return [
+        {
+            'id': row.id,
+            'entity_kind': row.entity_kind,
+            'company_id': row.company_id,
+            'min_date': change_date(row.min_date),
+            'max_date': change_date(row.max_date),
+            'created_at': row.created_at,
+        }
+        for row in rows
+    ]
+
+
+def summarize_data_changes(changes):
+    """
+    Merge changes into one date range per company; a `None` bound stays open-ended.
+    Returns {company_id: {'min_date', 'max_date', 'entity_kinds', 'last_id'}}.
+    """
+    summary = {}
+    for change in changes:
+        entry = summary.setdefault(change['company_id'], {
+            'min_date': change['min_date'],
+            'max_date': change['max_date'],
+            'entity_kinds': set(),
+            'last_id': change['id'],
+        })
+        if entry['min_date'] is not None:
+            entry['min_date'] = None if change['min_date'] is None else min(entry['min_date'], change['min_date'])
+        if entry['max_date'] is not None:
+            entry['max_date'] = None if change['max_date'] is None else max(entry['max_date'], change['max_date'])
+        entry['entity_kinds'].add(change['entity_kind'])
+        entry['last_id'] = max(entry['last_id'], change['id'])
+    return summary
+
+
+def compact_data_changes(conn, up_to_id):
+    """
+    Collapse rows with id <= `up_to_id` into one row per (company_id, entity_kind).
+    The surviving row keeps the group's highest id, so consumer cursors stay valid.
+    """
+    groups = {}
+    for change in fetch_data_changes(conn, limit=None, up_to_id=up_to_id):
+        groups.setdefault((change['company_id'], change['entity_kind']), []).append(change)
+
+    removed = 0
+    for group in groups.values():
+        if len(group) < 2:
+            continue
+        merged = summarize_data_changes(group)[group[0]['company_id']]
+        keep_id = merged['last_id']
+        conn.execute(text("""
+            UPDATE data_change_log
+            SET min_date = :min_date, max_date = :max_date
+            WHERE id = :id
+        """), {'id': keep_id, 'min_date': merged['min_date'], 'max_date': merged['max_date']})
+        drop_ids = [change['id'] for change in group if change['id'] != keep_id]
+        conn.execute(
+            text("DELETE FROM data_change_log WHERE id IN :ids").bindparams(bindparam('ids', expanding=True)),
+            {'ids': drop_ids},
+        )
+        removed += len(drop_ids)
+    return removed
+
+
+def purge_data_changes(conn, up_to_id):
+    """Drop changes every consumer has processed."""
+    result = conn.execute(text("DELETE FROM data_change_log WHERE id <= :up_to_id"), {'up_to_id': up_to_id})
+    return result.rowcount
@@ -10,7 +10,7 @@ from backend.services.reporting.rental_adjustments import (
     _resolve_rent_expense_account,
 )
 from backend.services.reporting.report_amortization_common import _calculate_dynamic_5314_total
-from backend.services.reporting.report_inventory_common import _get_inventory_balance_with_carry
+from backend.services.reporting.report_inventory_common import _get_period_inventory
 from backend.services.reporting.report_sql_fragments import (
     _coretax_filter_clause,
     _effective_coa_id_expr,
@@ -527,20 +527,21 @@ def _fetch_income_statement_data_internal(conn, start_date, end_date, company_id
     # 2. Handle COGS (HPP) with Manual Inventory Adjustments
     beginning_inv = 0
     ending_inv = 0
+    inventory_source = None
     
-    # We use start_date's year for the inventory balance
-    year = datetime.strptime(start_date, '%Y-%m-%d').year
-    
+    # Month-aligned periods read the month-end inventory snapshots; otherwise start_date's year balance
     try:
-        inv_balance = _get_inventory_balance_with_carry(conn, year, company_id, report_type)
+        inv_balance = _get_period_inventory(conn, start_date, end_date, company_id, report_type)
         beginning_inv = _to_float(inv_balance.get('beginning_inventory_amount'), 0.0)
         ending_inv = _to_float(inv_balance.get('ending_inventory_amount'), 0.0)
+        inventory_source = inv_balance.get('source')
     except Exception as e:
         logger.error(f"Failed to fetch inventory balances: {e}")
 
     # Identify 'Purchases' and 'Other COGS' from expenses.
     # Use robust COGS detection (subcategory normalization + 50xx code fallback).
     cogs_breakdown = _build_cogs_breakdown(expenses, start_date, beginning_inv, ending_inv)
+    cogs_breakdown['inventory_source'] = inventory_source
     calculate_hpp = cogs_breakdown['total_cogs']
 
     # Filter out COGS items and inject dynamic 5314 amount if mapped.
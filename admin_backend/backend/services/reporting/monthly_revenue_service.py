@@ -8,6 +8,8 @@ from backend.services.reporting.report_sql_fragments import (
     _mark_coa_join_clause,
     _split_parent_exclusion_clause,
 )
+from backend.services.reporting.report_value_utils import _year_date_bounds
+
 def fetch_monthly_revenue_data(conn, year, company_id=None, report_type='real'):
     """
     Fetch total revenue grouped by month for a specific year.
@@ -20,7 +22,7 @@ def fetch_monthly_revenue_data(conn, year, company_id=None, report_type='real'):
     effective_mapping_type = _effective_mapping_type_expr(conn, report_type, txn_alias='t', mapping_alias='mcm')
     effective_natural_direction = _effective_natural_direction_expr(conn, report_type, txn_alias='t', mark_alias='m')
     month_expr = "CAST(strftime('%m', t.txn_date) AS INTEGER)" if conn.dialect.name == 'sqlite' else "MONTH(t.txn_date)"
-    year_expr = "CAST(strftime('%Y', t.txn_date) AS INTEGER)" if conn.dialect.name == 'sqlite' else "YEAR(t.txn_date)"
+    company_clause = "AND t.company_id = :company_id" if company_id else ""
     query = text(f"""
         SELECT 
             {month_expr} as month_num,
@@ -55,17 +57,20 @@ def fetch_monthly_revenue_data(conn, year, company_id=None, report_type='real'):
         INNER JOIN marks m ON t.mark_id = m.id
         {mark_coa_join}
         INNER JOIN chart_of_accounts coa ON {effective_coa_id} = coa.id
-        WHERE {year_expr} = :year
+        WHERE t.txn_date >= :year_start
+            AND t.txn_date < :next_year_start
             AND coa.category = 'REVENUE'
-            AND (:company_id IS NULL OR t.company_id = :company_id)
+            {company_clause}
             {split_exclusion_clause}
                 {coretax_clause}
         GROUP BY {month_expr}
         ORDER BY month_num
     """)
     
+    year_start, next_year_start = _year_date_bounds(year)
     result = conn.execute(query, {
-        'year': year,
+        'year_start': year_start,
+        'next_year_start': next_year_start,
         'company_id': company_id
     })
     
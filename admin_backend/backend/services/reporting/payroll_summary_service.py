@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from sqlalchemy import text
 
@@ -11,6 +11,11 @@ from backend.services.reporting.report_value_utils import (
     _to_float,
 )
 from backend.services.reporting.report_payroll_common import _fetch_sagansa_user_map
+from backend.services.transactions.payroll_aggregates import (
+    PAYROLL_AGGREGATES_TABLE,
+    UNNAMED_COMPONENT,
+    payroll_aggregates_available,
+)
 
 
 def _empty_payroll_summary(start_date, end_date, message=None):
@@ -139,6 +144,42 @@ def _finalize_payroll_months(month_groups):
     return months
 
 
+def _aggregate_month_range(start_date, end_date):
+    """('YYYY-MM', 'YYYY-MM') when the period covers whole months, else None."""
+    start_obj = _parse_date(start_date)
+    end_obj = _parse_date(end_date)
+    if not start_obj or not end_obj or end_obj < start_obj or start_obj.day != 1:
+        return None
+    next_day = end_obj + timedelta(days=1)
+    if next_day.day != 1:
+        return None
+    return start_obj.strftime('%Y-%m'), end_obj.strftime('%Y-%m')
+
+
+def _payroll_aggregate_summary_query():
+    """`_payroll_summary_query` served from payroll_aggregates for whole-month periods."""
+    return text(f"""
+        SELECT
+            pa.period_month AS month_key,
+            NULLIF(pa.sagansa_user_id, '') AS sagansa_user_id,
+            COALESCE(m.personal_use, m.internal_report, m.tax_report, '{UNNAMED_COMPONENT}') AS mark_name,
+            SUM(pa.transaction_count) AS transaction_count,
+            COALESCE(SUM(pa.total_amount), 0) AS total_amount
+        FROM {PAYROLL_AGGREGATES_TABLE} pa
+        LEFT JOIN marks m ON m.id = pa.mark_id
+        WHERE pa.report_type = :report_type
+          AND pa.period_month BETWEEN :start_month AND :end_month
+          AND (:company_id IS NULL OR pa.company_id = :company_id)
+        GROUP BY
+            pa.period_month,
+            NULLIF(pa.sagansa_user_id, ''),
+            COALESCE(m.personal_use, m.internal_report, m.tax_report, '{UNNAMED_COMPONENT}')
+        ORDER BY
+            pa.period_month ASC,
+            NULLIF(pa.sagansa_user_id, '') ASC
+    """)
+
+
 def fetch_payroll_salary_summary_data(conn, start_date, end_date, company_id=None, report_type='real'):
     """
     Fetch payroll summary grouped by month -> employee -> salary component(mark).
@@ -161,12 +202,21 @@ def fetch_payroll_salary_summary_data(conn, start_date, end_date, company_id=Non
     total_amount = 0.0
     total_transactions = 0
 
-    rows = conn.execute(_payroll_summary_query(conn, txn_columns, split_exclusion_clause), {
-        'start_date': start_date,
-        'end_date': end_date,
-        'company_id': company_id,
-        'report_type': report_type
-    })
+    month_range = _aggregate_month_range(start_date, end_date)
+    if month_range and payroll_aggregates_available(conn):
+        rows = conn.execute(_payroll_aggregate_summary_query(), {
+            'start_month': month_range[0],
+            'end_month': month_range[1],
+            'company_id': company_id,
+            'report_type': report_type
+        })
+    else:
+        rows = conn.execute(_payroll_summary_query(conn, txn_columns, split_exclusion_clause), {
+            'start_date': start_date,
+            'end_date': end_date,
+            'company_id': company_id,
+            'report_type': report_type
+        })
 
     for row in rows:
         tx_count, amount = _append_payroll_summary_row(month_groups, row, user_map, employee_set)
@@ -1,9 +1,19 @@
+import atexit
+import hashlib
+import io
+import json
+import multiprocessing
 import os
+import tempfile
+import threading
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from copy import deepcopy
 
-from flask import current_app as app
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from backend.metrics import count_cache_lookup
 
 
 class PdfDependencyError(RuntimeError):
@@ -43,60 +53,140 @@ def format_indo_date(date_str):
         return date_str
 
 
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), 'templates')
+TEMPLATE_CACHE_DIR_ENV = 'PDF_TEMPLATE_CACHE_DIR'
+RENDER_WORKERS_ENV = 'PDF_RENDER_WORKERS'
+RENDER_CACHE_SIZE_ENV = 'PDF_RENDER_CACHE_SIZE'
+DEFAULT_RENDER_CACHE_SIZE = 32
+
+_template_env = None
+_render_pool = None
+_render_cache = OrderedDict()
+_render_cache_lock = threading.Lock()
+
+
 def _get_template_env():
-    template_dir = os.path.join(os.path.dirname(__file__), 'templates')
-    return Environment(loader=FileSystemLoader(template_dir))
+    """Shared Jinja environment; compiled templates are also kept in a bytecode cache on disk."""
+    global _template_env
+    if _template_env is None:
+        cache_dir = os.environ.get(TEMPLATE_CACHE_DIR_ENV) or os.path.join(
+            tempfile.gettempdir(), 'bank_converter_pdf_templates'
+        )
+        os.makedirs(cache_dir, exist_ok=True)
+        _template_env = Environment(
+            loader=FileSystemLoader(TEMPLATE_DIR),
+            bytecode_cache=FileSystemBytecodeCache(cache_dir),
+        )
+    return _template_env
 
 
-def _write_pdf(html_content, report_filename):
+def _html_to_pdf_bytes(html_content):
     pisa = _require_pisa()
-    output_dir = app.config.get('UPLOAD_FOLDER', os.path.join(os.getcwd(), 'tmp'))
-    os.makedirs(output_dir, exist_ok=True)
-
-    pdf_path = os.path.join(output_dir, report_filename)
-    with open(pdf_path, "wb") as pdf_file:
-        pisa_status = pisa.CreatePDF(html_content, dest=pdf_file)
+    buffer = io.BytesIO()
+    pisa_status = pisa.CreatePDF(html_content, dest=buffer)
 
     if pisa_status.err:
         raise Exception(f"Failed to generate PDF: {pisa_status.err}")
 
-    return pdf_path
+    return buffer.getvalue()
 
 
-def _merge_pdfs(pdf_paths, report_filename):
+def _merge_pdf_bytes(pdf_chunks):
     PdfReader, PdfWriter = _require_pdf_merge_lib()
-    output_dir = app.config.get('UPLOAD_FOLDER', os.path.join(os.getcwd(), 'tmp'))
-    os.makedirs(output_dir, exist_ok=True)
-
-    merged_pdf_path = os.path.join(output_dir, report_filename)
     writer = PdfWriter()
 
-    for pdf_path in pdf_paths:
-        reader = PdfReader(pdf_path)
+    for chunk in pdf_chunks:
+        reader = PdfReader(io.BytesIO(chunk))
         for page in reader.pages:
             writer.add_page(page)
 
-    with open(merged_pdf_path, "wb") as merged_file:
-        writer.write(merged_file)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
 
-    for pdf_path in pdf_paths:
-        try:
-            os.remove(pdf_path)
-        except OSError:
-            pass
 
-    return merged_pdf_path
+def _render_cache_size():
+    try:
+        return max(0, int(os.environ.get(RENDER_CACHE_SIZE_ENV, DEFAULT_RENDER_CACHE_SIZE)))
+    except ValueError:
+        return DEFAULT_RENDER_CACHE_SIZE
 
 
-def generate_income_statement_pdf(report_data):
-    """
-    Generate a PDF from income statement data using Jinja2 and xhtml2pdf.
-    """
-    # 1. Setup Jinja2 environment
-    env = _get_template_env()
-    template = env.get_template('income_statement.html')
-    
-    # 1.5 Prepare custom format variables
+def _render_cache_key(section, report_data):
+    try:
+        payload = json.dumps(report_data, sort_keys=True, default=str)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(f"{section}:{payload}".encode('utf-8')).hexdigest()
+
+
+def _render_cache_get(key):
+    if key is None:
+        return None
+    with _render_cache_lock:
+        pdf_bytes = _render_cache.get(key)
+        if pdf_bytes is not None:
+            _render_cache.move_to_end(key)
+    count_cache_lookup('pdf_render', pdf_bytes is not None)
+    return pdf_bytes
+
+
+def _render_cache_put(key, pdf_bytes):
+    max_size = _render_cache_size()
+    if key is None or max_size == 0:
+        return
+    with _render_cache_lock:
+        _render_cache[key] = pdf_bytes
+        _render_cache.move_to_end(key)
+        while len(_render_cache) > max_size:
+            _render_cache.popitem(last=False)
+
+
+def clear_render_cache():
+    with _render_cache_lock:
+        _render_cache.clear()
+
+
+def _render_workers():
+    try:
+        return int(os.environ.get(RENDER_WORKERS_ENV, min(3, os.cpu_count() or 1)))
+    except ValueError:
+        return 1
+
+
+def _warm_render_worker():
+    _get_template_env()
+    _require_pisa()
+
+
+def _get_render_pool():
+    """Lazily start the worker pool used to render independent report sections."""
+    global _render_pool
+    workers = _render_workers()
+    if workers <= 1:
+        return None
+    if _render_pool is None:
+        # spawn: the web process holds DB pools and threads that must not be forked.
+        _render_pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_warm_render_worker,
+        )
+    return _render_pool
+
+
+def _shutdown_render_pool():
+    global _render_pool
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=False, cancel_futures=True)
+        _render_pool = None
+
+
+atexit.register(_shutdown_render_pool)
+
+
+def _prepare_income_statement(report_data):
+    # Prepare custom format variables
     end_date_str = report_data.get('period', {}).get('end_date', '')
     report_data['end_date_formatted'] = format_indo_date(end_date_str) if end_date_str else ''
     
@@ -122,22 +212,10 @@ def generate_income_statement_pdf(report_data):
     report_data['total_tax_expenses'] = total_tax_expenses
     report_data['gross_profit'] = gross_profit
     report_data['ebt'] = ebt
+    return report_data
 
-    # 2. Render HTML
-    html_content = template.render(**report_data)
-
-    # 3. Create PDF
-    report_filename = f"income_statement_{report_data['period']['start_date']}.pdf"
-    return _write_pdf(html_content, report_filename)
-
-
-def generate_balance_sheet_pdf(report_data):
-    """
-    Generate a PDF from balance sheet data using Jinja2 and xhtml2pdf.
-    """
-    env = _get_template_env()
-    template = env.get_template('balance_sheet.html')
 
+def _prepare_balance_sheet(report_data):
     as_of_date = report_data.get('as_of_date', '')
     report_data['as_of_date_formatted'] = format_indo_date(as_of_date) if as_of_date else ''
 
@@ -183,10 +261,7 @@ def generate_balance_sheet_pdf(report_data):
             and not item.get('is_child_row')
         )
     ]
-
-    html_content = template.render(**report_data)
-    report_filename = f"balance_sheet_{as_of_date}.pdf"
-    return _write_pdf(html_content, report_filename)
+    return report_data
 
 
 def _group_amortization_items(items):
@@ -234,10 +309,7 @@ def _format_month_year(date_str):
         return str(date_str or '-')
 
 
-def generate_amortization_pdf(report_data):
-    env = _get_template_env()
-    template = env.get_template('amortization.html')
-
+def _prepare_amortization(report_data):
     items = report_data.get('items', [])
     calculated_items = [item for item in items if item.get('asset_id')]
     manual_items = [item for item in items if not item.get('asset_id')]
@@ -331,15 +403,83 @@ def generate_amortization_pdf(report_data):
     report_data['previous_year_label'] = int(report_data.get('year', 0) or 0) - 1
     report_data['current_year_label'] = int(report_data.get('year', 0) or 0)
 
-    html_content = template.render(**report_data)
-    report_filename = f"amortization_{report_data.get('year', '')}.pdf"
-    return _write_pdf(html_content, report_filename)
+    return report_data
 
 
-def generate_coretax_combined_pdf(income_statement_data, balance_sheet_data, amortization_data, report_filename):
-    pdf_paths = [
-        generate_income_statement_pdf(deepcopy(income_statement_data)),
-        generate_balance_sheet_pdf(deepcopy(balance_sheet_data)),
-        generate_amortization_pdf(deepcopy(amortization_data)),
-    ]
-    return _merge_pdfs(pdf_paths, report_filename)
+# section name -> (template, context preparer)
+PDF_SECTIONS = {
+    'income_statement': ('income_statement.html', _prepare_income_statement),
+    'balance_sheet': ('balance_sheet.html', _prepare_balance_sheet),
+    'amortization': ('amortization.html', _prepare_amortization),
+}
+
+
+def render_section_pdf(section, report_data):
+    """Render one report section to PDF bytes. Runs in the web process or in a render worker."""
+    template_name, prepare = PDF_SECTIONS[section]
+    template = _get_template_env().get_template(template_name)
+    html_content = template.render(**prepare(report_data))
+    return _html_to_pdf_bytes(html_content)
+
+
+def _render_sections(sections):
+    """
+    Render `(section, report_data)` pairs to PDF bytes, in order.
+
+    Cached sections are reused; the rest are rendered in the worker pool when
+    more than one is needed, otherwise (or if the pool is unavailable) inline.
+    """
+    keys = [_render_cache_key(section, report_data) for section, report_data in sections]
+    results = [_render_cache_get(key) for key in keys]
+    pending = [index for index, pdf_bytes in enumerate(results) if pdf_bytes is None]
+
+    pool = _get_render_pool() if len(pending) > 1 else None
+    if pool is not None:
+        try:
+            futures = {
+                index: pool.submit(render_section_pdf, *sections[index])
+                for index in pending
+            }
+            for index, future in futures.items():
+                results[index] = future.result()
+        except BrokenProcessPool:
+            _shutdown_render_pool()
+
+    for index in pending:
+        if results[index] is None:
+            section, report_data = sections[index]
+            results[index] = render_section_pdf(section, deepcopy(report_data))
+        _render_cache_put(keys[index], results[index])
+
+    return results
+
+
+def _render_pdf(section, report_data):
+    return io.BytesIO(_render_sections([(section, report_data)])[0])
+
+
+def generate_income_statement_pdf(report_data):
+    """
+    Generate a PDF from income statement data using Jinja2 and xhtml2pdf.
+    """
+    return _render_pdf('income_statement', report_data)
+
+
+def generate_balance_sheet_pdf(report_data):
+    """
+    Generate a PDF from balance sheet data using Jinja2 and xhtml2pdf.
+    """
+    return _render_pdf('balance_sheet', report_data)
+
+
+def generate_amortization_pdf(report_data):
+    return _render_pdf('amortization', report_data)
+
+
+def generate_coretax_combined_pdf(income_statement_data, balance_sheet_data, amortization_data):
+    pdf_chunks = _render_sections([
+        ('income_statement', income_statement_data),
+        ('balance_sheet', balance_sheet_data),
+        ('amortization', amortization_data),
+    ])
+    return io.BytesIO(_merge_pdf_bytes(pdf_chunks))
@@ -3,6 +3,14 @@ import logging
 from sqlalchemy import text
 
 from backend.db.schema import get_table_columns
+from backend.services.rental.rental_schedule import (
+    is_month_end,
+    month_key,
+    rental_schedule_available,
+    scheduled_cumulative_amortization,
+    scheduled_linked_payments_sql,
+    scheduled_rent_expense,
+)
 from backend.services.reporting.report_sql_fragments import (
     _coretax_filter_clause,
     _effective_coa_id_expr,
@@ -51,10 +59,24 @@ def _resolve_contract_bruto_amount(total_amount, linked_total, method, rate):
     return linked_total, rate
 
 
-def _build_rental_contract_tax_query(conn, contract_columns, report_type):
-    split_exclusion_clause = _split_parent_exclusion_clause(conn, 'tpay')
-    coretax_clause = _coretax_filter_clause(conn, report_type, 'm')
+def _build_rental_contract_tax_query(conn, contract_columns, report_type, use_schedule=False):
     columns = _contract_tax_query_columns(contract_columns)
+    if use_schedule:
+        linked_total_sql = scheduled_linked_payments_sql()
+    else:
+        linked_total_sql = f"""
+            SELECT
+                tpay.rental_contract_id,
+                COALESCE(SUM(ABS(tpay.amount)), 0) AS linked_total
+            FROM transactions tpay
+            LEFT JOIN marks m ON tpay.mark_id = m.id
+            WHERE tpay.rental_contract_id IS NOT NULL
+              {_coretax_filter_clause(conn, report_type, 'm')}
+              AND (:company_id IS NULL OR tpay.company_id = :company_id)
+              AND tpay.txn_date <= :as_of_date
+              {_split_parent_exclusion_clause(conn, 'tpay')}
+            GROUP BY tpay.rental_contract_id
+        """
 
     return text(f"""
         SELECT
@@ -67,19 +89,7 @@ def _build_rental_contract_tax_query(conn, contract_columns, report_type):
             {columns['payment_date_sql']} AS pph42_payment_date,
             COALESCE(txn.linked_total, 0) AS linked_total
         FROM rental_contracts c
-        LEFT JOIN (
-            SELECT
-                tpay.rental_contract_id,
-                COALESCE(SUM(ABS(tpay.amount)), 0) AS linked_total
-            FROM transactions tpay
-            LEFT JOIN marks m ON tpay.mark_id = m.id
-            WHERE tpay.rental_contract_id IS NOT NULL
-              {coretax_clause}
-              AND (:company_id IS NULL OR tpay.company_id = :company_id)
-              AND tpay.txn_date <= :as_of_date
-              {split_exclusion_clause}
-            GROUP BY tpay.rental_contract_id
-        ) txn ON txn.rental_contract_id = c.id
+        LEFT JOIN ({linked_total_sql}) txn ON txn.rental_contract_id = c.id
         WHERE c.start_date <= :as_of_date
           AND (:company_id IS NULL OR c.company_id = :company_id)
     """)
@@ -95,9 +105,12 @@ def _fetch_rental_contract_tax_rows(conn, as_of_date, company_id, report_type, r
     if require_deferred_only and 'pph42_payment_timing' not in contract_columns:
         return []
 
-    query = _build_rental_contract_tax_query(conn, contract_columns, report_type)
+    # The schedule keeps linked payments per month, so it only answers month-end dates.
+    use_schedule = rental_schedule_available(conn) and is_month_end(as_of_date)
+    query = _build_rental_contract_tax_query(conn, contract_columns, report_type, use_schedule)
     rows = conn.execute(query, {
         'as_of_date': as_of_date,
+        'as_of_month': month_key(as_of_date),
         'company_id': company_id,
     })
     if not require_deferred_only:
@@ -244,6 +257,8 @@ def _calculate_prorated_contract_rent_expense(conn, start_date, end_date, compan
     report_end = _parse_date(end_date)
     if not report_start or not report_end or report_end < report_start:
         return 0.0
+    if rental_schedule_available(conn):
+        return scheduled_rent_expense(conn, start_date, end_date, company_id)
 
     split_exclusion_clause = _split_parent_exclusion_clause(conn, 'tpay')
     coretax_clause = _coretax_filter_clause(conn, report_type, 'm')
@@ -330,6 +345,8 @@ def _calculate_cumulative_rental_amortization_as_of(conn, as_of_date, company_id
     as_of_date_obj = _parse_date(as_of_date)
     if not as_of_date_obj:
         return 0.0
+    if rental_schedule_available(conn):
+        return scheduled_cumulative_amortization(conn, as_of_date, company_id)
 
     split_exclusion_clause = _split_parent_exclusion_clause(conn, 'tpay')
     coretax_clause = _coretax_filter_clause(conn, report_type, 'm')
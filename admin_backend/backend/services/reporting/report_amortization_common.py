@@ -11,6 +11,7 @@ from backend.services.reporting.report_value_utils import (
     _parse_bool,
     _parse_date,
     _to_float,
+    _year_date_bounds,
 )
 
 
@@ -189,11 +190,6 @@ def _calculate_dynamic_5314_total(conn, start_date, end_date=None, company_id=No
 
     calculated_total = 0.0
     if use_mark_based_amortization:
-        if conn.dialect.name == 'sqlite':
-            txn_year_clause = "CAST(strftime('%Y', t.txn_date) AS INTEGER) <= YEAR(DATE(:start_date, '+3 year'))"
-        else:
-            txn_year_clause = "YEAR(t.txn_date) <= :report_year"
-
         txn_company_clause = "AND t.company_id = :company_id" if company_id else ""
         coretax_clause = _coretax_filter_clause(conn, report_type, 'm')
         mark_coa_join = _mark_coa_join_clause(conn, report_type, mark_ref='t.mark_id', mapping_alias='mcm', join_type='LEFT')
@@ -213,10 +209,10 @@ def _calculate_dynamic_5314_total(conn, start_date, end_date=None, company_id=No
             LEFT JOIN amortization_asset_groups ag ON t.amortization_asset_group_id = ag.id
             WHERE coa.code = '5314'
               {txn_company_clause}
-              AND {txn_year_clause}
+              AND t.txn_date < :next_year_start
               {coretax_clause}
         """)
-        txn_params = {'report_year': report_year}
+        txn_params = {'next_year_start': _year_date_bounds(report_year)[1]}
         if company_id:
             txn_params['company_id'] = company_id
 
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from flask import g, has_request_context, request
+from sqlalchemy import bindparam, text
+from sqlalchemy.exc import DBAPIError
+
+from backend.db.schema import on_schema_version_change
+from backend.db.session import get_db_engine
+from backend.metrics import count_cache_lookup
+
+REPORT_CACHE_SIZE_ENV = 'REPORT_CACHE_SIZE'
+DEFAULT_REPORT_CACHE_SIZE = 64
+
+# Every bump also advances ALL_SCOPE; writes that cannot be pinned to one company advance SHARED_SCOPE.
+ALL_SCOPE = 'all'
+SHARED_SCOPE = 'shared'
+WRITE_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+# Write-method endpoints that never change report inputs. Statement conversion bumps the
+# companies it imports into itself (record_data_changes); its previews write nothing.
+NON_MUTATING_ENDPOINTS = {
+    'company_bp.save_view_filters',
+    'pdf_bp.check_password',
+    'pdf_bp.check_upload_name',
+    'pdf_bp.convert_pdf',
+    'pdf_bp.detect_statement_type',
+    'report_bp.export_report',
+    'report_bp.save_report_settings',
+}
+NON_MUTATING_BLUEPRINTS = {'debug', 'metrics'}
+
+logger = logging.getLogger(__name__)
+
+_report_cache = OrderedDict()
+_report_cache_lock = threading.Lock()
+
+
+def _company_scope(company_id):
+    return f"company:{company_id}"
+
+
+def _bump_scope_query(conn):
+    if conn.dialect.name == 'sqlite':
+        return text("""
+            INSERT INTO report_data_versions (scope, version, updated_at)
+            VALUES (:scope, 1, CURRENT_TIMESTAMP)
+            ON CONFLICT(scope) DO UPDATE SET
+                version = version + 1,
+                updated_at = CURRENT_TIMESTAMP
+        """)
+    return text("""
+        INSERT INTO report_data_versions (scope, version, updated_at)
+        VALUES (:scope, 1, NOW())
+        ON DUPLICATE KEY UPDATE
+            version = version + 1,
+            updated_at = NOW()
+    """)
+
+
+def bump_data_version(conn, company_ids=None):
+    """
+    Invalidate cached reports for `company_ids` (all companies when empty).
+    Call inside the writing transaction so the new version commits with the data.
+    """
+    company_ids = sorted({str(company_id) for company_id in (company_ids or []) if company_id})
+    scopes = [_company_scope(company_id) for company_id in company_ids] or [SHARED_SCOPE]
+    query = _bump_scope_query(conn)
+    try:
+        for scope in [*scopes, ALL_SCOPE]:
+            conn.execute(query, {'scope': scope})
+    except DBAPIError as exc:
+        # Without the table (migration 071 not applied) reports are simply never cached.
+        logger.warning("Could not bump report data version: %s", exc)
+        return
+    if has_request_context():
+        g.report_data_version_bumped = True
+
+
+def report_data_version(conn, company_id=None):
+    """Version token for reports scoped to `company_id`; None disables caching."""
+    scopes = [_company_scope(company_id), SHARED_SCOPE] if company_id else [ALL_SCOPE]
+    try:
+        rows = conn.execute(text("""
+            SELECT scope, version
+            FROM report_data_versions
+            WHERE scope IN :scopes
+        """).bindparams(bindparam('scopes', expanding=True)), {'scopes': scopes})
+        versions = {row.scope: int(row.version) for row in rows}
+    except DBAPIError:
+        return None
+    return '.'.join(str(versions.get(scope, 0)) for scope in scopes)
+
+
+def report_cache_key(kind, params, version):
+    payload = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha256(f"{kind}:{version}:{payload}".encode('utf-8')).hexdigest()[:32]
+
+
+def _report_cache_size():
+    try:
+        return max(0, int(os.environ.get(REPORT_CACHE_SIZE_ENV, DEFAULT_REPORT_CACHE_SIZE)))
+    except ValueError:
+        return DEFAULT_REPORT_CACHE_SIZE
+
+
+def report_cache_get(key):
+    with _report_cache_lock:
+        body = _report_cache.get(key)
+        if body is not None:
+            _report_cache.move_to_end(key)
+    count_cache_lookup('report', body is not None)
+    return body
+
+
+def report_cache_put(key, body):
+    max_size = _report_cache_size()
+    if max_size == 0:
+        return
+    with _report_cache_lock:
+        _report_cache[key] = body
+        _report_cache.move_to_end(key)
+        while len(_report_cache) > max_size:
+            _report_cache.popitem(last=False)
+
+
+@on_schema_version_change
+def clear_report_cache(version=None):
+    with _report_cache_lock:
+        _report_cache.clear()
+
+
+def _request_mutates_report_data(response):
+    return (
+        request.method in WRITE_METHODS
+        and response.status_code < 400
+        and request.endpoint is not None
+        and request.endpoint not in NON_MUTATING_ENDPOINTS
+        and request.blueprint not in NON_MUTATING_BLUEPRINTS
+    )
+
+
+def register_report_invalidation(app):
+    """
+    Bump the shared data version after any successful write request that did not bump it itself,
+    so edits made through routes without an explicit `bump_data_version` call never leave stale reports.
+    """
+
+    @app.after_request
+    def invalidate_reports_after_write(response):
+        if g.pop('report_data_version_bumped', False) or not _request_mutates_report_data(response):
+            return response
+        engine, _ = get_db_engine()
+        if engine is not None:
+            try:
+                with engine.begin() as conn:
+                    bump_data_version(conn)
+            except Exception as exc:
+                logger.warning("Could not invalidate report cache after %s: %s", request.endpoint, exc)
+        return response
@@ -1,5 +1,6 @@
 from sqlalchemy import text
 
+from backend.services.inventory.inventory_snapshots import period_inventory_from_snapshots
 from backend.services.reporting.report_value_utils import _to_float
 
 
@@ -42,3 +43,26 @@ def _get_inventory_balance_with_carry(conn, year, company_id=None, report_type='
         'ending_inventory_amount': ending_amount,
         'ending_inventory_qty': ending_qty,
     }
+
+
+def _is_calendar_year(start_date, end_date):
+    start_date = str(start_date)[:10]
+    end_date = str(end_date)[:10]
+    return start_date[:4] == end_date[:4] and start_date[5:] == '01-01' and end_date[5:] == '12-31'
+
+
+def _get_period_inventory(conn, start_date, end_date, company_id=None, report_type='real'):
+    """
+    Beginning/ending inventory of the period plus the `source` it came from. Month-aligned
+    periods use the stored month-end snapshots; calendar years keep the saved year balance and
+    only fall back to snapshots when none was saved.
+    """
+    snapshot_balance = period_inventory_from_snapshots(conn, start_date, end_date, company_id)
+    if snapshot_balance is not None and not _is_calendar_year(start_date, end_date):
+        return {**snapshot_balance, 'source': 'inventory_snapshots'}
+
+    year = int(str(start_date)[:4])
+    balance = _get_inventory_balance_with_carry(conn, year, company_id, report_type)
+    if snapshot_balance is not None and not any(abs(value) >= 0.000001 for value in balance.values()):
+        return {**snapshot_balance, 'source': 'inventory_snapshots'}
+    return {**balance, 'source': 'inventory_balances'}
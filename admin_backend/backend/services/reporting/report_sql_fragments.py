@@ -1,5 +1,6 @@
 from sqlalchemy import text
 from backend.db.schema import get_table_columns
+from backend.services.transactions.split_flags import HAS_MARKED_CHILDREN, IS_SPLIT_CONTAINER
 
 
 def _trimmed_text_expr(conn, expr):
@@ -19,6 +20,8 @@ def _split_parent_exclusion_clause(conn, alias='t'):
     Logic:
     - Exclude parent if there exists at least one child with a mark_id
     - This ensures child transactions (the actual split entries) are counted, not the parent
+    - Uses the denormalized flags from migration 073 when present, falling back to
+      a correlated NOT EXISTS on older schemas
 
     Args:
         conn: Database connection
@@ -32,7 +35,11 @@ def _split_parent_exclusion_clause(conn, alias='t'):
         return ''
     if 'mark_id' not in txn_columns:
         # If mark_id doesn't exist, exclude all children to avoid double-counting
+        if IS_SPLIT_CONTAINER in txn_columns:
+            return f" AND {alias}.{IS_SPLIT_CONTAINER} = 0"
         return f" AND NOT EXISTS (SELECT 1 FROM transactions t_child WHERE t_child.parent_id = {alias}.id)"
+    if HAS_MARKED_CHILDREN in txn_columns:
+        return f" AND {alias}.{HAS_MARKED_CHILDREN} = 0"
 
     if conn.dialect.name == 'sqlite':
         mark_expr = "NULLIF(TRIM(COALESCE(CAST(t_child.mark_id AS TEXT), '')), '')"
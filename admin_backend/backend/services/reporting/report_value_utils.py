@@ -27,6 +27,12 @@ def _parse_date(value):
     return None
 
 
+def _year_date_bounds(year):
+    """Half-open `[year_start, next_year_start)` dates so year filters stay index-friendly."""
+    year = int(year)
+    return f"{year:04d}-01-01", f"{year + 1:04d}-01-01"
+
+
 def _to_float(value, default=0.0):
     try:
         return float(value)
@@ -0,0 +1,665 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import bindparam, text
+
+from backend.db.schema import get_table_columns
+from backend.errors import ApiError, BadRequestError
+from backend.services.rental.rental_schedule import refresh_rental_schedule, rental_contract_ids_for
+from backend.services.reporting import data_changes
+from backend.services.reporting.data_changes import record_transaction_changes
+from backend.services.transactions.import_batches import (
+    batch_keys_for,
+    refresh_import_batches,
+    refresh_import_batches_for,
+)
+from backend.services.transactions.mark_stats import (
+    mark_years_for,
+    refresh_mark_stats_for,
+    refresh_mark_years,
+    used_mark_ids,
+)
+from backend.services.transactions.payroll_aggregates import refresh_payroll_aggregates, salary_mark_ids_for
+from backend.services.transactions.split_flags import refresh_split_flags, refresh_split_flags_for, split_parent_ids
+from backend.services.transactions.transaction_search import refresh_search_index
+
+logger = logging.getLogger(__name__)
+
+# Bulk mark/company/delete over arbitrarily large selections. The selection is staged in a
+# per-connection temporary table and processed in keyset-ordered chunks, each in its own
+# short transaction, so no statement ever carries the whole ID list.
+BULK_CHUNK_SIZE_ENV = 'BULK_CHUNK_SIZE'
+BULK_ASYNC_THRESHOLD_ENV = 'BULK_ASYNC_THRESHOLD'
+BULK_JOB_STALE_SECONDS_ENV = 'BULK_JOB_STALE_SECONDS'
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_ASYNC_THRESHOLD = 5000
+# A pending/running job whose heartbeat (migration 083) is older than this lost its worker.
+DEFAULT_JOB_STALE_SECONDS = 900
+# Skipped IDs kept per reason in a result; the counts stay exact beyond this.
+SKIPPED_ID_LIMIT = 1000
+
+MARK = 'mark'
+COMPANY = 'company'
+DELETE = 'delete'
+OPERATIONS = (MARK, COMPANY, DELETE)
+
+SKIP_LINKED_TO_MANUAL = 'linked_to_manual_journal'
+SKIP_SPLIT_PARENT = 'split_parent'
+
+SELECTION_TABLE = 'bulk_selection'
+BULK_JOBS_TABLE = 'bulk_jobs'
+ACTIVE_JOB_STATUSES = ('pending', 'running')
+STALE_JOB_ERROR = 'Bulk job stopped reporting progress; its worker was restarted or died'
+
+
+class PartialBulkOperationError(ApiError):
+    """A chunk failed after earlier chunks committed; the payload says how much was applied."""
+
+    def __init__(self, result, error):
+        super().__init__(
+            f"Bulk {result['operation']} stopped after {result['processed_count']} of "
+            f"{result['total_count']} transactions: {error}",
+            status_code=500,
+            code='bulk_operation_partial',
+            payload={
+                'partial': True,
+                'operation': result['operation'],
+                'total_count': result['total_count'],
+                'processed_count': result['processed_count'],
+                'updated_count': result['updated_count'],
+                'skipped_counts': result['skipped_counts'],
+                'chunks': result['chunks'],
+            },
+        )
+        self.result = result
+
+# filter key -> (SQL predicate on transactions t, whether it takes a parameter)
+_FILTERS = {
+    'source_file': ("t.source_file = :source_file", True),
+    'bank_code': ("t.bank_code = :bank_code", True),
+    'bank_account_number': ("t.bank_account_number = :bank_account_number", True),
+    'company_id': ("t.company_id = :company_id", True),
+    'mark_id': ("t.mark_id = :mark_id", True),
+    'db_cr': ("t.db_cr = :db_cr", True),
+    'start_date': ("t.txn_date >= :start_date", True),
+    'end_date': ("t.txn_date <= :end_date", True),
+    'unmarked': ("(t.mark_id IS NULL OR t.mark_id = '')", False),
+}
+
+
+def _env_int(name, default):
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+def bulk_chunk_size():
+    return _env_int(BULK_CHUNK_SIZE_ENV, DEFAULT_CHUNK_SIZE)
+
+
+def bulk_async_threshold():
+    return _env_int(BULK_ASYNC_THRESHOLD_ENV, DEFAULT_ASYNC_THRESHOLD)
+
+
+def bulk_job_stale_seconds():
+    return _env_int(BULK_JOB_STALE_SECONDS_ENV, DEFAULT_JOB_STALE_SECONDS)
+
+
+def parse_bulk_filters(raw_filters):
+    """Validate a filter selection such as {"bank_code": "BCA", "unmarked": true, "start_date": ...}."""
+    if not isinstance(raw_filters, dict):
+        raise BadRequestError('filter must be an object')
+    unknown = sorted(set(raw_filters) - set(_FILTERS))
+    if unknown:
+        raise BadRequestError(f"Unsupported filter field(s): {', '.join(unknown)}")
+    filters = {}
+    for key, value in raw_filters.items():
+        if _FILTERS[key][1]:
+            value = str(value).strip() if value is not None else ''
+            if value:
+                filters[key] = value
+        elif value:
+            filters[key] = True
+    if not filters:
+        raise BadRequestError('filter must contain at least one criterion')
+    return filters
+
+
+def _filter_sql(conn, filters):
+    txn_columns = get_table_columns(conn, 'transactions')
+    clauses = []
+    params = {}
+    for key, value in filters.items():
+        column = 'mark_id' if key == 'unmarked' else key
+        if column in ('start_date', 'end_date'):
+            column = 'txn_date'
+        if column not in txn_columns:
+            raise BadRequestError(f'Filter {key} is not available: transactions.{column} is missing')
+        predicate, takes_param = _FILTERS[key]
+        clauses.append(predicate)
+        if takes_param:
+            params[key] = value
+    return ' AND '.join(clauses), params
+
+
+def _unique_ids(transaction_ids):
+    seen = set()
+    ordered = []
+    for txn_id in transaction_ids or []:
+        txn_id = str(txn_id).strip() if txn_id is not None else ''
+        if txn_id and txn_id not in seen:
+            seen.add(txn_id)
+            ordered.append(txn_id)
+    return ordered
+
+
+def bulk_selection_size(conn, transaction_ids=None, filters=None):
+    if filters:
+        where_sql, params = _filter_sql(conn, filters)
+        return int(conn.execute(text(f"SELECT COUNT(*) FROM transactions t WHERE {where_sql}"), params).scalar() or 0)
+    return len(_unique_ids(transaction_ids))
+
+
+# --- staging -----------------------------------------------------------------------------------
+
+def _create_selection(conn):
+    _drop_selection(conn)
+    conn.execute(text(f"""
+        CREATE TEMPORARY TABLE {SELECTION_TABLE} (
+            transaction_id VARCHAR(64) NOT NULL PRIMARY KEY,
+            skip_reason VARCHAR(40) NULL
+        )
+    """))
+
+
+def _drop_selection(conn):
+    if conn.dialect.name == 'sqlite':
+        conn.execute(text(f"DROP TABLE IF EXISTS temp.{SELECTION_TABLE}"))
+    else:
+        conn.execute(text(f"DROP TEMPORARY TABLE IF EXISTS {SELECTION_TABLE}"))
+
+
+def _stage_selection(conn, transaction_ids, filters, chunk_size):
+    if filters:
+        where_sql, params = _filter_sql(conn, filters)
+        conn.execute(text(f"""
+            INSERT INTO {SELECTION_TABLE} (transaction_id)
+            SELECT t.id FROM transactions t WHERE {where_sql}
+        """), params)
+    else:
+        ids = _unique_ids(transaction_ids)
+        for start in range(0, len(ids), chunk_size):
+            conn.execute(
+                text(f"INSERT INTO {SELECTION_TABLE} (transaction_id) VALUES (:transaction_id)"),
+                [{'transaction_id': txn_id} for txn_id in ids[start:start + chunk_size]],
+            )
+    return int(conn.execute(text(f"SELECT COUNT(*) FROM {SELECTION_TABLE}")).scalar() or 0)
+
+
+_CHUNK_RANGE_SQL = f"{SELECTION_TABLE}.transaction_id > :after AND {SELECTION_TABLE}.transaction_id <= :upto"
+
+
+def _next_chunk(conn, after, chunk_size):
+    rows = conn.execute(text(f"""
+        SELECT transaction_id
+        FROM {SELECTION_TABLE}
+        WHERE transaction_id > :after
+        ORDER BY transaction_id
+        LIMIT :limit
+    """), {'after': after, 'limit': chunk_size}).fetchall()
+    return [str(row.transaction_id) for row in rows]
+
+
+def _skip_where(conn, reason, exists_sql, bounds):
+    conn.execute(text(f"""
+        UPDATE {SELECTION_TABLE}
+        SET skip_reason = :reason
+        WHERE {_CHUNK_RANGE_SQL}
+          AND skip_reason IS NULL
+          AND EXISTS ({exists_sql})
+    """), {**bounds, 'reason': reason})
+
+
+def _chunk_ids(conn, bounds, skipped=False):
+    condition = 'IS NOT NULL' if skipped else 'IS NULL'
+    rows = conn.execute(text(f"""
+        SELECT transaction_id, skip_reason
+        FROM {SELECTION_TABLE}
+        WHERE {_CHUNK_RANGE_SQL} AND skip_reason {condition}
+        ORDER BY transaction_id
+    """), bounds).fetchall()
+    return [(str(row.transaction_id), row.skip_reason) for row in rows]
+
+
+def _update_selected(conn, set_fields, params, bounds):
+    """UPDATE the chunk's unskipped transactions as a join against the staged selection."""
+    if conn.dialect.name == 'sqlite':
+        sql = f"""
+            UPDATE transactions
+            SET {', '.join(set_fields)}
+            WHERE id IN (
+                SELECT transaction_id FROM {SELECTION_TABLE}
+                WHERE {_CHUNK_RANGE_SQL} AND skip_reason IS NULL
+            )
+        """
+    else:
+        sql = f"""
+            UPDATE transactions t
+            JOIN {SELECTION_TABLE} ON {SELECTION_TABLE}.transaction_id = t.id
+            SET {', '.join(f't.{field}' for field in set_fields)}
+            WHERE {_CHUNK_RANGE_SQL} AND {SELECTION_TABLE}.skip_reason IS NULL
+        """
+    return int(conn.execute(text(sql), {**params, **bounds}).rowcount or 0)
+
+
+# --- operations --------------------------------------------------------------------------------
+
+def _mark_chunk(conn, bounds, options, now, pending):
+    txn_columns = get_table_columns(conn, 'transactions')
+    mark_id = options.get('mark_id')
+    if get_table_columns(conn, 'manual_journal_links'):
+        _skip_where(conn, SKIP_LINKED_TO_MANUAL, f"""
+            SELECT 1 FROM manual_journal_links l
+            WHERE l.linked_txn_id = {SELECTION_TABLE}.transaction_id
+        """, bounds)
+    if mark_id and 'parent_id' in txn_columns:
+        _skip_where(conn, SKIP_SPLIT_PARENT, f"""
+            SELECT 1 FROM transactions c
+            WHERE c.parent_id = {SELECTION_TABLE}.transaction_id
+        """, bounds)
+
+    set_fields = ["mark_id = :mark_id"]
+    if 'updated_at' in txn_columns:
+        set_fields.append("updated_at = :updated_at")
+    updated_ids = [txn_id for txn_id, _ in _chunk_ids(conn, bounds)]
+    previous_mark_years = mark_years_for(conn, updated_ids)
+    _update_selected(conn, set_fields, {'mark_id': mark_id, 'updated_at': now}, bounds)
+    refresh_split_flags_for(conn, updated_ids)
+    refresh_search_index(conn, updated_ids)
+    refresh_payroll_aggregates(conn, refresh_mark_stats_for(conn, updated_ids, previous_mark_years))
+    refresh_rental_schedule(conn, rental_contract_ids_for(conn, updated_ids))
+    record_transaction_changes(conn, data_changes.TRANSACTIONS, updated_ids)
+    return len(updated_ids)
+
+
+def _split_families(conn, ids):
+    """`ids` plus their split parents and every sibling, so a family always shares one company."""
+    rows = conn.execute(
+        text("SELECT id, parent_id FROM transactions WHERE id IN :ids").bindparams(bindparam('ids', expanding=True)),
+        {'ids': ids},
+    ).fetchall()
+    family_ids = set(ids)
+    root_ids = {str(row.parent_id) if row.parent_id else str(row.id) for row in rows}
+    if root_ids:
+        children = conn.execute(
+            text("SELECT id FROM transactions WHERE parent_id IN :parent_ids")
+            .bindparams(bindparam('parent_ids', expanding=True)),
+            {'parent_ids': sorted(root_ids)},
+        ).fetchall()
+        family_ids.update(root_ids)
+        family_ids.update(str(row.id) for row in children)
+    return sorted(family_ids)
+
+
+def _company_chunk(conn, bounds, options, now, pending):
+    txn_columns = get_table_columns(conn, 'transactions')
+    ids = [txn_id for txn_id, _ in _chunk_ids(conn, bounds)]
+    if 'parent_id' in txn_columns:
+        ids = _split_families(conn, ids)
+    set_fields = ["company_id = :company_id"]
+    if 'updated_at' in txn_columns:
+        set_fields.append("updated_at = :updated_at")
+    record_transaction_changes(conn, data_changes.TRANSACTIONS, ids)
+    conn.execute(text(f"""
+        UPDATE transactions
+        SET {', '.join(set_fields)}
+        WHERE id IN :ids
+    """).bindparams(bindparam('ids', expanding=True)), {
+        'ids': ids,
+        'company_id': options.get('company_id'),
+        'updated_at': now,
+    })
+    refresh_import_batches_for(conn, ids)
+    refresh_payroll_aggregates(conn, salary_mark_ids_for(conn, ids))
+    refresh_rental_schedule(conn, rental_contract_ids_for(conn, ids))
+    record_transaction_changes(conn, data_changes.TRANSACTIONS, ids)
+    return len(ids)
+
+
+def delete_orphan_marks(conn, mark_ids):
+    """
+    Delete marks (and their COA mappings) no longer referenced by any transaction. Usage is read from
+    mark_stats when present, so refresh the marks' stats for the write first.
+    """
+    normalized_ids = sorted({str(mark_id).strip() for mark_id in (mark_ids or []) if str(mark_id or '').strip()})
+    if not normalized_ids:
+        return
+
+    still_used = used_mark_ids(conn, normalized_ids)
+    marks_to_delete = [mark_id for mark_id in normalized_ids if mark_id not in still_used]
+    if not marks_to_delete:
+        return
+
+    conn.execute(
+        text("DELETE FROM mark_coa_mapping WHERE mark_id IN :mids")
+        .bindparams(bindparam('mids', expanding=True)),
+        {'mids': marks_to_delete}
+    )
+    conn.execute(
+        text("DELETE FROM marks WHERE id IN :mids")
+        .bindparams(bindparam('mids', expanding=True)),
+        {'mids': marks_to_delete}
+    )
+
+
+def _delete_chunk(conn, bounds, options, now, pending):
+    txn_columns = get_table_columns(conn, 'transactions')
+    ids = [txn_id for txn_id, _ in _chunk_ids(conn, bounds)]
+    record_transaction_changes(conn, data_changes.TRANSACTIONS, ids)
+    parent_ids = split_parent_ids(conn, ids) if 'parent_id' in txn_columns else set()
+    pending.setdefault('batch_keys', set()).update(batch_keys_for(conn, ids))
+    contract_ids = rental_contract_ids_for(conn, ids)
+
+    mark_select = ', t.mark_id' if 'mark_id' in txn_columns else ', NULL AS mark_id'
+    rows = conn.execute(text(f"""
+        SELECT t.id{mark_select}
+        FROM transactions t
+        JOIN {SELECTION_TABLE} ON {SELECTION_TABLE}.transaction_id = t.id
+        WHERE {_CHUNK_RANGE_SQL}
+    """), bounds).fetchall()
+    child_rows = []
+    if 'parent_id' in txn_columns:
+        child_rows = conn.execute(text(f"""
+            SELECT t.id{mark_select}
+            FROM transactions t
+            JOIN {SELECTION_TABLE} ON {SELECTION_TABLE}.transaction_id = t.parent_id
+            WHERE {_CHUNK_RANGE_SQL}
+        """), bounds).fetchall()
+    child_ids = sorted({str(row.id) for row in child_rows} - set(ids))
+    mark_ids = {row.mark_id for row in list(rows) + list(child_rows) if row.mark_id}
+    # Includes the marks of surviving split parents, which may fall back into the reports once
+    # their marked children are gone.
+    mark_years = mark_years_for(conn, ids)
+
+    link_columns = get_table_columns(conn, 'manual_journal_links')
+    if link_columns:
+        link_fields = [field for field in ('manual_txn_id', 'linked_txn_id', 'child_txn_id') if field in link_columns]
+        conn.execute(
+            text(f"DELETE FROM manual_journal_links WHERE {' OR '.join(f'{field} IN :ids' for field in link_fields)}")
+            .bindparams(bindparam('ids', expanding=True)),
+            {'ids': ids + child_ids},
+        )
+
+    # Children first to satisfy fk_transactions_parent_id.
+    deleted = 0
+    if child_ids:
+        deleted += int(conn.execute(
+            text("DELETE FROM transactions WHERE id IN :ids").bindparams(bindparam('ids', expanding=True)),
+            {'ids': child_ids},
+        ).rowcount or 0)
+    deleted += int(conn.execute(
+        text("DELETE FROM transactions WHERE id IN :ids").bindparams(bindparam('ids', expanding=True)),
+        {'ids': ids},
+    ).rowcount or 0)
+
+    refresh_split_flags(conn, parent_ids)
+    refresh_search_index(conn, ids + child_ids)
+    refresh_rental_schedule(conn, contract_ids)
+    refresh_payroll_aggregates(conn, refresh_mark_years(conn, mark_years))
+    if options.get('delete_orphan_marks'):
+        delete_orphan_marks(conn, mark_ids)
+    return deleted
+
+
+def _finish_delete(conn, pending):
+    # A source file usually spans many chunks; its batch rows are recounted once per operation.
+    refresh_import_batches(conn, pending.get('batch_keys'))
+
+
+_CHUNK_HANDLERS = {
+    MARK: _mark_chunk,
+    COMPANY: _company_chunk,
+    DELETE: _delete_chunk,
+}
+
+# Work deferred by the chunk handlers into `pending`, run after the last committed chunk.
+_FINISH_HANDLERS = {
+    DELETE: _finish_delete,
+}
+
+
+def _new_result(operation, total_count):
+    return {
+        'operation': operation,
+        'total_count': total_count,
+        'processed_count': 0,
+        'updated_count': 0,
+        'skipped': {},
+        'skipped_counts': {},
+        'chunks': [],
+    }
+
+
+def _finish(conn, operation, pending):
+    finisher = _FINISH_HANDLERS.get(operation)
+    if finisher and pending:
+        with conn.begin():
+            finisher(conn, pending)
+    pending.clear()
+
+
+def _execute(conn, operation, transaction_ids, filters, options, on_progress=None):
+    """
+    Stage, then process chunk by chunk. `conn` must not be inside a transaction.
+    Each chunk commits on its own, so a failure after the first chunk raises
+    PartialBulkOperationError carrying the committed progress. Work the chunks
+    defer runs once after the last committed chunk, on failure too.
+    """
+    handler = _CHUNK_HANDLERS[operation]
+    chunk_size = bulk_chunk_size()
+    result = None
+    pending = {}
+    try:
+        with conn.begin():
+            _create_selection(conn)
+            result = _new_result(operation, _stage_selection(conn, transaction_ids, filters, chunk_size))
+            if on_progress:
+                on_progress(result)
+
+        after = ''
+        while True:
+            started = time.perf_counter()
+            with conn.begin():
+                ids = _next_chunk(conn, after, chunk_size)
+                if not ids:
+                    break
+                bounds = {'after': after, 'upto': ids[-1]}
+                updated = handler(conn, bounds, options, datetime.now(), pending)
+                skipped_rows = _chunk_ids(conn, bounds, skipped=True)
+                result['processed_count'] += len(ids)
+                result['updated_count'] += updated
+                for txn_id, reason in skipped_rows:
+                    result['skipped_counts'][reason] = result['skipped_counts'].get(reason, 0) + 1
+                    reason_ids = result['skipped'].setdefault(reason, [])
+                    if len(reason_ids) < SKIPPED_ID_LIMIT:
+                        reason_ids.append(txn_id)
+                result['chunks'].append({
+                    'chunk': len(result['chunks']) + 1,
+                    'size': len(ids),
+                    'updated': updated,
+                    'skipped': len(skipped_rows),
+                    'duration_ms': round((time.perf_counter() - started) * 1000, 1),
+                })
+                if on_progress:
+                    on_progress(result)
+            after = ids[-1]
+        _finish(conn, operation, pending)
+        return result
+    except Exception as exc:
+        if conn.in_transaction():
+            conn.rollback()
+        if pending:
+            try:
+                _finish(conn, operation, pending)
+            except Exception:
+                logger.exception('Deferred refresh after failed bulk %s failed', operation)
+        if result is not None and result['processed_count'] and not isinstance(exc, PartialBulkOperationError):
+            raise PartialBulkOperationError(result, exc) from exc
+        raise
+    finally:
+        if conn.in_transaction():
+            conn.rollback()
+        with conn.begin():
+            _drop_selection(conn)
+
+
+def run_bulk_operation(engine, operation, transaction_ids=None, filters=None, **options):
+    """Run a bulk operation in the caller's thread; returns the result with per-chunk timings."""
+    if operation not in OPERATIONS:
+        raise ValueError(f'Unknown bulk operation: {operation}')
+    with engine.connect() as conn:
+        return _execute(conn, operation, transaction_ids, filters, options)
+
+
+# --- asynchronous jobs -------------------------------------------------------------------------
+
+def bulk_jobs_available(conn):
+    return bool(get_table_columns(conn, BULK_JOBS_TABLE))
+
+
+def should_run_async(conn, selection_size, requested=None):
+    """Large selections (or an explicit request) run as a background job when migration 075 is in."""
+    if requested is False or not bulk_jobs_available(conn):
+        return False
+    return bool(requested) or selection_size > bulk_async_threshold()
+
+
+def _save_job(conn, job_id, status=None, result=None, error=None, finished=False):
+    fields = []
+    params = {'id': job_id}
+    if 'heartbeat_at' in get_table_columns(conn, BULK_JOBS_TABLE):
+        fields.append("heartbeat_at = :now")
+    if status:
+        fields.append("status = :status")
+        params['status'] = status
+        if status == 'running':
+            fields.append("started_at = :now")
+    if result is not None:
+        fields.extend([
+            "total_count = :total_count",
+            "processed_count = :processed_count",
+            "updated_count = :updated_count",
+            "result_json = :result_json",
+        ])
+        params.update({
+            'total_count': result['total_count'],
+            'processed_count': result['processed_count'],
+            'updated_count': result['updated_count'],
+            'result_json': json.dumps(
+                {key: result[key] for key in ('skipped', 'skipped_counts', 'chunks')},
+                separators=(',', ':'),
+            ),
+        })
+    if error is not None:
+        fields.append("error = :error")
+        params['error'] = str(error)[:2000]
+    if finished:
+        fields.append("finished_at = :now")
+    params['now'] = datetime.now()
+    conn.execute(text(f"UPDATE {BULK_JOBS_TABLE} SET {', '.join(fields)} WHERE id = :id"), params)
+
+
+def _spawn(target, *args):
+    thread = threading.Thread(target=target, args=args, name='bulk-operation', daemon=True)
+    thread.start()
+    return thread
+
+
+def _run_job(engine, job_id, operation, transaction_ids, filters, options):
+    with engine.connect() as conn:
+        try:
+            with conn.begin():
+                _save_job(conn, job_id, status='running')
+            result = _execute(
+                conn, operation, transaction_ids, filters, options,
+                on_progress=lambda progress: _save_job(conn, job_id, result=progress),
+            )
+            with conn.begin():
+                _save_job(conn, job_id, status='completed', result=result, finished=True)
+        except Exception as exc:
+            logger.exception('Bulk %s job %s failed', operation, job_id)
+            if conn.in_transaction():
+                conn.rollback()
+            with conn.begin():
+                _save_job(conn, job_id, status='failed', error=exc, finished=True)
+
+
+def start_bulk_job(engine, operation, transaction_ids=None, filters=None, total_count=0, **options):
+    """Queue a bulk operation on a background thread; poll `get_bulk_job` for progress."""
+    if operation not in OPERATIONS:
+        raise ValueError(f'Unknown bulk operation: {operation}')
+    job_id = str(uuid.uuid4())
+    with engine.begin() as conn:
+        conn.execute(text(f"""
+            INSERT INTO {BULK_JOBS_TABLE} (id, operation, status, total_count, created_at)
+            VALUES (:id, :operation, 'pending', :total_count, :created_at)
+        """), {'id': job_id, 'operation': operation, 'total_count': total_count, 'created_at': datetime.now()})
+    _spawn(_run_job, engine, job_id, operation, _unique_ids(transaction_ids), filters, options)
+    return {'job_id': job_id, 'operation': operation, 'status': 'pending', 'total_count': total_count}
+
+
+def expire_stale_bulk_jobs(conn):
+    """
+    Fail pending/running jobs whose heartbeat is older than BULK_JOB_STALE_SECONDS: their
+    daemon thread died with its process. Needs migration 083; returns the number of jobs failed.
+    """
+    if 'heartbeat_at' not in get_table_columns(conn, BULK_JOBS_TABLE):
+        return 0
+    now = datetime.now()
+    result = conn.execute(text(f"""
+        UPDATE {BULK_JOBS_TABLE}
+        SET status = 'failed', error = :error, finished_at = :now
+        WHERE status IN :statuses
+          AND COALESCE(heartbeat_at, started_at, created_at) < :cutoff
+    """).bindparams(bindparam('statuses', expanding=True)), {
+        'error': STALE_JOB_ERROR,
+        'now': now,
+        'statuses': list(ACTIVE_JOB_STATUSES),
+        'cutoff': now - timedelta(seconds=bulk_job_stale_seconds()),
+    })
+    return int(result.rowcount or 0)
+
+
+def get_bulk_job(conn, job_id):
+    """Job status and progress; call inside a transaction, since orphaned jobs are failed first."""
+    expire_stale_bulk_jobs(conn)
+    row = conn.execute(text(f"""
+        SELECT id, operation, status, total_count, processed_count, updated_count,
+               result_json, error, created_at, started_at, finished_at
+        FROM {BULK_JOBS_TABLE}
+        WHERE id = :id
+    """), {'id': job_id}).fetchone()
+    if not row:
+        return None
+    job = {
+        'job_id': row.id,
+        'operation': row.operation,
+        'status': row.status,
+        'total_count': int(row.total_count or 0),
+        'processed_count': int(row.processed_count or 0),
+        'updated_count': int(row.updated_count or 0),
+        'error': row.error,
+        # Chunks commit one by one: a failed job may already have applied some of them.
+        'partial': row.status == 'failed' and int(row.processed_count or 0) > 0,
+        'created_at': row.created_at,
+        'started_at': row.started_at,
+        'finished_at': row.finished_at,
+    }
+    job.update(json.loads(row.result_json) if row.result_json else {'skipped': {}, 'skipped_counts': {}, 'chunks': []})
+    return job
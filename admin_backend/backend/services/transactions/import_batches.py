@@ -0,0 +1,248 @@
+from sqlalchemy import bindparam, text
+
+from backend.db.schema import get_table_columns
+
+# Upload dashboard aggregates, maintained per (source_file, bank_code) by the import and delete paths
+# so the summary and checklist endpoints read a handful of rows instead of grouping all transactions.
+# A NULL bank_code is stored as '' so it can be part of the primary key.
+IMPORT_BATCHES_TABLE = 'import_batches'
+IMPORT_BATCH_MONTHS_TABLE = 'import_batch_months'
+CHECKLIST_EXCLUDED_BANK_CODE = 'MANUAL'
+
+
+def import_batches_available(conn):
+    return bool(get_table_columns(conn, IMPORT_BATCHES_TABLE)) and bool(
+        get_table_columns(conn, IMPORT_BATCH_MONTHS_TABLE)
+    )
+
+
+def _batch_key(source_file, bank_code):
+    return str(source_file), str(bank_code or '')
+
+
+def _normalize_keys(keys):
+    return sorted({_batch_key(source_file, bank_code) for source_file, bank_code in (keys or []) if source_file})
+
+
+def _period_exprs(conn, column):
+    if conn.dialect.name == 'sqlite':
+        return (
+            f"CAST(strftime('%Y', {column}) AS INTEGER)",
+            f"CAST(strftime('%m', {column}) AS INTEGER)",
+        )
+    return f"YEAR({column})", f"MONTH({column})"
+
+
+def batch_keys_for(conn, transaction_ids):
+    """(source_file, bank_code) batches of `transaction_ids`; collect before deleting or reassigning them."""
+    transaction_ids = [str(txn_id) for txn_id in (transaction_ids or []) if txn_id]
+    if not transaction_ids or not import_batches_available(conn):
+        return set()
+    rows = conn.execute(text("""
+        SELECT DISTINCT source_file, bank_code
+        FROM transactions
+        WHERE id IN :ids AND source_file IS NOT NULL
+    """).bindparams(bindparam('ids', expanding=True)), {'ids': transaction_ids})
+    return {_batch_key(row.source_file, row.bank_code) for row in rows}
+
+
+def batch_keys_for_company(conn, company_id):
+    """Batches holding rows of `company_id`; collect before the company is detached from them."""
+    if not import_batches_available(conn):
+        return set()
+    rows = conn.execute(text("""
+        SELECT DISTINCT source_file, bank_code
+        FROM transactions
+        WHERE company_id = :company_id AND source_file IS NOT NULL
+    """), {'company_id': company_id})
+    return {_batch_key(row.source_file, row.bank_code) for row in rows}
+
+
+def _batch_summary(conn, source_file, bank_code, has_bank_account_number):
+    bank_account_number_expr = (
+        "MAX(NULLIF(TRIM(bank_account_number), ''))"
+        if has_bank_account_number else
+        "NULL"
+    )
+    account_variant_count_expr = (
+        "COUNT(DISTINCT COALESCE(NULLIF(TRIM(bank_account_number), ''), '__EMPTY__'))"
+        if has_bank_account_number else
+        "0"
+    )
+    return conn.execute(text(f"""
+        SELECT COUNT(*) AS transaction_count,
+               MIN(txn_date) AS start_date,
+               MAX(txn_date) AS end_date,
+               {bank_account_number_expr} AS bank_account_number,
+               {account_variant_count_expr} AS account_variant_count,
+               COUNT(DISTINCT company_id) AS company_count,
+               SUM(CASE WHEN db_cr = 'DB' THEN amount ELSE 0 END) AS total_debit,
+               SUM(CASE WHEN db_cr = 'CR' THEN amount ELSE 0 END) AS total_credit,
+               MAX(created_at) AS last_upload
+        FROM transactions
+        WHERE source_file = :source_file
+          AND COALESCE(bank_code, '') = :bank_code
+    """), {'source_file': source_file, 'bank_code': bank_code}).fetchone()
+
+
+def _batch_months(conn, source_file, bank_code, has_bank_account_number, has_parent_id):
+    year_expr, month_expr = _period_exprs(conn, 'txn_date')
+    account_expr = (
+        "COALESCE(NULLIF(TRIM(bank_account_number), ''), '')"
+        if has_bank_account_number else
+        "''"
+    )
+    parent_filter_sql = "AND (parent_id IS NULL OR parent_id = '')" if has_parent_id else ""
+    return conn.execute(text(f"""
+        SELECT {year_expr} AS period_year,
+               {month_expr} AS period_month,
+               {account_expr} AS bank_account_number,
+               COUNT(*) AS transaction_count,
+               SUM(CASE WHEN db_cr = 'DB' THEN amount ELSE 0 END) AS total_debit,
+               SUM(CASE WHEN db_cr = 'CR' THEN amount ELSE 0 END) AS total_credit,
+               MAX(created_at) AS last_upload
+        FROM transactions
+        WHERE source_file = :source_file
+          AND COALESCE(bank_code, '') = :bank_code
+          AND txn_date IS NOT NULL
+          {parent_filter_sql}
+        GROUP BY {year_expr}, {month_expr}, {account_expr}
+    """), {'source_file': source_file, 'bank_code': bank_code}).fetchall()
+
+
+def refresh_import_batches(conn, keys):
+    """
+    Recompute the summary and month coverage rows of the (source_file, bank_code) `keys`
+    from their current transactions. Call inside the writing transaction.
+    """
+    keys = _normalize_keys(keys)
+    if not keys or not import_batches_available(conn):
+        return
+    txn_columns = get_table_columns(conn, 'transactions')
+    has_bank_account_number = 'bank_account_number' in txn_columns
+    has_parent_id = 'parent_id' in txn_columns
+    for source_file, bank_code in keys:
+        params = {'source_file': source_file, 'bank_code': bank_code}
+        conn.execute(text(f"""
+            DELETE FROM {IMPORT_BATCHES_TABLE}
+            WHERE source_file = :source_file AND bank_code = :bank_code
+        """), params)
+        conn.execute(text(f"""
+            DELETE FROM {IMPORT_BATCH_MONTHS_TABLE}
+            WHERE source_file = :source_file AND bank_code = :bank_code
+        """), params)
+
+        summary = _batch_summary(conn, source_file, bank_code, has_bank_account_number)
+        if not summary or not int(summary.transaction_count or 0):
+            continue
+        conn.execute(text(f"""
+            INSERT INTO {IMPORT_BATCHES_TABLE} (
+                source_file, bank_code, transaction_count, start_date, end_date,
+                bank_account_number, account_variant_count, company_count,
+                total_debit, total_credit, last_upload
+            ) VALUES (
+                :source_file, :bank_code, :transaction_count, :start_date, :end_date,
+                :bank_account_number, :account_variant_count, :company_count,
+                :total_debit, :total_credit, :last_upload
+            )
+        """), {**params, **summary._mapping})
+
+        if bank_code in ('', CHECKLIST_EXCLUDED_BANK_CODE):
+            continue
+        month_rows = [
+            {**params, **row._mapping}
+            for row in _batch_months(conn, source_file, bank_code, has_bank_account_number, has_parent_id)
+        ]
+        if month_rows:
+            conn.execute(text(f"""
+                INSERT INTO {IMPORT_BATCH_MONTHS_TABLE} (
+                    source_file, bank_code, bank_account_number, period_year, period_month,
+                    transaction_count, total_debit, total_credit, last_upload
+                ) VALUES (
+                    :source_file, :bank_code, :bank_account_number, :period_year, :period_month,
+                    :transaction_count, :total_debit, :total_credit, :last_upload
+                )
+            """), month_rows)
+
+
+def refresh_import_batches_for(conn, transaction_ids):
+    """Refresh the batches `transaction_ids` currently belong to (after an update, not a delete)."""
+    refresh_import_batches(conn, batch_keys_for(conn, transaction_ids))
+
+
+def list_import_batches(conn):
+    """Upload summary rows, newest upload first."""
+    rows = conn.execute(text(f"""
+        SELECT source_file,
+               transaction_count,
+               start_date,
+               end_date,
+               NULLIF(bank_code, '') AS bank_code,
+               bank_account_number,
+               account_variant_count,
+               company_count,
+               total_debit,
+               total_credit,
+               last_upload
+        FROM {IMPORT_BATCHES_TABLE}
+        ORDER BY last_upload DESC
+    """))
+    return rows.fetchall()
+
+
+def list_month_coverage(conn, year):
+    """
+    Checklist cells for `year`: one dict per (month, bank_code, bank_account_number)
+    with the same fields the live GROUP BY produced.
+    """
+    rows = conn.execute(text(f"""
+        SELECT period_month, bank_code, bank_account_number, source_file,
+               transaction_count, total_debit, total_credit, last_upload
+        FROM {IMPORT_BATCH_MONTHS_TABLE}
+        WHERE period_year = :year
+        ORDER BY period_month ASC, bank_code ASC, bank_account_number ASC, source_file ASC
+    """), {'year': int(year)}).fetchall()
+
+    cells = {}
+    for row in rows:
+        key = (int(row.period_month), str(row.bank_code), str(row.bank_account_number or ''))
+        cell = cells.get(key)
+        if cell is None:
+            cell = cells[key] = {
+                'txn_month': key[0],
+                'bank_code': key[1],
+                'bank_account_number': key[2] or None,
+                'source_files': [],
+                'transaction_count': 0,
+                'total_debit': 0.0,
+                'total_credit': 0.0,
+                'last_upload': None,
+            }
+        cell['source_files'].append(str(row.source_file))
+        cell['transaction_count'] += int(row.transaction_count or 0)
+        cell['total_debit'] += float(row.total_debit or 0)
+        cell['total_credit'] += float(row.total_credit or 0)
+        if row.last_upload is not None and (cell['last_upload'] is None or row.last_upload > cell['last_upload']):
+            cell['last_upload'] = row.last_upload
+    return list(cells.values())
+
+
+def repair_import_batches(conn):
+    """Rebuild both tables from transactions; returns the number of batches written."""
+    if not import_batches_available(conn):
+        return 0
+    keys = {
+        _batch_key(row.source_file, row.bank_code)
+        for row in conn.execute(text("""
+            SELECT DISTINCT source_file, bank_code
+            FROM transactions
+            WHERE source_file IS NOT NULL
+        """))
+    }
+    keys |= {
+        _batch_key(row.source_file, row.bank_code)
+        for table in (IMPORT_BATCHES_TABLE, IMPORT_BATCH_MONTHS_TABLE)
+        for row in conn.execute(text(f"SELECT DISTINCT source_file, bank_code FROM {table}"))
+    }
+    refresh_import_batches(conn, keys)
+    return int(conn.execute(text(f"SELECT COUNT(*) FROM {IMPORT_BATCHES_TABLE}")).scalar() or 0)
@@ -0,0 +1,248 @@
+from sqlalchemy import bindparam, text
+
+from backend.db.schema import get_table_columns
+from backend.services.reporting.report_value_utils import _year_date_bounds
+from backend.services.transactions.payroll_aggregates import payroll_aggregates_available
+
+# Per-mark usage counters (migration 077), refreshed by the transaction write paths so the mark
+# lookups, usage-sorted mark lists and orphan cleanup read one row per mark instead of counting
+# that mark's transactions. Writes recount only the (mark, year) rows they touched and roll
+# mark_stats up from the yearly rows; the payroll aggregates (migration 079) are keyed by the same
+# marks, and the write paths refresh them with the mark ids returned by refresh_mark_stats_for().
+MARK_STATS_TABLE = 'mark_stats'
+MARK_STATS_YEARS_TABLE = 'mark_stats_years'
+REFRESH_CHUNK_SIZE = 500
+
+_DEBIT_SQL = "UPPER(TRIM(COALESCE(db_cr, ''))) IN ('DB', 'DEBIT', 'D', 'DE')"
+_CREDIT_SQL = "UPPER(TRIM(COALESCE(db_cr, ''))) IN ('CR', 'CREDIT', 'K', 'KREDIT')"
+_YEAR_COUNTERS_SQL = f"""COUNT(*),
+                       SUM(CASE WHEN {_DEBIT_SQL} THEN amount ELSE 0 END),
+                       SUM(CASE WHEN {_CREDIT_SQL} THEN amount ELSE 0 END),
+                       SUM(CASE WHEN {_DEBIT_SQL} THEN 1 ELSE 0 END),
+                       SUM(CASE WHEN {_CREDIT_SQL} THEN 1 ELSE 0 END),
+                       MAX(txn_date)"""
+_YEAR_COLUMNS_SQL = (
+    "mark_id, period_year, transaction_count, total_debit, total_credit, debit_count, credit_count, last_used_date"
+)
+
+
+def mark_stats_available(conn):
+    return bool(get_table_columns(conn, MARK_STATS_TABLE)) and bool(
+        get_table_columns(conn, MARK_STATS_YEARS_TABLE)
+    )
+
+
+def _normalize_mark_ids(mark_ids):
+    return sorted({str(mark_id).strip() for mark_id in (mark_ids or []) if str(mark_id or '').strip()})
+
+
+def _year_expr(conn, column):
+    if conn.dialect.name == 'sqlite':
+        return f"CAST(strftime('%Y', {column}) AS INTEGER)"
+    return f"YEAR({column})"
+
+
+def _execute_chunked(conn, statements, mark_ids, params=None):
+    for start in range(0, len(mark_ids), REFRESH_CHUNK_SIZE):
+        chunk_params = {**(params or {}), 'mark_ids': mark_ids[start:start + REFRESH_CHUNK_SIZE]}
+        for statement in statements:
+            conn.execute(text(statement).bindparams(bindparam('mark_ids', expanding=True)), chunk_params)
+
+
+def mark_years_for(conn, transaction_ids):
+    """
+    (mark_id, year) pairs of `transaction_ids`, their split children and their split parents, with
+    year None for undated rows; collect before changing or deleting them. A parent's rows depend on
+    whether its children are marked.
+    """
+    transaction_ids = sorted({str(txn_id) for txn_id in (transaction_ids or []) if txn_id})
+    if not transaction_ids or not (mark_stats_available(conn) or payroll_aggregates_available(conn)):
+        return set()
+    where_sql = "id IN :ids"
+    if 'parent_id' in get_table_columns(conn, 'transactions'):
+        where_sql = "(id IN :ids OR parent_id IN :ids OR id IN (SELECT parent_id FROM transactions WHERE id IN :ids))"
+    query = text(f"""
+        SELECT DISTINCT mark_id, {_year_expr(conn, 'txn_date')} AS period_year
+        FROM transactions
+        WHERE {where_sql} AND mark_id IS NOT NULL
+    """).bindparams(bindparam('ids', expanding=True))
+    mark_years = set()
+    for start in range(0, len(transaction_ids), REFRESH_CHUNK_SIZE):
+        rows = conn.execute(query, {'ids': transaction_ids[start:start + REFRESH_CHUNK_SIZE]})
+        mark_years |= {
+            (str(row.mark_id), int(row.period_year) if row.period_year is not None else None)
+            for row in rows
+        }
+    return mark_years
+
+
+def mark_ids_for(conn, transaction_ids):
+    """Marks carried by `transaction_ids`, their split children and their split parents."""
+    return {mark_id for mark_id, _year in mark_years_for(conn, transaction_ids)}
+
+
+def _roll_up_mark_stats(conn, mark_ids):
+    """Rebuild the mark_stats rows of `mark_ids` from their yearly rows plus their undated transactions."""
+    _execute_chunked(conn, (
+        f"DELETE FROM {MARK_STATS_TABLE} WHERE mark_id IN :mark_ids",
+        f"""
+            INSERT INTO {MARK_STATS_TABLE} (mark_id, transaction_count, debit_count, credit_count, last_used_date)
+            SELECT mark_id, SUM(transaction_count), SUM(debit_count), SUM(credit_count), MAX(last_used_date)
+            FROM (
+                SELECT mark_id, transaction_count, debit_count, credit_count, last_used_date
+                FROM {MARK_STATS_YEARS_TABLE}
+                WHERE mark_id IN :mark_ids
+                UNION ALL
+                SELECT mark_id,
+                       COUNT(*),
+                       SUM(CASE WHEN {_DEBIT_SQL} THEN 1 ELSE 0 END),
+                       SUM(CASE WHEN {_CREDIT_SQL} THEN 1 ELSE 0 END),
+                       NULL
+                FROM transactions
+                WHERE mark_id IN :mark_ids AND txn_date IS NULL
+                GROUP BY mark_id
+            ) usage_rows
+            GROUP BY mark_id
+        """,
+    ), mark_ids)
+
+
+def refresh_mark_stats(conn, mark_ids):
+    """
+    Recompute the counters and yearly totals of `mark_ids` from all of their transactions.
+    Call inside the writing transaction; marks without transactions lose their rows.
+    """
+    mark_ids = _normalize_mark_ids(mark_ids)
+    if not mark_ids or not mark_stats_available(conn):
+        return
+    year_expr = _year_expr(conn, 'txn_date')
+    _execute_chunked(conn, (
+        f"DELETE FROM {MARK_STATS_YEARS_TABLE} WHERE mark_id IN :mark_ids",
+        f"""
+            INSERT INTO {MARK_STATS_YEARS_TABLE} ({_YEAR_COLUMNS_SQL})
+            SELECT mark_id,
+                   {year_expr},
+                   {_YEAR_COUNTERS_SQL}
+            FROM transactions
+            WHERE mark_id IN :mark_ids AND txn_date IS NOT NULL
+            GROUP BY mark_id, {year_expr}
+        """,
+    ), mark_ids)
+    _roll_up_mark_stats(conn, mark_ids)
+
+
+def refresh_mark_years(conn, mark_years):
+    """
+    Recount the yearly rows of the (mark_id, year) pairs in `mark_years` and roll up their marks'
+    counters; the other years of those marks are left as they are. Returns the refreshed mark ids.
+    """
+    years_by_mark = {}
+    for mark_id, year in mark_years or ():
+        mark_id = str(mark_id or '').strip()
+        if mark_id:
+            years_by_mark.setdefault(mark_id, set()).add(year)
+    if not years_by_mark or not mark_stats_available(conn):
+        return set(years_by_mark)
+
+    marks_by_year = {}
+    for mark_id, years in years_by_mark.items():
+        for year in years - {None}:
+            marks_by_year.setdefault(year, []).append(mark_id)
+    for year, mark_ids in sorted(marks_by_year.items()):
+        year_start, next_year_start = _year_date_bounds(year)
+        _execute_chunked(conn, (
+            f"DELETE FROM {MARK_STATS_YEARS_TABLE} WHERE mark_id IN :mark_ids AND period_year = :period_year",
+            f"""
+                INSERT INTO {MARK_STATS_YEARS_TABLE} ({_YEAR_COLUMNS_SQL})
+                SELECT mark_id,
+                       :period_year,
+                       {_YEAR_COUNTERS_SQL}
+                FROM transactions
+                WHERE mark_id IN :mark_ids AND txn_date >= :year_start AND txn_date < :next_year_start
+                GROUP BY mark_id
+            """,
+        ), sorted(mark_ids), {'period_year': year, 'year_start': year_start, 'next_year_start': next_year_start})
+    _roll_up_mark_stats(conn, sorted(years_by_mark))
+    return set(years_by_mark)
+
+
+def refresh_mark_stats_for(conn, transaction_ids, previous_mark_years=()):
+    """
+    Refresh the (mark, year) rows `transaction_ids` carry now plus `previous_mark_years` (from
+    mark_years_for) they carried before the write. Returns the mark ids involved, for the payroll
+    aggregates.
+    """
+    return refresh_mark_years(conn, mark_years_for(conn, transaction_ids) | set(previous_mark_years or ()))
+
+
+def used_mark_ids(conn, mark_ids):
+    """The subset of `mark_ids` still carried by at least one transaction."""
+    mark_ids = _normalize_mark_ids(mark_ids)
+    if not mark_ids:
+        return set()
+    table = MARK_STATS_TABLE if mark_stats_available(conn) else 'transactions'
+    rows = conn.execute(
+        text(f"SELECT DISTINCT mark_id FROM {table} WHERE mark_id IN :mark_ids")
+        .bindparams(bindparam('mark_ids', expanding=True)),
+        {'mark_ids': mark_ids},
+    )
+    return {str(row.mark_id).strip() for row in rows if row.mark_id}
+
+
+def natural_direction_fallback_sql(conn, mark_alias='m'):
+    """
+    SQL for the direction a mark is mostly used in ('DB' on ties, 'CR' when unused), for marks
+    without an explicit natural_direction. Reads mark_stats when present.
+    """
+    if mark_stats_available(conn):
+        return f"""COALESCE((
+            SELECT CASE WHEN ms.debit_count >= ms.credit_count THEN 'DB' ELSE 'CR' END
+            FROM {MARK_STATS_TABLE} ms
+            WHERE ms.mark_id = {mark_alias}.id
+        ), 'CR')"""
+    return f"""(
+        SELECT CASE
+            WHEN SUM(CASE WHEN UPPER(TRIM(COALESCE(t.db_cr, ''))) IN ('DB', 'DEBIT', 'D', 'DE') THEN 1 ELSE 0 END) >=
+                 SUM(CASE WHEN UPPER(TRIM(COALESCE(t.db_cr, ''))) IN ('CR', 'CREDIT', 'K', 'KREDIT') THEN 1 ELSE 0 END)
+            THEN 'DB'
+            ELSE 'CR'
+        END
+        FROM transactions t
+        WHERE t.mark_id = {mark_alias}.id
+    )"""
+
+
+def list_mark_years(conn, mark_id):
+    """Yearly usage of `mark_id`, oldest year first."""
+    rows = conn.execute(text(f"""
+        SELECT period_year, transaction_count, total_debit, total_credit
+        FROM {MARK_STATS_YEARS_TABLE}
+        WHERE mark_id = :mark_id
+        ORDER BY period_year ASC
+    """), {'mark_id': mark_id})
+    return [
+        {
+            'year': int(row.period_year),
+            'transaction_count': int(row.transaction_count or 0),
+            'total_debit': float(row.total_debit or 0),
+            'total_credit': float(row.total_credit or 0),
+        }
+        for row in rows
+    ]
+
+
+def repair_mark_stats(conn):
+    """Rebuild both tables from transactions; returns the number of marks with usage."""
+    if not mark_stats_available(conn):
+        return 0
+    mark_ids = {
+        str(row.mark_id)
+        for row in conn.execute(text("SELECT DISTINCT mark_id FROM transactions WHERE mark_id IS NOT NULL"))
+    }
+    mark_ids |= {
+        str(row.mark_id)
+        for table in (MARK_STATS_TABLE, MARK_STATS_YEARS_TABLE)
+        for row in conn.execute(text(f"SELECT DISTINCT mark_id FROM {table}"))
+    }
+    refresh_mark_stats(conn, mark_ids)
+    return int(conn.execute(text(f"SELECT COUNT(*) FROM {MARK_STATS_TABLE}")).scalar() or 0)
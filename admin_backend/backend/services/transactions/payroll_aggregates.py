@@ -0,0 +1,174 @@
+from sqlalchemy import bindparam, text
+
+from backend.db.schema import get_table_columns
+from backend.services.reporting.report_sql_fragments import _split_parent_exclusion_clause
+from backend.services.transactions.split_flags import IS_SPLIT_CONTAINER, split_flags_available
+
+# Salary totals per company, Sagansa user, payroll month, report type and salary mark
+# (migration 079). Rows are recomputed per mark inside the writing transaction (the transaction
+# write paths call in here with the marks refresh_mark_stats_for() returns, and the payroll
+# endpoints after assigning users or periods), so the payroll monthly summary and the payroll
+# report read a handful of rows per employee instead of scanning salary transactions. Empty strings stand in for a missing company or user.
+PAYROLL_AGGREGATES_TABLE = 'payroll_aggregates'
+REFRESH_CHUNK_SIZE = 500
+UNNAMED_COMPONENT = '(Unnamed Salary Component)'
+
+
+def payroll_aggregates_available(conn):
+    return bool(get_table_columns(conn, PAYROLL_AGGREGATES_TABLE))
+
+
+def _normalize_mark_ids(mark_ids):
+    return sorted({str(mark_id).strip() for mark_id in (mark_ids or []) if str(mark_id or '').strip()})
+
+
+def _period_month_expr(conn, txn_columns):
+    effective_date_expr = "COALESCE(t.payroll_period_month, t.txn_date)" if 'payroll_period_month' in txn_columns else "t.txn_date"
+    if conn.dialect.name == 'sqlite':
+        return f"strftime('%Y-%m', {effective_date_expr})"
+    return f"DATE_FORMAT({effective_date_expr}, '%Y-%m')"
+
+
+def _unmarked_split_parent_expr(conn, txn_columns):
+    """1 for split parents whose children are all unmarked: the payroll page skips them, reports keep them."""
+    if split_flags_available(conn, txn_columns):
+        return f"CASE WHEN t.{IS_SPLIT_CONTAINER} = 1 THEN 1 ELSE 0 END"
+    if 'parent_id' in txn_columns:
+        return "CASE WHEN EXISTS (SELECT 1 FROM transactions t_child WHERE t_child.parent_id = t.id) THEN 1 ELSE 0 END"
+    return "0"
+
+
+def refresh_payroll_aggregates(conn, mark_ids):
+    """
+    Recompute the rows of `mark_ids` from their current salary transactions.
+    Call inside the writing transaction, after split flags are refreshed; marks that are not
+    salary components (or have no mapping for a report type) simply lose their rows.
+    """
+    mark_ids = _normalize_mark_ids(mark_ids)
+    if not mark_ids or not payroll_aggregates_available(conn):
+        return
+    mark_columns = get_table_columns(conn, 'marks')
+    txn_columns = get_table_columns(conn, 'transactions')
+    delete_query = text(
+        f"DELETE FROM {PAYROLL_AGGREGATES_TABLE} WHERE mark_id IN :mark_ids"
+    ).bindparams(bindparam('mark_ids', expanding=True))
+    if 'is_salary_component' not in mark_columns:
+        for start in range(0, len(mark_ids), REFRESH_CHUNK_SIZE):
+            conn.execute(delete_query, {'mark_ids': mark_ids[start:start + REFRESH_CHUNK_SIZE]})
+        return
+
+    user_expr = "COALESCE(CAST(t.sagansa_user_id AS CHAR), '')" if 'sagansa_user_id' in txn_columns else "''"
+    period_month_expr = _period_month_expr(conn, txn_columns)
+    unmarked_split_parent_expr = _unmarked_split_parent_expr(conn, txn_columns)
+    report_type_expr = "mcm.report_type" if 'report_type' in get_table_columns(conn, 'mark_coa_mapping') else "'real'"
+    insert_query = text(f"""
+        INSERT INTO {PAYROLL_AGGREGATES_TABLE} (
+            company_id, sagansa_user_id, period_month, report_type, mark_id,
+            unmarked_split_parent, transaction_count, total_amount
+        )
+        SELECT COALESCE(t.company_id, ''),
+               {user_expr},
+               {period_month_expr},
+               mcm.report_type,
+               t.mark_id,
+               {unmarked_split_parent_expr},
+               COUNT(t.id),
+               COALESCE(SUM(ABS(t.amount)), 0)
+        FROM transactions t
+        INNER JOIN marks m ON m.id = t.mark_id
+        INNER JOIN (
+            SELECT DISTINCT mark_id, {report_type_expr} AS report_type
+            FROM mark_coa_mapping mcm
+            WHERE mark_id IN :mark_ids
+        ) mcm ON mcm.mark_id = t.mark_id
+        WHERE t.mark_id IN :mark_ids
+          AND COALESCE(m.is_salary_component, 0) = 1
+          AND mcm.report_type IS NOT NULL
+          AND {period_month_expr} IS NOT NULL
+          {_split_parent_exclusion_clause(conn, 't')}
+        GROUP BY COALESCE(t.company_id, ''), {user_expr}, {period_month_expr}, mcm.report_type, t.mark_id,
+                 {unmarked_split_parent_expr}
+    """).bindparams(bindparam('mark_ids', expanding=True))
+    for start in range(0, len(mark_ids), REFRESH_CHUNK_SIZE):
+        params = {'mark_ids': mark_ids[start:start + REFRESH_CHUNK_SIZE]}
+        conn.execute(delete_query, params)
+        conn.execute(insert_query, params)
+
+
+def salary_mark_ids_for(conn, transaction_ids):
+    """Salary marks carried by `transaction_ids` and their split children."""
+    transaction_ids = [str(txn_id) for txn_id in (transaction_ids or []) if txn_id]
+    if not transaction_ids or not payroll_aggregates_available(conn):
+        return set()
+    if 'is_salary_component' not in get_table_columns(conn, 'marks'):
+        return set()
+    where_sql = "t.id IN :ids"
+    if 'parent_id' in get_table_columns(conn, 'transactions'):
+        where_sql = "(t.id IN :ids OR t.parent_id IN :ids)"
+    rows = conn.execute(text(f"""
+        SELECT DISTINCT t.mark_id
+        FROM transactions t
+        INNER JOIN marks m ON m.id = t.mark_id
+        WHERE {where_sql} AND COALESCE(m.is_salary_component, 0) = 1
+    """).bindparams(bindparam('ids', expanding=True)), {'ids': transaction_ids})
+    return {str(row.mark_id) for row in rows}
+
+
+def fetch_payroll_aggregate_rows(conn, start_month, end_month, company_id=None, report_type='real',
+                                 include_unmarked_split_parents=True):
+    """
+    Aggregated salary rows between two 'YYYY-MM' months (inclusive): one per period month, user and
+    salary mark, with the mark's current names. `sagansa_user_id` is None for unassigned rows.
+    """
+    unmarked_split_sql = "" if include_unmarked_split_parents else "AND pa.unmarked_split_parent = 0"
+    rows = conn.execute(text(f"""
+        SELECT
+            pa.period_month,
+            pa.sagansa_user_id,
+            pa.mark_id,
+            m.personal_use,
+            m.internal_report,
+            m.tax_report,
+            SUM(pa.transaction_count) AS transaction_count,
+            SUM(pa.total_amount) AS total_amount
+        FROM {PAYROLL_AGGREGATES_TABLE} pa
+        LEFT JOIN marks m ON m.id = pa.mark_id
+        WHERE pa.report_type = :report_type
+          AND pa.period_month BETWEEN :start_month AND :end_month
+          AND (:company_id IS NULL OR pa.company_id = :company_id)
+          {unmarked_split_sql}
+        GROUP BY pa.period_month, pa.sagansa_user_id, pa.mark_id, m.personal_use, m.internal_report, m.tax_report
+        ORDER BY pa.period_month ASC, pa.sagansa_user_id ASC
+    """), {
+        'report_type': report_type,
+        'start_month': start_month,
+        'end_month': end_month,
+        'company_id': company_id,
+    })
+    return [
+        {
+            'period_month': row.period_month,
+            'sagansa_user_id': str(row.sagansa_user_id or '').strip() or None,
+            'mark_id': row.mark_id,
+            'component_name': row.personal_use or row.internal_report or row.tax_report or UNNAMED_COMPONENT,
+            'transaction_count': int(row.transaction_count or 0),
+            'total_amount': float(row.total_amount or 0.0),
+        }
+        for row in rows
+    ]
+
+
+def repair_payroll_aggregates(conn):
+    """Rebuild the table from transactions; returns the number of aggregate rows."""
+    if not payroll_aggregates_available(conn):
+        return 0
+    mark_ids = {
+        str(row.mark_id)
+        for row in conn.execute(text("SELECT DISTINCT mark_id FROM transactions WHERE mark_id IS NOT NULL"))
+    }
+    mark_ids |= {
+        str(row.mark_id)
+        for row in conn.execute(text(f"SELECT DISTINCT mark_id FROM {PAYROLL_AGGREGATES_TABLE}"))
+    }
+    refresh_payroll_aggregates(conn, mark_ids)
+    return int(conn.execute(text(f"SELECT COUNT(*) FROM {PAYROLL_AGGREGATES_TABLE}")).scalar() or 0)
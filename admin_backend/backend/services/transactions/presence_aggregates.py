@@ -0,0 +1,187 @@
+from sqlalchemy import bindparam, text
+
+from backend.db.schema import get_table_columns
+
+# Presence totals per company, Sagansa user, store and day (migration 080). The presence sync
+# recomputes every date it touched inside its transaction, so payroll reconciliation reads one
+# row per employee-day (or a handful per employee-month) instead of paging through
+# payroll_presences. Empty strings stand in for a missing company, user or store.
+PRESENCE_DAILY_TABLE = 'payroll_presence_daily'
+REFRESH_CHUNK_SIZE = 500
+SUMMARY_GROUPS = ('company', 'user', 'store', 'day', 'month')
+
+
+def presence_aggregates_available(conn):
+    return bool(get_table_columns(conn, PRESENCE_DAILY_TABLE))
+
+
+def _normalize_dates(presence_dates):
+    return sorted({str(value).strip()[:10] for value in (presence_dates or []) if str(value or '').strip()})
+
+
+def _daily_select_sql(where_sql):
+    """One row per company, user, store and presence date of payroll_presences matching `where_sql`."""
+    # Shifts that cross midnight (end before start) are not checked for early leave.
+    return f"""
+        SELECT COALESCE(p.company_id, '') AS company_id,
+               COALESCE(CAST(p.sagansa_user_id AS CHAR), '') AS sagansa_user_id,
+               COALESCE(p.store_name, '') AS store_name,
+               p.presence_date AS presence_date,
+               MAX(COALESCE(p.creator_name, p.user_name)) AS user_name,
+               COUNT(*) AS presence_count,
+               SUM(CASE WHEN p.check_in_at IS NOT NULL THEN 1 ELSE 0 END) AS shift_count,
+               COALESCE(SUM(p.work_minutes), 0) AS worked_minutes,
+               SUM(CASE
+                   WHEN TIME(p.check_in_at) > TIME(p.shift_start_time) THEN 1 ELSE 0
+               END) AS late_count,
+               SUM(CASE
+                   WHEN TIME(p.check_out_at) < TIME(p.shift_end_time)
+                        AND TIME(p.shift_end_time) > TIME(p.shift_start_time) THEN 1 ELSE 0
+               END) AS early_leave_count
+        FROM payroll_presences p
+        WHERE p.presence_date IS NOT NULL AND {where_sql}
+        GROUP BY COALESCE(p.company_id, ''), COALESCE(CAST(p.sagansa_user_id AS CHAR), ''),
+                 COALESCE(p.store_name, ''), p.presence_date
+    """
+
+
+def refresh_presence_aggregates(conn, presence_dates):
+    """
+    Recompute the daily rows of `presence_dates` from payroll_presences.
+    Call inside the writing transaction with the old and new dates of every upserted record.
+    """
+    presence_dates = _normalize_dates(presence_dates)
+    if not presence_dates or not presence_aggregates_available(conn):
+        return
+    delete_query = text(
+        f"DELETE FROM {PRESENCE_DAILY_TABLE} WHERE presence_date IN :dates"
+    ).bindparams(bindparam('dates', expanding=True))
+    insert_query = text(f"""
+        INSERT INTO {PRESENCE_DAILY_TABLE} (
+            company_id, sagansa_user_id, store_name, presence_date, user_name,
+            presence_count, shift_count, worked_minutes, late_count, early_leave_count
+        )
+        {_daily_select_sql('p.presence_date IN :dates')}
+    """).bindparams(bindparam('dates', expanding=True))
+    for start in range(0, len(presence_dates), REFRESH_CHUNK_SIZE):
+        params = {'dates': presence_dates[start:start + REFRESH_CHUNK_SIZE]}
+        conn.execute(delete_query, params)
+        conn.execute(insert_query, params)
+
+
+def _group_columns(conn, group_by):
+    month_expr = (
+        "strftime('%Y-%m', d.presence_date)" if conn.dialect.name == 'sqlite'
+        else "DATE_FORMAT(d.presence_date, '%Y-%m')"
+    )
+    columns = {
+        'company': [('company_id', 'd.company_id')],
+        'user': [('sagansa_user_id', 'd.sagansa_user_id')],
+        'store': [('store_name', 'd.store_name')],
+        'day': [('presence_date', 'd.presence_date')],
+        'month': [('month', month_expr)],
+    }
+    return [column for key in group_by for column in columns[key]]
+
+
+def fetch_presence_summary(conn, start_date, end_date, group_by=('user',), company_id=None, user_id=None,
+                           store_name=None):
+    """
+    Presence totals between two 'YYYY-MM-DD' dates (inclusive), grouped by any of SUMMARY_GROUPS
+    in the given order, plus the overall totals. Reads payroll_presence_daily when migration 080
+    is applied and aggregates payroll_presences directly otherwise.
+    Raises ValueError for an unknown group.
+    """
+    group_by = list(dict.fromkeys(group_by or ()))
+    unknown = [key for key in group_by if key not in SUMMARY_GROUPS]
+    if unknown:
+        raise ValueError(f"unknown group_by value(s): {', '.join(unknown)}")
+
+    params = {'start_date': start_date, 'end_date': end_date}
+    if presence_aggregates_available(conn):
+        source_sql = PRESENCE_DAILY_TABLE
+        source = PRESENCE_DAILY_TABLE
+    else:
+        source_sql = f"({_daily_select_sql('p.presence_date BETWEEN :start_date AND :end_date')})"
+        source = 'payroll_presences'
+
+    where_clauses = ["d.presence_date BETWEEN :start_date AND :end_date"]
+    if company_id:
+        where_clauses.append("d.company_id = :company_id")
+        params['company_id'] = company_id
+    if user_id:
+        where_clauses.append("d.sagansa_user_id = :user_id")
+        params['user_id'] = user_id
+    if store_name is not None:
+        where_clauses.append("d.store_name = :store_name")
+        params['store_name'] = store_name
+
+    def run(columns):
+        select_sql = ''.join(f"{expr} AS {alias}, " for alias, expr in columns)
+        if any(alias == 'sagansa_user_id' for alias, _ in columns):
+            select_sql += "MAX(d.user_name) AS user_name, "
+        group_sql = ''
+        if columns:
+            expressions = ', '.join(expr for _, expr in columns)
+            group_sql = f"GROUP BY {expressions} ORDER BY {expressions}"
+        return conn.execute(text(f"""
+            SELECT {select_sql}
+                   COUNT(DISTINCT d.presence_date) AS day_count,
+                   COALESCE(SUM(d.presence_count), 0) AS presence_count,
+                   COALESCE(SUM(d.shift_count), 0) AS shift_count,
+                   COALESCE(SUM(d.worked_minutes), 0) AS worked_minutes,
+                   COALESCE(SUM(d.late_count), 0) AS late_count,
+                   COALESCE(SUM(d.early_leave_count), 0) AS early_leave_count
+            FROM {source_sql} d
+            WHERE {' AND '.join(where_clauses)}
+            {group_sql}
+        """), params).fetchall()
+
+    columns = _group_columns(conn, group_by)
+    rows = [_summary_row(row, columns) for row in run(columns)]
+    return {
+        'group_by': group_by,
+        'source': source,
+        'rows': rows,
+        'summary': _summary_row(run([])[0], []),
+    }
+
+
+def _summary_row(row, columns):
+    values = dict(row._mapping)
+    result = {}
+    for alias, _ in columns:
+        value = values.get(alias)
+        if alias == 'presence_date':
+            result[alias] = str(value)[:10] if value else None
+        else:
+            result[alias] = (str(value).strip() or None) if value is not None else None
+        if alias == 'sagansa_user_id':
+            result['user_name'] = values.get('user_name')
+    worked_minutes = int(values.get('worked_minutes') or 0)
+    result.update({
+        'day_count': int(values.get('day_count') or 0),
+        'presence_count': int(values.get('presence_count') or 0),
+        'shift_count': int(values.get('shift_count') or 0),
+        'worked_minutes': worked_minutes,
+        'worked_hours': round(worked_minutes / 60.0, 2),
+        'late_count': int(values.get('late_count') or 0),
+        'early_leave_count': int(values.get('early_leave_count') or 0),
+    })
+    return result
+
+
+def repair_presence_aggregates(conn):
+    """Rebuild the table from payroll_presences; returns the number of daily rows."""
+    if not presence_aggregates_available(conn) or not get_table_columns(conn, 'payroll_presences'):
+        return 0
+    presence_dates = {
+        row.presence_date
+        for row in conn.execute(text("SELECT DISTINCT presence_date FROM payroll_presences WHERE presence_date IS NOT NULL"))
+    }
+    presence_dates |= {
+        row.presence_date
+        for row in conn.execute(text(f"SELECT DISTINCT presence_date FROM {PRESENCE_DAILY_TABLE}"))
+    }
+    refresh_presence_aggregates(conn, presence_dates)
+    return int(conn.execute(text(f"SELECT COUNT(*) FROM {PRESENCE_DAILY_TABLE}")).scalar() or 0)
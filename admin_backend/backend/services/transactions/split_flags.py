@@ -0,0 +1,126 @@
+from sqlalchemy import bindparam, text
+
+from backend.db.schema import get_table_columns
+
+# Denormalized from child rows so report queries can skip split containers with a plain predicate
+# instead of a correlated NOT EXISTS per candidate row.
+IS_SPLIT_CONTAINER = 'is_split_container'
+HAS_MARKED_CHILDREN = 'has_marked_children'
+SPLIT_FLAG_COLUMNS = (IS_SPLIT_CONTAINER, HAS_MARKED_CHILDREN)
+
+
+def split_flags_available(conn, txn_columns=None):
+    if txn_columns is None:
+        txn_columns = get_table_columns(conn, 'transactions')
+    return set(SPLIT_FLAG_COLUMNS).issubset(txn_columns)
+
+
+def _trimmed_mark_expr(conn, alias):
+    cast_type = 'TEXT' if conn.dialect.name == 'sqlite' else 'CHAR'
+    return f"NULLIF(TRIM(COALESCE(CAST({alias}.mark_id AS {cast_type}), '')), '')"
+
+
+def _child_flags(conn, parent_ids=None):
+    """{parent_id: has_marked_children} for every parent that has children (optionally limited to `parent_ids`)."""
+    where_sql = "parent_id IS NOT NULL AND parent_id <> ''"
+    params = {}
+    if parent_ids is not None:
+        where_sql = "parent_id IN :parent_ids"
+        params['parent_ids'] = parent_ids
+    query = text(f"""
+        SELECT parent_id,
+               MAX(CASE WHEN {_trimmed_mark_expr(conn, 'c')} IS NOT NULL THEN 1 ELSE 0 END) AS has_marked_children
+        FROM transactions c
+        WHERE {where_sql}
+        GROUP BY parent_id
+    """)
+    if parent_ids is not None:
+        query = query.bindparams(bindparam('parent_ids', expanding=True))
+    return {str(row.parent_id): int(row.has_marked_children or 0) for row in conn.execute(query, params)}
+
+
+def _write_flags(conn, ids, is_split_container, has_marked_children):
+    if not ids:
+        return 0
+    result = conn.execute(text(f"""
+        UPDATE transactions
+        SET {IS_SPLIT_CONTAINER} = :is_split_container,
+            {HAS_MARKED_CHILDREN} = :has_marked_children
+        WHERE id IN :ids
+    """).bindparams(bindparam('ids', expanding=True)), {
+        'ids': sorted(ids),
+        'is_split_container': is_split_container,
+        'has_marked_children': has_marked_children,
+    })
+    return int(result.rowcount or 0)
+
+
+def refresh_split_flags(conn, parent_ids):
+    """
+    Recompute the split flags of `parent_ids` from their current children.
+    Call inside the writing transaction after children are inserted, deleted or re-marked.
+    """
+    parent_ids = {str(parent_id) for parent_id in (parent_ids or []) if parent_id}
+    if not parent_ids or not split_flags_available(conn):
+        return
+    flags = _child_flags(conn, sorted(parent_ids))
+    _write_flags(conn, [pid for pid, marked in flags.items() if marked], 1, 1)
+    _write_flags(conn, [pid for pid, marked in flags.items() if not marked], 1, 0)
+    _write_flags(conn, parent_ids - set(flags), 0, 0)
+
+
+def split_parent_ids(conn, transaction_ids):
+    """Parents of the split children among `transaction_ids`; collect before deleting those children."""
+    transaction_ids = [str(txn_id) for txn_id in (transaction_ids or []) if txn_id]
+    if not transaction_ids:
+        return set()
+    rows = conn.execute(text("""
+        SELECT DISTINCT parent_id
+        FROM transactions
+        WHERE id IN :ids AND parent_id IS NOT NULL
+    """).bindparams(bindparam('ids', expanding=True)), {'ids': transaction_ids})
+    return {str(row.parent_id) for row in rows if row.parent_id}
+
+
+def refresh_split_flags_for(conn, transaction_ids):
+    """Refresh the flags of `transaction_ids` and of the split parents they belong to."""
+    transaction_ids = [str(txn_id) for txn_id in (transaction_ids or []) if txn_id]
+    if not transaction_ids or not split_flags_available(conn):
+        return
+    refresh_split_flags(conn, set(transaction_ids) | split_parent_ids(conn, transaction_ids))
+
+
+def split_parent_ids_for_marks(conn, mark_ids):
+    """Parents of split children carrying `mark_ids`; collect before clearing those marks."""
+    mark_ids = [mark_id for mark_id in (mark_ids or []) if mark_id]
+    if not mark_ids:
+        return set()
+    rows = conn.execute(text("""
+        SELECT DISTINCT parent_id
+        FROM transactions
+        WHERE mark_id IN :mark_ids AND parent_id IS NOT NULL
+    """).bindparams(bindparam('mark_ids', expanding=True)), {'mark_ids': mark_ids})
+    return {str(row.parent_id) for row in rows if row.parent_id}
+
+
+def repair_split_flags(conn):
+    """Recompute every split flag from scratch; returns the number of rows corrected."""
+    if not split_flags_available(conn):
+        return 0
+    expected = {pid: (1, marked) for pid, marked in _child_flags(conn).items()}
+    current = {
+        str(row.id): (int(row.is_split_container or 0), int(row.has_marked_children or 0))
+        for row in conn.execute(text(f"""
+            SELECT id, {IS_SPLIT_CONTAINER} AS is_split_container, {HAS_MARKED_CHILDREN} AS has_marked_children
+            FROM transactions
+            WHERE {IS_SPLIT_CONTAINER} <> 0 OR {HAS_MARKED_CHILDREN} <> 0
+        """))
+    }
+    stale = {
+        txn_id for txn_id in set(expected) | set(current)
+        if expected.get(txn_id, (0, 0)) != current.get(txn_id, (0, 0))
+    }
+    return sum(
+        _write_flags(conn, [txn_id for txn_id in stale if expected.get(txn_id, (0, 0)) == flags], *flags)
+        for flags in ((1, 1), (1, 0), (0, 0))
+    )
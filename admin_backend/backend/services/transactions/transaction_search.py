@@ -0,0 +1,203 @@
+import re
+
+from sqlalchemy import bindparam, text
+
+from backend.db.schema import get_table_columns
+
+# Full-text index over transaction descriptions and mark names (migration 076): an InnoDB FULLTEXT
+# table on MySQL, an FTS5 virtual table on SQLite. Writers refresh the rows they touch; searches
+# join the ranked matches instead of scanning `description LIKE '%term%'`.
+SEARCH_TABLE = 'transaction_search'
+MAX_SEARCH_TERMS = 8
+REFRESH_CHUNK_SIZE = 500
+MARK_NAME_COLUMNS = ('internal_report', 'personal_use', 'tax_report')
+# InnoDB FULLTEXT never indexes tokens shorter than innodb_ft_min_token_size or its default
+# stopwords, so `+pt*` would match nothing. Such terms are matched as word prefixes with LIKE
+# against the normalized search_text instead.
+DEFAULT_INNODB_MIN_TOKEN_SIZE = 3
+INNODB_STOPWORDS = frozenset((
+    'a', 'about', 'an', 'are', 'as', 'at', 'be', 'by', 'com', 'de', 'en', 'for', 'from', 'how', 'i',
+    'in', 'is', 'it', 'la', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'what', 'when',
+    'where', 'who', 'will', 'with', 'und', 'www',
+))
+
+_NON_WORD_RE = re.compile(r'[\W_]+', re.UNICODE)
+
+
+def normalize_search_text(*parts):
+    """Lowercased words of `parts` joined by single spaces; punctuation separates words."""
+    joined = ' '.join(str(part) for part in parts if part)
+    return ' '.join(_NON_WORD_RE.sub(' ', joined.lower()).split())
+
+
+def search_terms(search):
+    return normalize_search_text(search).split()[:MAX_SEARCH_TERMS]
+
+
+def search_index_available(conn):
+    return bool(get_table_columns(conn, SEARCH_TABLE))
+
+
+_innodb_min_token_size = None
+
+
+def _mysql_min_token_size(conn):
+    global _innodb_min_token_size
+    if _innodb_min_token_size is None:
+        value = conn.execute(text("SELECT @@innodb_ft_min_token_size")).scalar()
+        _innodb_min_token_size = int(value or DEFAULT_INNODB_MIN_TOKEN_SIZE)
+    return _innodb_min_token_size
+
+
+def _mysql_match_sql(terms, min_token_size):
+    """
+    (match_sql, params) over the FULLTEXT index for `terms`; terms InnoDB does not index
+    (too short or stopwords) become word-prefix LIKE filters on the same rows.
+    """
+    indexed_terms = [term for term in terms if len(term) >= min_token_size and term not in INNODB_STOPWORDS]
+    unindexed_terms = [term for term in terms if term not in indexed_terms]
+    params = {}
+    conditions = []
+    rank_sql = '0'
+    if indexed_terms:
+        rank_sql = "MATCH(search_text) AGAINST (:search_query IN BOOLEAN MODE)"
+        conditions.append(rank_sql)
+        params['search_query'] = ' '.join(f'+{term}*' for term in indexed_terms)
+    for index, term in enumerate(unindexed_terms):
+        # search_text is single-space separated words, so ' <term>' starts a word.
+        conditions.append(f"CONCAT(' ', search_text) LIKE :search_prefix_{index}")
+        params[f'search_prefix_{index}'] = f'% {term}%'
+    match_sql = f"""
+        SELECT transaction_id, {rank_sql} AS search_rank
+        FROM {SEARCH_TABLE}
+        WHERE {' AND '.join(conditions)}
+    """
+    return match_sql, params
+
+
+def _index_rows(conn, where_sql, params, expanding=(), limit=None):
+    mark_columns = get_table_columns(conn, 'marks')
+    mark_names = [column for column in MARK_NAME_COLUMNS if column in mark_columns]
+    mark_select = ''.join(f", m.{column} AS mark_{column}" for column in mark_names)
+    mark_join = "LEFT JOIN marks m ON m.id = t.mark_id" if mark_names else ""
+    query = text(f"""
+        SELECT t.id, t.description{mark_select}
+        FROM transactions t
+        {mark_join}
+        WHERE {where_sql}
+        {f'ORDER BY t.id LIMIT {int(limit)}' if limit else ''}
+    """)
+    if expanding:
+        query = query.bindparams(*(bindparam(name, expanding=True) for name in expanding))
+    return [
+        {
+            'transaction_id': str(row.id),
+            'search_text': normalize_search_text(
+                row.description, *(getattr(row, f'mark_{column}') for column in mark_names)
+            ),
+        }
+        for row in conn.execute(query, params)
+    ]
+
+
+def _replace_index_rows(conn, transaction_ids, rows):
+    conn.execute(
+        text(f"DELETE FROM {SEARCH_TABLE} WHERE transaction_id IN :ids").bindparams(bindparam('ids', expanding=True)),
+        {'ids': sorted(transaction_ids)},
+    )
+    if rows:
+        conn.execute(text(f"""
+            INSERT INTO {SEARCH_TABLE} (transaction_id, search_text)
+            VALUES (:transaction_id, :search_text)
+        """), rows)
+
+
+def refresh_search_index(conn, transaction_ids):
+    """
+    Re-index `transaction_ids` and their split children from current descriptions and marks.
+    Call inside the writing transaction; IDs that no longer exist drop out of the index.
+    """
+    transaction_ids = sorted({str(txn_id) for txn_id in (transaction_ids or []) if txn_id})
+    if not transaction_ids or not search_index_available(conn):
+        return
+    has_parent_id = 'parent_id' in get_table_columns(conn, 'transactions')
+    where_sql = "t.id IN :ids OR t.parent_id IN :ids" if has_parent_id else "t.id IN :ids"
+    for start in range(0, len(transaction_ids), REFRESH_CHUNK_SIZE):
+        chunk = transaction_ids[start:start + REFRESH_CHUNK_SIZE]
+        rows = _index_rows(conn, where_sql, {'ids': chunk}, expanding=('ids',))
+        _replace_index_rows(conn, set(chunk) | {row['transaction_id'] for row in rows}, rows)
+
+
+def transaction_ids_for_marks(conn, mark_ids):
+    """Transactions carrying `mark_ids`; collect before a mark is renamed or detached."""
+    mark_ids = [mark_id for mark_id in (mark_ids or []) if mark_id]
+    if not mark_ids or not search_index_available(conn):
+        return set()
+    rows = conn.execute(
+        text("SELECT id FROM transactions WHERE mark_id IN :mark_ids").bindparams(bindparam('mark_ids', expanding=True)),
+        {'mark_ids': mark_ids},
+    )
+    return {str(row.id) for row in rows}
+
+
+def repair_search_index(conn):
+    """Rebuild the whole index in id order; returns the number of transactions indexed."""
+    if not search_index_available(conn):
+        return 0
+    conn.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+    indexed = 0
+    after = ''
+    while True:
+        rows = _index_rows(conn, "t.id > :after", {'after': after}, limit=REFRESH_CHUNK_SIZE)
+        if not rows:
+            return indexed
+        conn.execute(text(f"""
+            INSERT INTO {SEARCH_TABLE} (transaction_id, search_text)
+            VALUES (:transaction_id, :search_text)
+        """), rows)
+        indexed += len(rows)
+        after = rows[-1]['transaction_id']
+
+
+def search_join(conn, search, alias='t'):
+    """
+    (join_sql, params) restricting `alias` to transactions matching every word of `search`,
+    each as a prefix, and exposing a relevance score as `search_hits.search_rank` (higher is better).
+    Returns ('', {}) for a blank search. With the index, terms match at word starts only
+    ('umber' does not find 'Sumber'); without it the substring LIKE matching still applies.
+    """
+    terms = search_terms(search)
+    if not terms:
+        return '', {}
+
+    if search_index_available(conn):
+        if conn.dialect.name == 'sqlite':
+            match_sql = f"""
+                SELECT transaction_id, -bm25({SEARCH_TABLE}) AS search_rank
+                FROM {SEARCH_TABLE}
+                WHERE {SEARCH_TABLE} MATCH :search_query
+            """
+            params = {'search_query': ' '.join(f'"{term}"*' for term in terms)}
+        else:
+            match_sql, params = _mysql_match_sql(terms, _mysql_min_token_size(conn))
+        return f"JOIN ({match_sql}) search_hits ON search_hits.transaction_id = {alias}.id", params
+
+    mark_columns = get_table_columns(conn, 'marks')
+    fields = ['t_search.description'] + [
+        f'm_search.{column}' for column in MARK_NAME_COLUMNS if column in mark_columns
+    ]
+    mark_join = "LEFT JOIN marks m_search ON m_search.id = t_search.mark_id" if len(fields) > 1 else ""
+    params = {}
+    term_clauses = []
+    for index, term in enumerate(terms):
+        params[f'search_term_{index}'] = f'%{term}%'
+        term_clauses.append('(' + ' OR '.join(
+            f"LOWER(COALESCE({field}, '')) LIKE :search_term_{index}" for field in fields
+        ) + ')')
+    match_sql = f"""
+        SELECT t_search.id AS transaction_id, 0 AS search_rank
+        FROM transactions t_search
+        {mark_join}
+        WHERE {' AND '.join(term_clauses)}
+    """
+    return f"JOIN ({match_sql}) search_hits ON search_hits.transaction_id = {alias}.id", params
@@ -1,17 +1,33 @@
 import logging
 import uuid
 
-import pandas as pd
-
 from backend.db.schema import get_table_columns
 from backend.db.session import get_db_engine
+from backend.metrics import count_import_rows
+from backend.services.reporting import data_changes
+from backend.services.reporting.data_changes import change_date, record_data_changes
+from backend.services.transactions.import_batches import refresh_import_batches
+from backend.services.transactions.mark_stats import refresh_mark_stats_for
+from backend.services.transactions.payroll_aggregates import refresh_payroll_aggregates
 from backend.services.transactions.transaction_queries import insert_transactions_query
+from backend.services.transactions.transaction_search import refresh_search_index
 from backend.services.transactions.transaction_utils import build_transaction_record
 
 logger = logging.getLogger(__name__)
 
 
-def save_transactions_to_db(df: pd.DataFrame, bank_code: str, source_file: str, file_hash: str):
+def _imported_date_ranges(records):
+    ranges = {}
+    for record in records:
+        txn_date = change_date(record.get('txn_date'))
+        if txn_date is None:
+            continue
+        low, high = ranges.get(record.get('company_id'), (txn_date, txn_date))
+        ranges[record.get('company_id')] = (min(low, txn_date), max(high, txn_date))
+    return [(company_id, low, high) for company_id, (low, high) in ranges.items()]
+
+
+def save_transactions_to_db(df, bank_code: str, source_file: str, file_hash: str):
     engine, error_msg = get_db_engine()
     if engine is None:
         return False, error_msg or 'Failed to connect to database'
@@ -59,6 +75,11 @@ def save_transactions_to_db(df: pd.DataFrame, bank_code: str, source_file: str,
                 for record in records
             ]
             conn.execute(insert_transactions_query(insert_columns), insert_records)
+            record_data_changes(conn, data_changes.TRANSACTIONS, _imported_date_ranges(records))
+            refresh_import_batches(conn, {(record.get('source_file'), record.get('bank_code')) for record in records})
+            refresh_search_index(conn, [record['id'] for record in records])
+            refresh_payroll_aggregates(conn, refresh_mark_stats_for(conn, [record['id'] for record in records]))
+        count_import_rows(bank_code, inserted=len(insert_records))
         return True, None
     except Exception as exc:
         return False, f'Database Error: {exc}'
@@ -1,12 +1,12 @@
 import re
 from datetime import datetime
 
-import pandas as pd
-
 
 def null_if_nan(value):
     if value is None:
         return None
+    import pandas as pd
+
     try:
         if pd.isna(value):
             return None
@@ -1,5 +1,4 @@
 import re
-import pdfplumber
 import pandas as pd
 from datetime import datetime
 
@@ -9,6 +8,7 @@ from bank_parsers.parser_common import (
     conversion_timestamp,
     ensure_pdf_file,
     format_amount,
+    open_pdf_document,
     parse_decimal_amount,
     source_file_name,
     validate_pdf_document,
@@ -24,7 +24,7 @@ def parse_statement(pdf_path):
     current_conversion_timestamp = conversion_timestamp()
 
     try:
-        with pdfplumber.open(pdf_path) as pdf:
+        with open_pdf_document(pdf_path, bank_key='bca') as pdf:
             validate_pdf_document(pdf, 'BCA statement')
             full_text_parts = collect_page_text(pdf)
 
@@ -1,7 +1,7 @@
-import pdfplumber
 import pandas as pd
 import re
 from datetime import datetime
+from decimal import Decimal
 
 from bank_parsers.parser_common import (
     append_debug_log,
@@ -9,6 +9,7 @@ from bank_parsers.parser_common import (
     conversion_timestamp,
     ensure_pdf_file,
     format_amount,
+    open_pdf_document,
     parse_decimal_amount,
     reset_debug_log,
     source_file_name,
@@ -48,7 +49,7 @@ def parse_statement(pdf_path, base_year=None, password=None):
         f"base_year: {base_year}",
     )
     try:
-        with pdfplumber.open(pdf_path, password=password) as pdf:
+        with open_pdf_document(pdf_path, password=password, bank_key='ccbca') as pdf:
             validate_pdf_document(pdf, 'BCA credit card statement')
             full_text_parts = collect_page_text(pdf)
 
@@ -2,11 +2,11 @@ import re
 from datetime import datetime
 
 import pandas as pd
-import pdfplumber
 from bank_parsers.parser_common import (
     conversion_timestamp,
     ensure_pdf_file,
     format_amount,
+    open_pdf_document,
     parse_decimal_amount,
     source_file_name,
     validate_pdf_document,
@@ -29,7 +29,7 @@ def parse_statement(pdf_path):
     transactions = []
     
     try:
-        with pdfplumber.open(pdf_path) as pdf:
+        with open_pdf_document(pdf_path, bank_key='blu') as pdf:
             validate_pdf_document(pdf, 'BLU statement')
             
             # Extract text from first page
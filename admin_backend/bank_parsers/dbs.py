@@ -1,4 +1,3 @@
-import pdfplumber
 import pandas as pd
 import re
 from datetime import datetime
@@ -9,6 +8,7 @@ from bank_parsers.parser_common import (
     conversion_timestamp,
     ensure_pdf_file,
     format_amount,
+    open_pdf_document,
     parse_decimal_amount,
     reset_debug_log,
     source_file_name,
@@ -39,7 +39,7 @@ def parse_statement(pdf_path, password=None, target_year=None):
     
     try:
         # Open PDF with password if provided
-        with pdfplumber.open(pdf_path, password=password) as pdf:
+        with open_pdf_document(pdf_path, password=password, bank_key='dbs') as pdf:
             validate_pdf_document(pdf, 'DBS statement')
             full_text_parts = collect_page_text(pdf)
             for page in pdf.pages:
@@ -3,12 +3,12 @@ from datetime import datetime
 from decimal import Decimal
 
 import pandas as pd
-import pdfplumber
 from bank_parsers.parser_common import (
     collect_page_text,
     conversion_timestamp,
     ensure_pdf_file,
     format_amount,
+    open_pdf_document,
     parse_decimal_amount,
     source_file_name,
     validate_pdf_document,
@@ -139,7 +139,7 @@ def parse_statement(pdf_path):
 
     try:
         lines = []
-        with pdfplumber.open(pdf_path) as pdf:
+        with open_pdf_document(pdf_path, bank_key='mandiri') as pdf:
             validate_pdf_document(pdf, 'Mandiri statement')
             full_text_parts = collect_page_text(pdf)
             for text in full_text_parts:
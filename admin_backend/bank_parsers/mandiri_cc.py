@@ -1,12 +1,12 @@
 import re
 from datetime import datetime
 import pandas as pd
-import pdfplumber
 from bank_parsers.parser_common import (
     collect_page_text,
     conversion_timestamp,
     ensure_pdf_file,
     format_amount,
+    open_pdf_document,
     parse_decimal_amount,
     source_file_name,
     validate_pdf_document,
@@ -53,7 +53,7 @@ def parse_statement(pdf_path, password=None):
     current_conversion_timestamp = conversion_timestamp()
     
     try:
-        with pdfplumber.open(pdf_path, password=password) as pdf:
+        with open_pdf_document(pdf_path, password=password, bank_key='ccmandiri') as pdf:
             validate_pdf_document(pdf, 'Mandiri credit card statement')
             full_text_parts = collect_page_text(pdf)
 
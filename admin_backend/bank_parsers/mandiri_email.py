@@ -3,7 +3,6 @@ from datetime import datetime
 from decimal import Decimal
 
 import pandas as pd
-import pdfplumber
 
 from bank_parsers import mandiri
 from bank_parsers.parser_common import (
@@ -11,6 +10,7 @@ from bank_parsers.parser_common import (
     conversion_timestamp,
     ensure_pdf_file,
     format_amount,
+    open_pdf_document,
     parse_decimal_id_amount,
     parse_decimal_us_amount,
     source_file_name,
@@ -435,7 +435,7 @@ def parse_statement(pdf_path):
 
     try:
         lines = []
-        with pdfplumber.open(pdf_path) as pdf:
+        with open_pdf_document(pdf_path, bank_key='mandiri_email') as pdf:
             validate_pdf_document(pdf, 'Mandiri email statement')
             full_text_parts = collect_page_text(pdf)
             for text in full_text_parts:
@@ -1,7 +1,14 @@
 import os
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
 
+PDF_BACKEND_ENV = 'BANK_PARSER_PDF_BACKEND'
+DEFAULT_PDF_BACKEND = 'pdfplumber'
+
+_pdf_backend_override = ContextVar('pdf_backend_override', default=None)
+
 
 def parser_debug_enabled():
     return str(os.environ.get('BANK_PARSER_DEBUG_LOGS', '')).strip().lower() in {
@@ -63,6 +70,198 @@ def validate_pdf_document(pdf, statement_name):
         raise ValueError(f"PDF file validation failed. The file may be corrupted: {exc}")
 
 
+class PdfplumberBackend:
+    """Default extraction backend; documents are native pdfplumber objects."""
+
+    name = 'pdfplumber'
+
+    def open(self, pdf_path, password=None):
+        import pdfplumber
+
+        return pdfplumber.open(pdf_path, password=password)
+
+
+class PdfiumBackend:
+    """pypdfium2-based backend exposing the pdfplumber page interface parsers rely on."""
+
+    name = 'pdfium'
+
+    def open(self, pdf_path, password=None):
+        return PdfiumDocument(pdf_path, password=password)
+
+
+class PdfiumDocument:
+    def __init__(self, pdf_path, password=None):
+        import pypdfium2
+
+        self._pdf = pypdfium2.PdfDocument(pdf_path, password=password)
+        self.pages = [PdfiumPage(self._pdf, index) for index in range(len(self._pdf))]
+        self.metadata = self._pdf.get_metadata_dict()
+
+    def close(self):
+        for page in self.pages:
+            page.close()
+        self._pdf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        self.close()
+
+
+class PdfiumPage:
+    def __init__(self, pdf, page_index):
+        self._pdf = pdf
+        self.page_number = page_index + 1
+        self._page = None
+        self._textpage = None
+        self._chars = None
+
+    def _load(self):
+        if self._textpage is None:
+            self._page = self._pdf[self.page_number - 1]
+            self._textpage = self._page.get_textpage()
+        return self._textpage
+
+    @property
+    def width(self):
+        self._load()
+        return self._page.get_width()
+
+    @property
+    def height(self):
+        self._load()
+        return self._page.get_height()
+
+    @property
+    def chars(self):
+        if self._chars is None:
+            import pypdfium2.raw as pdfium_c
+
+            textpage = self._load()
+            height = self._page.get_height()
+            chars = []
+            for index in range(textpage.count_chars()):
+                codepoint = pdfium_c.FPDFText_GetUnicode(textpage.raw, index)
+                if not codepoint:
+                    continue
+                left, bottom, right, top = textpage.get_charbox(index, loose=True)
+                chars.append({
+                    'text': chr(codepoint),
+                    'x0': left,
+                    'x1': right,
+                    'top': height - top,
+                    'bottom': height - bottom,
+                })
+            self._chars = chars
+        return self._chars
+
+    def extract_text(self):
+        text = self._load().get_text_range()
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+
+    def extract_words(self, keep_blank_chars=False, x_tolerance=3, y_tolerance=3, use_text_flow=False, **_kwargs):
+        chars = [char for char in self.chars if char['text'] not in ('\r', '\n')]
+        if not use_text_flow:
+            chars = _sort_chars_into_lines(chars, y_tolerance)
+
+        words = []
+        current = None
+        for char in chars:
+            is_blank = char['text'].isspace()
+            if is_blank and not keep_blank_chars:
+                current = None
+                continue
+
+            starts_new_word = (
+                current is None
+                or char['x0'] > current['x1'] + x_tolerance
+                or char['x0'] < current['x0']
+                or abs(char['top'] - current['top']) > y_tolerance
+            )
+            if starts_new_word:
+                if is_blank:
+                    continue
+                current = dict(char)
+                words.append(current)
+                continue
+
+            current['text'] += char['text']
+            current['x1'] = max(current['x1'], char['x1'])
+            current['bottom'] = max(current['bottom'], char['bottom'])
+
+        for word in words:
+            word['text'] = word['text'].rstrip()
+        return [word for word in words if word['text']]
+
+    def close(self):
+        if self._textpage is not None:
+            self._textpage.close()
+            self._page.close()
+        self._textpage = None
+        self._page = None
+
+
+def _sort_chars_into_lines(chars, y_tolerance):
+    lines = []
+    for char in sorted(chars, key=lambda item: item['top']):
+        if lines and abs(char['top'] - lines[-1][0]) <= y_tolerance:
+            lines[-1][1].append(char)
+        else:
+            lines.append((char['top'], [char]))
+    ordered = []
+    for _, line_chars in lines:
+        ordered.extend(sorted(line_chars, key=lambda item: item['x0']))
+    return ordered
+
+
+PDF_BACKENDS = {
+    PdfplumberBackend.name: PdfplumberBackend(),
+    PdfiumBackend.name: PdfiumBackend(),
+}
+
+
+def resolve_pdf_backend_name(bank_key=None):
+    """Pick the backend: explicit override, then per-bank env, then global env."""
+    override = _pdf_backend_override.get()
+    if override:
+        return override
+
+    candidates = []
+    if bank_key:
+        candidates.append(os.environ.get(f"{PDF_BACKEND_ENV}_{str(bank_key).upper()}"))
+    candidates.append(os.environ.get(PDF_BACKEND_ENV))
+    for candidate in candidates:
+        name = str(candidate or '').strip().lower()
+        if name:
+            return name
+    return DEFAULT_PDF_BACKEND
+
+
+def get_pdf_backend(name=None, bank_key=None):
+    backend_name = name or resolve_pdf_backend_name(bank_key)
+    backend = PDF_BACKENDS.get(backend_name)
+    if backend is None:
+        raise ValueError(f"Unknown PDF extraction backend: {backend_name}")
+    return backend
+
+
+@contextmanager
+def pdf_backend_override(name):
+    """Force every parser in the current context onto one backend (used by parity checks)."""
+    get_pdf_backend(name)
+    token = _pdf_backend_override.set(name)
+    try:
+        yield
+    finally:
+        _pdf_backend_override.reset(token)
+
+
+def open_pdf_document(pdf_path, password=None, bank_key=None):
+    return get_pdf_backend(bank_key=bank_key).open(pdf_path, password=password)
+
+
 def collect_page_text(pdf):
     full_text_parts = []
     for page in pdf.pages:
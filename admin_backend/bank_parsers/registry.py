@@ -0,0 +1,81 @@
+import importlib
+import threading
+
+DEFAULT_BANK_KEY = 'bca'
+
+
+class ParserSpec:
+    """A bank parser module and how to call its `parse_statement`; the module is imported on first use."""
+
+    def __init__(self, bank_key, module_name, call, file_format='pdf'):
+        self.bank_key = bank_key
+        self.module_name = module_name
+        self.file_format = file_format
+        self._call = call
+
+    def load(self):
+        return _load_module(self.module_name)
+
+    def parse(self, file_path, inferred_year=None, password=None):
+        return self._call(self.load(), file_path, inferred_year, password)
+
+
+PARSERS = {
+    spec.bank_key: spec
+    for spec in (
+        ParserSpec('bca', 'bank_parsers.bca', lambda module, path, year, password: module.parse_statement(path)),
+        ParserSpec('mandiri', 'bank_parsers.mandiri', lambda module, path, year, password: module.parse_statement(path)),
+        ParserSpec(
+            'mandiri_email', 'bank_parsers.mandiri_email',
+            lambda module, path, year, password: module.parse_statement(path),
+        ),
+        ParserSpec(
+            'dbs', 'bank_parsers.dbs',
+            lambda module, path, year, password: module.parse_statement(path, target_year=year),
+        ),
+        ParserSpec('ccbca', 'bank_parsers.bca_cc', lambda module, path, year, password: module.parse_statement(path, year)),
+        ParserSpec(
+            'ccmandiri', 'bank_parsers.mandiri_cc',
+            lambda module, path, year, password: module.parse_statement(path, password=password),
+        ),
+        ParserSpec(
+            'bri', 'bank_parsers.bri',
+            lambda module, path, year, password: module.parse_statement(path),
+            file_format='csv',
+        ),
+        ParserSpec(
+            'saqu', 'bank_parsers.saqu',
+            lambda module, path, year, password: module.parse_statement(path, password=password),
+        ),
+        ParserSpec('blu', 'bank_parsers.blu', lambda module, path, year, password: module.parse_statement(path)),
+    )
+}
+
+_modules = {}
+_modules_lock = threading.Lock()
+
+
+def _load_module(module_name):
+    module = _modules.get(module_name)
+    if module is None:
+        with _modules_lock:
+            module = _modules.get(module_name)
+            if module is None:
+                module = importlib.import_module(module_name)
+                _modules[module_name] = module
+    return module
+
+
+def get_parser(bank_key):
+    """Spec for `bank_key`; unrecognised keys fall back to the BCA parser, as manual selection always has."""
+    return PARSERS.get(bank_key) or PARSERS[DEFAULT_BANK_KEY]
+
+
+def loaded_parser_modules():
+    return sorted(_modules)
+
+
+def preload_parsers():
+    """Import every parser now, e.g. in a preloading gunicorn master so workers share the pages."""
+    for spec in PARSERS.values():
+        spec.load()
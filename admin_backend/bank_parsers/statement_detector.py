@@ -0,0 +1,315 @@
+import re
+
+from bank_parsers.parser_common import open_pdf_document
+
+# Backend lookup key, so detection can use its own extractor via
+# BANK_PARSER_PDF_BACKEND_DETECT without affecting the parsers.
+DETECTOR_BACKEND_KEY = 'detect'
+
+MONTH_NUMBERS = {
+    'JAN': 1, 'JANUARI': 1, 'JANUARY': 1,
+    'FEB': 2, 'FEBRUARI': 2, 'FEBRUARY': 2,
+    'MAR': 3, 'MARET': 3, 'MARCH': 3,
+    'APR': 4, 'APRIL': 4,
+    'MAY': 5, 'MEI': 5,
+    'JUN': 6, 'JUNI': 6, 'JUNE': 6,
+    'JUL': 7, 'JULI': 7, 'JULY': 7,
+    'AUG': 8, 'AGT': 8, 'AGU': 8, 'AGS': 8, 'AGUSTUS': 8, 'AUGUST': 8,
+    'SEP': 9, 'SEPT': 9, 'SEPTEMBER': 9,
+    'OCT': 10, 'OKT': 10, 'OKTOBER': 10, 'OCTOBER': 10,
+    'NOV': 11, 'NOPEMBER': 11, 'NOVEMBER': 11,
+    'DEC': 12, 'DES': 12, 'DESEMBER': 12, 'DECEMBER': 12,
+}
+
+# Per-bank first-page signatures. A signature matches when its markers score
+# at least `min_score`; the highest score wins and ties go to the earlier entry,
+# so the more specific statement types are listed before their parent banks.
+STATEMENT_SIGNATURES = [
+    {
+        'bank_key': 'ccbca',
+        'markers': (
+            ('REKENING KARTU KREDIT', 3),
+            ('TANGGAL REKENING', 2),
+            ('TAGIHAN BARU', 1),
+            ('PEMBAYARAN MINIMUM', 1),
+            ('HALO BCA', 1),
+        ),
+        'min_score': 3,
+        'account_patterns': (
+            r'(\d{4}-\d{4}-\d{4}-\d{4})',
+            r'(\d{4}-\d{2}XX-XXXX-\d{4})',
+        ),
+        'period_patterns': (
+            r'TANGGAL\s+REKENING\s*:\s*(\d{1,2}\s+[A-Za-z]+\s+\d{2,4})',
+            r'TANGGAL\s+REKENING\s*:\s*(\d{2}/\d{2}/\d{2,4})',
+        ),
+        'currency_patterns': (r'JUMLAH\s*\(\s*([A-Z]{3})\s*\)',),
+    },
+    {
+        'bank_key': 'ccmandiri',
+        'markers': (
+            ('NO KARTU', 2),
+            ('TANGGAL TAGIHAN', 2),
+            ('TAGIHAN BULAN LALU', 1),
+            ("LIVIN'POIN", 1),
+            ('MANDIRI', 1),
+        ),
+        'min_score': 4,
+        'account_patterns': (r'No\s+Kartu\s*:\s*(\d{4}\s+\d{4}\s+\d{4}\s+\d{4})',),
+        'period_patterns': (r'Tanggal\s+Tagihan\s*:\s*(\d{1,2}\s+[A-Za-z]+\s+\d{4})',),
+    },
+    {
+        'bank_key': 'mandiri_email',
+        'markers': (
+            ('REKENING KORAN / STATEMENT OF ACCOUNT', 4),
+            ('THIS E-STATEMENT IS AN ELECTRONIC DOCUMENT', 4),
+            ('RINGKASAN / AT A GLANCE', 1),
+            ('MANDIRI', 1),
+        ),
+        'min_score': 4,
+        'account_patterns': (
+            r'Nomor\s+Rekening(?:/Account Number)?\s*:\s*([0-9\s]+)',
+            r'(\d{3}-\d{2}-\d{7}-\d)',
+        ),
+        'period_patterns': (
+            r'Periode\s*/\s*Period\s*:\s*(\d{1,2}/\d{2}/\d{2,4})',
+            r'Periode(?:/Period)?\s*:\s*(\d{1,2}\s+[A-Za-z]+\s+\d{4})',
+        ),
+        'currency_patterns': (r'Mata\s+Uang(?:/Currency)?\s*:\s*([A-Z]{3})',),
+    },
+    {
+        'bank_key': 'mandiri',
+        'markers': (
+            ('NOMOR REKENING/ACCOUNT NUMBER', 2),
+            ('PERIODE/PERIOD', 1),
+            ('SALDO AWAL/INITIAL BALANCE', 1),
+            ('PT BANK MANDIRI', 2),
+            ('TABUNGAN MANDIRI', 1),
+            ('E-STATEMENT', 1),
+        ),
+        'min_score': 3,
+        'account_patterns': (r'Nomor\s+Rekening(?:/Account Number)?\s*:\s*([0-9\s]+)',),
+        'period_patterns': (r'Periode(?:/Period)?\s*:\s*(\d{1,2}\s+[A-Za-z]+\s+\d{4})',),
+        'currency_patterns': (r'Mata\s+Uang(?:/Currency)?\s*:\s*([A-Z]{3})',),
+    },
+    {
+        'bank_key': 'blu',
+        'markers': (
+            ('BLUACCOUNT', 3),
+            ('BCA DIGITAL', 3),
+            ('TANGGAL & JAM', 1),
+            ('SISA SALDO', 1),
+        ),
+        'min_score': 3,
+        'account_patterns': (r'Rekening\s*/\s*Account\s*\n\s*(\w+)',),
+        'period_patterns': (r'Periode[^:\n]*:\s*(\d{1,2}\s+[A-Za-z]+\s+\d{4})',),
+    },
+    {
+        'bank_key': 'saqu',
+        'markers': (
+            ('SAQU', 3),
+            ('SAKU UTAMA', 2),
+            ('SAKU NABUNG', 1),
+            ('SAKU TRANSAKSI', 1),
+            ('BOOSTER', 1),
+        ),
+        'min_score': 3,
+        'account_patterns': (r'No(?:mor)?\s+rekening\s*:\s*(\d+)',),
+        'period_patterns': (r'Periode[^:\n]*:\s*(\d{1,2}\s+[A-Za-z]+\s+\d{4})',),
+    },
+    {
+        'bank_key': 'dbs',
+        'markers': (
+            ('DBS', 2),
+            ('DBS CUSTOMER CENTRE', 2),
+            ('STATEMENT DATE', 1),
+            ('ACCOUNT NUMBER', 1),
+            ('CONTINUE TO NEXT PAGE', 1),
+        ),
+        'min_score': 3,
+        'account_patterns': (r'Account\s+Number\s*:\s*([0-9-]+)',),
+        'period_patterns': (
+            r'Statement\s+Date\s*:\s*(\d{1,2}\s+[A-Za-z]+\s+\d{4})',
+            r'(\d{2}/\d{2}/\d{4})',
+        ),
+        'date_order': 'mdy',
+    },
+    {
+        'bank_key': 'bca',
+        'markers': (
+            ('REKENING TAHAPAN', 2),
+            ('NO. REKENING', 1),
+            ('MATA UANG', 1),
+            ('MUTASI CR', 1),
+            ('SALDO AWAL', 1),
+            ('BERSAMBUNG KE HALAMAN BERIKUT', 1),
+            ('BCA', 1),
+        ),
+        'min_score': 3,
+        'account_patterns': (r'NO\.?\s*REK(?:ENING)?\s*:?[\s\n]*([0-9\s]+)',),
+        'period_patterns': (r'PERIODE\s*:?[\s\n]*([A-Z]+\s+\d{4})',),
+        'currency_patterns': (r'MATA\s+UANG\s*:?[\s\n]*([A-Z]{3})',),
+    },
+]
+
+BRI_CSV_COLUMNS = {'NOREK', 'TGL_TRAN', 'DESK_TRAN', 'MUTASI_DEBET', 'MUTASI_KREDIT', 'GLSIGN'}
+
+
+def _first_match(patterns, text):
+    for pattern in patterns or ():
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            return match.group(1).strip()
+    return None
+
+
+def _normalize_account(value):
+    if not value:
+        return None
+    if re.fullmatch(r'[\d\s-]+', value):
+        return re.sub(r'\D', '', value)
+    return value
+
+
+def _parse_period(raw, date_order='dmy'):
+    """Turn a matched period fragment into {'raw', 'year', 'month'}."""
+    if not raw:
+        return None
+
+    year = None
+    month = None
+    numeric = re.fullmatch(r'(\d{1,2})/(\d{1,2})/(\d{2,4})', raw)
+    if numeric:
+        first, second, year_part = numeric.groups()
+        month = int(first) if date_order == 'mdy' else int(second)
+        year = int(year_part)
+    else:
+        tokens = raw.upper().split()
+        for token in tokens:
+            if token in MONTH_NUMBERS and month is None:
+                month = MONTH_NUMBERS[token]
+            elif re.fullmatch(r'\d{4}', token):
+                year = int(token)
+        if year is None and tokens and re.fullmatch(r'\d{2}', tokens[-1]):
+            year = int(tokens[-1])
+
+    if year is not None and year < 100:
+        year += 2000
+    if month is not None and not 1 <= month <= 12:
+        month = None
+    return {'raw': raw, 'year': year, 'month': month}
+
+
+def _layout_features(page):
+    words = page.extract_words(x_tolerance=3, y_tolerance=3)
+    width = getattr(page, 'width', None)
+    height = getattr(page, 'height', None)
+    return {
+        'word_count': len(words),
+        'page_width': round(float(width), 1) if width else None,
+        'page_height': round(float(height), 1) if height else None,
+        'has_text_layer': bool(words),
+    }
+
+
+def score_signatures(text):
+    """Score every registered signature against first-page text, best first."""
+    upper_text = ' '.join((text or '').upper().split())
+    scored = []
+    for order, signature in enumerate(STATEMENT_SIGNATURES):
+        matched = [marker for marker, _ in signature['markers'] if marker in upper_text]
+        score = sum(weight for marker, weight in signature['markers'] if marker in upper_text)
+        if score >= signature['min_score']:
+            scored.append((score, -order, signature, matched))
+    scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+    return [(signature, score, matched) for score, _, signature, matched in scored]
+
+
+def detect_from_text(text):
+    candidates = score_signatures(text)
+    if not candidates:
+        return {
+            'bank_key': None,
+            'account_number': None,
+            'period': None,
+            'currency': None,
+            'confidence': 0.0,
+            'matched_markers': [],
+            'candidates': [],
+        }
+
+    signature, score, matched = candidates[0]
+    max_score = sum(weight for _, weight in signature['markers'])
+    return {
+        'bank_key': signature['bank_key'],
+        'account_number': _normalize_account(_first_match(signature.get('account_patterns'), text)),
+        'period': _parse_period(
+            _first_match(signature.get('period_patterns'), text),
+            signature.get('date_order', 'dmy'),
+        ),
+        'currency': (_first_match(signature.get('currency_patterns'), text) or 'IDR').upper(),
+        'confidence': round(score / max_score, 2),
+        'matched_markers': matched,
+        'candidates': [
+            {'bank_key': candidate['bank_key'], 'score': candidate_score}
+            for candidate, candidate_score, _ in candidates
+        ],
+    }
+
+
+def detect_pdf_statement(pdf_path, password=None):
+    """Identify a PDF statement from its first page only."""
+    with open_pdf_document(pdf_path, password=password, bank_key=DETECTOR_BACKEND_KEY) as pdf:
+        if not pdf.pages:
+            raise ValueError("PDF file is empty or corrupted")
+        first_page = pdf.pages[0]
+        text = first_page.extract_text() or ''
+        layout = _layout_features(first_page)
+
+    result = detect_from_text(text)
+    result['layout'] = layout
+    return result
+
+
+def detect_csv_statement(csv_path):
+    with open(csv_path, 'r', encoding='utf-8', errors='ignore') as handle:
+        header = handle.readline()
+        first_row = handle.readline()
+
+    delimiter = ';' if ';' in header else ','
+    columns = [col.strip().strip('"').upper() for col in header.split(delimiter)]
+    if not BRI_CSV_COLUMNS.issubset(columns):
+        return detect_from_text('')
+
+    values = [value.strip().strip('"') for value in first_row.split(delimiter)]
+    row = dict(zip(columns, values))
+    account_number = row.get('NOREK') or None
+    if account_number and re.fullmatch(r'[\d.]+E\+\d+', account_number, re.IGNORECASE):
+        account_number = f"{float(account_number):.0f}"
+
+    period = None
+    date_match = re.search(r'(\d{1,4})[/-](\d{1,2})[/-](\d{1,4})', row.get('TGL_TRAN', ''))
+    if date_match:
+        first, second, third = date_match.groups()
+        year = int(first) if len(first) == 4 else int(third)
+        if year < 100:
+            year += 2000
+        period = {'raw': row.get('TGL_TRAN'), 'year': year, 'month': int(second)}
+
+    return {
+        'bank_key': 'bri',
+        'account_number': account_number,
+        'period': period,
+        'currency': 'IDR',
+        'confidence': 1.0,
+        'matched_markers': sorted(BRI_CSV_COLUMNS),
+        'candidates': [{'bank_key': 'bri', 'score': len(BRI_CSV_COLUMNS)}],
+    }
+
+
+def detect_statement(file_path, password=None, is_csv=None):
+    if is_csv is None:
+        is_csv = file_path.lower().endswith('.csv')
+    if is_csv:
+        return detect_csv_statement(file_path)
+    return detect_pdf_statement(file_path, password=password)
@@ -1,3 +1,4 @@
+import hashlib
 import re
 from collections import Counter
 from pathlib import Path
@@ -102,3 +103,9 @@ def migration_summary():
         'errors': errors,
         'next_prefix': next_prefix,
     }
+
+
+def migration_fingerprint():
+    """Hash of every migration file name; it changes whenever a migration is added, renamed or removed."""
+    names = sorted(path.name for path in [*list_mysql_migrations(), *list_sqlite_migrations()])
+    return hashlib.sha256('\n'.join(names).encode('utf-8')).hexdigest()
@@ -0,0 +1,148 @@
+-- Migration 070: Composite indexes for report queries.
+-- Each index is created only when its table/column exists and the index is missing.
+
+SET @dbname = DATABASE();
+
+-- 1) Report date ranges scoped to one company
+SET @preparedStatement = (
+  SELECT IF(
+    (SELECT COUNT(*)
+     FROM INFORMATION_SCHEMA.COLUMNS
+     WHERE TABLE_SCHEMA = @dbname
+       AND TABLE_NAME = 'transactions'
+       AND COLUMN_NAME = 'company_id'
+    ) = 0
+    OR
+    (SELECT COUNT(*)
+     FROM INFORMATION_SCHEMA.STATISTICS
+     WHERE TABLE_SCHEMA = @dbname
+       AND TABLE_NAME = 'transactions'
+       AND INDEX_NAME = 'idx_transactions_company_date'
+    ) > 0,
+    'SELECT 1',
+    'CREATE INDEX idx_transactions_company_date ON transactions (company_id, txn_date)'
+  )
+);
+PREPARE stmt FROM @preparedStatement;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- 2) Report date ranges across all companies
+SET @preparedStatement = (
+  SELECT IF(
+    (SELECT COUNT(*)
+     FROM INFORMATION_SCHEMA.COLUMNS
+     WHERE TABLE_SCHEMA = @dbname
+       AND TABLE_NAME = 'transactions'
+       AND COLUMN_NAME = 'txn_date'
+    ) = 0
+    OR
+    (SELECT COUNT(*)
+     FROM INFORMATION_SCHEMA.STATISTICS
+     WHERE TABLE_SCHEMA = @dbname
+       AND TABLE_NAME = 'transactions'
+       AND INDEX_NAME = 'idx_transactions_txn_date'
+    ) > 0,
+    'SELECT 1',
+    'CREATE INDEX idx_transactions_txn_date ON transactions (txn_date)'
+  )
+);
+PREPARE stmt FROM @preparedStatement;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- 3) Split-parent NOT EXISTS probes (t_child.parent_id = t.id)
+SET @preparedStatement = (
+  SELECT IF(
+    (SELECT COUNT(*)
+     FROM INFORMATION_SCHEMA.COLUMNS
+     WHERE TABLE_SCHEMA = @dbname
+       AND TABLE_NAME = 'transactions'
+       AND COLUMN_NAME = 'parent_id'
+    ) = 0
+    OR
+    (SELECT COUNT(*)
+     FROM INFORMATION_SCHEMA.STATISTICS
+     WHERE TABLE_SCHEMA = @dbname
+       AND TABLE_NAME = 'transactions'
+       AND INDEX_NAME = 'idx_transactions_parent'
+    ) > 0,
+    'SELECT 1',
+    'CREATE INDEX idx_transactions_parent ON transactions (parent_id)'
+  )
+);
+PREPARE stmt FROM @preparedStatement;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- 4) Mark-driven reports and mark usage counts
+SET @preparedStatement = (
+  SELECT IF(
+    (SELECT COUNT(*)
+     FROM INFORMATION_SCHEMA.COLUMNS
+     WHERE TABLE_SCHEMA = @dbname
+       AND TABLE_NAME = 'transactions'
+       AND COLUMN_NAME = 'mark_id'
+    ) = 0
+    OR
+    (SELECT COUNT(*)
+     FROM INFORMATION_SCHEMA.STATISTICS
+     WHERE TABLE_SCHEMA = @dbname
+       AND TABLE_NAME = 'transactions'
+       AND INDEX_NAME = 'idx_transactions_mark_date'
+    ) > 0,
+    'SELECT 1',
+    'CREATE INDEX idx_transactions_mark_date ON transactions (mark_id, txn_date)'
+  )
+);
+PREPARE stmt FROM @preparedStatement;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- 5) Upload history and per-file lookups
+SET @preparedStatement = (
+  SELECT IF(
+    (SELECT COUNT(*)
+     FROM INFORMATION_SCHEMA.COLUMNS
+     WHERE TABLE_SCHEMA = @dbname
+       AND TABLE_NAME = 'transactions'
+       AND COLUMN_NAME = 'source_file'
+    ) = 0
+    OR
+    (SELECT COUNT(*)
+     FROM INFORMATION_SCHEMA.STATISTICS
+     WHERE TABLE_SCHEMA = @dbname
+       AND TABLE_NAME = 'transactions'
+       AND INDEX_NAME = 'idx_transactions_source_bank'
+    ) > 0,
+    'SELECT 1',
+    'CREATE INDEX idx_transactions_source_bank ON transactions (source_file, bank_code)'
+  )
+);
+PREPARE stmt FROM @preparedStatement;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+-- 6) Covering lookup for the per-report-type COA join
+SET @preparedStatement = (
+  SELECT IF(
+    (SELECT COUNT(*)
+     FROM INFORMATION_SCHEMA.COLUMNS
+     WHERE TABLE_SCHEMA = @dbname
+       AND TABLE_NAME = 'mark_coa_mapping'
+       AND COLUMN_NAME = 'report_type'
+    ) = 0
+    OR
+    (SELECT COUNT(*)
+     FROM INFORMATION_SCHEMA.STATISTICS
+     WHERE TABLE_SCHEMA = @dbname
+       AND TABLE_NAME = 'mark_coa_mapping'
+       AND INDEX_NAME = 'idx_mark_coa_mapping_scope'
+    ) > 0,
+    'SELECT 1',
+    'CREATE INDEX idx_mark_coa_mapping_scope ON mark_coa_mapping (mark_id, report_type, mapping_type, coa_id)'
+  )
+);
+PREPARE stmt FROM @preparedStatement;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
@@ -0,0 +1,25 @@
+-- Migration 070 (SQLite): Composite indexes for report queries.
+
+-- Report date ranges scoped to one company
+CREATE INDEX IF NOT EXISTS idx_transactions_company_date
+  ON transactions (company_id, txn_date);
+
+-- Report date ranges across all companies
+CREATE INDEX IF NOT EXISTS idx_transactions_txn_date
+  ON transactions (txn_date);
+
+-- Split-parent NOT EXISTS probes (t_child.parent_id = t.id)
+CREATE INDEX IF NOT EXISTS idx_transactions_parent
+  ON transactions (parent_id);
+
+-- Mark-driven reports and mark usage counts
+CREATE INDEX IF NOT EXISTS idx_transactions_mark_date
+  ON transactions (mark_id, txn_date);
+
+-- Upload history and per-file lookups
+CREATE INDEX IF NOT EXISTS idx_transactions_source_bank
+  ON transactions (source_file, bank_code);
+
+-- Covering lookup for the per-report-type COA join
+CREATE INDEX IF NOT EXISTS idx_mark_coa_mapping_scope
+  ON mark_coa_mapping (mark_id, report_type, mapping_type, coa_id);
@@ -0,0 +1,10 @@
+-- Migration 071: Create report_data_versions table
+-- Per-scope counters bumped by every write that can change report figures.
+-- Cached report results are keyed by these versions, so an edit invalidates them.
+-- Scopes: 'all' (every write), 'shared' (writes not tied to one company), 'company:<id>'.
+
+CREATE TABLE IF NOT EXISTS report_data_versions (
+    scope VARCHAR(100) NOT NULL PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
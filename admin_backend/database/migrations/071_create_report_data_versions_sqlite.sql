@@ -0,0 +1,8 @@
+-- Migration 071 (SQLite): Create report_data_versions table
+-- Scopes: 'all' (every write), 'shared' (writes not tied to one company), 'company:<id>'.
+
+CREATE TABLE IF NOT EXISTS report_data_versions (
+    scope TEXT NOT NULL PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
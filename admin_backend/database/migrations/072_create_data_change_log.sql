@@ -0,0 +1,14 @@
+-- Migration 072: Create data_change_log table
+-- One row per mutating operation: which company and transaction-date range it touched.
+-- Written in the same transaction as the change, and consumers read it by id cursor
+-- to refresh derived balances/summaries incrementally instead of rebuilding them.
+
+CREATE TABLE IF NOT EXISTS data_change_log (
+    id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    entity_kind VARCHAR(50) NOT NULL,
+    company_id CHAR(36) NULL COMMENT 'NULL when the change is not tied to one company',
+    min_date DATE NULL COMMENT 'NULL min/max means the whole history is affected',
+    max_date DATE NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    KEY idx_data_change_log_company (company_id, id)
+);
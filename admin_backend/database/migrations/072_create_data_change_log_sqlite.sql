@@ -0,0 +1,14 @@
+-- Migration 072 (SQLite): Create data_change_log table
+-- One row per mutating operation: which company and transaction-date range it touched.
+
+CREATE TABLE IF NOT EXISTS data_change_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    entity_kind TEXT NOT NULL,
+    company_id TEXT,
+    min_date TEXT,
+    max_date TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_data_change_log_company
+  ON data_change_log (company_id, id);
@@ -0,0 +1,75 @@
+-- Migration 073: Denormalized split-parent flags on transactions.
+--
+-- Reports used to exclude split containers with a correlated
+-- NOT EXISTS (SELECT 1 FROM transactions t_child WHERE t_child.parent_id = t.id ...)
+-- evaluated for every candidate row. These flags are maintained by the split,
+-- manual journal and mark-assignment paths (backend/services/transactions/split_flags.py)
+-- and can be rebuilt with scripts/maintenance/repair_split_flags.py.
+--
+-- is_split_container:  the row has at least one child (split or manual journal line)
+-- has_marked_children: at least one child carries a non-blank mark_id
+
+SET @split_container_column_exists := (
+    SELECT COUNT(*)
+    FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND TABLE_NAME = 'transactions'
+      AND COLUMN_NAME = 'is_split_container'
+);
+
+SET @add_split_container_column_sql := IF(
+    @split_container_column_exists = 0,
+    'ALTER TABLE transactions ADD COLUMN is_split_container TINYINT(1) NOT NULL DEFAULT 0',
+    'SELECT 1'
+);
+PREPARE add_split_container_column_stmt FROM @add_split_container_column_sql;
+EXECUTE add_split_container_column_stmt;
+DEALLOCATE PREPARE add_split_container_column_stmt;
+
+SET @marked_children_column_exists := (
+    SELECT COUNT(*)
+    FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND TABLE_NAME = 'transactions'
+      AND COLUMN_NAME = 'has_marked_children'
+);
+
+SET @add_marked_children_column_sql := IF(
+    @marked_children_column_exists = 0,
+    'ALTER TABLE transactions ADD COLUMN has_marked_children TINYINT(1) NOT NULL DEFAULT 0',
+    'SELECT 1'
+);
+PREPARE add_marked_children_column_stmt FROM @add_marked_children_column_sql;
+EXECUTE add_marked_children_column_stmt;
+DEALLOCATE PREPARE add_marked_children_column_stmt;
+
+-- Backfill from existing children. The grouped derived table is materialized,
+-- so MySQL accepts it alongside the UPDATE target.
+UPDATE transactions parent
+JOIN (
+    SELECT parent_id,
+           MAX(CASE WHEN NULLIF(TRIM(COALESCE(CAST(mark_id AS CHAR), '')), '') IS NOT NULL THEN 1 ELSE 0 END) AS marked
+    FROM transactions
+    WHERE COALESCE(TRIM(parent_id), '') <> ''
+    GROUP BY parent_id
+) child ON child.parent_id = parent.id
+SET parent.is_split_container = 1,
+    parent.has_marked_children = child.marked;
+
+-- Report ranges filter on company/date and the split flag in one index probe.
+SET @split_flag_index_exists := (
+    SELECT COUNT(*)
+    FROM INFORMATION_SCHEMA.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND TABLE_NAME = 'transactions'
+      AND INDEX_NAME = 'idx_transactions_company_date_split'
+);
+
+SET @add_split_flag_index_sql := IF(
+    @split_flag_index_exists = 0,
+    'ALTER TABLE transactions ADD INDEX idx_transactions_company_date_split (company_id, txn_date, has_marked_children)',
+    'SELECT 1'
+);
+PREPARE add_split_flag_index_stmt FROM @add_split_flag_index_sql;
+EXECUTE add_split_flag_index_stmt;
+DEALLOCATE PREPARE add_split_flag_index_stmt;
@@ -0,0 +1,21 @@
+-- Migration 073 (SQLite): Denormalized split-parent flags on transactions.
+
+ALTER TABLE transactions ADD COLUMN is_split_container INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE transactions ADD COLUMN has_marked_children INTEGER NOT NULL DEFAULT 0;
+
+UPDATE transactions
+SET is_split_container = CASE
+      WHEN EXISTS (SELECT 1 FROM transactions c WHERE c.parent_id = transactions.id) THEN 1
+      ELSE 0
+    END,
+    has_marked_children = CASE
+      WHEN EXISTS (
+        SELECT 1 FROM transactions c
+        WHERE c.parent_id = transactions.id
+          AND NULLIF(TRIM(COALESCE(CAST(c.mark_id AS TEXT), '')), '') IS NOT NULL
+      ) THEN 1
+      ELSE 0
+    END;
+
+CREATE INDEX IF NOT EXISTS idx_transactions_company_date_split
+  ON transactions (company_id, txn_date, has_marked_children);
@@ -0,0 +1,103 @@
+-- Migration 074: Per-source-file import summaries for the upload dashboard.
+--
+-- The upload summary and checklist endpoints used to GROUP BY the whole
+-- transactions table on every page load. These tables hold the same aggregates
+-- per (source_file, bank_code) and are refreshed by the import, delete and
+-- bank-account assignment paths (backend/services/transactions/import_batches.py).
+-- Rebuild them with scripts/maintenance/repair_import_batches.py.
+--
+-- bank_code is stored as '' when the transactions carry no bank code.
+
+CREATE TABLE IF NOT EXISTS import_batches (
+    source_file VARCHAR(255) NOT NULL,
+    bank_code VARCHAR(50) NOT NULL DEFAULT '',
+    transaction_count INT NOT NULL DEFAULT 0,
+    start_date DATE NULL,
+    end_date DATE NULL,
+    bank_account_number VARCHAR(100) NULL,
+    account_variant_count INT NOT NULL DEFAULT 0,
+    company_count INT NOT NULL DEFAULT 0,
+    total_debit DECIMAL(18,2) NOT NULL DEFAULT 0,
+    total_credit DECIMAL(18,2) NOT NULL DEFAULT 0,
+    last_upload DATETIME NULL,
+    PRIMARY KEY (source_file, bank_code),
+    KEY idx_import_batches_last_upload (last_upload)
+);
+
+-- Checklist coverage: one row per batch, bank account and calendar month.
+-- Split children and manual journals are not uploads and are left out.
+CREATE TABLE IF NOT EXISTS import_batch_months (
+    source_file VARCHAR(255) NOT NULL,
+    bank_code VARCHAR(50) NOT NULL,
+    bank_account_number VARCHAR(100) NOT NULL DEFAULT '',
+    period_year SMALLINT NOT NULL,
+    period_month TINYINT NOT NULL,
+    transaction_count INT NOT NULL DEFAULT 0,
+    total_debit DECIMAL(18,2) NOT NULL DEFAULT 0,
+    total_credit DECIMAL(18,2) NOT NULL DEFAULT 0,
+    last_upload DATETIME NULL,
+    PRIMARY KEY (source_file, bank_code, bank_account_number, period_year, period_month),
+    KEY idx_import_batch_months_period (period_year, period_month, bank_code)
+);
+
+-- Refreshing a batch re-reads its rows by source file.
+SET @source_file_index_exists := (
+    SELECT COUNT(*)
+    FROM INFORMATION_SCHEMA.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND TABLE_NAME = 'transactions'
+      AND INDEX_NAME = 'idx_transactions_source_bank'
+);
+
+SET @add_source_file_index_sql := IF(
+    @source_file_index_exists = 0,
+    'ALTER TABLE transactions ADD INDEX idx_transactions_source_bank (source_file, bank_code)',
+    'SELECT 1'
+);
+PREPARE add_source_file_index_stmt FROM @add_source_file_index_sql;
+EXECUTE add_source_file_index_stmt;
+DEALLOCATE PREPARE add_source_file_index_stmt;
+
+-- Backfill. Re-running replaces the rows rather than duplicating them.
+DELETE FROM import_batch_months;
+DELETE FROM import_batches;
+
+INSERT INTO import_batches (
+    source_file, bank_code, transaction_count, start_date, end_date,
+    bank_account_number, account_variant_count, company_count,
+    total_debit, total_credit, last_upload
+)
+SELECT source_file,
+       COALESCE(bank_code, ''),
+       COUNT(*),
+       MIN(txn_date),
+       MAX(txn_date),
+       MAX(NULLIF(TRIM(bank_account_number), '')),
+       COUNT(DISTINCT COALESCE(NULLIF(TRIM(bank_account_number), ''), '__EMPTY__')),
+       COUNT(DISTINCT company_id),
+       SUM(CASE WHEN db_cr = 'DB' THEN amount ELSE 0 END),
+       SUM(CASE WHEN db_cr = 'CR' THEN amount ELSE 0 END),
+       MAX(created_at)
+FROM transactions
+WHERE source_file IS NOT NULL
+GROUP BY source_file, COALESCE(bank_code, '');
+
+INSERT INTO import_batch_months (
+    source_file, bank_code, bank_account_number, period_year, period_month,
+    transaction_count, total_debit, total_credit, last_upload
+)
+SELECT source_file,
+       bank_code,
+       COALESCE(NULLIF(TRIM(bank_account_number), ''), ''),
+       YEAR(txn_date),
+       MONTH(txn_date),
+       COUNT(*),
+       SUM(CASE WHEN db_cr = 'DB' THEN amount ELSE 0 END),
+       SUM(CASE WHEN db_cr = 'CR' THEN amount ELSE 0 END),
+       MAX(created_at)
+FROM transactions
+WHERE source_file IS NOT NULL
+  AND COALESCE(bank_code, '') NOT IN ('', 'MANUAL')
+  AND txn_date IS NOT NULL
+  AND (parent_id IS NULL OR parent_id = '')
+GROUP BY source_file, bank_code, COALESCE(NULLIF(TRIM(bank_account_number), ''), ''), YEAR(txn_date), MONTH(txn_date);
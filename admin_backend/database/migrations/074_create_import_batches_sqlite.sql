@@ -0,0 +1,78 @@
+-- Migration 074 (SQLite): Per-source-file import summaries for the upload dashboard.
+-- bank_code is stored as '' when the transactions carry no bank code.
+
+CREATE TABLE IF NOT EXISTS import_batches (
+    source_file TEXT NOT NULL,
+    bank_code TEXT NOT NULL DEFAULT '',
+    transaction_count INTEGER NOT NULL DEFAULT 0,
+    start_date TEXT,
+    end_date TEXT,
+    bank_account_number TEXT,
+    account_variant_count INTEGER NOT NULL DEFAULT 0,
+    company_count INTEGER NOT NULL DEFAULT 0,
+    total_debit REAL NOT NULL DEFAULT 0,
+    total_credit REAL NOT NULL DEFAULT 0,
+    last_upload TEXT,
+    PRIMARY KEY (source_file, bank_code)
+);
+
+CREATE INDEX IF NOT EXISTS idx_import_batches_last_upload ON import_batches (last_upload);
+
+CREATE TABLE IF NOT EXISTS import_batch_months (
+    source_file TEXT NOT NULL,
+    bank_code TEXT NOT NULL,
+    bank_account_number TEXT NOT NULL DEFAULT '',
+    period_year INTEGER NOT NULL,
+    period_month INTEGER NOT NULL,
+    transaction_count INTEGER NOT NULL DEFAULT 0,
+    total_debit REAL NOT NULL DEFAULT 0,
+    total_credit REAL NOT NULL DEFAULT 0,
+    last_upload TEXT,
+    PRIMARY KEY (source_file, bank_code, bank_account_number, period_year, period_month)
+);
+
+CREATE INDEX IF NOT EXISTS idx_import_batch_months_period
+  ON import_batch_months (period_year, period_month, bank_code);
+
+CREATE INDEX IF NOT EXISTS idx_transactions_source_bank ON transactions (source_file, bank_code);
+
+INSERT INTO import_batches (
+    source_file, bank_code, transaction_count, start_date, end_date,
+    bank_account_number, account_variant_count, company_count,
+    total_debit, total_credit, last_upload
+)
+SELECT source_file,
+       COALESCE(bank_code, ''),
+       COUNT(*),
+       MIN(txn_date),
+       MAX(txn_date),
+       MAX(NULLIF(TRIM(bank_account_number), '')),
+       COUNT(DISTINCT COALESCE(NULLIF(TRIM(bank_account_number), ''), '__EMPTY__')),
+       COUNT(DISTINCT company_id),
+       SUM(CASE WHEN db_cr = 'DB' THEN amount ELSE 0 END),
+       SUM(CASE WHEN db_cr = 'CR' THEN amount ELSE 0 END),
+       MAX(created_at)
+FROM transactions
+WHERE source_file IS NOT NULL
+GROUP BY source_file, COALESCE(bank_code, '');
+
+INSERT INTO import_batch_months (
+    source_file, bank_code, bank_account_number, period_year, period_month,
+    transaction_count, total_debit, total_credit, last_upload
+)
+SELECT source_file,
+       bank_code,
+       COALESCE(NULLIF(TRIM(bank_account_number), ''), ''),
+       CAST(strftime('%Y', txn_date) AS INTEGER),
+       CAST(strftime('%m', txn_date) AS INTEGER),
+       COUNT(*),
+       SUM(CASE WHEN db_cr = 'DB' THEN amount ELSE 0 END),
+       SUM(CASE WHEN db_cr = 'CR' THEN amount ELSE 0 END),
+       MAX(created_at)
+FROM transactions
+WHERE source_file IS NOT NULL
+  AND COALESCE(bank_code, '') NOT IN ('', 'MANUAL')
+  AND txn_date IS NOT NULL
+  AND (parent_id IS NULL OR parent_id = '')
+GROUP BY source_file, bank_code, COALESCE(NULLIF(TRIM(bank_account_number), ''), ''),
+         CAST(strftime('%Y', txn_date) AS INTEGER), CAST(strftime('%m', txn_date) AS INTEGER);
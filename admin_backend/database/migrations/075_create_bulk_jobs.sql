@@ -0,0 +1,22 @@
+-- Migration 075: Progress of background bulk transaction operations.
+--
+-- Bulk mark/company/delete requests above BULK_ASYNC_THRESHOLD rows run on a
+-- worker thread (backend/services/transactions/bulk_operations.py). Each
+-- processed chunk updates its job row, so any worker can answer
+-- GET /api/transactions/bulk-jobs/<id>.
+-- result_json holds the skipped IDs per reason and the per-chunk timings.
+
+CREATE TABLE IF NOT EXISTS bulk_jobs (
+    id CHAR(36) NOT NULL PRIMARY KEY,
+    operation VARCHAR(20) NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    total_count INT NOT NULL DEFAULT 0,
+    processed_count INT NOT NULL DEFAULT 0,
+    updated_count INT NOT NULL DEFAULT 0,
+    result_json LONGTEXT NULL,
+    error TEXT NULL,
+    created_at DATETIME NOT NULL,
+    started_at DATETIME NULL,
+    finished_at DATETIME NULL,
+    KEY idx_bulk_jobs_created_at (created_at)
+);
@@ -0,0 +1,17 @@
+-- Migration 075 (SQLite): Progress of background bulk transaction operations.
+
+CREATE TABLE IF NOT EXISTS bulk_jobs (
+    id TEXT NOT NULL PRIMARY KEY,
+    operation TEXT NOT NULL,
+    status TEXT NOT NULL,
+    total_count INTEGER NOT NULL DEFAULT 0,
+    processed_count INTEGER NOT NULL DEFAULT 0,
+    updated_count INTEGER NOT NULL DEFAULT 0,
+    result_json TEXT,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_bulk_jobs_created_at ON bulk_jobs (created_at);
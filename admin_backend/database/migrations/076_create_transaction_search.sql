@@ -0,0 +1,47 @@
+-- Migration 076: Full-text index over transaction descriptions and mark names.
+--
+-- The linking dialogs used to search with description LIKE '%term%', which scans
+-- every transaction on each keystroke. transaction_search holds one normalized
+-- row per transaction (description plus the mark's report names) under a
+-- FULLTEXT index, queried in BOOLEAN MODE with prefix terms
+-- (backend/services/transactions/transaction_search.py). Writers refresh the rows
+-- they touch; rebuild with scripts/maintenance/repair_search_index.py.
+--
+-- Search terms now match at the start of a word instead of anywhere inside it:
+-- 'sumb' finds 'Sumber Makmur', 'umber' no longer does.
+-- The backfill uses REGEXP_REPLACE and so needs MySQL 8.0, like the utf8mb4_0900
+-- collations the schema already relies on.
+
+CREATE TABLE IF NOT EXISTS transaction_search (
+    transaction_id CHAR(36) NOT NULL PRIMARY KEY,
+    search_text TEXT NOT NULL
+) ENGINE=InnoDB;
+
+-- Backfill before the FULLTEXT index exists; building it once afterwards is much faster.
+-- Same normalization as normalize_search_text(): lowercase, and every run of non-word
+-- characters (underscores included) becomes one space.
+INSERT IGNORE INTO transaction_search (transaction_id, search_text)
+SELECT t.id,
+       TRIM(REGEXP_REPLACE(
+           LOWER(CONCAT_WS(' ', t.description, m.internal_report, m.personal_use, m.tax_report)),
+           '[\\W_]+', ' '
+       ))
+FROM transactions t
+LEFT JOIN marks m ON m.id = t.mark_id;
+
+SET @search_fulltext_index_exists := (
+    SELECT COUNT(*)
+    FROM INFORMATION_SCHEMA.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND TABLE_NAME = 'transaction_search'
+      AND INDEX_NAME = 'ft_transaction_search_text'
+);
+
+SET @add_search_fulltext_index_sql := IF(
+    @search_fulltext_index_exists = 0,
+    'ALTER TABLE transaction_search ADD FULLTEXT INDEX ft_transaction_search_text (search_text)',
+    'SELECT 1'
+);
+PREPARE add_search_fulltext_index_stmt FROM @add_search_fulltext_index_sql;
+EXECUTE add_search_fulltext_index_stmt;
+DEALLOCATE PREPARE add_search_fulltext_index_stmt;
@@ -0,0 +1,16 @@
+-- Migration 076 (SQLite): Full-text index over transaction descriptions and mark names (FTS5).
+-- prefix='2 3' keeps short prefix queries on the index instead of scanning the vocabulary.
+
+CREATE VIRTUAL TABLE IF NOT EXISTS transaction_search USING fts5(
+    search_text,
+    transaction_id UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
+INSERT INTO transaction_search (transaction_id, search_text)
+SELECT t.id,
+       LOWER(COALESCE(t.description, '') || ' ' || COALESCE(m.internal_report, '') || ' '
+             || COALESCE(m.personal_use, '') || ' ' || COALESCE(m.tax_report, ''))
+FROM transactions t
+LEFT JOIN marks m ON m.id = t.mark_id;
@@ -0,0 +1,61 @@
+-- Migration 077: Cached per-mark usage statistics.
+--
+-- The manual journal mark lookup used to derive each mark's natural_direction
+-- fallback from a correlated subquery counting DB/CR rows over all of that
+-- mark's transactions. mark_stats holds those counts (plus last use), and
+-- mark_stats_years the same counters and totals per year; both are refreshed
+-- by the transaction write paths (backend/services/transactions/mark_stats.py),
+-- which recount only the years a write touched and roll mark_stats up from them.
+-- Rebuild them with scripts/maintenance/repair_mark_stats.py.
+
+CREATE TABLE IF NOT EXISTS mark_stats (
+    mark_id CHAR(36) NOT NULL,
+    transaction_count INT NOT NULL DEFAULT 0,
+    debit_count INT NOT NULL DEFAULT 0,
+    credit_count INT NOT NULL DEFAULT 0,
+    last_used_date DATE NULL,
+    PRIMARY KEY (mark_id),
+    KEY idx_mark_stats_usage (transaction_count)
+);
+
+CREATE TABLE IF NOT EXISTS mark_stats_years (
+    mark_id CHAR(36) NOT NULL,
+    period_year SMALLINT NOT NULL,
+    transaction_count INT NOT NULL DEFAULT 0,
+    total_debit DECIMAL(18,2) NOT NULL DEFAULT 0,
+    total_credit DECIMAL(18,2) NOT NULL DEFAULT 0,
+    debit_count INT NOT NULL DEFAULT 0,
+    credit_count INT NOT NULL DEFAULT 0,
+    last_used_date DATE NULL,
+    PRIMARY KEY (mark_id, period_year)
+);
+
+-- Backfill. Re-running replaces the rows rather than duplicating them.
+DELETE FROM mark_stats_years;
+DELETE FROM mark_stats;
+
+INSERT INTO mark_stats (mark_id, transaction_count, debit_count, credit_count, last_used_date)
+SELECT mark_id,
+       COUNT(*),
+       SUM(CASE WHEN UPPER(TRIM(COALESCE(db_cr, ''))) IN ('DB', 'DEBIT', 'D', 'DE') THEN 1 ELSE 0 END),
+       SUM(CASE WHEN UPPER(TRIM(COALESCE(db_cr, ''))) IN ('CR', 'CREDIT', 'K', 'KREDIT') THEN 1 ELSE 0 END),
+       MAX(txn_date)
+FROM transactions
+WHERE mark_id IS NOT NULL
+GROUP BY mark_id;
+
+INSERT INTO mark_stats_years (
+    mark_id, period_year, transaction_count, total_debit, total_credit, debit_count, credit_count, last_used_date
+)
+SELECT mark_id,
+       YEAR(txn_date),
+       COUNT(*),
+       SUM(CASE WHEN UPPER(TRIM(COALESCE(db_cr, ''))) IN ('DB', 'DEBIT', 'D', 'DE') THEN amount ELSE 0 END),
+       SUM(CASE WHEN UPPER(TRIM(COALESCE(db_cr, ''))) IN ('CR', 'CREDIT', 'K', 'KREDIT') THEN amount ELSE 0 END),
+       SUM(CASE WHEN UPPER(TRIM(COALESCE(db_cr, ''))) IN ('DB', 'DEBIT', 'D', 'DE') THEN 1 ELSE 0 END),
+       SUM(CASE WHEN UPPER(TRIM(COALESCE(db_cr, ''))) IN ('CR', 'CREDIT', 'K', 'KREDIT') THEN 1 ELSE 0 END),
+       MAX(txn_date)
+FROM transactions
+WHERE mark_id IS NOT NULL
+  AND txn_date IS NOT NULL
+GROUP BY mark_id, YEAR(txn_date);
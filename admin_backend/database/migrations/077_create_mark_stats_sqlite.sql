@@ -0,0 +1,49 @@
+-- Migration 077 (SQLite): Cached per-mark usage statistics.
+
+CREATE TABLE IF NOT EXISTS mark_stats (
+    mark_id TEXT NOT NULL PRIMARY KEY,
+    transaction_count INTEGER NOT NULL DEFAULT 0,
+    debit_count INTEGER NOT NULL DEFAULT 0,
+    credit_count INTEGER NOT NULL DEFAULT 0,
+    last_used_date TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_mark_stats_usage ON mark_stats (transaction_count);
+
+CREATE TABLE IF NOT EXISTS mark_stats_years (
+    mark_id TEXT NOT NULL,
+    period_year INTEGER NOT NULL,
+    transaction_count INTEGER NOT NULL DEFAULT 0,
+    total_debit REAL NOT NULL DEFAULT 0,
+    total_credit REAL NOT NULL DEFAULT 0,
+    debit_count INTEGER NOT NULL DEFAULT 0,
+    credit_count INTEGER NOT NULL DEFAULT 0,
+    last_used_date TEXT,
+    PRIMARY KEY (mark_id, period_year)
+);
+
+INSERT INTO mark_stats (mark_id, transaction_count, debit_count, credit_count, last_used_date)
+SELECT mark_id,
+       COUNT(*),
+       SUM(CASE WHEN UPPER(TRIM(COALESCE(db_cr, ''))) IN ('DB', 'DEBIT', 'D', 'DE') THEN 1 ELSE 0 END),
+       SUM(CASE WHEN UPPER(TRIM(COALESCE(db_cr, ''))) IN ('CR', 'CREDIT', 'K', 'KREDIT') THEN 1 ELSE 0 END),
+       MAX(txn_date)
+FROM transactions
+WHERE mark_id IS NOT NULL
+GROUP BY mark_id;
+
+INSERT INTO mark_stats_years (
+    mark_id, period_year, transaction_count, total_debit, total_credit, debit_count, credit_count, last_used_date
+)
+SELECT mark_id,
+       CAST(strftime('%Y', txn_date) AS INTEGER),
+       COUNT(*),
+       SUM(CASE WHEN UPPER(TRIM(COALESCE(db_cr, ''))) IN ('DB', 'DEBIT', 'D', 'DE') THEN amount ELSE 0 END),
+       SUM(CASE WHEN UPPER(TRIM(COALESCE(db_cr, ''))) IN ('CR', 'CREDIT', 'K', 'KREDIT') THEN amount ELSE 0 END),
+       SUM(CASE WHEN UPPER(TRIM(COALESCE(db_cr, ''))) IN ('DB', 'DEBIT', 'D', 'DE') THEN 1 ELSE 0 END),
+       SUM(CASE WHEN UPPER(TRIM(COALESCE(db_cr, ''))) IN ('CR', 'CREDIT', 'K', 'KREDIT') THEN 1 ELSE 0 END),
+       MAX(txn_date)
+FROM transactions
+WHERE mark_id IS NOT NULL
+  AND txn_date IS NOT NULL
+GROUP BY mark_id, CAST(strftime('%Y', txn_date) AS INTEGER);
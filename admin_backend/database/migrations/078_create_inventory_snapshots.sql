@@ -0,0 +1,40 @@
+-- Migration 078: Monthly inventory valuation snapshots.
+--
+-- Inventory used to be valued only at year-end (inventory_balances, saved by
+-- hand from /api/inventory-balances/auto). inventory_snapshots holds one
+-- quantity/value total per company and month-end, inventory_snapshot_items the
+-- valued lines behind it. Rows are written by the snapshot builder
+-- (backend/services/inventory/inventory_snapshots.py), on demand through
+-- POST /api/inventory-snapshots/build or on a schedule with
+-- scripts/maintenance/build_inventory_snapshots.py. The income statement reads
+-- them for month-aligned periods.
+
+CREATE TABLE IF NOT EXISTS inventory_snapshots (
+    company_id VARCHAR(36) NOT NULL,
+    period_year SMALLINT NOT NULL,
+    period_month TINYINT NOT NULL,
+    snapshot_date DATE NOT NULL,
+    as_of_date DATE NULL,
+    snapshot_source VARCHAR(32) NULL,
+    quantity DECIMAL(18,4) NOT NULL DEFAULT 0,
+    amount DECIMAL(18,2) NOT NULL DEFAULT 0,
+    line_count INT NOT NULL DEFAULT 0,
+    missing_price_count INT NOT NULL DEFAULT 0,
+    built_at DATETIME NOT NULL,
+    PRIMARY KEY (company_id, period_year, period_month)
+);
+
+CREATE TABLE IF NOT EXISTS inventory_snapshot_items (
+    company_id VARCHAR(36) NOT NULL,
+    period_year SMALLINT NOT NULL,
+    period_month TINYINT NOT NULL,
+    product_id VARCHAR(64) NOT NULL,
+    product_name VARCHAR(255) NULL,
+    unit_name VARCHAR(64) NULL,
+    quantity DECIMAL(18,4) NOT NULL DEFAULT 0,
+    unit_price DECIMAL(18,4) NULL,
+    total_value DECIMAL(18,2) NULL,
+    price_effective_date DATE NULL,
+    price_batch_id VARCHAR(36) NULL,
+    PRIMARY KEY (company_id, period_year, period_month, product_id)
+);
@@ -0,0 +1,31 @@
+-- Migration 078 (SQLite): Monthly inventory valuation snapshots.
+
+CREATE TABLE IF NOT EXISTS inventory_snapshots (
+    company_id TEXT NOT NULL,
+    period_year INTEGER NOT NULL,
+    period_month INTEGER NOT NULL,
+    snapshot_date TEXT NOT NULL,
+    as_of_date TEXT,
+    snapshot_source TEXT,
+    quantity REAL NOT NULL DEFAULT 0,
+    amount REAL NOT NULL DEFAULT 0,
+    line_count INTEGER NOT NULL DEFAULT 0,
+    missing_price_count INTEGER NOT NULL DEFAULT 0,
+    built_at TEXT NOT NULL,
+    PRIMARY KEY (company_id, period_year, period_month)
+);
+
+CREATE TABLE IF NOT EXISTS inventory_snapshot_items (
+    company_id TEXT NOT NULL,
+    period_year INTEGER NOT NULL,
+    period_month INTEGER NOT NULL,
+    product_id TEXT NOT NULL,
+    product_name TEXT,
+    unit_name TEXT,
+    quantity REAL NOT NULL DEFAULT 0,
+    unit_price REAL,
+    total_value REAL,
+    price_effective_date TEXT,
+    price_batch_id TEXT,
+    PRIMARY KEY (company_id, period_year, period_month, product_id)
+);
@@ -0,0 +1,56 @@
+-- Migration 079: Pre-aggregated payroll totals.
+--
+-- The payroll monthly summary and the payroll salary report used to scan
+-- salary transactions (marks.is_salary_component, an EXISTS over
+-- mark_coa_mapping, split exclusion and a YEAR(COALESCE(payroll_period_month,
+-- txn_date)) predicate) and group them in Python. payroll_aggregates holds
+-- the count and absolute amount per company, Sagansa user, payroll month,
+-- report type and salary mark; rows are recomputed per mark by the write
+-- paths (backend/services/transactions/payroll_aggregates.py).
+-- unmarked_split_parent flags split parents whose children are all unmarked:
+-- the payroll page skips them, the payroll report keeps them.
+-- Rebuild the table with scripts/maintenance/repair_payroll_aggregates.py.
+
+CREATE TABLE IF NOT EXISTS payroll_aggregates (
+    company_id VARCHAR(36) NOT NULL DEFAULT '',
+    sagansa_user_id VARCHAR(128) NOT NULL DEFAULT '',
+    period_month CHAR(7) NOT NULL,
+    report_type VARCHAR(20) NOT NULL,
+    mark_id CHAR(36) NOT NULL,
+    unmarked_split_parent TINYINT NOT NULL DEFAULT 0,
+    transaction_count INT NOT NULL DEFAULT 0,
+    total_amount DECIMAL(18,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (report_type, period_month, company_id, sagansa_user_id, mark_id, unmarked_split_parent),
+    KEY idx_payroll_aggregates_mark (mark_id)
+);
+
+-- Backfill. Re-running replaces the rows rather than duplicating them.
+DELETE FROM payroll_aggregates;
+
+INSERT INTO payroll_aggregates (
+    company_id, sagansa_user_id, period_month, report_type, mark_id,
+    unmarked_split_parent, transaction_count, total_amount
+)
+SELECT COALESCE(t.company_id, ''),
+       COALESCE(CAST(t.sagansa_user_id AS CHAR), ''),
+       DATE_FORMAT(COALESCE(t.payroll_period_month, t.txn_date), '%Y-%m'),
+       mcm.report_type,
+       t.mark_id,
+       CASE WHEN t.is_split_container = 1 THEN 1 ELSE 0 END,
+       COUNT(t.id),
+       COALESCE(SUM(ABS(t.amount)), 0)
+FROM transactions t
+INNER JOIN marks m ON m.id = t.mark_id
+INNER JOIN (
+    SELECT DISTINCT mark_id, report_type FROM mark_coa_mapping
+) mcm ON mcm.mark_id = t.mark_id
+WHERE COALESCE(m.is_salary_component, 0) = 1
+  AND mcm.report_type IS NOT NULL
+  AND COALESCE(t.payroll_period_month, t.txn_date) IS NOT NULL
+  AND t.has_marked_children = 0
+GROUP BY COALESCE(t.company_id, ''),
+         COALESCE(CAST(t.sagansa_user_id AS CHAR), ''),
+         DATE_FORMAT(COALESCE(t.payroll_period_month, t.txn_date), '%Y-%m'),
+         mcm.report_type,
+         t.mark_id,
+         CASE WHEN t.is_split_container = 1 THEN 1 ELSE 0 END;
@@ -0,0 +1,16 @@
+-- Migration 079 (SQLite): Pre-aggregated payroll totals.
+-- Backfill with scripts/maintenance/repair_payroll_aggregates.py.
+
+CREATE TABLE IF NOT EXISTS payroll_aggregates (
+    company_id TEXT NOT NULL DEFAULT '',
+    sagansa_user_id TEXT NOT NULL DEFAULT '',
+    period_month TEXT NOT NULL,
+    report_type TEXT NOT NULL,
+    mark_id TEXT NOT NULL,
+    unmarked_split_parent INTEGER NOT NULL DEFAULT 0,
+    transaction_count INTEGER NOT NULL DEFAULT 0,
+    total_amount REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (report_type, period_month, company_id, sagansa_user_id, mark_id, unmarked_split_parent)
+);
+
+CREATE INDEX IF NOT EXISTS idx_payroll_aggregates_mark ON payroll_aggregates (mark_id);
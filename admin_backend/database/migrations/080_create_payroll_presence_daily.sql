@@ -0,0 +1,28 @@
+-- Migration 080: Daily presence totals.
+--
+-- Payroll reconciliation used to page through payroll_presences (one row per
+-- check-in) to add up worked minutes per employee. payroll_presence_daily
+-- holds, per company, Sagansa user, store and presence date, the number of
+-- presence records, attended shifts (records with a check-in), worked
+-- minutes and the late check-ins / early check-outs against the shift
+-- times. The presence sync recomputes the dates it touched
+-- (backend/services/transactions/presence_aggregates.py); empty strings
+-- stand in for a missing company, user or store.
+-- payroll_presences is created by the application on first sync, so this
+-- migration does not backfill: run
+-- scripts/maintenance/repair_presence_aggregates.py after applying it.
+
+CREATE TABLE IF NOT EXISTS payroll_presence_daily (
+    company_id VARCHAR(64) NOT NULL DEFAULT '',
+    sagansa_user_id VARCHAR(128) NOT NULL DEFAULT '',
+    store_name VARCHAR(255) NOT NULL DEFAULT '',
+    presence_date DATE NOT NULL,
+    user_name VARCHAR(255) NULL,
+    presence_count INT NOT NULL DEFAULT 0,
+    shift_count INT NOT NULL DEFAULT 0,
+    worked_minutes INT NOT NULL DEFAULT 0,
+    late_count INT NOT NULL DEFAULT 0,
+    early_leave_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (presence_date, company_id, sagansa_user_id, store_name),
+    KEY idx_payroll_presence_daily_user (sagansa_user_id, presence_date)
+);
@@ -0,0 +1,18 @@
+-- Migration 080 (SQLite): Daily presence totals.
+-- Backfill with scripts/maintenance/repair_presence_aggregates.py.
+
+CREATE TABLE IF NOT EXISTS payroll_presence_daily (
+    company_id TEXT NOT NULL DEFAULT '',
+    sagansa_user_id TEXT NOT NULL DEFAULT '',
+    store_name TEXT NOT NULL DEFAULT '',
+    presence_date TEXT NOT NULL,
+    user_name TEXT,
+    presence_count INTEGER NOT NULL DEFAULT 0,
+    shift_count INTEGER NOT NULL DEFAULT 0,
+    worked_minutes INTEGER NOT NULL DEFAULT 0,
+    late_count INTEGER NOT NULL DEFAULT 0,
+    early_leave_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (presence_date, company_id, sagansa_user_id, store_name)
+);
+
+CREATE INDEX IF NOT EXISTS idx_payroll_presence_daily_user ON payroll_presence_daily (sagansa_user_id, presence_date);
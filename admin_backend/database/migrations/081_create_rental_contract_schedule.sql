@@ -0,0 +1,28 @@
+-- Migration 081: Monthly rental contract schedule.
+--
+-- The income statement's prorated contract rent and the balance sheet's
+-- prepaid rent amortization and PPh 4(2) bridges used to join every rental
+-- contract to an aggregate of its linked transactions and walk the contract
+-- months in Python on each report. rental_contract_schedule holds, per
+-- contract, payment company and month:
+--   rent_expense     linked payments spread evenly over the contract months
+--   linked_payments  linked payments dated in that month (PPh 4(2) base)
+--   start_day        the contract start day on the start month of each
+--                    contract year (0 otherwise); that month's expense only
+--                    counts in the cumulative amortization once it is reached
+-- Rows are rebuilt per contract by the contract endpoints and the
+-- transaction writes that touch linked payments
+-- (backend/services/rental/rental_schedule.py). The monthly spread is
+-- computed in Python, so fill the table with
+-- scripts/maintenance/repair_rental_schedule.py after applying this.
+
+CREATE TABLE IF NOT EXISTS rental_contract_schedule (
+    contract_id CHAR(36) NOT NULL,
+    txn_company_id VARCHAR(36) NOT NULL DEFAULT '',
+    period_month CHAR(7) NOT NULL,
+    rent_expense DECIMAL(20,6) NOT NULL DEFAULT 0,
+    linked_payments DECIMAL(18,2) NOT NULL DEFAULT 0,
+    start_day TINYINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (contract_id, txn_company_id, period_month),
+    KEY idx_rental_contract_schedule_month (period_month, txn_company_id)
+);
@@ -0,0 +1,14 @@
+-- Migration 081 (SQLite): Monthly rental contract schedule.
+-- Fill with scripts/maintenance/repair_rental_schedule.py.
+
+CREATE TABLE IF NOT EXISTS rental_contract_schedule (
+    contract_id TEXT NOT NULL,
+    txn_company_id TEXT NOT NULL DEFAULT '',
+    period_month TEXT NOT NULL,
+    rent_expense REAL NOT NULL DEFAULT 0,
+    linked_payments REAL NOT NULL DEFAULT 0,
+    start_day INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (contract_id, txn_company_id, period_month)
+);
+
+CREATE INDEX IF NOT EXISTS idx_rental_contract_schedule_month ON rental_contract_schedule (period_month, txn_company_id);
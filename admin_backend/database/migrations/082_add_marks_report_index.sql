@@ -0,0 +1,27 @@
+-- Migration 082: Index the report_type-dependent lookup on marks.
+-- Coretax mark summaries drive from marks.is_coretax, then probe transactions by mark.
+
+SET @dbname = DATABASE();
+
+SET @preparedStatement = (
+  SELECT IF(
+    (SELECT COUNT(*)
+     FROM INFORMATION_SCHEMA.COLUMNS
+     WHERE TABLE_SCHEMA = @dbname
+       AND TABLE_NAME = 'marks'
+       AND COLUMN_NAME = 'is_coretax'
+    ) = 0
+    OR
+    (SELECT COUNT(*)
+     FROM INFORMATION_SCHEMA.STATISTICS
+     WHERE TABLE_SCHEMA = @dbname
+       AND TABLE_NAME = 'marks'
+       AND INDEX_NAME = 'idx_marks_coretax'
+    ) > 0,
+    'SELECT 1',
+    'CREATE INDEX idx_marks_coretax ON marks (is_coretax, id)'
+  )
+);
+PREPARE stmt FROM @preparedStatement;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
@@ -0,0 +1,5 @@
+-- Migration 082 (SQLite): Index the report_type-dependent lookup on marks.
+
+-- Coretax mark summaries drive from marks.is_coretax
+CREATE INDEX IF NOT EXISTS idx_marks_coretax
+  ON marks (is_coretax, id);
@@ -0,0 +1,40 @@
+-- Migration 083: Heartbeat for background bulk jobs.
+--
+-- Bulk jobs run on daemon threads, so a process restart leaves their row in
+-- 'pending' or 'running'. Every progress save now stamps heartbeat_at, and
+-- reading a job fails those whose heartbeat is older than
+-- BULK_JOB_STALE_SECONDS (backend/services/transactions/bulk_operations.py).
+
+SET @heartbeat_column_exists := (
+    SELECT COUNT(*)
+    FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND TABLE_NAME = 'bulk_jobs'
+      AND COLUMN_NAME = 'heartbeat_at'
+);
+
+SET @add_heartbeat_column_sql := IF(
+    @heartbeat_column_exists = 0,
+    'ALTER TABLE bulk_jobs ADD COLUMN heartbeat_at DATETIME NULL',
+    'SELECT 1'
+);
+PREPARE add_heartbeat_column_stmt FROM @add_heartbeat_column_sql;
+EXECUTE add_heartbeat_column_stmt;
+DEALLOCATE PREPARE add_heartbeat_column_stmt;
+
+SET @status_index_exists := (
+    SELECT COUNT(*)
+    FROM INFORMATION_SCHEMA.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND TABLE_NAME = 'bulk_jobs'
+      AND INDEX_NAME = 'idx_bulk_jobs_status'
+);
+
+SET @add_status_index_sql := IF(
+    @status_index_exists = 0,
+    'CREATE INDEX idx_bulk_jobs_status ON bulk_jobs (status)',
+    'SELECT 1'
+);
+PREPARE add_status_index_stmt FROM @add_status_index_sql;
+EXECUTE add_status_index_stmt;
+DEALLOCATE PREPARE add_status_index_stmt;
@@ -0,0 +1,5 @@
+-- Migration 083 (SQLite): Heartbeat for background bulk jobs.
+
+ALTER TABLE bulk_jobs ADD COLUMN heartbeat_at TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_bulk_jobs_status ON bulk_jobs (status);
@@ -0,0 +1,41 @@
+import os
+import shutil
+import tempfile
+
+# prometheus_client aggregates metrics across workers through files in this directory.
+# It must be set before any worker imports the app.
+metrics_dir = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR',
+    os.path.join(tempfile.gettempdir(), 'bank_converter_metrics'),
+)
+
+# Import the app once in the master and fork workers from it, so shared modules are
+# loaded a single time and their pages are shared copy-on-write.
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1').strip().lower() not in {'0', 'false', 'no', 'off'}
+# Also import pandas and every bank parser in the master (trades master RSS for faster first uploads).
+preload_bank_parsers = os.environ.get('PRELOAD_BANK_PARSERS', '').strip().lower() in {'1', 'true', 'yes', 'on'}
+
+
+def on_starting(server):
+    # Stale files from a previous master would be summed into the new one.
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+    if preload_app and preload_bank_parsers:
+        from bank_parsers.registry import preload_parsers
+
+        preload_parsers()
+
+
+def post_fork(server, worker):
+    if preload_app:
+        from backend.db.session import dispose_engines
+
+        dispose_engines()
+
+
+def child_exit(server, worker):
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,9 +1,13 @@
 import os
 import logging
+import time
 from pathlib import Path
 from sqlalchemy import create_engine, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.pool import NullPool
 from dotenv import load_dotenv
-from database.migration_index import MIGRATIONS_DIR, list_mysql_migrations, migration_summary
+from backend.db.schema import publish_schema_version
+from database.migration_index import MIGRATIONS_DIR, list_mysql_migrations, migration_fingerprint, migration_summary
 
 # Load environment variables
 BASE_DIR = Path(__file__).resolve().parent
@@ -20,30 +24,84 @@ DB_NAME = os.environ.get('DB_NAME', 'bank_converter')
 DB_URL = f"mysql+pymysql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 DB_BASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}"
 
+# Named MySQL lock held while applying migrations, so concurrent workers/hosts apply them once.
+MIGRATION_LOCK_NAME = 'pdf_excel_migrations'
+MIGRATION_LOCK_TIMEOUT_ENV = 'MIGRATION_LOCK_TIMEOUT'
+DEFAULT_MIGRATION_LOCK_TIMEOUT = 300
+
 
 def _split_sql_statements(sql):
-    if 'DELIMITER //' in sql:
-        sections = sql.split('DELIMITER //')
-        statements = []
+    """
+    Split a migration script into statements on the current delimiter (`;` or one set by DELIMITER),
+    ignoring delimiters inside quoted strings, identifiers and comments. Comments are dropped.
+    """
+    statements = []
+    buffer = []
+    delimiter = ';'
+    quote = None
+    index = 0
+    length = len(sql)
+
+    def flush():
+        statement = ''.join(buffer).strip()
+        if statement:
+            statements.append(statement)
+        buffer.clear()
+
+    while index < length:
+        char = sql[index]
+
+        if quote:
+            buffer.append(char)
+            if char == '\\' and quote != '`' and index + 1 < length:
+                buffer.append(sql[index + 1])
+                index += 2
+                continue
+            if char == quote:
+                if sql.startswith(quote, index + 1):
+                    buffer.append(quote)
+                    index += 2
+                    continue
+                quote = None
+            index += 1
+            continue
 
-        if sections[0].strip():
-            statements.extend([s.strip() for s in sections[0].split(';') if s.strip()])
+        line_start = index == 0 or sql[index - 1] == '\n'
+        if line_start and sql[index:index + 10].upper() == 'DELIMITER ':
+            line_end = sql.find('\n', index)
+            line_end = length if line_end == -1 else line_end
+            flush()
+            delimiter = sql[index + 10:line_end].strip() or ';'
+            index = line_end
+            continue
 
-        for section in sections[1:]:
-            if '//' in section:
-                blocks = section.split('//')
-                for block in blocks[:-1]:
-                    if block.strip():
-                        statements.append(block.strip())
+        if char in ("'", '"', '`'):
+            quote = char
+            buffer.append(char)
+            index += 1
+            continue
 
-                last_part = blocks[-1].replace('DELIMITER ;', '')
-                if last_part.strip():
-                    statements.extend([s.strip() for s in last_part.split(';') if s.strip()])
-            elif section.strip():
-                statements.extend([s.strip() for s in section.split(';') if s.strip()])
-        return statements
+        if char == '#' or (sql.startswith('--', index) and (index + 2 >= length or sql[index + 2].isspace())):
+            line_end = sql.find('\n', index)
+            index = length if line_end == -1 else line_end
+            continue
 
-    return [s.strip() for s in sql.split(';') if s.strip()]
+        if sql.startswith('/*', index) and not sql.startswith('/*!', index):
+            comment_end = sql.find('*/', index + 2)
+            index = length if comment_end == -1 else comment_end + 2
+            buffer.append(' ')
+            continue
+
+        if sql.startswith(delimiter, index):
+            flush()
+            index += len(delimiter)
+            continue
+
+        buffer.append(char)
+        index += 1
+
+    flush()
+    return statements
 
 
 def validate_migration_layout():
@@ -67,16 +125,96 @@ def validate_migration_layout():
     return True
 
 
+def _lock_timeout():
+    try:
+        return int(os.environ.get(MIGRATION_LOCK_TIMEOUT_ENV, DEFAULT_MIGRATION_LOCK_TIMEOUT))
+    except ValueError:
+        return DEFAULT_MIGRATION_LOCK_TIMEOUT
+
+
+def stored_fingerprint(conn):
+    """Fingerprint recorded by the last complete run, or None when there is none yet."""
+    try:
+        return conn.execute(text("SELECT fingerprint FROM pdf_excel_migration_state WHERE id = 1")).scalar()
+    except DBAPIError:
+        return None
+
+
+def _ensure_ledger(conn):
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS pdf_excel_migrations (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            migration_name VARCHAR(255) UNIQUE,
+            executed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            duration_ms INT NULL
+        )
+    """))
+    has_duration = conn.execute(text("""
+        SELECT COUNT(*)
+        FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = 'pdf_excel_migrations'
+          AND COLUMN_NAME = 'duration_ms'
+    """)).scalar()
+    if not has_duration:
+        conn.execute(text("ALTER TABLE pdf_excel_migrations ADD COLUMN duration_ms INT NULL"))
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS pdf_excel_migration_state (
+            id TINYINT PRIMARY KEY,
+            fingerprint CHAR(64) NOT NULL,
+            migration_count INT NOT NULL,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """))
+    conn.commit()
+
+
+def _store_fingerprint(conn, fingerprint, migration_count):
+    conn.execute(text("""
+        INSERT INTO pdf_excel_migration_state (id, fingerprint, migration_count, updated_at)
+        VALUES (1, :fingerprint, :migration_count, NOW())
+        ON DUPLICATE KEY UPDATE
+            fingerprint = VALUES(fingerprint),
+            migration_count = VALUES(migration_count),
+            updated_at = VALUES(updated_at)
+    """), {'fingerprint': fingerprint, 'migration_count': migration_count})
+    conn.commit()
+
+
+def _acquire_lock(conn):
+    acquired = conn.execute(
+        text("SELECT GET_LOCK(:name, :timeout)"),
+        {'name': MIGRATION_LOCK_NAME, 'timeout': _lock_timeout()},
+    ).scalar()
+    return acquired == 1
+
+
+def _release_lock(conn):
+    conn.execute(text("SELECT RELEASE_LOCK(:name)"), {'name': MIGRATION_LOCK_NAME})
+
+
 def run_migrations():
     logger.info("--- Starting Database Migrations ---")
+    fingerprint = migration_fingerprint()
+
+    # 1. Fast path: one query when the last complete run saw exactly these migration files.
+    engine = create_engine(DB_URL, poolclass=NullPool)
+    try:
+        with engine.connect() as conn:
+            if stored_fingerprint(conn) == fingerprint:
+                logger.info("Schema is current (fingerprint %s); no migrations pending.", fingerprint[:12])
+                return True
+    except Exception:
+        # Database not created yet or unreachable; the full run below reports real errors.
+        pass
 
     if not validate_migration_layout():
         logger.error("Database migration validation failed. Aborting migration run.")
         return False
     
-    # 1. Ensure Database exists
+    # 2. Ensure Database exists
     try:
-        base_engine = create_engine(DB_BASE_URL)
+        base_engine = create_engine(DB_BASE_URL, poolclass=NullPool)
         with base_engine.connect() as conn:
             conn.execute(text(f"CREATE DATABASE IF NOT EXISTS {DB_NAME}"))
             conn.commit()
@@ -84,58 +222,59 @@ def run_migrations():
         logger.error("Error ensuring database exists: %s", e)
         return False
 
-    # 2. Connect to the database
+    # 3. Apply pending migrations while holding the migration lock
+    current_migration_name = None
+    current_statement = None
+    applied_count = 0
     try:
-        engine = create_engine(DB_URL)
         with engine.connect() as conn:
-            # Create migrations table if not exists
-            conn.execute(text("""
-                CREATE TABLE IF NOT EXISTS pdf_excel_migrations (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    migration_name VARCHAR(255) UNIQUE,
-                    executed_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """))
-            conn.commit()
-
-            # Get list of executed migrations
-            result = conn.execute(text("SELECT migration_name FROM pdf_excel_migrations"))
-            executed = {row[0] for row in result}
+            _ensure_ledger(conn)
 
-            # 3. Find and run new migrations
-            if not MIGRATIONS_DIR.exists():
-                logger.error("Migrations directory not found: %s", MIGRATIONS_DIR)
+            if not _acquire_lock(conn):
+                logger.error("Could not acquire migration lock '%s' within %ss", MIGRATION_LOCK_NAME, _lock_timeout())
                 return False
+            try:
+                # Read after locking: another worker may have just applied everything.
+                result = conn.execute(text("SELECT migration_name FROM pdf_excel_migrations"))
+                executed = {row[0] for row in result}
+
+                if not MIGRATIONS_DIR.exists():
+                    logger.error("Migrations directory not found: %s", MIGRATIONS_DIR)
+                    return False
+
+                migration_files = list_mysql_migrations()
+                skipped_count = 0
+
+                for migration in migration_files:
+                    migration_name = migration.name
+                    if migration_name in executed:
+                        skipped_count += 1
+                        continue
 
-            migration_files = list_mysql_migrations()
-            applied_count = 0
-            skipped_count = 0
-            current_migration_name = None
-            current_statement = None
-            
-            for migration in migration_files:
-                migration_name = migration.name
-                if migration_name not in executed:
                     current_migration_name = migration_name
                     logger.info("Running migration: %s", migration_name)
+                    started = time.perf_counter()
                     with migration.open('r') as f:
-                        sql = f.read()
-
-                        statements = _split_sql_statements(sql)
+                        for statement in _split_sql_statements(f.read()):
+                            current_statement = statement
+                            conn.execute(text(statement))
+                    duration_ms = int(round((time.perf_counter() - started) * 1000))
 
-                        for statement in statements:
-                            if statement:
-                                current_statement = statement
-                                conn.execute(text(statement))
-                    
                     # Log as executed
-                    conn.execute(text("INSERT INTO pdf_excel_migrations (migration_name) VALUES (:name)"), {"name": migration_name})
+                    conn.execute(
+                        text("INSERT INTO pdf_excel_migrations (migration_name, duration_ms) VALUES (:name, :duration_ms)"),
+                        {"name": migration_name, "duration_ms": duration_ms},
+                    )
                     conn.commit()
                     applied_count += 1
+                    current_migration_name = None
                     current_statement = None
-                    logger.info("Migration %s completed.", migration_name)
-                else:
-                    skipped_count += 1
+                    logger.info("Migration %s completed in %s ms.", migration_name, duration_ms)
+
+                previous_fingerprint = stored_fingerprint(conn)
+                _store_fingerprint(conn, fingerprint, len(migration_files))
+            finally:
+                _release_lock(conn)
 
             logger.info(
                 "Migration summary: applied=%s skipped=%s total=%s",
@@ -146,12 +285,17 @@ def run_migrations():
 
     except Exception as e:
         logger.error("Migration failed: %s", e)
-        if 'current_migration_name' in locals() and current_migration_name:
+        if current_migration_name:
             logger.error("Failed migration file: %s", current_migration_name)
-        if 'current_statement' in locals() and current_statement:
+        if current_statement:
             preview = " ".join(current_statement.strip().split())
             logger.error("Failed SQL statement: %s", preview[:500])
         return False
+    finally:
+        engine.dispose()
+
+    if applied_count or previous_fingerprint != fingerprint:
+        publish_schema_version(fingerprint)
 
     logger.info("--- Migrations Finished ---")
     return True
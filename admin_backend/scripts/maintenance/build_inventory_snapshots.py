@@ -0,0 +1,73 @@
+"""
+Build month-end inventory snapshots (migration 078) for every company, or the ones given.
+Without a range it builds the month that just closed, so it can run from cron early each month:
+
+    python scripts/maintenance/build_inventory_snapshots.py
+    python scripts/maintenance/build_inventory_snapshots.py --start-month 2025-01 --end-month 2025-06 --company-id <id>
+"""
+import argparse
+import sys
+from datetime import date
+sys.path.append('.')
+
+from backend.db.session import get_db_engine
+from backend.routes.inventory.inventory_bp import build_month_end_valuer, _remaining_storage_credentials
+from backend.services.inventory.inventory_snapshots import (
+    build_inventory_snapshots,
+    inventory_snapshots_available,
+    month_range,
+)
+from dotenv import load_dotenv
+from sqlalchemy import text
+
+load_dotenv()
+
+
+def _previous_month():
+    today = date.today()
+    if today.month == 1:
+        return f"{today.year - 1}-12"
+    return f"{today.year}-{today.month - 1:02d}"
+
+
+def build(start_month=None, end_month=None, company_ids=None):
+    engine, error = get_db_engine()
+    if error:
+        print("Database connection error:", error)
+        return False
+
+    try:
+        start_month = start_month or _previous_month()
+        months = month_range(start_month, end_month or start_month)
+        api_url, token = _remaining_storage_credentials({})
+
+        with engine.connect() as conn:
+            if not inventory_snapshots_available(conn):
+                print("inventory_snapshots / inventory_snapshot_items missing. Run migration 078 first.")
+                return False
+            if not company_ids:
+                company_ids = [row.id for row in conn.execute(text("SELECT id FROM companies ORDER BY name ASC"))]
+
+        for company_id in company_ids:
+            print(f"Building {len(months)} inventory snapshot(s) for company {company_id}...")
+            value_month_end = build_month_end_valuer(engine, company_id, api_url, token)
+            for snapshot in build_inventory_snapshots(engine, company_id, months, value_month_end):
+                print(
+                    f"  {snapshot['snapshot_date']}: qty {snapshot['quantity']:.2f}, "
+                    f"value {snapshot['amount']:.2f}, {snapshot['missing_price_count']} line(s) without price"
+                )
+        print("Build finished.")
+        return True
+
+    except Exception as e:
+        print("Build failed:", e)
+        return False
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build month-end inventory snapshots.")
+    parser.add_argument('--start-month', help="First month to build, YYYY-MM (default: previous month)")
+    parser.add_argument('--end-month', help="Last month to build, YYYY-MM (default: start month)")
+    parser.add_argument('--company-id', action='append', dest='company_ids', help="Company to build; repeatable")
+    args = parser.parse_args()
+    sys.exit(0 if build(args.start_month, args.end_month, args.company_ids) else 1)
@@ -0,0 +1,32 @@
+import sys
+sys.path.append('.')
+
+from backend.db.session import get_db_engine
+from backend.services.transactions.import_batches import import_batches_available, repair_import_batches
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def repair():
+    engine, error = get_db_engine()
+    if error:
+        print("Database connection error:", error)
+        return False
+
+    try:
+        with engine.begin() as conn:
+            if not import_batches_available(conn):
+                print("import_batches / import_batch_months missing. Run migration 074 first.")
+                return False
+
+            print("Rebuilding upload summaries from transactions...")
+            batch_count = repair_import_batches(conn)
+            print(f"Repair finished: {batch_count} import batch(es) summarized.")
+            return True
+
+    except Exception as e:
+        print("Repair failed:", e)
+        return False
+
+if __name__ == '__main__':
+    sys.exit(0 if repair() else 1)
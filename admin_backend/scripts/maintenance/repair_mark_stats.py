@@ -0,0 +1,32 @@
+import sys
+sys.path.append('.')
+
+from backend.db.session import get_db_engine
+from backend.services.transactions.mark_stats import mark_stats_available, repair_mark_stats
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def repair():
+    engine, error = get_db_engine()
+    if error:
+        print("Database connection error:", error)
+        return False
+
+    try:
+        with engine.begin() as conn:
+            if not mark_stats_available(conn):
+                print("mark_stats / mark_stats_years missing. Run migration 077 first.")
+                return False
+
+            print("Rebuilding mark usage statistics from transactions...")
+            mark_count = repair_mark_stats(conn)
+            print(f"Repair finished: {mark_count} mark(s) with usage.")
+            return True
+
+    except Exception as e:
+        print("Repair failed:", e)
+        return False
+
+if __name__ == '__main__':
+    sys.exit(0 if repair() else 1)
@@ -0,0 +1,32 @@
+import sys
+sys.path.append('.')
+
+from backend.db.session import get_db_engine
+from backend.services.transactions.presence_aggregates import presence_aggregates_available, repair_presence_aggregates
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def repair():
+    engine, error = get_db_engine()
+    if error:
+        print("Database connection error:", error)
+        return False
+
+    try:
+        with engine.begin() as conn:
+            if not presence_aggregates_available(conn):
+                print("payroll_presence_daily missing. Run migration 080 first.")
+                return False
+
+            print("Rebuilding daily presence totals from payroll presences...")
+            row_count = repair_presence_aggregates(conn)
+            print(f"Repair finished: {row_count} daily row(s).")
+            return True
+
+    except Exception as e:
+        print("Repair failed:", e)
+        return False
+
+if __name__ == '__main__':
+    sys.exit(0 if repair() else 1)
@@ -0,0 +1,32 @@
+import sys
+sys.path.append('.')
+
+from backend.db.session import get_db_engine
+from backend.services.rental.rental_schedule import rental_schedule_available, repair_rental_schedule
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def repair():
+    engine, error = get_db_engine()
+    if error:
+        print("Database connection error:", error)
+        return False
+
+    try:
+        with engine.begin() as conn:
+            if not rental_schedule_available(conn):
+                print("rental_contract_schedule missing. Run migration 081 first.")
+                return False
+
+            print("Rebuilding rental contract schedules from contracts and linked transactions...")
+            row_count = repair_rental_schedule(conn)
+            print(f"Repair finished: {row_count} schedule row(s).")
+            return True
+
+    except Exception as e:
+        print("Repair failed:", e)
+        return False
+
+if __name__ == '__main__':
+    sys.exit(0 if repair() else 1)
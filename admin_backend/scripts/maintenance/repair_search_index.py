@@ -0,0 +1,32 @@
+import sys
+sys.path.append('.')
+
+from backend.db.session import get_db_engine
+from backend.services.transactions.transaction_search import repair_search_index, search_index_available
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def repair():
+    engine, error = get_db_engine()
+    if error:
+        print("Database connection error:", error)
+        return False
+
+    try:
+        with engine.begin() as conn:
+            if not search_index_available(conn):
+                print("transaction_search missing. Run migration 076 first.")
+                return False
+
+            print("Rebuilding transaction search index...")
+            indexed_count = repair_search_index(conn)
+            print(f"Repair finished: {indexed_count} transaction(s) indexed.")
+            return True
+
+    except Exception as e:
+        print("Repair failed:", e)
+        return False
+
+if __name__ == '__main__':
+    sys.exit(0 if repair() else 1)
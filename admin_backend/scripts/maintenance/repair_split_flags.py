@@ -0,0 +1,32 @@
+import sys
+sys.path.append('.')
+
+from backend.db.session import get_db_engine
+from backend.services.transactions.split_flags import repair_split_flags, split_flags_available
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def repair():
+    engine, error = get_db_engine()
+    if error:
+        print("Database connection error:", error)
+        return False
+
+    try:
+        with engine.begin() as conn:
+            if not split_flags_available(conn):
+                print("transactions.is_split_container / has_marked_children missing. Run migration 073 first.")
+                return False
+
+            print("Recomputing split flags from child transactions...")
+            corrected = repair_split_flags(conn)
+            print(f"Repair finished: {corrected} transaction(s) corrected.")
+            return True
+
+    except Exception as e:
+        print("Repair failed:", e)
+        return False
+
+if __name__ == '__main__':
+    sys.exit(0 if repair() else 1)
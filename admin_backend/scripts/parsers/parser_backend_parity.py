@@ -0,0 +1,136 @@
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from bank_parsers.parser_common import DEFAULT_PDF_BACKEND, PDF_BACKENDS, pdf_backend_override
+from backend.routes.uploads.pdf_helpers import parse_statement
+
+# Columns stamped at parse time; they always differ between runs.
+VOLATILE_COLUMNS = {'created_at'}
+
+
+def collect_corpus(paths):
+    """Expand the given files/directories into a sorted list of statement files."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                for name in names:
+                    if name.lower().endswith(('.pdf', '.csv')):
+                        files.append(os.path.join(root, name))
+        elif os.path.exists(path):
+            files.append(path)
+    return sorted(files)
+
+
+def parse_with_backend(bank_key, file_path, backend_name, password=None):
+    with pdf_backend_override(backend_name):
+        return parse_statement(
+            bank_key,
+            file_path,
+            password=password,
+            is_csv=file_path.lower().endswith('.csv'),
+        )
+
+
+def _comparable_rows(df):
+    columns = [col for col in df.columns if col not in VOLATILE_COLUMNS]
+    return [
+        tuple('' if value is None else str(value) for value in row)
+        for row in df[columns].itertuples(index=False, name=None)
+    ], columns
+
+
+def diff_parsed_transactions(baseline_df, candidate_df, max_examples=5):
+    """Compare two parsed statements row by row, ignoring parse-time columns."""
+    baseline_rows, baseline_columns = _comparable_rows(baseline_df)
+    candidate_rows, candidate_columns = _comparable_rows(candidate_df)
+
+    differences = []
+    if baseline_columns != candidate_columns:
+        differences.append({
+            'kind': 'columns',
+            'baseline': baseline_columns,
+            'candidate': candidate_columns,
+        })
+
+    for index in range(max(len(baseline_rows), len(candidate_rows))):
+        baseline_row = baseline_rows[index] if index < len(baseline_rows) else None
+        candidate_row = candidate_rows[index] if index < len(candidate_rows) else None
+        if baseline_row != candidate_row:
+            differences.append({
+                'kind': 'row',
+                'index': index,
+                'baseline': baseline_row,
+                'candidate': candidate_row,
+            })
+
+    return {
+        'baseline_count': len(baseline_rows),
+        'candidate_count': len(candidate_rows),
+        'difference_count': len(differences),
+        'examples': differences[:max_examples],
+    }
+
+
+def run_parity(bank_key, paths, baseline=DEFAULT_PDF_BACKEND, candidate='pdfium', password=None):
+    results = []
+    for file_path in collect_corpus(paths):
+        result = {'file': file_path}
+        try:
+            baseline_df = parse_with_backend(bank_key, file_path, baseline, password=password)
+            candidate_df = parse_with_backend(bank_key, file_path, candidate, password=password)
+            result.update(diff_parsed_transactions(baseline_df, candidate_df))
+        except Exception as exc:
+            result['error'] = str(exc)
+        results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Parse a statement corpus with two extraction backends and diff the transactions.'
+    )
+    parser.add_argument('bank_key', help='Parser key, e.g. bca, dbs, ccbca, mandiri')
+    parser.add_argument('paths', nargs='+', help='Statement files or directories')
+    parser.add_argument('--baseline', default=DEFAULT_PDF_BACKEND, choices=sorted(PDF_BACKENDS))
+    parser.add_argument('--candidate', default='pdfium', choices=sorted(PDF_BACKENDS))
+    parser.add_argument('--password', default=None)
+    args = parser.parse_args()
+
+    results = run_parity(
+        args.bank_key,
+        args.paths,
+        baseline=args.baseline,
+        candidate=args.candidate,
+        password=args.password,
+    )
+    if not results:
+        print("No statement files found")
+        return 1
+
+    mismatched = 0
+    for result in results:
+        if 'error' in result:
+            mismatched += 1
+            print(f"ERROR {result['file']}: {result['error']}")
+            continue
+        if result['difference_count']:
+            mismatched += 1
+            print(
+                f"DIFF  {result['file']}: {result['baseline_count']} vs "
+                f"{result['candidate_count']} rows, {result['difference_count']} differences"
+            )
+            for example in result['examples']:
+                print(f"      {example}")
+        else:
+            print(f"OK    {result['file']}: {result['baseline_count']} rows")
+
+    print(f"\n{len(results) - mismatched}/{len(results)} files identical ({args.baseline} vs {args.candidate})")
+    return 1 if mismatched else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
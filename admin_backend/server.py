@@ -9,6 +9,10 @@ load_dotenv(BASE_DIR / ".env")
 
 from migrate import run_migrations
 from backend.error_handlers import register_error_handlers
+from backend.metrics import register_metrics
+from backend.profiling import register_profiling
+from backend.request_stats import register_request_stats
+from backend.services.reporting.report_cache import register_report_invalidation
 from backend.routes.transactions.service_bp import service_bp
 from backend.routes.master_data.company_bp import company_bp
 from backend.routes.master_data.coa_bp import coa_bp
@@ -31,9 +35,15 @@ from backend.routes.transactions.history_bp import history_bp
 from backend.routes.transactions.payroll_bp import payroll_bp
 from backend.routes.master_data.mark_bp import mark_bp
 from backend.routes.reporting.fiscal_corrections_bp import fiscal_corrections_bp
+from backend.routes.debug.debug_bp import debug_bp
+from backend.routes.debug.metrics_bp import metrics_bp
 
 app = Flask(__name__)
 register_error_handlers(app)
+register_request_stats(app)
+register_metrics(app)
+register_profiling(app)
+register_report_invalidation(app)
 # Configure CORS
 CORS(app, resources={r"/*": {"origins": "*", "allow_headers": "*", "expose_headers": "*"}})
 
@@ -65,6 +75,8 @@ app.register_blueprint(history_bp)
 app.register_blueprint(payroll_bp)
 app.register_blueprint(mark_bp)
 app.register_blueprint(fiscal_corrections_bp)
+app.register_blueprint(debug_bp)
+app.register_blueprint(metrics_bp)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,40 @@
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.pool import StaticPool
+
+import migrate
+from backend.db import schema
+from database.migration_index import MIGRATIONS_DIR
+
+
+@pytest.fixture(autouse=True)
+def _fresh_table_columns():
+    """Each test builds its own schema; start without columns cached by an earlier one."""
+    schema.forget_table_columns()
+    yield
+    schema.forget_table_columns()
+
+
+@pytest.fixture
+def make_sqlite_engine():
+    """`make_sqlite_engine()` returns a new in-memory SQLite engine whose connections share one database."""
+    engines = []
+
+    def make():
+        engine = sa.create_engine('sqlite://', poolclass=StaticPool)
+        engines.append(engine)
+        return engine
+
+    yield make
+    for engine in engines:
+        engine.dispose()
+
+
+@pytest.fixture
+def run_migration():
+    """`run_migration(conn, name)` applies database/migrations/<name> one statement at a time, like migrate.py."""
+    def run(conn, name):
+        for statement in migrate._split_sql_statements((MIGRATIONS_DIR / name).read_text()):
+            conn.exec_driver_sql(statement)
+        schema.forget_table_columns()
+    return run
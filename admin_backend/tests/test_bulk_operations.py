@@ -0,0 +1,227 @@
+import pytest
+from flask import Flask
+from sqlalchemy import event, text
+
+from backend.db import session
+from backend.error_handlers import register_error_handlers
+from backend.routes.transactions.history_bp import history_bp
+from backend.services.transactions import bulk_operations
+
+
+@pytest.fixture
+def engine(make_sqlite_engine, run_migration):
+    engine = make_sqlite_engine()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("""
+            CREATE TABLE transactions (
+                id TEXT PRIMARY KEY, parent_id TEXT, description TEXT, amount REAL, db_cr TEXT,
+                txn_date TEXT, mark_id TEXT, company_id TEXT, bank_code TEXT, source_file TEXT,
+                created_at TEXT, updated_at TEXT
+            )
+        """)
+        conn.exec_driver_sql(
+            "CREATE TABLE manual_journal_links (id TEXT PRIMARY KEY, manual_txn_id TEXT, linked_txn_id TEXT)"
+        )
+        conn.exec_driver_sql("CREATE TABLE marks (id TEXT PRIMARY KEY, internal_report TEXT)")
+        conn.exec_driver_sql("CREATE TABLE mark_coa_mapping (id TEXT PRIMARY KEY, mark_id TEXT)")
+        conn.exec_driver_sql("INSERT INTO marks (id) VALUES ('m-old'), ('m-new')")
+        run_migration(conn, '071_create_report_data_versions_sqlite.sql')
+        run_migration(conn, '072_create_data_change_log_sqlite.sql')
+        run_migration(conn, '075_create_bulk_jobs_sqlite.sql')
+        run_migration(conn, '083_add_bulk_job_heartbeat_sqlite.sql')
+        conn.exec_driver_sql("""
+            INSERT INTO transactions (id, parent_id, company_id, txn_date, amount, db_cr, bank_code, source_file, mark_id)
+            VALUES
+            ('t1', NULL, 'c1', '2025-03-01', 10, 'DB', 'BCA', 'bca_mar.pdf', NULL),
+            ('t2', NULL, 'c1', '2025-03-02', 20, 'DB', 'BCA', 'bca_mar.pdf', NULL),
+            ('t3', NULL, 'c1', '2025-03-03', 30, 'DB', 'BCA', 'bca_mar.pdf', NULL),
+            ('t3-a', 't3', 'c1', '2025-03-03', 30, 'DB', NULL, NULL, 'm-old'),
+            ('t4', NULL, 'c1', '2025-03-04', 40, 'DB', 'BCA', 'bca_mar.pdf', NULL),
+            ('t5', NULL, 'c1', '2025-03-05', 50, 'DB', 'BCA', 'bca_mar.pdf', 'm-old'),
+            ('t6', NULL, 'c1', '2025-04-01', 60, 'DB', 'BCA', 'bca_apr.pdf', NULL),
+            ('d1', NULL, 'c1', '2025-03-06', 70, 'DB', 'DBS', 'dbs_mar.pdf', NULL)
+        """)
+        conn.exec_driver_sql("INSERT INTO manual_journal_links VALUES ('l1', 'manual-1', 't4')")
+    return engine
+
+
+def _client(monkeypatch, engine, chunk_size=2):
+    monkeypatch.setattr(session, '_db_engine', engine)
+    monkeypatch.setenv(bulk_operations.BULK_CHUNK_SIZE_ENV, str(chunk_size))
+    app = Flask(__name__)
+    register_error_handlers(app)
+    app.register_blueprint(history_bp)
+    return app.test_client()
+
+
+def _column(engine, column):
+    with engine.connect() as conn:
+        return dict(conn.execute(text(f"SELECT id, {column} FROM transactions")).fetchall())
+
+
+def test_bulk_mark_by_filter_processes_chunks_and_reports_skips(monkeypatch, engine):
+    client = _client(monkeypatch, engine)
+
+    response = client.post('/api/transactions/bulk-mark', json={
+        'mark_id': 'm-new',
+        'filter': {'bank_code': 'BCA', 'unmarked': True, 'start_date': '2025-03-01', 'end_date': '2025-03-31'},
+    })
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['updated_count'] == 2
+    assert body['skipped'] == {'split_parent': ['t3'], 'linked_to_manual_journal': ['t4']}
+    assert body['skipped_split_parent_ids'] == ['t3']
+    assert [chunk['size'] for chunk in body['chunks']] == [2, 2]
+    marks = _column(engine, 'mark_id')
+    assert (marks['t1'], marks['t2']) == ('m-new', 'm-new')
+    assert (marks['t3'], marks['t4'], marks['t5'], marks['t6'], marks['d1']) == (None, None, 'm-old', None, None)
+
+    response = client.post('/api/transactions/bulk-mark', json={'transaction_ids': ['t4', 't5'], 'mark_id': None})
+    body = response.get_json()
+    assert (body['updated_count'], body['skipped_split_parent_ids']) == (1, ['t4'])
+
+
+def test_bulk_assign_company_moves_whole_split_families(monkeypatch, engine):
+    client = _client(monkeypatch, engine)
+
+    response = client.post('/api/transactions/bulk-assign-company', json={
+        'transaction_ids': ['t3-a', 'd1'], 'company_id': 'c2',
+    })
+
+    assert response.status_code == 200
+    companies = _column(engine, 'company_id')
+    assert {txn_id for txn_id, company in companies.items() if company == 'c2'} == {'t3', 't3-a', 'd1'}
+
+
+def test_delete_by_source_removes_children_links_and_orphan_marks(monkeypatch, engine):
+    client = _client(monkeypatch, engine)
+
+    response = client.post('/api/transactions/delete-by-source', json={'source_file': 'bca_mar.pdf'})
+
+    assert response.status_code == 200
+    assert response.get_json()['message'] == 'Deleted 6 transactions'
+    assert set(_column(engine, 'id')) == {'t6', 'd1'}
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM manual_journal_links")).scalar() == 0
+        assert [row.id for row in conn.execute(text("SELECT id FROM marks"))] == ['m-new']
+
+
+
+def test_chunks_probe_each_table_schema_once(monkeypatch, engine):
+    client = _client(monkeypatch, engine)
+    probes = []
+    event.listen(engine, 'before_cursor_execute', lambda *args: probes.append(args[2]) if 'PRAGMA' in args[2] else None)
+
+    response = client.post('/api/transactions/delete-by-source', json={'source_file': 'bca_mar.pdf'})
+
+    assert response.status_code == 200
+    assert len(response.get_json()['chunks']) == 3
+    assert probes and len(probes) == len(set(probes))
+
+
+def _import_batch_counts(engine):
+    with engine.connect() as conn:
+        return dict(conn.execute(text("SELECT source_file, transaction_count FROM import_batches")).fetchall())
+
+
+def test_delete_refreshes_import_batches_once_after_the_last_chunk(monkeypatch, engine, run_migration):
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ALTER TABLE transactions ADD COLUMN bank_account_number TEXT")
+        run_migration(conn, '074_create_import_batches_sqlite.sql')
+    client = _client(monkeypatch, engine)
+    refreshed = []
+    refresh = bulk_operations.refresh_import_batches
+    monkeypatch.setattr(
+        bulk_operations, 'refresh_import_batches', lambda conn, keys: refreshed.append(set(keys)) or refresh(conn, keys)
+    )
+
+    response = client.post('/api/transactions/delete-by-source', json={'source_file': 'bca_mar.pdf'})
+
+    assert response.status_code == 200
+    assert len(response.get_json()['chunks']) == 3
+    assert refreshed == [{('bca_mar.pdf', 'BCA')}]
+    assert _import_batch_counts(engine) == {'bca_apr.pdf': 1, 'dbs_mar.pdf': 1}
+
+    monkeypatch.setenv(bulk_operations.BULK_CHUNK_SIZE_ENV, '1')
+    _fail_on_chunk(monkeypatch, bulk_operations.DELETE, 2)
+    response = client.post('/api/transactions/bulk-delete', json={'transaction_ids': ['d1', 't6']})
+    assert response.status_code == 500
+    assert _import_batch_counts(engine) == {'bca_apr.pdf': 1}
+
+def test_large_selection_runs_as_a_background_job(monkeypatch, engine):
+    client = _client(monkeypatch, engine)
+    monkeypatch.setenv(bulk_operations.BULK_ASYNC_THRESHOLD_ENV, '3')
+    monkeypatch.setattr(bulk_operations, '_spawn', lambda target, *args: target(*args))
+
+    response = client.post('/api/transactions/bulk-delete', json={'transaction_ids': ['t1', 't2', 't6', 'd1']})
+
+    assert response.status_code == 202
+    job_id = response.get_json()['job_id']
+    job = client.get(f'/api/transactions/bulk-jobs/{job_id}').get_json()
+    assert job['status'] == 'completed'
+    assert (job['total_count'], job['processed_count'], job['updated_count']) == (4, 4, 4)
+    assert len(job['chunks']) == 2
+    assert set(_column(engine, 'id')) == {'t3', 't3-a', 't4', 't5'}
+    assert client.get('/api/transactions/bulk-jobs/missing').status_code == 404
+
+
+def _fail_on_chunk(monkeypatch, operation, failing_chunk):
+    handler = bulk_operations._CHUNK_HANDLERS[operation]
+    calls = []
+
+    def flaky(conn, bounds, options, now, pending):
+        calls.append(bounds)
+        if len(calls) == failing_chunk:
+            raise RuntimeError('lost connection')
+        return handler(conn, bounds, options, now, pending)
+
+    monkeypatch.setitem(bulk_operations._CHUNK_HANDLERS, operation, flaky)
+
+
+def test_failure_after_committed_chunks_reports_a_partial_result(monkeypatch, engine):
+    client = _client(monkeypatch, engine)
+    _fail_on_chunk(monkeypatch, bulk_operations.DELETE, 2)
+
+    response = client.post('/api/transactions/delete-by-source', json={'source_file': 'bca_mar.pdf'})
+
+    assert response.status_code == 500
+    body = response.get_json()
+    assert body['code'] == 'bulk_operation_partial' and body['partial'] is True
+    assert (body['total_count'], body['processed_count'], body['updated_count']) == (5, 2, 2)
+    assert set(_column(engine, 'id')) == {'t3', 't3-a', 't4', 't5', 't6', 'd1'}
+
+    monkeypatch.setenv(bulk_operations.BULK_ASYNC_THRESHOLD_ENV, '1')
+    monkeypatch.setattr(bulk_operations, '_spawn', lambda target, *args: target(*args))
+    _fail_on_chunk(monkeypatch, bulk_operations.DELETE, 2)
+    response = client.post('/api/transactions/bulk-delete', json={'transaction_ids': ['t4', 't5', 't6', 'd1']})
+    job = client.get(f"/api/transactions/bulk-jobs/{response.get_json()['job_id']}").get_json()
+    assert job['status'] == 'failed' and job['partial'] is True
+    assert (job['processed_count'], job['updated_count']) == (2, 2)
+
+
+def test_orphaned_jobs_are_failed_once_their_heartbeat_is_stale(monkeypatch, engine):
+    client = _client(monkeypatch, engine)
+    monkeypatch.setenv(bulk_operations.BULK_ASYNC_THRESHOLD_ENV, '1')
+    # The worker thread never runs, as after a restart between queueing and processing.
+    monkeypatch.setattr(bulk_operations, '_spawn', lambda target, *args: None)
+
+    job_id = client.post('/api/transactions/bulk-delete', json={'transaction_ids': ['t1', 't2']}).get_json()['job_id']
+    assert client.get(f'/api/transactions/bulk-jobs/{job_id}').get_json()['status'] == 'pending'
+
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE bulk_jobs SET created_at = '2000-01-01 00:00:00' WHERE id = :id"), {'id': job_id})
+    job = client.get(f'/api/transactions/bulk-jobs/{job_id}').get_json()
+
+    assert job['status'] == 'failed'
+    assert job['error'] == bulk_operations.STALE_JOB_ERROR
+    assert job['partial'] is False and job['finished_at']
+
+
+def test_invalid_filter_is_rejected(monkeypatch, engine):
+    client = _client(monkeypatch, engine)
+
+    response = client.post('/api/transactions/bulk-mark', json={'mark_id': 'm-new', 'filter': {'amount': 5}})
+    assert response.status_code == 400
+    response = client.post('/api/transactions/bulk-delete', json={'filter': {'unmarked': False}})
+    assert response.status_code == 400
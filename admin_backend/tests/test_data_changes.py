@@ -0,0 +1,116 @@
+import pytest
+from flask import Flask
+
+from backend.db import session
+from backend.error_handlers import register_error_handlers
+from backend.routes.transactions.history_bp import history_bp
+from backend.services.reporting import data_changes
+from backend.services.reporting.data_changes import (
+    compact_data_changes,
+    fetch_data_changes,
+    record_data_change,
+    record_transaction_changes,
+    summarize_data_changes,
+)
+from backend.services.reporting.report_cache import report_data_version
+
+
+def _build_engine(make_sqlite_engine, run_migration, with_change_log=True):
+    engine = make_sqlite_engine()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("""
+            CREATE TABLE transactions (
+                id TEXT PRIMARY KEY, parent_id TEXT, company_id TEXT, txn_date TEXT, mark_id TEXT
+            )
+        """)
+        run_migration(conn, '071_create_report_data_versions_sqlite.sql')
+        if with_change_log:
+            run_migration(conn, '072_create_data_change_log_sqlite.sql')
+        conn.exec_driver_sql("""
+            INSERT INTO transactions (id, parent_id, company_id, txn_date) VALUES
+            ('t1', NULL, 'c1', '2025-01-10'),
+            ('t1-a', 't1', 'c1', '2025-01-10'),
+            ('t2', NULL, 'c1', '2025-03-05'),
+            ('t3', NULL, 'c2', '2024-12-31')
+        """)
+    return engine
+
+
+@pytest.fixture
+def engine(make_sqlite_engine, run_migration):
+    return _build_engine(make_sqlite_engine, run_migration)
+
+
+def _changes(engine):
+    with engine.connect() as conn:
+        return fetch_data_changes(conn)
+
+
+def test_transaction_changes_are_grouped_per_company_and_bump_versions(engine):
+    with engine.connect() as conn:
+        before = report_data_version(conn, 'c2')
+
+    with engine.begin() as conn:
+        record_transaction_changes(conn, data_changes.TRANSACTIONS, ['t1', 't2', 't3'])
+
+    ranges = {(c['company_id'], c['min_date'], c['max_date']) for c in _changes(engine)}
+    assert ranges == {('c1', '2025-01-10', '2025-03-05'), ('c2', '2024-12-31', '2024-12-31')}
+    with engine.connect() as conn:
+        assert report_data_version(conn, 'c2') != before
+
+
+def test_change_log_rolls_back_with_the_write(engine):
+    try:
+        with engine.begin() as conn:
+            record_transaction_changes(conn, data_changes.TRANSACTIONS, ['t1'])
+            raise RuntimeError('write failed')
+    except RuntimeError:
+        pass
+
+    assert _changes(engine) == []
+
+
+def test_summarize_and_compact_merge_ranges_and_keep_cursor(engine):
+    with engine.begin() as conn:
+        record_data_change(conn, data_changes.MARK, 'c1', '2025-02-01', '2025-02-01')
+        record_data_change(conn, data_changes.MARK, 'c1', '2025-01-01', '2025-01-15')
+        record_data_change(conn, data_changes.AMORTIZATION, 'c1', '2025-06-01')
+        record_data_change(conn, data_changes.MARK, 'c2', '2025-01-01', '2025-01-01')
+
+    changes = _changes(engine)
+    summary = summarize_data_changes(changes)
+    assert summary['c1']['min_date'] == '2025-01-01'
+    assert summary['c1']['max_date'] is None
+    assert summary['c1']['entity_kinds'] == {data_changes.MARK, data_changes.AMORTIZATION}
+
+    with engine.begin() as conn:
+        removed = compact_data_changes(conn, changes[-1]['id'])
+    compacted = _changes(engine)
+
+    assert removed == 1
+    assert [change['id'] for change in compacted] == [changes[1]['id'], changes[2]['id'], changes[3]['id']]
+    assert (compacted[0]['min_date'], compacted[0]['max_date']) == ('2025-01-01', '2025-02-01')
+
+
+def test_bulk_delete_records_range_before_rows_are_gone(monkeypatch, engine):
+    monkeypatch.setattr(session, '_db_engine', engine)
+    app = Flask(__name__)
+    register_error_handlers(app)
+    app.register_blueprint(history_bp)
+
+    response = app.test_client().post('/api/transactions/bulk-delete', json={'transaction_ids': ['t3']})
+
+    assert response.status_code == 200
+    assert [(c['entity_kind'], c['company_id'], c['min_date']) for c in _changes(engine)] == [
+        (data_changes.TRANSACTIONS, 'c2', '2024-12-31'),
+    ]
+
+
+def test_missing_change_log_still_invalidates_reports(make_sqlite_engine, run_migration):
+    engine = _build_engine(make_sqlite_engine, run_migration, with_change_log=False)
+    with engine.connect() as conn:
+        before = report_data_version(conn, 'c1')
+    with engine.begin() as conn:
+        record_transaction_changes(conn, data_changes.TRANSACTIONS, ['t1'])
+    with engine.connect() as conn:
+        assert report_data_version(conn, 'c1') != before
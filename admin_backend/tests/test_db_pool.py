@@ -0,0 +1,49 @@
+import sqlalchemy as sa
+from sqlalchemy.pool import StaticPool
+
+from backend.db import session
+from backend.db.instrumentation import TimedQueuePool
+
+
+def _reset_reporting(monkeypatch, primary, replica_url=''):
+    monkeypatch.setattr(session, '_db_engine', primary)
+    monkeypatch.setattr(session, '_reporting_engine', None)
+    monkeypatch.setattr(session, '_reporting_retry_at', 0.0)
+    monkeypatch.setattr(session, 'REPORTING_DB_URL', replica_url)
+
+
+def test_pool_options_prefer_engine_specific_settings(monkeypatch):
+    monkeypatch.setenv('DB_POOL_SIZE', '8')
+    monkeypatch.setenv('REPORTING_DB_POOL_SIZE', '3')
+    monkeypatch.setenv('REPORTING_DB_POOL_PRE_PING', '0')
+    monkeypatch.setenv('DB_POOL_RECYCLE', 'soon')
+
+    primary = session.pool_options('DB')
+    reporting = session.pool_options('REPORTING_DB')
+
+    assert primary['poolclass'] is TimedQueuePool
+    assert primary['pool_size'] == 8 and primary['pool_pre_ping'] is True
+    assert primary['pool_recycle'] == session.POOL_DEFAULTS['POOL_RECYCLE']
+    assert reporting['pool_size'] == 3 and reporting['pool_pre_ping'] is False
+
+
+def test_reporting_engine_shares_single_connection_primary(monkeypatch):
+    primary = sa.create_engine('sqlite://', poolclass=StaticPool)
+    _reset_reporting(monkeypatch, primary)
+
+    assert session.get_reporting_engine() == (primary, None)
+
+
+def test_reporting_engine_uses_replica_and_falls_back_when_unreachable(monkeypatch, tmp_path):
+    primary = sa.create_engine('sqlite://', poolclass=StaticPool)
+    _reset_reporting(monkeypatch, primary, f"sqlite:///{tmp_path / 'replica.db'}")
+
+    engine, error = session.get_reporting_engine()
+    assert error is None and engine is not primary
+    assert isinstance(engine.pool, TimedQueuePool) and engine.pool.metrics_label == 'reporting'
+    assert session.get_reporting_engine()[0] is engine
+
+    _reset_reporting(monkeypatch, primary, f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    assert session.get_reporting_engine() == (primary, None)
+    assert session._reporting_retry_at > 0
+    assert session._reporting_engine is None
@@ -0,0 +1,100 @@
+import io
+from types import SimpleNamespace
+
+from openpyxl import load_workbook
+
+from backend.routes.reporting.general_ledger_helpers import (
+    attach_ledger_pages,
+    build_ledger_accounts,
+    iter_ledger_csv,
+    iter_ledger_export_rows,
+    write_ledger_workbook,
+)
+
+
+def _row(transaction_id, txn_date, coa_code, signed_amount):
+    return SimpleNamespace(_mapping={
+        'transaction_id': transaction_id,
+        'txn_date': txn_date,
+        'description': f'txn {transaction_id}',
+        'mark_name': 'Sales',
+        'coa_code': coa_code,
+        'coa_name': f'Account {coa_code}',
+        'coa_category': 'ASSET',
+        'signed_amount': signed_amount,
+    })
+
+
+ROWS = [
+    _row('t1', '2025-01-02', '1101', 100),
+    _row('t2', '2025-01-05', '1101', -40),
+    _row('t1', '2025-01-02', '4001', -100),
+]
+
+
+def test_running_balance_restarts_per_account_and_marks_account_end():
+    entries = list(iter_ledger_export_rows(iter(ROWS)))
+
+    assert [entry['running_balance'] for entry in entries] == [100.0, 60.0, -100.0]
+    assert entries[0]['account_end'] is None
+    assert entries[1]['account_end']['ending_balance'] == 60.0
+    assert entries[1]['account_end']['total_credit'] == 40.0
+    assert entries[2]['account_end']['coa_code'] == '4001'
+
+
+def test_workbook_has_summary_and_one_sheet_per_account():
+    output = io.BytesIO()
+    write_ledger_workbook(iter(ROWS), output)
+    output.seek(0)
+    workbook = load_workbook(output)
+
+    assert workbook.sheetnames == ['Summary', '1101_Account 1101', '4001_Account 4001']
+    summary = list(workbook['Summary'].values)
+    assert summary[1] == ('1101', 'Account 1101', 'ASSET', 0, 100, 40, 60)
+    assert len(list(workbook['1101_Account 1101'].values)) == 3
+
+
+def test_csv_stream_contains_header_and_every_entry():
+    lines = ''.join(iter_ledger_csv(iter(ROWS))).splitlines()
+
+    assert lines[0] == 'Tanggal,Deskripsi,Mark,COA,Debit,Kredit,Saldo'
+    assert len(lines) == 4
+
+
+def test_export_running_balance_starts_from_opening_balance():
+    entries = list(iter_ledger_export_rows(iter(ROWS), opening_balances={'1101': 25}))
+
+    assert [entry['running_balance'] for entry in entries] == [125.0, 85.0, -100.0]
+    assert entries[1]['account_end']['ending_balance'] == 85.0
+
+
+def test_ledger_page_continues_from_opening_balance():
+    accounts = build_ledger_accounts([SimpleNamespace(_mapping={
+        'coa_code': '1101',
+        'coa_name': 'Account 1101',
+        'coa_category': 'ASSET',
+        'opening_balance': 30,
+        'total_debit': 150,
+        'total_credit': 40,
+        'entry_count': 3,
+        'transaction_count': 3,
+    })])
+    page = [
+        SimpleNamespace(_mapping={
+            **row._mapping,
+            'amount': abs(row._mapping['signed_amount']),
+            'db_cr': 'DB' if row._mapping['signed_amount'] > 0 else 'CR',
+            'mapping_type': 'DIRECT',
+            'period_running_balance': running,
+        })
+        for row, running in zip(ROWS[:2], (100, 60))
+    ]
+
+    attach_ledger_pages(accounts, page, offset=0, limit=2)
+    account = accounts[0]
+
+    assert account['ending_balance'] == 140.0
+    assert [txn['running_balance'] for txn in account['transactions']] == [130.0, 90.0]
+    assert [txn['credit'] for txn in account['transactions']] == [0, 40.0]
+    assert account['has_more'] is True
+    assert account['next_offset'] == 2
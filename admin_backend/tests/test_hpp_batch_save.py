@@ -0,0 +1,132 @@
+import pytest
+from flask import Flask
+from sqlalchemy import event, text
+
+from backend.db import session
+from backend.error_handlers import register_error_handlers
+from backend.routes.inventory.hpp_bp import hpp_bp
+from backend.routes.inventory.hpp_helpers import diff_batch_products
+
+TXN_COUNT = 200
+
+
+@pytest.fixture
+def engine(make_sqlite_engine):
+    engine = make_sqlite_engine()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE transactions (id TEXT PRIMARY KEY, txn_date TEXT, amount REAL)")
+        conn.exec_driver_sql("""
+            CREATE TABLE hpp_batches (
+                id TEXT PRIMARY KEY, company_id TEXT, memo TEXT, batch_date TEXT, total_amount REAL, created_at TEXT
+            )
+        """)
+        conn.exec_driver_sql("CREATE TABLE hpp_batch_transactions (batch_id TEXT, transaction_id TEXT)")
+        conn.exec_driver_sql("""
+            CREATE TABLE hpp_batch_products (
+                id TEXT PRIMARY KEY, batch_id TEXT, stock_monitoring_id TEXT, quantity REAL,
+                foreign_currency TEXT, foreign_price REAL, calculated_total_idr REAL, calculated_unit_idr_hpp REAL
+            )
+        """)
+        conn.execute(text("INSERT INTO transactions VALUES (:id, :txn_date, :amount)"), [
+            {'id': f't{index:03d}', 'txn_date': f'2025-03-{index % 28 + 1:02d}', 'amount': -100}
+            for index in range(TXN_COUNT)
+        ])
+    return engine
+
+
+def _client(monkeypatch, engine):
+    monkeypatch.setattr(session, '_db_engine', engine)
+    app = Flask(__name__)
+    register_error_handlers(app)
+    app.register_blueprint(hpp_bp)
+    return app.test_client()
+
+
+def _count_statements(engine):
+    statements = []
+    event.listen(engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+    return statements
+
+
+def _items(count, price=10.0):
+    return [
+        {'stock_monitoring_id': f'sm-{index:02d}', 'quantity': 2, 'foreign_price': price}
+        for index in range(count)
+    ]
+
+
+def test_large_batch_saves_in_a_bounded_number_of_statements(monkeypatch, engine):
+    client = _client(monkeypatch, engine)
+    statements = _count_statements(engine)
+
+    response = client.post('/api/hpp-batches', json={
+        'company_id': 'c1',
+        'transaction_ids': [f't{index:03d}' for index in range(TXN_COUNT)],
+        'items': _items(50),
+    })
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['total_amount'] == TXN_COUNT * 100
+    assert len(body['diff']['transactions']['added']) == TXN_COUNT
+    assert body['diff']['products']['added_count'] == 50
+    assert len(statements) < 15
+    with engine.connect() as conn:
+        batch = conn.execute(text("SELECT batch_date FROM hpp_batches")).fetchone()
+        assert batch.batch_date == '2025-03-01'
+        assert conn.execute(text("SELECT COUNT(*) FROM hpp_batch_transactions")).scalar() == TXN_COUNT
+        unit_prices = {row[0] for row in conn.execute(text("SELECT calculated_unit_idr_hpp FROM hpp_batch_products"))}
+        assert unit_prices == {200.0}
+
+
+def test_resave_applies_only_the_diff(monkeypatch, engine):
+    client = _client(monkeypatch, engine)
+    batch_id = client.post('/api/hpp-batches', json={
+        'company_id': 'c1', 'batch_date': '2025-03-31',
+        'transaction_ids': ['t000', 't001', 't002'], 'items': _items(3),
+    }).get_json()['batch_id']
+    with engine.connect() as conn:
+        kept_product_id = conn.execute(
+            text("SELECT id FROM hpp_batch_products WHERE stock_monitoring_id = 'sm-00'")
+        ).scalar()
+
+    items = _items(2) + [{'stock_monitoring_id': 'sm-09', 'quantity': 4, 'foreign_price': 10.0}]
+    response = client.post('/api/hpp-batches', json={
+        'id': batch_id, 'company_id': 'c1', 'batch_date': '2025-03-31',
+        'transaction_ids': ['t001', 't002', 't003', 't003'], 'items': items,
+    })
+
+    assert response.status_code == 200
+    diff = response.get_json()['diff']
+    assert diff['transactions'] == {'added': ['t003'], 'removed': ['t000'], 'unchanged_count': 2}
+    assert diff['products'] == {'added_count': 1, 'updated_count': 2, 'removed_count': 1, 'unchanged_count': 0}
+    with engine.connect() as conn:
+        linked = {row[0] for row in conn.execute(text("SELECT transaction_id FROM hpp_batch_transactions"))}
+        assert linked == {'t001', 't002', 't003'}
+        products = dict(conn.execute(text("SELECT stock_monitoring_id, id FROM hpp_batch_products")).fetchall())
+        assert set(products) == {'sm-00', 'sm-01', 'sm-09'}
+        assert products['sm-00'] == kept_product_id
+
+    response = client.post('/api/hpp-batches', json={
+        'id': batch_id, 'company_id': 'c1', 'batch_date': '2025-03-31',
+        'transaction_ids': ['t001', 't002', 't003'], 'items': items,
+    })
+    assert response.get_json()['diff']['products']['unchanged_count'] == 3
+    assert client.post('/api/hpp-batches', json={
+        'id': 'missing', 'company_id': 'c1', 'transaction_ids': ['t001'], 'items': [],
+    }).status_code == 404
+
+
+def test_sub_cent_quantity_changes_are_not_treated_as_unchanged():
+    stored = {
+        'id': 'p1', 'stock_monitoring_id': 'sm-00', 'qty': 1.25, 'currency': 'USD',
+        'price': 10.0, 'total_idr': 100.0, 'unit_idr': 80.0,
+    }
+    requested = {**stored, 'qty': 1.255, 'price': 10.001}
+    requested.pop('id')
+
+    _, updates, _, unchanged = diff_batch_products([stored], [requested])
+    assert [row['id'] for row in updates] == ['p1'] and unchanged == 0
+
+    requested['qty'] = 1.25
+    assert diff_batch_products([stored], [requested])[3] == 1
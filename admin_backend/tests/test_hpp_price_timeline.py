@@ -0,0 +1,91 @@
+import pytest
+from flask import Flask
+
+from backend.db import session
+from backend.error_handlers import register_error_handlers
+from backend.routes.inventory.hpp_bp import hpp_bp
+from backend.services.inventory import hpp_price_timeline
+from backend.services.inventory.hpp_price_timeline import HppPriceTimeline, load_hpp_price_timeline
+
+
+def _reference(reference_id, product_id, effective_date, unit_price, batch_id='b1', product_name=None):
+    return {
+        'reference_id': reference_id,
+        'batch_id': batch_id,
+        'product_id': product_id,
+        'product_name': product_name or product_id,
+        'unit_price': unit_price,
+        'effective_date': effective_date,
+        'batch_memo': '',
+    }
+
+
+def test_as_of_lookups_pick_the_price_in_force():
+    timeline = HppPriceTimeline([
+        _reference('r3', 'p1', '2025-06-01', 30.0, batch_id='b3', product_name='Kopi Arabika'),
+        _reference('r1', 'p1', '2024-02-01', 10.0, product_name='Kopi Arabika'),
+        _reference('r2', 'p1', '2024-02-01', 20.0, batch_id='b2', product_name='Kopi Arabika'),
+        _reference('r4', 'p2', '2025-01-01', 5.0, product_name='Gula_Aren'),
+        _reference('r5', 'p3', None, 9.0),
+    ])
+
+    assert timeline.latest('p1', '2024-01-31') is None
+    assert timeline.latest('p1', '2024-12-31')['reference_id'] == 'r2'
+    assert timeline.latest('p1', '2025-06-01')['unit_price'] == 30.0
+    assert [ref['reference_id'] for ref in timeline.options('p1', '2024-12-31')] == ['r2', 'r1']
+    assert timeline.latest_by_name('gula - aren', '2025-12-31')['product_id'] == 'p2'
+    assert timeline.options_by_name('kopi arabika', '2023-12-31') == []
+    assert set(timeline.latest_prices('2024-12-31')) == {'p1'}
+    assert timeline.latest('p3', '2030-01-01') is None
+
+
+@pytest.fixture
+def engine(make_sqlite_engine):
+    engine = make_sqlite_engine()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("""
+            CREATE TABLE hpp_batches (
+                id TEXT PRIMARY KEY, company_id TEXT, memo TEXT, batch_date TEXT, created_at TEXT
+            )
+        """)
+        conn.exec_driver_sql("""
+            CREATE TABLE hpp_batch_products (
+                id TEXT PRIMARY KEY, batch_id TEXT, stock_monitoring_id TEXT, calculated_unit_idr_hpp REAL
+            )
+        """)
+        conn.exec_driver_sql("""
+            INSERT INTO hpp_batches VALUES
+            ('b1', 'c1', 'Jan', '2025-01-10', NULL),
+            ('b2', 'c1', 'Mar', NULL, '2025-03-05 10:00:00'),
+            ('b3', 'c2', 'Other', '2025-01-01', NULL)
+        """)
+        conn.exec_driver_sql("""
+            INSERT INTO hpp_batch_products VALUES
+            ('bp1', 'b1', 'sm-1', 100), ('bp2', 'b2', 'sm-1', 120), ('bp3', 'b3', 'sm-1', 999)
+        """)
+    return engine
+
+
+def test_timeline_is_cached_per_company_until_batches_change(monkeypatch, engine):
+    monkeypatch.setattr(session, '_db_engine', engine)
+    hpp_price_timeline.invalidate_hpp_price_timelines()
+    monitoring_index = {'sm-1': {'id': 'sm-1', 'name': 'Biji Kopi'}}
+
+    with engine.connect() as conn:
+        timeline = load_hpp_price_timeline(conn, 'c1', monitoring_index)
+        assert load_hpp_price_timeline(conn, 'c1', monitoring_index) is timeline
+        assert load_hpp_price_timeline(conn, 'c1', {}) is not timeline
+        timeline = load_hpp_price_timeline(conn, 'c1', monitoring_index)
+    assert timeline.latest('sm-1', '2025-02-28')['unit_price'] == 100
+    assert timeline.latest('sm-1', '2025-12-31')['batch_memo'] == 'Mar'
+    assert timeline.latest_by_name('biji kopi', '2025-12-31')['reference_id'] == 'bp2'
+
+    app = Flask(__name__)
+    register_error_handlers(app)
+    app.register_blueprint(hpp_bp)
+    assert app.test_client().delete('/api/hpp-batches/b2').status_code == 200
+
+    with engine.connect() as conn:
+        reloaded = load_hpp_price_timeline(conn, 'c1', monitoring_index)
+    assert reloaded is not timeline
+    assert reloaded.latest('sm-1', '2025-12-31')['unit_price'] == 100
@@ -0,0 +1,144 @@
+import pytest
+from flask import Flask
+from sqlalchemy import text
+
+from backend.db import session
+from backend.error_handlers import register_error_handlers
+from backend.routes.transactions.history_bp import history_bp
+from backend.services.transactions.import_batches import refresh_import_batches, repair_import_batches
+
+
+@pytest.fixture
+def engine(make_sqlite_engine, run_migration):
+    engine = make_sqlite_engine()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("""
+            CREATE TABLE transactions (
+                id TEXT PRIMARY KEY, parent_id TEXT, description TEXT, amount REAL, db_cr TEXT,
+                txn_date TEXT, mark_id TEXT, company_id TEXT, bank_code TEXT, bank_account_number TEXT,
+                source_file TEXT, created_at TEXT, updated_at TEXT
+            )
+        """)
+        conn.exec_driver_sql(
+            "CREATE TABLE manual_journal_links ("
+            "id TEXT PRIMARY KEY, manual_txn_id TEXT, linked_txn_id TEXT, child_txn_id TEXT)"
+        )
+        conn.exec_driver_sql("CREATE TABLE marks (id TEXT PRIMARY KEY, internal_report TEXT)")
+        conn.exec_driver_sql("CREATE TABLE mark_coa_mapping (id TEXT PRIMARY KEY, mark_id TEXT)")
+        conn.exec_driver_sql("""
+            CREATE TABLE bank_account_definitions (
+                id TEXT PRIMARY KEY, bank_code TEXT, account_number TEXT, display_name TEXT,
+                active_from TEXT, active_until TEXT
+            )
+        """)
+        conn.exec_driver_sql(
+            "INSERT INTO bank_account_definitions VALUES ('d1', 'BCA', '111', 'Operasional', NULL, NULL)"
+        )
+        run_migration(conn, '071_create_report_data_versions_sqlite.sql')
+        run_migration(conn, '072_create_data_change_log_sqlite.sql')
+        conn.exec_driver_sql("""
+            INSERT INTO transactions
+                (id, parent_id, company_id, txn_date, amount, db_cr, bank_code, bank_account_number, source_file, created_at)
+            VALUES
+            ('a1', NULL, 'c1', '2025-01-05', 100, 'DB', 'BCA', '111', 'bca_jan.pdf', '2025-02-01 09:00:00'),
+            ('a2', NULL, 'c1', '2025-01-20', 40, 'CR', 'BCA', '111', 'bca_jan.pdf', '2025-02-01 09:00:00'),
+            ('a3', NULL, 'c2', '2025-02-02', 25, 'DB', 'BCA', '111', 'bca_jan.pdf', '2025-02-01 09:00:00'),
+            ('a3-split', 'a3', 'c2', '2025-02-02', 25, 'DB', NULL, NULL, NULL, '2025-02-03 10:00:00'),
+            ('b1', NULL, 'c1', '2025-01-11', 70, 'DB', 'DBS', NULL, 'dbs_jan.pdf', '2025-02-05 08:00:00'),
+            ('m1', NULL, 'c1', '2025-01-15', 5, 'DB', 'MANUAL', NULL, 'MANUAL', '2025-02-06 08:00:00')
+        """)
+        run_migration(conn, '074_create_import_batches_sqlite.sql')
+    return engine
+
+
+def _client(monkeypatch, engine):
+    monkeypatch.setattr(session, '_db_engine', engine)
+    app = Flask(__name__)
+    register_error_handlers(app)
+    app.register_blueprint(history_bp)
+    return app.test_client()
+
+
+def _summary(client):
+    response = client.get('/api/transactions/upload-summary')
+    assert response.status_code == 200
+    return {(item['source_file'], item['bank_code']): item for item in response.get_json()['summary']}
+
+
+def _checklist_cell(client, month, column_key):
+    response = client.get('/api/transactions/upload-checklist?year=2025')
+    assert response.status_code == 200
+    return response.get_json()['months'][month - 1]['banks'].get(column_key)
+
+
+def test_migration_backfills_summary_and_checklist(monkeypatch, engine):
+    client = _client(monkeypatch, engine)
+
+    summary = _summary(client)
+    assert set(summary) == {('bca_jan.pdf', 'BCA'), ('dbs_jan.pdf', 'DBS'), ('MANUAL', 'MANUAL')}
+    bca = summary[('bca_jan.pdf', 'BCA')]
+    assert bca['transaction_count'] == 3
+    assert (bca['start_date'], bca['end_date']) == ('2025-01-05', '2025-02-02')
+    assert (bca['total_debit'], bca['total_credit']) == (125, 40)
+    assert bca['company_count'] == 2
+    assert bca['bank_account_display_name'] == 'Operasional'
+    assert not bca['is_account_mixed']
+
+    january = _checklist_cell(client, 1, 'BCA::111')
+    assert january['source_files'] == ['bca_jan.pdf']
+    assert january['transaction_count'] == 2
+    assert january['last_upload'] == '2025-02-01'
+    assert _checklist_cell(client, 2, 'BCA::111')['transaction_count'] == 1
+    assert _checklist_cell(client, 1, 'DBS')['total_debit'] == 70
+    assert _checklist_cell(client, 1, 'MANUAL') is None
+
+
+def test_writes_keep_batches_current(monkeypatch, engine):
+    client = _client(monkeypatch, engine)
+
+    response = client.post('/api/transactions/assign-bank-account', json={
+        'source_file': 'dbs_jan.pdf', 'bank_code': 'DBS', 'account_number': '999',
+    })
+    assert response.status_code == 400  # no such definition
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO bank_account_definitions VALUES ('d2', 'DBS', '999', 'Payroll', NULL, NULL)"
+        )
+    response = client.post('/api/transactions/assign-bank-account', json={
+        'source_file': 'dbs_jan.pdf', 'bank_code': 'DBS', 'account_number': '999',
+    })
+    assert response.status_code == 200
+    assert _summary(client)[('dbs_jan.pdf', 'DBS')]['bank_account_display_name'] == 'Payroll'
+    assert _checklist_cell(client, 1, 'DBS::999')['transaction_count'] == 1
+
+    response = client.post('/api/transactions/bulk-delete', json={'transaction_ids': ['a1']})
+    assert response.status_code == 200
+    assert _summary(client)[('bca_jan.pdf', 'BCA')]['transaction_count'] == 2
+    assert _checklist_cell(client, 1, 'BCA::111')['total_credit'] == 40
+
+    response = client.post('/api/transactions/delete-by-source', json={'source_file': 'bca_jan.pdf'})
+    assert response.status_code == 200
+    assert ('bca_jan.pdf', 'BCA') not in _summary(client)
+    assert _checklist_cell(client, 1, 'BCA::111') == {'uploaded': False}
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("""
+            INSERT INTO transactions (id, company_id, txn_date, amount, db_cr, bank_code, source_file, created_at)
+            VALUES ('n1', 'c1', '2025-03-01', 12, 'CR', 'BRI', 'bri_mar.csv', '2025-03-02 08:00:00')
+        """)
+        refresh_import_batches(conn, [('bri_mar.csv', 'BRI')])
+    assert _checklist_cell(client, 3, 'BRI')['total_credit'] == 12
+
+
+def test_repair_rebuilds_drifted_batches(engine):
+    with engine.begin() as conn:
+        conn.exec_driver_sql("UPDATE import_batches SET transaction_count = 99 WHERE source_file = 'bca_jan.pdf'")
+        conn.exec_driver_sql("""
+            INSERT INTO import_batches (source_file, bank_code, transaction_count)
+            VALUES ('gone.pdf', 'BCA', 4)
+        """)
+
+    with engine.begin() as conn:
+        assert repair_import_batches(conn) == 3
+        counts = dict(conn.execute(text("SELECT source_file, transaction_count FROM import_batches")).fetchall())
+    assert counts == {'bca_jan.pdf': 3, 'dbs_jan.pdf': 1, 'MANUAL': 1}
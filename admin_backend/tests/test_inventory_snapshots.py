@@ -0,0 +1,114 @@
+import pytest
+from flask import Flask
+from sqlalchemy import text
+
+from backend.db import session
+from backend.error_handlers import register_error_handlers
+from backend.routes.inventory import inventory_bp as inventory_module
+from backend.routes.inventory.inventory_bp import inventory_bp
+from backend.services.inventory.inventory_snapshots import save_inventory_snapshot
+from backend.services.reporting.report_inventory_common import _get_period_inventory
+
+
+@pytest.fixture
+def engine(make_sqlite_engine, run_migration):
+    engine = make_sqlite_engine()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("""
+            CREATE TABLE inventory_balances (
+                id TEXT PRIMARY KEY, company_id TEXT, year INTEGER,
+                beginning_inventory_amount REAL, beginning_inventory_qty REAL,
+                ending_inventory_amount REAL, ending_inventory_qty REAL,
+                created_at TEXT, updated_at TEXT
+            )
+        """)
+        run_migration(conn, '071_create_report_data_versions_sqlite.sql')
+        run_migration(conn, '072_create_data_change_log_sqlite.sql')
+        run_migration(conn, '078_create_inventory_snapshots_sqlite.sql')
+    return engine
+
+
+def _valuation(snapshot_date, quantity, unit_price):
+    return {
+        'snapshot_date': snapshot_date,
+        'as_of_date': snapshot_date,
+        'snapshot_source': 'dashboard_monitoring',
+        'quantity': quantity,
+        'amount': quantity * unit_price,
+        'line_count': 2,
+        'missing_price_count': 1,
+        'items': [
+            {'product_id': 'p1', 'product_name': 'Kopi', 'unit_name': 'kg', 'quantity': quantity,
+             'unit_price': unit_price, 'total_value': quantity * unit_price,
+             'price_effective_date': '2025-01-10', 'price_batch_id': 'b1'},
+            {'product_id': 'p2', 'product_name': 'Gula', 'quantity': 0.0, 'unit_price': None, 'total_value': None},
+        ],
+    }
+
+
+def test_build_stores_each_month_end_and_serves_them(monkeypatch, engine):
+    monkeypatch.setattr(session, '_db_engine', engine)
+    valued_dates = []
+
+    def fake_valuer(engine_arg, company_id, api_url, token):
+        assert (company_id, token) == ('c1', 'secret')
+
+        def value_month_end(snapshot_date):
+            valued_dates.append(snapshot_date)
+            return _valuation(snapshot_date, 10.0 + len(valued_dates), 2.0)
+
+        return value_month_end
+
+    monkeypatch.setattr(inventory_module, 'build_month_end_valuer', fake_valuer)
+    app = Flask(__name__)
+    register_error_handlers(app)
+    app.register_blueprint(inventory_bp)
+    client = app.test_client()
+
+    response = client.post('/api/inventory-snapshots/build', json={
+        'company_id': 'c1', 'start_month': '2024-12', 'end_month': '2025-02', 'token': 'secret',
+    })
+
+    assert response.status_code == 200
+    assert valued_dates == ['2024-12-31', '2025-01-31', '2025-02-28']
+    assert [snapshot['amount'] for snapshot in response.get_json()['snapshots']] == [22.0, 24.0, 26.0]
+
+    listed = client.get('/api/inventory-snapshots?company_id=c1&start_month=2025-01&end_month=2025-12').get_json()
+    assert [(row['month'], row['quantity']) for row in listed['snapshots']] == [(1, 12.0), (2, 13.0)]
+
+    detail = client.get('/api/inventory-snapshots/2025/2?company_id=c1').get_json()
+    assert detail['snapshot']['missing_price_count'] == 1
+    assert [(item['product_id'], item['has_price']) for item in detail['items']] == [('p2', False), ('p1', True)]
+    assert client.get('/api/inventory-snapshots/2025/3?company_id=c1').status_code == 404
+    assert client.post('/api/inventory-snapshots/build', json={
+        'company_id': 'c1', 'start_month': '2025-03', 'end_month': '2025-01', 'token': 'secret',
+    }).status_code == 400
+
+    with engine.connect() as conn:
+        kinds = {row.entity_kind for row in conn.execute(text("SELECT entity_kind FROM data_change_log"))}
+    assert kinds == {'inventory'}
+
+
+def test_period_inventory_prefers_snapshots_for_month_aligned_periods(engine):
+    with engine.begin() as conn:
+        conn.exec_driver_sql("""
+            INSERT INTO inventory_balances VALUES
+            ('ib1', 'c1', 2025, 100, 10, 300, 30, '2025-01-01', '2025-01-01')
+        """)
+        save_inventory_snapshot(conn, 'c1', 2024, 12, _valuation('2024-12-31', 5.0, 10.0))
+        save_inventory_snapshot(conn, 'c1', 2025, 3, _valuation('2025-03-31', 8.0, 10.0))
+        save_inventory_snapshot(conn, 'c1', 2025, 12, _valuation('2025-12-31', 7.0, 10.0))
+
+    with engine.connect() as conn:
+        quarter = _get_period_inventory(conn, '2025-01-01', '2025-03-31', 'c1')
+        assert quarter['source'] == 'inventory_snapshots'
+        assert (quarter['beginning_inventory_amount'], quarter['ending_inventory_amount']) == (50.0, 80.0)
+
+        # A saved year balance wins for the calendar year; mid-month ranges cannot use month-ends.
+        full_year = _get_period_inventory(conn, '2025-01-01', '2025-12-31', 'c1')
+        assert (full_year['source'], full_year['ending_inventory_amount']) == ('inventory_balances', 300.0)
+        assert _get_period_inventory(conn, '2025-01-01', '2025-03-15', 'c1')['source'] == 'inventory_balances'
+        assert _get_period_inventory(conn, '2025-02-01', '2025-03-31', 'c1')['source'] == 'inventory_balances'
+
+        conn.exec_driver_sql("DELETE FROM inventory_balances")
+        assert _get_period_inventory(conn, '2025-01-01', '2025-12-31', 'c1')['ending_inventory_amount'] == 70.0
@@ -0,0 +1,175 @@
+import pytest
+from flask import Flask
+from sqlalchemy import text
+
+from backend.db import session
+from backend.error_handlers import register_error_handlers
+from backend.routes.master_data.mark_bp import mark_bp
+from backend.routes.transactions.history_bp import _fetch_marks_lookup, history_bp
+from backend.services.transactions.mark_stats import repair_mark_stats
+
+
+@pytest.fixture
+def engine(make_sqlite_engine, run_migration):
+    engine = make_sqlite_engine()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("""
+            CREATE TABLE transactions (
+                id TEXT PRIMARY KEY, parent_id TEXT, description TEXT, amount REAL, db_cr TEXT,
+                txn_date TEXT, mark_id TEXT, company_id TEXT, bank_code TEXT, source_file TEXT,
+                created_at TEXT, updated_at TEXT
+            )
+        """)
+        conn.exec_driver_sql(
+            "CREATE TABLE manual_journal_links (id TEXT PRIMARY KEY, manual_txn_id TEXT, linked_txn_id TEXT)"
+        )
+        conn.exec_driver_sql("""
+            CREATE TABLE marks (
+                id TEXT PRIMARY KEY, internal_report TEXT, personal_use TEXT, tax_report TEXT,
+                natural_direction TEXT, updated_at TEXT
+            )
+        """)
+        conn.exec_driver_sql("CREATE TABLE chart_of_accounts (id TEXT PRIMARY KEY, code TEXT, name TEXT)")
+        conn.exec_driver_sql(
+            "CREATE TABLE mark_coa_mapping (id TEXT PRIMARY KEY, mark_id TEXT, coa_id TEXT, mapping_type TEXT)"
+        )
+        conn.exec_driver_sql("""
+            INSERT INTO marks (id, personal_use, natural_direction) VALUES
+            ('m-sales', 'Penjualan', NULL), ('m-fuel', 'BBM', NULL), ('m-fixed', 'Gaji', 'DB'), ('m-idle', 'Lain', NULL)
+        """)
+        run_migration(conn, '071_create_report_data_versions_sqlite.sql')
+        run_migration(conn, '072_create_data_change_log_sqlite.sql')
+        conn.exec_driver_sql("""
+            INSERT INTO transactions (id, company_id, txn_date, amount, db_cr, bank_code, source_file, mark_id)
+            VALUES
+            ('s1', 'c1', '2024-12-20', 100, 'CR', 'BCA', 'bca.pdf', 'm-sales'),
+            ('s2', 'c1', '2025-01-05', 150, 'CR', 'BCA', 'bca.pdf', 'm-sales'),
+            ('s3', 'c1', '2025-01-06', 20, 'DB', 'BCA', 'bca.pdf', 'm-sales'),
+            ('f1', 'c1', '2025-01-07', 30, 'DB', 'BCA', 'bca.pdf', 'm-fuel'),
+            ('x1', 'c1', '2025-01-08', 40, 'DB', 'BCA', 'other.pdf', NULL)
+        """)
+        run_migration(conn, '077_create_mark_stats_sqlite.sql')
+    return engine
+
+
+def _client(monkeypatch, engine):
+    monkeypatch.setattr(session, '_db_engine', engine)
+    app = Flask(__name__)
+    register_error_handlers(app)
+    app.register_blueprint(history_bp)
+    app.register_blueprint(mark_bp)
+    return app.test_client()
+
+
+def _directions(engine):
+    with engine.connect() as conn:
+        lookup = _fetch_marks_lookup(conn, ['m-sales', 'm-fuel', 'm-fixed', 'm-idle'])
+    return {mark_id: data['natural_direction'] for mark_id, data in lookup.items()}
+
+
+def test_migration_backfills_stats_used_by_lookups_and_lists(monkeypatch, engine):
+    client = _client(monkeypatch, engine)
+
+    assert _directions(engine) == {'m-sales': 'CR', 'm-fuel': 'DB', 'm-fixed': 'DB', 'm-idle': 'CR'}
+
+    marks = client.get('/api/marks?sort=usage').get_json()['marks']
+    assert [mark['id'] for mark in marks] == ['m-sales', 'm-fuel', 'm-fixed', 'm-idle']
+    assert (marks[0]['transaction_count'], marks[0]['last_used_date']) == (3, '2025-01-06')
+
+    stats = client.get('/api/marks/m-sales/stats').get_json()
+    assert (stats['debit_count'], stats['credit_count']) == (1, 2)
+    assert stats['years'] == [
+        {'year': 2024, 'transaction_count': 1, 'total_debit': 0.0, 'total_credit': 100.0},
+        {'year': 2025, 'transaction_count': 2, 'total_debit': 20.0, 'total_credit': 150.0},
+    ]
+    assert client.get('/api/marks/m-idle/stats').get_json()['transaction_count'] == 0
+    assert client.get('/api/marks/missing/stats').status_code == 404
+
+
+def test_writes_keep_stats_current(monkeypatch, engine):
+    client = _client(monkeypatch, engine)
+
+    assert client.post('/api/transactions/s2/assign-mark', json={'mark_id': 'm-fuel'}).status_code == 200
+    assert client.post('/api/transactions/x1/assign-mark', json={'mark_id': 'm-idle'}).status_code == 200
+    assert _directions(engine)['m-sales'] == 'DB'
+    assert _directions(engine)['m-idle'] == 'DB'
+
+    response = client.post('/api/transactions/bulk-mark', json={'transaction_ids': ['s1'], 'mark_id': 'm-fuel'})
+    assert response.status_code == 200
+    stats = client.get('/api/marks/m-fuel/stats').get_json()
+    assert (stats['transaction_count'], stats['debit_count'], stats['credit_count']) == (3, 1, 2)
+
+    assert client.post('/api/transactions/bulk-delete', json={'transaction_ids': ['s3']}).status_code == 200
+    assert client.get('/api/marks/m-sales/stats').get_json()['transaction_count'] == 0
+
+    assert client.delete('/api/marks/m-idle').status_code == 200
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM mark_stats WHERE mark_id = 'm-idle'")).scalar() == 0
+
+
+def test_writes_recount_only_the_years_they_touch(monkeypatch, engine):
+    client = _client(monkeypatch, engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "UPDATE mark_stats_years SET total_credit = 999 WHERE mark_id = 'm-sales' AND period_year = 2024"
+        )
+
+    assert client.post('/api/transactions/s2/assign-mark', json={'mark_id': 'm-fuel'}).status_code == 200
+
+    stats = client.get('/api/marks/m-sales/stats').get_json()
+    assert (stats['transaction_count'], stats['debit_count'], stats['credit_count']) == (2, 1, 1)
+    assert stats['years'] == [
+        {'year': 2024, 'transaction_count': 1, 'total_debit': 0.0, 'total_credit': 999.0},
+        {'year': 2025, 'transaction_count': 1, 'total_debit': 20.0, 'total_credit': 0.0},
+    ]
+
+
+def _stats_rows(engine):
+    with engine.connect() as conn:
+        return (
+            conn.execute(text("SELECT * FROM mark_stats ORDER BY mark_id")).fetchall(),
+            conn.execute(text("SELECT * FROM mark_stats_years ORDER BY mark_id, period_year")).fetchall(),
+        )
+
+
+def test_incremental_refreshes_match_a_full_rebuild(monkeypatch, engine):
+    client = _client(monkeypatch, engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("""
+            INSERT INTO transactions (id, company_id, txn_date, amount, db_cr, bank_code, source_file, mark_id)
+            VALUES ('u1', 'c1', NULL, 5, 'DB', 'BCA', 'bca.pdf', 'm-fuel')
+        """)
+        repair_mark_stats(conn)
+
+    assert client.post('/api/transactions/s1/assign-mark', json={'mark_id': 'm-fuel'}).status_code == 200
+    response = client.post('/api/transactions/bulk-mark', json={'transaction_ids': ['u1', 'x1'], 'mark_id': 'm-sales'})
+    assert response.status_code == 200
+    assert client.post('/api/transactions/bulk-delete', json={'transaction_ids': ['s3']}).status_code == 200
+    incremental = _stats_rows(engine)
+
+    with engine.begin() as conn:
+        repair_mark_stats(conn)
+    assert _stats_rows(engine) == incremental
+
+
+def test_delete_by_source_drops_orphan_marks_and_their_stats(monkeypatch, engine):
+    client = _client(monkeypatch, engine)
+
+    response = client.post('/api/transactions/delete-by-source', json={'source_file': 'bca.pdf'})
+
+    assert response.status_code == 200
+    with engine.connect() as conn:
+        assert {row.id for row in conn.execute(text("SELECT id FROM marks"))} == {'m-fixed', 'm-idle'}
+        assert conn.execute(text("SELECT COUNT(*) FROM mark_stats")).scalar() == 0
+        assert conn.execute(text("SELECT COUNT(*) FROM mark_stats_years")).scalar() == 0
+
+
+def test_repair_rebuilds_drifted_stats(engine):
+    with engine.begin() as conn:
+        conn.exec_driver_sql("UPDATE mark_stats SET transaction_count = 42 WHERE mark_id = 'm-sales'")
+        conn.exec_driver_sql("INSERT INTO mark_stats (mark_id, transaction_count) VALUES ('m-idle', 7)")
+
+    with engine.begin() as conn:
+        assert repair_mark_stats(conn) == 2
+        counts = dict(conn.execute(text("SELECT mark_id, transaction_count FROM mark_stats")).fetchall())
+    assert counts == {'m-sales': 3, 'm-fuel': 1}
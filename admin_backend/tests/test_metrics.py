@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('prometheus_client')
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+WORKER_SCRIPT = """
+from backend.metrics import count_cache_lookup, observe_parser, observe_remote_call
+observe_parser('bca', 0.2)
+observe_remote_call('Presence API', 0.05)
+count_cache_lookup('pdf_render', hit=True)
+"""
+
+SCRAPE_SCRIPT = """
+from backend.metrics import render_metrics
+print(render_metrics()[0].decode())
+"""
+
+
+def _run(script, metrics_dir):
+    env = {**os.environ, 'PROMETHEUS_MULTIPROC_DIR': str(metrics_dir)}
+    return subprocess.run(
+        [sys.executable, '-c', script],
+        cwd=BACKEND_DIR,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+def test_metrics_from_separate_workers_are_aggregated(tmp_path):
+    _run(WORKER_SCRIPT, tmp_path)
+    _run(WORKER_SCRIPT, tmp_path)
+
+    scrape = _run(SCRAPE_SCRIPT, tmp_path)
+
+    assert 'bank_parser_duration_seconds_count{bank_key="bca"} 2.0' in scrape
+    assert 'remote_api_duration_seconds_count{resource="Presence API"} 2.0' in scrape
+    assert 'cache_lookups_total{cache="pdf_render",result="hit"} 2.0' in scrape
@@ -0,0 +1,105 @@
+import sqlalchemy as sa
+
+import migrate
+from backend.db import schema
+from backend.services.reporting import report_cache
+from database import migration_index
+
+
+def test_split_ignores_delimiters_in_strings_and_comments():
+    sql = """
+    -- leading comment; not a statement
+    INSERT INTO notes (body) VALUES ('a; b'), ("c;d"), ('it''s; fine');
+    /* block; comment */
+    UPDATE `odd;name` SET x = 1; # trailing; comment
+    """
+
+    assert migrate._split_sql_statements(sql) == [
+        "INSERT INTO notes (body) VALUES ('a; b'), (\"c;d\"), ('it''s; fine')",
+        "UPDATE `odd;name` SET x = 1",
+    ]
+
+
+def test_split_honours_delimiter_directive():
+    sql = """
+CREATE TABLE t (id INT);
+DELIMITER //
+CREATE TRIGGER trg BEFORE INSERT ON t FOR EACH ROW
+BEGIN
+    SET NEW.id = NEW.id + 1;
+END//
+DELIMITER ;
+DROP TABLE x;
+"""
+
+    statements = migrate._split_sql_statements(sql)
+
+    assert statements[0] == 'CREATE TABLE t (id INT)'
+    assert statements[1].startswith('CREATE TRIGGER trg') and statements[1].endswith('END')
+    assert 'SET NEW.id = NEW.id + 1;' in statements[1]
+    assert statements[2] == 'DROP TABLE x'
+
+
+def test_existing_migrations_split_cleanly():
+    for path in migration_index.list_mysql_migrations():
+        for statement in migrate._split_sql_statements(path.read_text()):
+            assert not statement.upper().startswith('DELIMITER'), path.name
+            assert not statement.startswith('--'), path.name
+
+
+def test_fingerprint_changes_when_a_migration_is_added(tmp_path, monkeypatch):
+    monkeypatch.setattr(migration_index, 'MIGRATIONS_DIR', tmp_path)
+    (tmp_path / '001_init.sql').write_text('SELECT 1;')
+    (tmp_path / '001_init_sqlite.sql').write_text('SELECT 1;')
+    before = migration_index.migration_fingerprint()
+
+    (tmp_path / '002_next.sql').write_text('SELECT 2;')
+
+    assert migration_index.migration_fingerprint() != before
+
+
+def test_current_fingerprint_short_circuits_startup(tmp_path, monkeypatch):
+    db_path = tmp_path / 'state.db'
+    engine = sa.create_engine(f'sqlite:///{db_path}')
+    with engine.begin() as conn:
+        conn.exec_driver_sql('CREATE TABLE pdf_excel_migration_state (id INTEGER PRIMARY KEY, fingerprint TEXT)')
+        conn.exec_driver_sql(
+            'INSERT INTO pdf_excel_migration_state (id, fingerprint) VALUES (1, ?)',
+            (migration_index.migration_fingerprint(),),
+        )
+    monkeypatch.setattr(migrate, 'DB_URL', f'sqlite:///{db_path}')
+
+    def fail_validation():
+        raise AssertionError('layout validation should be skipped when nothing is pending')
+
+    monkeypatch.setattr(migrate, 'validate_migration_layout', fail_validation)
+
+    assert migrate.run_migrations() is True
+
+
+def test_schema_version_event_reaches_subscribers(monkeypatch):
+    monkeypatch.setattr(schema, '_schema_version_listeners', list(schema._schema_version_listeners))
+    seen = []
+    schema.on_schema_version_change(seen.append)
+    report_cache.report_cache_put('key', b'body')
+
+    schema.publish_schema_version('abc123')
+
+    assert seen == ['abc123']
+    assert report_cache.report_cache_get('key') is None
+
+
+def test_table_columns_are_cached_until_the_schema_version_changes(make_sqlite_engine):
+    engine = make_sqlite_engine()
+    statements = []
+    sa.event.listen(engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE notes (id INTEGER PRIMARY KEY)")
+        assert schema.get_table_columns(conn, 'notes') == {'id'}
+        conn.exec_driver_sql("ALTER TABLE notes ADD COLUMN body TEXT")
+        assert schema.get_table_columns(conn, 'notes') == {'id'}
+
+        schema.publish_schema_version('def456')
+
+        assert schema.get_table_columns(conn, 'notes') == {'id', 'body'}
+    assert sum('PRAGMA table_info' in statement for statement in statements) == 2
@@ -0,0 +1,165 @@
+import pytest
+from flask import Flask
+
+from backend.db import session
+from backend.error_handlers import register_error_handlers
+from backend.routes.transactions import payroll_bp as payroll_module
+from backend.routes.transactions.history_bp import history_bp
+from backend.routes.transactions.payroll_bp import payroll_bp
+from backend.services.reporting import payroll_summary_service
+from backend.services.reporting.payroll_summary_service import fetch_payroll_salary_summary_data
+from backend.services.transactions.payroll_aggregates import repair_payroll_aggregates
+
+
+@pytest.fixture
+def engine(make_sqlite_engine, run_migration):
+    engine = make_sqlite_engine()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("""
+            CREATE TABLE transactions (
+                id TEXT PRIMARY KEY, parent_id TEXT, description TEXT, amount REAL, db_cr TEXT,
+                txn_date TEXT, mark_id TEXT, company_id TEXT, sagansa_user_id TEXT, payroll_period_month TEXT,
+                is_split_container INTEGER NOT NULL DEFAULT 0, has_marked_children INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT, updated_at TEXT
+            )
+        """)
+        conn.exec_driver_sql("""
+            CREATE TABLE marks (
+                id TEXT PRIMARY KEY, personal_use TEXT, internal_report TEXT, tax_report TEXT,
+                is_salary_component INTEGER
+            )
+        """)
+        conn.exec_driver_sql("CREATE TABLE mark_coa_mapping (id TEXT PRIMARY KEY, mark_id TEXT, report_type TEXT)")
+        conn.exec_driver_sql(
+            "CREATE TABLE manual_journal_links (id TEXT PRIMARY KEY, manual_txn_id TEXT, linked_txn_id TEXT)"
+        )
+        conn.exec_driver_sql("""
+            INSERT INTO marks VALUES
+            ('gaji', 'Gaji Pokok', NULL, NULL, 1),
+            ('bonus', NULL, 'Bonus', NULL, 1),
+            ('sewa', 'Sewa', NULL, NULL, 0)
+        """)
+        conn.exec_driver_sql("""
+            INSERT INTO mark_coa_mapping VALUES
+            ('m1', 'gaji', 'real'), ('m2', 'gaji', 'coretax'), ('m3', 'bonus', 'real'), ('m4', 'sewa', 'real')
+        """)
+        conn.exec_driver_sql("""
+            INSERT INTO transactions
+                (id, parent_id, amount, db_cr, txn_date, mark_id, company_id, sagansa_user_id, payroll_period_month,
+                 is_split_container, has_marked_children)
+            VALUES
+            ('t1', NULL, -100, 'DB', '2025-01-25', 'gaji', 'c1', 'u1', NULL, 0, 0),
+            ('t2', NULL, -120, 'DB', '2025-02-01', 'gaji', 'c1', 'u1', '2025-01-01', 0, 0),
+            ('t3', NULL, -90, 'DB', '2025-01-28', 'gaji', 'c1', 'u2', NULL, 0, 0),
+            ('t4', NULL, -30, 'DB', '2025-03-05', 'bonus', 'c1', NULL, NULL, 0, 0),
+            ('t5', NULL, -50, 'DB', '2025-01-05', 'sewa', 'c1', 'u1', NULL, 0, 0),
+            ('t6', NULL, -70, 'DB', '2025-02-10', 'gaji', 'c2', 'u1', NULL, 0, 0),
+            ('p1', NULL, -200, 'DB', '2025-02-20', 'gaji', 'c1', 'u2', NULL, 1, 1),
+            ('p1-a', 'p1', -200, 'DB', '2025-02-20', 'bonus', 'c1', 'u2', NULL, 0, 0),
+            ('p2', NULL, -40, 'DB', '2025-02-21', 'bonus', 'c1', 'u1', NULL, 1, 0),
+            ('p2-a', 'p2', -40, 'DB', '2025-02-21', NULL, 'c1', 'u1', NULL, 0, 0)
+        """)
+        run_migration(conn, '079_create_payroll_aggregates_sqlite.sql')
+        repair_payroll_aggregates(conn)
+    return engine
+
+
+def _client(monkeypatch, engine):
+    monkeypatch.setattr(session, '_db_engine', engine)
+    monkeypatch.setattr(payroll_module, '_get_sagansa_user_map', lambda: {'u1': {'id': 'u1', 'name': 'Ani'}})
+    monkeypatch.setattr(payroll_module, '_sagansa_user_exists', lambda user_id: True)
+    monkeypatch.setattr(payroll_module, '_is_payroll_employee', lambda conn, user_id: True)
+    app = Flask(__name__)
+    register_error_handlers(app)
+    app.register_blueprint(payroll_bp)
+    app.register_blueprint(history_bp)
+    return app.test_client()
+
+
+def _live(monkeypatch, fetch):
+    with monkeypatch.context() as patch:
+        patch.setattr(payroll_module, 'payroll_aggregates_available', lambda conn: False)
+        patch.setattr(payroll_summary_service, 'payroll_aggregates_available', lambda conn: False)
+        return fetch()
+
+
+def _sorted_rows(body):
+    return sorted(body['rows'], key=lambda row: str(row['sagansa_user_id']))
+
+
+def test_monthly_summary_and_report_match_the_transaction_scan(monkeypatch, engine):
+    client = _client(monkeypatch, engine)
+    monkeypatch.setattr(payroll_summary_service, '_fetch_sagansa_user_map', lambda: {'u1': {'id': 'u1', 'name': 'Ani'}})
+
+    for query in ('year=2025', 'year=2025&month=1', 'year=2025&company_id=c1', 'year=2025&report_type=coretax'):
+        url = f'/api/payroll/monthly-summary?{query}'
+        aggregated = client.get(url).get_json()
+        live = _live(monkeypatch, lambda: client.get(url).get_json())
+        assert aggregated['summary'] == live['summary']
+        assert _sorted_rows(aggregated) == _sorted_rows(live)
+
+    year = client.get('/api/payroll/monthly-summary?year=2025&company_id=c1').get_json()
+    assert year['summary']['total_salary_amount'] == 540.0
+    assert {row['sagansa_user_id']: row['transaction_count'] for row in year['rows']} == {'u1': 2, 'u2': 2, None: 1}
+
+    with engine.connect() as conn:
+        for period in (('2025-01-01', '2025-12-31'), ('2025-02-01', '2025-02-28')):
+            aggregated = fetch_payroll_salary_summary_data(conn, *period, company_id='c1')
+            live = _live(monkeypatch, lambda: fetch_payroll_salary_summary_data(conn, *period, company_id='c1'))
+            assert aggregated == live
+        # The report keeps split parents whose children are unmarked; the payroll page does not.
+        february = fetch_payroll_salary_summary_data(conn, '2025-02-01', '2025-02-28', company_id='c1')
+        assert february['summary']['total_amount'] == 240.0
+
+
+def test_payroll_writes_keep_the_aggregate_current(monkeypatch, engine):
+    client = _client(monkeypatch, engine)
+
+    assert client.put('/api/payroll/transactions/t4/assign-user', json={'sagansa_user_id': 'u2'}).status_code == 200
+    assert client.put(
+        '/api/payroll/transactions/t1/period-month', json={'payroll_period_month': '2025-03'}
+    ).status_code == 200
+    assert client.put('/api/payroll/transactions/bulk-assign-user', json={
+        'transaction_ids': ['t3'], 'sagansa_user_id': 'u1',
+    }).status_code == 200
+
+    january = client.get('/api/payroll/monthly-summary?year=2025&month=1&company_id=c1').get_json()
+    assert [(row['sagansa_user_id'], row['total_amount']) for row in january['rows']] == [('u1', 210.0)]
+    march = client.get('/api/payroll/monthly-summary?year=2025&month=3&company_id=c1').get_json()
+    assert {row['sagansa_user_id']: row['total_amount'] for row in march['rows']} == {'u1': 100.0, 'u2': 30.0}
+
+    live = _live(monkeypatch, lambda: client.get('/api/payroll/monthly-summary?year=2025').get_json())
+    assert client.get('/api/payroll/monthly-summary?year=2025').get_json()['summary'] == live['summary']
+
+
+def _assert_matches_live(monkeypatch, client):
+    for query in ('year=2025', 'year=2025&company_id=c1', 'year=2025&company_id=c2'):
+        url = f'/api/payroll/monthly-summary?{query}'
+        live = _live(monkeypatch, lambda: client.get(url).get_json())
+        aggregated = client.get(url).get_json()
+        assert aggregated['summary'] == live['summary']
+        assert _sorted_rows(aggregated) == _sorted_rows(live)
+
+
+def test_marking_a_split_child_refreshes_its_parent(monkeypatch, engine):
+    client = _client(monkeypatch, engine)
+
+    # Marking the only child of p2 drops p2 itself from the totals; unmarking brings it back.
+    assert client.post('/api/transactions/p2-a/assign-mark', json={'mark_id': 'gaji'}).status_code == 200
+    _assert_matches_live(monkeypatch, client)
+    february = client.get('/api/payroll/monthly-summary?year=2025&month=2&company_id=c1').get_json()
+    assert {row['sagansa_user_id']: row['total_amount'] for row in february['rows']} == {'u1': 40.0, 'u2': 200.0}
+
+    assert client.post('/api/transactions/p2-a/assign-mark', json={'mark_id': None}).status_code == 200
+    _assert_matches_live(monkeypatch, client)
+
+
+def test_assigning_a_company_moves_the_aggregate_rows(monkeypatch, engine):
+    client = _client(monkeypatch, engine)
+
+    assert client.post('/api/transactions/t6/assign-company', json={'company_id': 'c1'}).status_code == 200
+    assert client.post('/api/transactions/p1-a/assign-company', json={'company_id': 'c2'}).status_code == 200
+
+    _assert_matches_live(monkeypatch, client)
+    c2 = client.get('/api/payroll/monthly-summary?year=2025&company_id=c2').get_json()
+    assert c2['summary']['total_salary_amount'] == 200.0
@@ -0,0 +1,73 @@
+import pytest
+from reportlab.pdfgen import canvas
+
+from bank_parsers.parser_common import (
+    collect_page_text,
+    get_pdf_backend,
+    open_pdf_document,
+    pdf_backend_override,
+    resolve_pdf_backend_name,
+)
+
+
+@pytest.fixture
+def statement_pdf(tmp_path):
+    pdf_path = tmp_path / 'statement.pdf'
+    pdf = canvas.Canvas(str(pdf_path))
+    pdf.drawString(50, 800, "TANGGAL KETERANGAN MUTASI")
+    pdf.drawString(50, 780, "01/02")
+    pdf.drawString(100, 780, "TRSF E-BANKING")
+    pdf.drawString(340, 780, "1,000.00")
+    pdf.showPage()
+    pdf.save()
+    return str(pdf_path)
+
+
+def _words(pdf_path, backend_name, **kwargs):
+    with get_pdf_backend(backend_name).open(pdf_path) as pdf:
+        return [
+            (word['text'], round(word['x0']))
+            for word in pdf.pages[0].extract_words(**kwargs)
+        ]
+
+
+def test_pdfium_backend_matches_pdfplumber_words(statement_pdf):
+    for kwargs in (
+        {'keep_blank_chars': True, 'x_tolerance': 3, 'y_tolerance': 3, 'use_text_flow': True},
+        {'keep_blank_chars': True, 'x_tolerance': 3, 'y_tolerance': 3},
+        {},
+    ):
+        baseline = _words(statement_pdf, 'pdfplumber', **kwargs)
+        candidate = _words(statement_pdf, 'pdfium', **kwargs)
+        assert [text for text, _ in candidate] == [text for text, _ in baseline]
+        assert all(abs(a - b) <= 1 for (_, a), (_, b) in zip(candidate, baseline))
+
+
+def test_pdfium_backend_matches_pdfplumber_text(statement_pdf):
+    with get_pdf_backend('pdfplumber').open(statement_pdf) as pdf:
+        baseline = collect_page_text(pdf)
+    with get_pdf_backend('pdfium').open(statement_pdf) as pdf:
+        candidate = collect_page_text(pdf)
+    assert candidate == baseline
+
+
+def test_backend_selection_prefers_override_then_bank_then_global(monkeypatch):
+    monkeypatch.delenv('BANK_PARSER_PDF_BACKEND', raising=False)
+    monkeypatch.delenv('BANK_PARSER_PDF_BACKEND_DBS', raising=False)
+    assert resolve_pdf_backend_name('dbs') == 'pdfplumber'
+
+    monkeypatch.setenv('BANK_PARSER_PDF_BACKEND', 'pdfium')
+    assert resolve_pdf_backend_name('dbs') == 'pdfium'
+
+    monkeypatch.setenv('BANK_PARSER_PDF_BACKEND_DBS', 'pdfplumber')
+    assert resolve_pdf_backend_name('dbs') == 'pdfplumber'
+    assert resolve_pdf_backend_name('bca') == 'pdfium'
+
+    with pdf_backend_override('pdfplumber'):
+        assert resolve_pdf_backend_name('bca') == 'pdfplumber'
+
+
+def test_unknown_backend_is_rejected(monkeypatch, statement_pdf):
+    monkeypatch.setenv('BANK_PARSER_PDF_BACKEND', 'nope')
+    with pytest.raises(ValueError):
+        open_pdf_document(statement_pdf)
@@ -0,0 +1,98 @@
+import io
+
+import pytest
+from pypdf import PdfReader
+
+from backend.services.reporting import pdf_service
+
+
+INCOME_STATEMENT = {
+    'period': {'start_date': '2025-01-01', 'end_date': '2025-12-31'},
+    'company_name': 'PT Test',
+    'settings': {},
+    'revenue': [{'code': '4001', 'name': 'Sales', 'amount': 1000}],
+    'expenses': [
+        {'code': '5101', 'name': 'Gaji', 'amount': 200},
+        {'code': '5491', 'name': 'Pajak', 'amount': 10},
+    ],
+    'cogs_breakdown': {
+        'beginning_inventory': 0,
+        'purchases_items': [],
+        'other_cogs_items': [],
+        'ending_inventory': 0,
+        'total_cogs': 0,
+    },
+    'total_revenue': 1000,
+    'total_cogs': 0,
+    'net_income': 790,
+}
+
+BALANCE_SHEET = {
+    'as_of_date': '2025-12-31',
+    'company_name': 'PT Test',
+    'settings': {},
+    'assets': {'current': [{'code': '1101', 'name': 'Kas', 'amount': 500}], 'non_current': []},
+    'liabilities': {'current': [], 'non_current': []},
+    'equity': {'items': [{'code': '3101', 'name': 'Modal', 'amount': 500}]},
+    'total_assets': 500,
+    'total_liabilities': 0,
+    'total_equity': 500,
+    'total_liabilities_and_equity': 500,
+}
+
+AMORTIZATION = {
+    'year': 2025,
+    'company_name': 'PT Test',
+    'settings': {},
+    'items': [{
+        'asset_id': 'a1',
+        'asset_name': 'Laptop',
+        'asset_type': 'Tangible',
+        'acquisition_cost': 1000,
+        'acquisition_date': '2024-03-01',
+        'annual_amortization': 250,
+        'accumulated_depreciation_prev_year': 250,
+        'total_accumulated_depreciation': 500,
+        'book_value_end_year': 500,
+    }],
+}
+
+
+@pytest.fixture(autouse=True)
+def inline_rendering(monkeypatch):
+    monkeypatch.setenv('PDF_RENDER_WORKERS', '1')
+    pdf_service.clear_render_cache()
+    yield
+    pdf_service.clear_render_cache()
+
+
+def test_combined_pdf_is_merged_in_memory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    buffer = pdf_service.generate_coretax_combined_pdf(INCOME_STATEMENT, BALANCE_SHEET, AMORTIZATION)
+
+    assert len(PdfReader(io.BytesIO(buffer.getvalue())).pages) == 3
+    assert list(tmp_path.iterdir()) == []
+    assert 'gross_profit' not in INCOME_STATEMENT
+
+
+def test_identical_payload_is_served_from_render_cache(monkeypatch):
+    calls = []
+    render = pdf_service._html_to_pdf_bytes
+
+    def counting_render(html_content):
+        calls.append(html_content)
+        return render(html_content)
+
+    monkeypatch.setattr(pdf_service, '_html_to_pdf_bytes', counting_render)
+
+    first = pdf_service.generate_balance_sheet_pdf(dict(BALANCE_SHEET)).getvalue()
+    second = pdf_service.generate_balance_sheet_pdf(dict(BALANCE_SHEET)).getvalue()
+    pdf_service.generate_balance_sheet_pdf({**BALANCE_SHEET, 'company_name': 'PT Lain'})
+
+    assert first == second
+    assert len(calls) == 2
+
+
+def test_template_environment_is_shared():
+    assert pdf_service._get_template_env() is pdf_service._get_template_env()
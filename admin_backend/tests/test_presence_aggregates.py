@@ -0,0 +1,93 @@
+from flask import Flask
+
+from backend.db import session
+from backend.error_handlers import register_error_handlers
+from backend.routes.transactions import payroll_bp as payroll_module
+from backend.routes.transactions.payroll_bp import payroll_bp
+from backend.services.transactions import presence_aggregates
+
+
+def _presence(presence_id, user_id, name, store, date, check_in, check_out, work_minutes):
+    return {
+        'id': presence_id, 'user_id': user_id, 'creator': name, 'store': store, 'presence_date': date,
+        'shift_start_time': '08:00', 'shift_end_time': '16:00',
+        'check_in': f'{date} {check_in}:00' if check_in else None,
+        'check_out': f'{date} {check_out}:00' if check_out else None,
+        'work_minutes': work_minutes, 'company_id': 'c1',
+    }
+
+
+RECORDS = [
+    _presence(1, 'u1', 'Ani', 'Kemang', '2025-01-06', '07:55', '16:05', 480),
+    _presence(2, 'u1', 'Ani', 'Kemang', '2025-01-07', '08:20', '15:30', 430),
+    _presence(3, 'u1', 'Ani', 'Senopati', '2025-02-03', '08:00', '16:00', 480),
+    _presence(4, 'u2', 'Budi', 'Kemang', '2025-01-06', '07:50', None, 0),
+    _presence(5, 'u2', 'Budi', 'Kemang', '2025-01-31', '09:00', '17:00', 420),
+]
+
+
+def _client(monkeypatch, make_sqlite_engine, run_migration, with_migration=True):
+    engine = make_sqlite_engine()
+    if with_migration:
+        with engine.begin() as conn:
+            run_migration(conn, '080_create_payroll_presence_daily_sqlite.sql')
+    remote = {'records': RECORDS}
+    monkeypatch.setattr(session, '_db_engine', engine)
+    monkeypatch.setattr(payroll_module, '_fetch_remote_presences', lambda url, token, params: {'data': remote['records']})
+    app = Flask(__name__)
+    register_error_handlers(app)
+    app.register_blueprint(payroll_bp)
+    return app.test_client(), engine, remote
+
+
+def _summary(client, query):
+    response = client.get(f'/api/payroll/presences/summary?{query}')
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_sync_maintains_daily_totals_and_summary_groups(monkeypatch, make_sqlite_engine, run_migration):
+    client, engine, remote = _client(monkeypatch, make_sqlite_engine, run_migration)
+    assert client.post('/api/payroll/presences/sync', json={'token': 'secret'}).status_code == 200
+
+    by_user = _summary(client, 'year=2025&month=1')
+    assert by_user['source'] == 'payroll_presence_daily'
+    assert [
+        (row['sagansa_user_id'], row['user_name'], row['day_count'], row['shift_count'], row['worked_minutes'],
+         row['late_count'], row['early_leave_count'])
+        for row in by_user['rows']
+    ] == [('u1', 'Ani', 2, 2, 910, 1, 1), ('u2', 'Budi', 2, 2, 420, 1, 0)]
+    assert by_user['summary']['worked_hours'] == round(1330 / 60, 2)
+
+    by_month = _summary(client, 'date_start=2025-01-01&date_end=2025-02-28&group_by=user,month&store=Kemang')
+    assert [(row['sagansa_user_id'], row['month'], row['presence_count']) for row in by_month['rows']] == [
+        ('u1', '2025-01', 2), ('u2', '2025-01', 2),
+    ]
+
+    # A re-sync that moves a presence to another date refreshes both the old and the new day.
+    remote['records'] = [_presence(2, 'u1', 'Ani', 'Kemang', '2025-02-04', '08:00', '16:00', 480)]
+    assert client.post('/api/payroll/presences/sync', json={'token': 'secret'}).get_json()['updated'] == 1
+    by_day = _summary(client, 'year=2025&user_id=u1&group_by=day')
+    assert [(row['presence_date'], row['worked_minutes']) for row in by_day['rows']] == [
+        ('2025-01-06', 480), ('2025-02-03', 480), ('2025-02-04', 480),
+    ]
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql('DELETE FROM payroll_presence_daily')
+        assert presence_aggregates.repair_presence_aggregates(conn) == 5
+    assert _summary(client, 'year=2025&user_id=u1&group_by=day')['rows'] == by_day['rows']
+
+
+def test_summary_without_migration_reads_presences_and_validates(monkeypatch, make_sqlite_engine, run_migration):
+    client, _, _ = _client(monkeypatch, make_sqlite_engine, run_migration, with_migration=False)
+    assert client.post('/api/payroll/presences/sync', json={'token': 'secret'}).status_code == 200
+
+    by_store = _summary(client, 'year=2025&group_by=store')
+    assert by_store['source'] == 'payroll_presences'
+    assert [(row['store_name'], row['presence_count'], row['late_count']) for row in by_store['rows']] == [
+        ('Kemang', 4, 2), ('Senopati', 1, 0),
+    ]
+
+    assert client.get('/api/payroll/presences/summary?date_start=2025-01-01').status_code == 400
+    assert client.get('/api/payroll/presences/summary?year=2025&group_by=shift').status_code == 400
+    assert client.get('/api/payroll/presences/summary?date_start=2025-02-01&date_end=2025-01-01').status_code == 400
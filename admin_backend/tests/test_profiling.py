@@ -0,0 +1,82 @@
+import json
+import time
+
+from flask import Flask, jsonify
+
+from collections import Counter
+
+from backend.profiling import load_profile, profile_file_path, register_profiling, top_functions_from_samples
+
+
+def _busy(seconds):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(200))
+    return total
+
+
+def _app():
+    app = Flask(__name__)
+    register_profiling(app)
+
+    @app.route('/api/slow')
+    def slow():
+        return jsonify({'total': _busy(0.05)})
+
+    return app
+
+
+def test_no_hooks_without_configured_tokens(monkeypatch):
+    monkeypatch.delenv('PROFILING_TOKENS', raising=False)
+    app = _app()
+
+    assert app.before_request_funcs == {}
+    assert 'X-Profile-Id' not in app.test_client().get('/api/slow?_profile=anything').headers
+
+
+def test_sampled_profile_writes_collapsed_stacks(monkeypatch, tmp_path):
+    monkeypatch.setenv('PROFILING_TOKENS', 'secret')
+    monkeypatch.setenv('PROFILING_DIR', str(tmp_path))
+    client = _app().test_client()
+
+    assert 'X-Profile-Id' not in client.get('/api/slow', headers={'X-Profile-Token': 'wrong'}).headers
+
+    response = client.get('/api/slow', headers={'X-Profile-Token': 'secret'})
+    profile_id = response.headers['X-Profile-Id']
+    meta = load_profile(profile_id)
+
+    assert meta['mode'] == 'sample' and meta['path'] == '/api/slow'
+    assert meta['samples'] > 0 and meta['top_functions']
+    with open(profile_file_path(profile_id, 'collapsed'), encoding='utf-8') as handle:
+        collapsed = handle.read()
+    assert '_busy (' in collapsed
+    assert collapsed.splitlines()[0].rsplit(' ', 1)[1].isdigit()
+
+
+def test_top_functions_rank_cumulative_then_self_time():
+    stacks = Counter({'main;view;query': 6, 'main;view': 2, 'main;render': 2})
+
+    top = top_functions_from_samples(stacks, 0.005, limit=3)
+
+    assert [item['function'] for item in top] == ['main', 'view', 'query']
+    assert top[1]['cumulative_ms'] == 40.0 and top[1]['self_ms'] == 10.0
+
+
+def test_cprofile_mode_and_path_allowlist(monkeypatch, tmp_path):
+    monkeypatch.setenv('PROFILING_TOKENS', 'secret')
+    monkeypatch.setenv('PROFILING_DIR', str(tmp_path))
+    client = _app().test_client()
+
+    response = client.get('/api/slow?_profile=secret&_profile_mode=cprofile')
+    profile_id = response.headers['X-Profile-Id']
+    meta = json.loads((tmp_path / f'{profile_id}.json').read_text())
+
+    assert meta['mode'] == 'cprofile'
+    assert meta['path'] == '/api/slow?_profile_mode=cprofile'
+    assert 'secret' not in json.dumps(meta)
+    assert any(item['function'].startswith('_busy ') for item in meta['top_functions'])
+    assert profile_file_path(profile_id, 'prof') is not None
+
+    monkeypatch.setenv('PROFILING_PATHS', '/api/reports')
+    assert 'X-Profile-Id' not in client.get('/api/slow?_profile=secret').headers
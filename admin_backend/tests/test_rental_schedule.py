@@ -0,0 +1,140 @@
+import pytest
+from flask import Flask
+from sqlalchemy import text
+
+from backend.db import session
+from backend.error_handlers import register_error_handlers
+from backend.routes.rental import rental_contract_bp as rental_contract_module
+from backend.routes.rental.rental_contract_bp import rental_contract_bp
+from backend.services.rental.rental_schedule import repair_rental_schedule
+from backend.services.reporting import rental_adjustments
+from backend.services.reporting.rental_adjustments import (
+    _calculate_cumulative_rental_amortization_as_of,
+    _calculate_prorated_contract_rent_expense,
+    _calculate_rental_tax_breakdown,
+    _calculate_rental_tax_payable_as_of,
+)
+
+PERIODS = [
+    ('2024-01-01', '2024-12-31'),
+    ('2024-03-01', '2024-03-31'),
+    ('2024-03-25', '2024-04-10'),
+    ('2025-01-01', '2025-06-30'),
+]
+AS_OF_DATES = ['2024-03-15', '2024-03-31', '2024-06-30', '2024-12-31', '2025-01-31', '2025-03-10', '2025-03-25']
+COMPANIES = [None, 'c1', 'c2']
+
+
+@pytest.fixture
+def engine(make_sqlite_engine, run_migration):
+    engine = make_sqlite_engine()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("""
+            CREATE TABLE rental_contracts (
+                id TEXT PRIMARY KEY, company_id TEXT, start_date TEXT, end_date TEXT, total_amount REAL,
+                calculation_method TEXT, pph42_rate REAL, pph42_payment_timing TEXT, pph42_payment_date TEXT
+            )
+        """)
+        conn.exec_driver_sql("""
+            CREATE TABLE transactions (
+                id TEXT PRIMARY KEY, parent_id TEXT, amount REAL, db_cr TEXT, txn_date TEXT, mark_id TEXT,
+                company_id TEXT, rental_contract_id TEXT,
+                is_split_container INTEGER NOT NULL DEFAULT 0, has_marked_children INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        conn.exec_driver_sql("CREATE TABLE marks (id TEXT PRIMARY KEY, is_rental INTEGER)")
+        conn.exec_driver_sql("INSERT INTO marks VALUES ('sewa', 1), ('lain', 0)")
+        conn.exec_driver_sql("""
+            INSERT INTO rental_contracts VALUES
+            ('k1', 'c1', '2024-03-20', '2025-03-19', 0, 'NETTO', 10, 'next_period', '2024-06-15'),
+            ('k2', 'c1', '2024-07-01', '2024-12-31', 12000, 'BRUTO', 10, 'same_period', NULL),
+            ('k3', 'c2', '2025-01-15', NULL, 0, 'BRUTO', 10, 'next_year', NULL)
+        """)
+        conn.exec_driver_sql("""
+            INSERT INTO transactions
+                (id, parent_id, amount, db_cr, txn_date, mark_id, company_id, rental_contract_id,
+                 is_split_container, has_marked_children)
+            VALUES
+            ('t1', NULL, -6000, 'DB', '2024-03-10', 'sewa', 'c1', 'k1', 0, 0),
+            ('t2', NULL, -6000, 'DB', '2024-09-05', 'sewa', 'c1', 'k1', 0, 0),
+            ('t3', NULL, -3000, 'DB', '2024-07-01', 'sewa', 'c1', 'k2', 0, 0),
+            ('t4', NULL, -1000, 'DB', '2024-08-01', 'sewa', 'c2', 'k2', 0, 0),
+            ('t5', NULL, -500, 'DB', '2025-01-20', 'sewa', 'c2', 'k3', 0, 0),
+            ('p1', NULL, -999, 'DB', '2024-05-01', NULL, 'c1', 'k1', 1, 1),
+            ('p1-a', 'p1', -999, 'DB', '2024-05-01', 'lain', 'c1', NULL, 0, 0),
+            ('t6', NULL, -800, 'DB', '2024-04-02', 'sewa', 'c1', NULL, 0, 0)
+        """)
+        run_migration(conn, '081_create_rental_contract_schedule_sqlite.sql')
+        repair_rental_schedule(conn)
+    return engine
+
+
+def _live(monkeypatch, fetch):
+    with monkeypatch.context() as patch:
+        patch.setattr(rental_adjustments, 'rental_schedule_available', lambda conn: False)
+        return fetch()
+
+
+def _assert_schedule_matches_live(monkeypatch, conn):
+    for company_id in COMPANIES:
+        for start_date, end_date in PERIODS:
+            scheduled = _calculate_prorated_contract_rent_expense(conn, start_date, end_date, company_id)
+            live = _live(monkeypatch, lambda: _calculate_prorated_contract_rent_expense(
+                conn, start_date, end_date, company_id
+            ))
+            assert scheduled == pytest.approx(live)
+        for as_of_date in AS_OF_DATES:
+            for calculate in (
+                _calculate_cumulative_rental_amortization_as_of,
+                _calculate_rental_tax_payable_as_of,
+            ):
+                scheduled = calculate(conn, as_of_date, company_id)
+                live = _live(monkeypatch, lambda: calculate(conn, as_of_date, company_id))
+                assert scheduled == pytest.approx(live)
+            scheduled = _calculate_rental_tax_breakdown(conn, as_of_date, company_id)
+            live = _live(monkeypatch, lambda: _calculate_rental_tax_breakdown(conn, as_of_date, company_id))
+            assert scheduled == pytest.approx(live)
+
+
+def test_schedule_bridges_match_the_linked_transaction_scan(monkeypatch, engine):
+    with engine.connect() as conn:
+        _assert_schedule_matches_live(monkeypatch, conn)
+
+        # k1 spreads 12000 over 13 months (March 2024 - March 2025); the split parent is excluded.
+        assert _calculate_prorated_contract_rent_expense(conn, '2024-03-01', '2024-03-31', 'c1') == pytest.approx(
+            12000 / 13
+        )
+        # March 2025 only counts once the start day (20) is reached.
+        assert _calculate_cumulative_rental_amortization_as_of(conn, '2025-03-10') == pytest.approx(
+            12 * 12000 / 13 + 4000 + 500
+        )
+        # Only t1 is paid by the end of March 2024: NETTO 6000 grossed up at 10%.
+        assert _calculate_rental_tax_breakdown(conn, '2024-03-31', 'c1')['unpaid_tax'] == pytest.approx(
+            6000 / 0.9 * 0.1
+        )
+
+
+def test_contract_endpoints_rebuild_the_schedule(monkeypatch, engine):
+    monkeypatch.setattr(session, '_db_engine', engine)
+    monkeypatch.setattr(rental_contract_module, 'create_or_update_prepaid_from_contract', lambda *args, **kwargs: {})
+    app = Flask(__name__)
+    register_error_handlers(app)
+    app.register_blueprint(rental_contract_bp)
+    client = app.test_client()
+
+    assert client.post('/api/rental-contracts/k2/link-transaction', json={'transaction_id': 't6'}).status_code == 200
+    assert client.delete('/api/rental-contracts/k1/unlink-transaction/t2').status_code == 200
+    # Moving t3 from k2 to k1 rebuilds both contracts.
+    assert client.post('/api/rental-contracts/k1/link-transaction', json={'transaction_id': 't3'}).status_code == 200
+
+    with engine.connect() as conn:
+        _assert_schedule_matches_live(monkeypatch, conn)
+        assert _calculate_prorated_contract_rent_expense(conn, '2024-07-01', '2024-12-31', 'c1') == pytest.approx(
+            6 * 9000 / 13 + 800
+        )
+
+    assert client.delete('/api/rental-contracts/k1').status_code == 200
+    with engine.connect() as conn:
+        contract_ids = {row.contract_id for row in conn.execute(text("SELECT contract_id FROM rental_contract_schedule"))}
+        assert contract_ids == {'k2', 'k3'}
+        _assert_schedule_matches_live(monkeypatch, conn)
@@ -0,0 +1,114 @@
+import pytest
+from flask import Blueprint, Flask, request
+
+from backend.db import session
+from backend.routes.reporting.report_cache_helpers import cached_report_response
+from backend.services.reporting.report_cache import (
+    bump_data_version,
+    clear_report_cache,
+    register_report_invalidation,
+    report_data_version,
+)
+
+@pytest.fixture
+def engine(make_sqlite_engine, run_migration):
+    engine = make_sqlite_engine()
+    with engine.begin() as conn:
+        run_migration(conn, '071_create_report_data_versions_sqlite.sql')
+    return engine
+
+
+def _app(engine, monkeypatch):
+    monkeypatch.setattr(session, '_db_engine', engine)
+    clear_report_cache()
+    app = Flask(__name__)
+    register_report_invalidation(app)
+    app.builds = 0
+
+    @app.route('/report')
+    def report():
+        company_id = request.args.get('company_id')
+
+        def build_report():
+            app.builds += 1
+            return {'company_id': company_id, 'total': 100}
+
+        with engine.connect() as conn:
+            return cached_report_response(conn, 'test-report', company_id, {'year': 2025}, build_report)
+
+    @app.route('/marks', methods=['POST'])
+    def edit_mark():
+        return {'success': True}
+
+    uploads = Blueprint('pdf_bp', __name__)
+
+    @uploads.route('/api/check-upload-name', methods=['POST'])
+    def check_upload_name():
+        return {'exists': False}
+
+    app.register_blueprint(uploads)
+    return app
+
+
+def test_repeated_views_are_cached_and_revalidated_with_etag(monkeypatch, engine):
+    app = _app(engine, monkeypatch)
+    client = app.test_client()
+
+    first = client.get('/report?company_id=c1')
+    second = client.get('/report?company_id=c1')
+    not_modified = client.get('/report?company_id=c1', headers={'If-None-Match': first.headers['ETag']})
+
+    assert first.get_json() == second.get_json() == {'company_id': 'c1', 'total': 100}
+    assert first.headers['ETag'] == second.headers['ETag']
+    assert not_modified.status_code == 304
+    assert app.builds == 1
+
+
+def test_write_request_invalidates_cached_reports(monkeypatch, engine):
+    app = _app(engine, monkeypatch)
+    client = app.test_client()
+
+    etag = client.get('/report').headers['ETag']
+    client.post('/marks')
+    response = client.get('/report', headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert app.builds == 2
+
+
+def test_read_only_upload_checks_keep_cached_reports(monkeypatch, engine):
+    app = _app(engine, monkeypatch)
+    client = app.test_client()
+
+    etag = client.get('/report').headers['ETag']
+    client.post('/api/check-upload-name')
+    response = client.get('/report', headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert app.builds == 1
+
+
+def test_company_bump_leaves_other_companies_cached(engine):
+    with engine.connect() as conn:
+        before = {scope: report_data_version(conn, scope) for scope in ('c1', 'c2', None)}
+    with engine.begin() as conn:
+        bump_data_version(conn, ['c1', None])
+    with engine.connect() as conn:
+        after = {scope: report_data_version(conn, scope) for scope in ('c1', 'c2', None)}
+
+    assert after['c2'] == before['c2']
+    assert after['c1'] != before['c1']
+    assert after[None] != before[None]
+
+
+def test_reports_are_computed_uncached_without_versions_table(monkeypatch, make_sqlite_engine):
+    app = _app(make_sqlite_engine(), monkeypatch)
+    client = app.test_client()
+
+    response = client.get('/report')
+    client.get('/report')
+    client.post('/marks')
+
+    assert 'ETag' not in response.headers
+    assert app.builds == 2
@@ -0,0 +1,193 @@
+import os
+import re
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import event, text
+
+import migrate
+from backend.routes.reporting.general_ledger_helpers import coretax_filter_clause, mark_coa_join_clause
+from backend.routes.reporting.general_ledger_queries import (
+    build_general_ledger_account_balances_query,
+    build_general_ledger_page_query,
+)
+from backend.routes.reporting.report_queries import build_marks_summary_query
+from backend.services.reporting.balance_sheet_service import _build_balance_sheet_query
+from backend.services.reporting.income_statement_service import _build_income_statement_query
+from backend.services.reporting.monthly_revenue_service import fetch_monthly_revenue_data
+from backend.services.reporting.report_sql_fragments import _coretax_filter_clause, _split_parent_exclusion_clause
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE chart_of_accounts (
+    id TEXT PRIMARY KEY, code TEXT, name TEXT, category TEXT, subcategory TEXT, fiscal_category TEXT, is_active INTEGER
+);
+CREATE TABLE marks (
+    id TEXT PRIMARY KEY, personal_use TEXT, internal_report TEXT, tax_report TEXT, natural_direction TEXT,
+    fiscal_category TEXT, is_coretax INTEGER
+);
+CREATE TABLE mark_coa_mapping (id TEXT PRIMARY KEY, mark_id TEXT, coa_id TEXT, mapping_type TEXT, report_type TEXT);
+CREATE TABLE transactions (
+    id TEXT PRIMARY KEY, txn_date DATE, description TEXT, amount REAL, db_cr TEXT,
+    bank_code TEXT, source_file TEXT, file_hash TEXT, mark_id TEXT, company_id TEXT,
+    parent_id TEXT, coa_id TEXT, coa_id_coretax TEXT
+)
+"""
+REPORT_INDEXES = {
+    'idx_transactions_company_date',
+    'idx_transactions_txn_date',
+    'idx_transactions_parent',
+    'idx_transactions_mark_date',
+}
+
+
+@pytest.fixture
+def sqlite_engine(make_sqlite_engine, run_migration):
+    engine = make_sqlite_engine()
+    with engine.begin() as conn:
+        for statement in migrate._split_sql_statements(SQLITE_SCHEMA):
+            conn.exec_driver_sql(statement)
+        run_migration(conn, '070_add_reporting_indexes_sqlite.sql')
+        run_migration(conn, '082_add_marks_report_index_sqlite.sql')
+    return engine
+
+
+def _capture_report_statements(engine, company_id):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if re.search(r'FROM\s+transactions\s+t\b', statement):
+            statements.append((statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', capture)
+    try:
+        with engine.connect() as conn:
+            fetch_monthly_revenue_data(conn, 2025, company_id)
+
+            params = {'start_date': '2025-01-01', 'end_date': '2025-12-31', 'fiscal_year_start': '2025-01-01'}
+            company_filter = ''
+            if company_id:
+                company_filter = 'AND t.company_id = :company_id'
+                params['company_id'] = company_id
+            query_kwargs = {
+                'conn': conn,
+                'mark_coa_join': mark_coa_join_clause(conn, 'real', mark_ref='m.id', mapping_alias='mcm', join_type='LEFT'),
+                'company_filter': company_filter,
+                'coretax_filter': coretax_filter_clause(conn, 'real', 'm'),
+                'coa_filter': '',
+                'report_type': 'real',
+            }
+            conn.execute(build_general_ledger_account_balances_query(**query_kwargs), params)
+            conn.execute(build_general_ledger_page_query(**query_kwargs), {**params, 'offset': 0, 'limit': 50})
+    finally:
+        event.remove(engine, 'before_cursor_execute', capture)
+    return statements
+
+
+def _sqlite_transaction_lookups(conn, statement, parameters):
+    plan = [row[-1] for row in conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters)]
+    return [step for step in plan if re.match(r'(SCAN|SEARCH) t(_child)? ', step)]
+
+
+@pytest.mark.parametrize('company_id', [None, 'company-1'])
+def test_sqlite_report_queries_search_transactions_by_index(sqlite_engine, company_id):
+    statements = _capture_report_statements(sqlite_engine, company_id)
+    assert len(statements) == 3
+
+    with sqlite_engine.connect() as conn:
+        for statement, parameters in statements:
+            lookups = _sqlite_transaction_lookups(conn, statement, parameters)
+            assert lookups
+            for step in lookups:
+                assert step.startswith('SEARCH'), step
+                assert any(index in step for index in REPORT_INDEXES), step
+            if company_id:
+                assert any('idx_transactions_company_date' in step for step in lookups)
+
+
+def test_sqlite_split_parent_probe_uses_parent_index(sqlite_engine):
+    statements = _capture_report_statements(sqlite_engine, None)
+
+    with sqlite_engine.connect() as conn:
+        child_lookups = [
+            step
+            for statement, parameters in statements
+            for step in _sqlite_transaction_lookups(conn, statement, parameters)
+            if step.startswith(('SCAN t_child', 'SEARCH t_child'))
+        ]
+    assert child_lookups
+    assert all('idx_transactions_parent' in step for step in child_lookups)
+
+
+def _financial_statement_statements(conn, report_type, company_id):
+    split_exclusion = _split_parent_exclusion_clause(conn, 't')
+    coretax_clause = _coretax_filter_clause(conn, report_type, 'm')
+    return [
+        (
+            _build_income_statement_query(conn, report_type, split_exclusion, coretax_clause),
+            {'start_date': '2025-01-01', 'end_date': '2025-12-31', 'company_id': company_id},
+        ),
+        (
+            _build_balance_sheet_query(conn, report_type),
+            {'as_of_date': '2025-12-31', 'start_date': None, 'company_id': company_id},
+        ),
+    ]
+
+
+def _sqlite_plan(conn, query, parameters):
+    return [row[-1] for row in conn.execute(text(f'EXPLAIN QUERY PLAN {query.text}'), parameters)]
+
+
+@pytest.mark.parametrize('report_type', ['real', 'coretax'])
+@pytest.mark.parametrize('company_id', [None, 'company-1'])
+def test_sqlite_financial_statements_use_report_indexes(sqlite_engine, report_type, company_id):
+    with sqlite_engine.connect() as conn:
+        for query, parameters in _financial_statement_statements(conn, report_type, company_id):
+            plan = _sqlite_plan(conn, query, parameters)
+            transaction_steps = [step for step in plan if re.match(r'(SCAN|SEARCH) t ', step)]
+            assert transaction_steps
+            assert all(
+                step.startswith('SEARCH') and any(index in step for index in REPORT_INDEXES)
+                for step in transaction_steps
+            ), plan
+            assert any(re.match(r'SEARCH m USING .*\(id=\?\)', step) for step in plan), plan
+            assert any(
+                step.startswith('SEARCH mcm') and 'idx_mark_coa_mapping_scope' in step for step in plan
+            ), plan
+            assert not any(step.startswith(('SCAN t_child', 'SCAN m ', 'SCAN mcm')) for step in plan), plan
+
+
+def test_sqlite_coretax_marks_summary_drives_from_marks_index(sqlite_engine):
+    with sqlite_engine.connect() as conn:
+        plan = _sqlite_plan(conn, build_marks_summary_query(conn, 'coretax'), {
+            'start_date': '2025-01-01', 'end_date': '2025-12-31', 'company_id': None,
+        })
+    assert any(step.startswith('SEARCH m ') and 'idx_marks_coretax' in step for step in plan), plan
+    assert any(step.startswith('SEARCH t ') and 'idx_transactions_mark_date' in step for step in plan), plan
+
+
+@pytest.mark.skipif(
+    not os.environ.get('REPORT_INDEX_MYSQL_URL'),
+    reason='set REPORT_INDEX_MYSQL_URL to a migrated MySQL database to run',
+)
+def test_mysql_report_queries_can_use_report_indexes():
+    engine = sa.create_engine(os.environ['REPORT_INDEX_MYSQL_URL'])
+    statements = _capture_report_statements(engine, 'company-1')
+    assert len(statements) == 3
+
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            plan = conn.exec_driver_sql(f'EXPLAIN {statement}', parameters).mappings().all()
+            transaction_steps = [step for step in plan if step['table'] in ('t', 't_child')]
+            assert transaction_steps
+            for step in transaction_steps:
+                possible_keys = set((step['possible_keys'] or '').split(','))
+                assert possible_keys & REPORT_INDEXES, step
+
+        for report_type in ('real', 'coretax'):
+            for query, parameters in _financial_statement_statements(conn, report_type, 'company-1'):
+                plan = conn.execute(text(f'EXPLAIN {query.text}'), parameters).mappings().all()
+                steps = {step['table']: set((step['possible_keys'] or '').split(',')) for step in plan}
+                assert steps['t'] & REPORT_INDEXES, plan
+                assert 'PRIMARY' in steps['m'], plan
+                assert 'idx_mark_coa_mapping_scope' in steps['mcm'], plan
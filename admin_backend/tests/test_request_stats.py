@@ -0,0 +1,56 @@
+import sqlalchemy as sa
+from flask import Flask, jsonify
+from sqlalchemy import text
+
+from backend.db.instrumentation import instrument_engine, normalize_statement, track_remote_call
+from backend.request_stats import recent_request_stats, register_request_stats
+
+
+def test_normalize_statement_groups_literals_and_in_lists():
+    first = normalize_statement("SELECT * FROM t WHERE id = 'a1' AND amount > 10 AND mark_id IN (%s, %s, %s)")
+    second = normalize_statement("SELECT *\n  FROM t WHERE id = 'b2' AND amount > 99 AND mark_id IN (%s)")
+
+    assert first == second == 'SELECT * FROM t WHERE id = ? AND amount > ? AND mark_id IN (...)'
+
+
+def _app_with_engine():
+    engine = instrument_engine(sa.create_engine('sqlite://'))
+    app = Flask(__name__)
+    register_request_stats(app)
+
+    @app.route('/per-record')
+    def per_record():
+        with engine.connect() as conn:
+            for index in range(25):
+                conn.execute(text('SELECT :value'), {'value': index})
+        with track_remote_call('Presence API'):
+            pass
+        return jsonify({'ok': True})
+
+    return app
+
+
+def test_request_gets_server_timing_and_history_entry():
+    response = _app_with_engine().test_client().get('/per-record')
+
+    timing = response.headers['Server-Timing']
+    assert timing.startswith('db;dur=')
+    assert 'desc="25 queries"' in timing
+    assert 'remote;dur=' in timing and 'total;dur=' in timing
+
+    entry = recent_request_stats(1)[0]
+    assert entry['path'] == '/per-record'
+    assert entry['statement_count'] == 25
+    assert entry['distinct_statements'] == 1
+    assert entry['repeated_statements'][0]['count'] == 25
+    assert entry['remote_calls'][0]['resource'] == 'Presence API'
+    assert entry['total_ms'] >= entry['db_ms']
+
+
+def test_statements_outside_a_request_are_not_collected():
+    engine = instrument_engine(sa.create_engine('sqlite://'))
+    before = len(recent_request_stats())
+    with engine.connect() as conn:
+        conn.execute(text('SELECT 1'))
+
+    assert len(recent_request_stats()) == before
@@ -0,0 +1,124 @@
+import pytest
+from flask import Flask
+from sqlalchemy import text
+
+from backend.db import session
+from backend.error_handlers import register_error_handlers
+from backend.routes.accounting_utils import split_parent_exclusion_clause
+from backend.routes.transactions.history_bp import history_bp
+from backend.services.reporting.report_sql_fragments import _split_parent_exclusion_clause
+from backend.services.transactions.split_flags import repair_split_flags
+
+
+def _build_engine(make_sqlite_engine, run_migration, with_flags=True):
+    engine = make_sqlite_engine()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("""
+            CREATE TABLE transactions (
+                id TEXT PRIMARY KEY, parent_id TEXT, description TEXT, amount REAL, db_cr TEXT,
+                txn_date TEXT, mark_id TEXT, notes TEXT, company_id TEXT, created_at TEXT, updated_at TEXT
+            )
+        """)
+        conn.exec_driver_sql(
+            "CREATE TABLE marks (id TEXT PRIMARY KEY, internal_report TEXT, personal_use TEXT, tax_report TEXT)"
+        )
+        conn.exec_driver_sql(
+            "CREATE TABLE manual_journal_links (id TEXT PRIMARY KEY, manual_txn_id TEXT, linked_txn_id TEXT)"
+        )
+        run_migration(conn, '071_create_report_data_versions_sqlite.sql')
+        run_migration(conn, '072_create_data_change_log_sqlite.sql')
+        conn.exec_driver_sql("""
+            INSERT INTO transactions (id, parent_id, company_id, txn_date, amount, db_cr, mark_id) VALUES
+            ('split', NULL, 'c1', '2025-01-10', 100, 'DB', NULL),
+            ('split-a', 'split', 'c1', '2025-01-10', 60, 'DB', 'm1'),
+            ('split-b', 'split', 'c1', '2025-01-10', 40, 'DB', '  '),
+            ('draft', NULL, 'c1', '2025-01-11', 50, 'DB', NULL),
+            ('draft-a', 'draft', 'c1', '2025-01-11', 50, 'DB', NULL),
+            ('plain', NULL, 'c1', '2025-01-12', 10, 'DB', 'm1')
+        """)
+        if with_flags:
+            run_migration(conn, '073_add_transaction_split_flags_sqlite.sql')
+    return engine
+
+
+@pytest.fixture
+def engine(make_sqlite_engine, run_migration):
+    return _build_engine(make_sqlite_engine, run_migration)
+
+
+def _flags(engine):
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT id, is_split_container, has_marked_children FROM transactions"))
+        return {row.id: (row.is_split_container, row.has_marked_children) for row in rows}
+
+
+def _client(monkeypatch, engine):
+    monkeypatch.setattr(session, '_db_engine', engine)
+    app = Flask(__name__)
+    register_error_handlers(app)
+    app.register_blueprint(history_bp)
+    return app.test_client()
+
+
+def test_migration_backfills_flags_from_children(engine):
+    flags = _flags(engine)
+
+    assert flags['split'] == (1, 1)
+    assert flags['draft'] == (1, 0)
+    assert flags['plain'] == (0, 0)
+    assert flags['split-a'] == (0, 0)
+
+
+def test_exclusion_clauses_use_flags_and_fall_back_without_them(engine, make_sqlite_engine, run_migration):
+    with engine.connect() as conn:
+        assert _split_parent_exclusion_clause(conn, 't').strip() == 'AND t.has_marked_children = 0'
+        assert split_parent_exclusion_clause(conn, 't').strip() == 'AND t.is_split_container = 0'
+        included = {row.id for row in conn.execute(text(
+            f"SELECT t.id FROM transactions t WHERE 1 = 1 {_split_parent_exclusion_clause(conn, 't')}"
+        ))}
+    assert 'split' not in included
+    assert {'draft', 'split-a', 'plain'} <= included
+
+    with _build_engine(make_sqlite_engine, run_migration, with_flags=False).connect() as conn:
+        assert 'NOT EXISTS' in _split_parent_exclusion_clause(conn, 't')
+        assert 'NOT EXISTS' in split_parent_exclusion_clause(conn, 't')
+
+
+def test_split_save_and_child_mark_changes_maintain_parent_flags(monkeypatch, engine):
+    client = _client(monkeypatch, engine)
+
+    response = client.post('/api/transactions/plain/splits', json={'splits': [
+        {'amount': 4, 'mark_id': 'm1'},
+        {'amount': 6, 'mark_id': None},
+    ]})
+    assert response.status_code == 200
+    assert _flags(engine)['plain'] == (1, 1)
+
+    response = client.post('/api/transactions/split-a/assign-mark', json={'mark_id': None})
+    assert response.status_code == 200
+    assert _flags(engine)['split'] == (1, 0)
+
+    response = client.post('/api/transactions/bulk-delete', json={'transaction_ids': ['draft-a']})
+    assert response.status_code == 200
+    assert _flags(engine)['draft'] == (0, 0)
+
+    response = client.post('/api/transactions/plain/splits', json={'splits': []})
+    assert response.status_code == 200
+    assert _flags(engine)['plain'] == (0, 0)
+
+
+def test_repair_corrects_drifted_flags(engine):
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "UPDATE transactions SET is_split_container = 0, has_marked_children = 0 WHERE id = 'split'"
+        )
+        conn.exec_driver_sql("UPDATE transactions SET is_split_container = 1 WHERE id = 'plain'")
+
+    with engine.begin() as conn:
+        assert repair_split_flags(conn) == 2
+    with engine.begin() as conn:
+        assert repair_split_flags(conn) == 0
+
+    flags = _flags(engine)
+    assert flags['split'] == (1, 1)
+    assert flags['plain'] == (0, 0)
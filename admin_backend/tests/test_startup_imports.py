@@ -0,0 +1,82 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from bank_parsers import registry
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+# Generous enough for a loaded CI box; a regression back to eager pandas/parser imports blows well past it.
+IMPORT_BUDGET_SECONDS = float(os.environ.get('STARTUP_IMPORT_BUDGET_SECONDS', '2.0'))
+HEAVY_MODULES = ('pandas', 'numpy', 'PyPDF2', 'pdfplumber', 'pypdfium2', 'openpyxl', 'bank_parsers.bca')
+
+STARTUP_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import server
+elapsed = time.perf_counter() - started
+print(json.dumps({
+    'seconds': elapsed,
+    'heavy': sorted(name for name in %r if name in sys.modules),
+    'routes': len(list(server.app.url_map.iter_rules())),
+}))
+"""
+
+
+def _cold_import():
+    env = {**os.environ, 'PROFILING_TOKENS': ''}
+    env.pop('PROMETHEUS_MULTIPROC_DIR', None)
+    result = subprocess.run(
+        [sys.executable, '-c', STARTUP_SCRIPT % (HEAVY_MODULES,)],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_server_import_skips_heavy_dependencies_and_stays_within_budget():
+    # Warm the bytecode cache so the measurement is import work, not compilation.
+    _cold_import()
+    startup = _cold_import()
+
+    assert startup['heavy'] == []
+    assert startup['routes'] > 100
+    assert startup['seconds'] < IMPORT_BUDGET_SECONDS, startup
+
+
+def test_parser_registry_maps_keys_and_falls_back_to_bca():
+    assert registry.get_parser('bri').file_format == 'csv'
+    assert registry.get_parser('ccmandiri').module_name == 'bank_parsers.mandiri_cc'
+    assert registry.get_parser('unknown').bank_key == registry.DEFAULT_BANK_KEY
+
+
+def test_parser_module_is_imported_on_first_parse(monkeypatch):
+    calls = []
+
+    class FakeParserModule:
+        @staticmethod
+        def parse_statement(path, password=None):
+            calls.append((path, password))
+            return 'parsed'
+
+    monkeypatch.setattr(registry, '_modules', {})
+    monkeypatch.setattr(registry.importlib, 'import_module', lambda name: FakeParserModule)
+
+    assert registry.loaded_parser_modules() == []
+    assert registry.get_parser('saqu').parse('statement.pdf', password='secret') == 'parsed'
+    assert registry.loaded_parser_modules() == ['bank_parsers.saqu']
+    assert calls == [('statement.pdf', 'secret')]
+
+
+@pytest.mark.parametrize('bank_key, is_csv', [('bri', False), ('mandiri', True)])
+def test_parse_statement_rejects_wrong_file_format(bank_key, is_csv):
+    from backend.routes.uploads.pdf_helpers import parse_statement
+
+    with pytest.raises(ValueError):
+        parse_statement(bank_key, 'statement.file', is_csv=is_csv)
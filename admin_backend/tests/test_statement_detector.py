@@ -0,0 +1,84 @@
+from reportlab.pdfgen import canvas
+
+from bank_parsers.statement_detector import detect_from_text, detect_statement
+
+
+def test_detects_bca_account_period_and_currency():
+    text = (
+        "REKENING TAHAPAN\n"
+        "NO. REKENING : 1234567890\n"
+        "PERIODE : JANUARI 2025\n"
+        "MATA UANG : IDR\n"
+        "TANGGAL KETERANGAN CBG MUTASI SALDO\n"
+    )
+    result = detect_from_text(text)
+
+    assert result['bank_key'] == 'bca'
+    assert result['account_number'] == '1234567890'
+    assert result['period'] == {'raw': 'JANUARI 2025', 'year': 2025, 'month': 1}
+    assert result['currency'] == 'IDR'
+
+
+def test_credit_card_signature_wins_over_parent_bank():
+    text = (
+        "REKENING KARTU KREDIT BCA\n"
+        "TANGGAL REKENING : 15 FEBRUARI 2025\n"
+        "NO. REKENING 4556-12XX-XXXX-1234\n"
+        "TAGIHAN BARU  PEMBAYARAN MINIMUM  MATA UANG : IDR\n"
+    )
+    result = detect_from_text(text)
+
+    assert result['bank_key'] == 'ccbca'
+    assert result['period']['month'] == 2
+    assert result['period']['year'] == 2025
+    assert [candidate['bank_key'] for candidate in result['candidates']][:2] == ['ccbca', 'bca']
+
+
+def test_dbs_numeric_period_is_month_first():
+    text = "DBS\nAccount Number : 123-456-789\n01/19/2025 02/04/2025 Rp. 11,704,461"
+    result = detect_from_text(text)
+
+    assert result['bank_key'] == 'dbs'
+    assert result['account_number'] == '123456789'
+    assert result['period']['month'] == 1
+
+
+def test_unknown_text_returns_no_bank():
+    result = detect_from_text("Invoice #42\nThank you for your purchase")
+
+    assert result['bank_key'] is None
+    assert result['confidence'] == 0.0
+
+
+def test_detects_bri_csv_from_header(tmp_path):
+    csv_path = tmp_path / 'mutasi.csv'
+    csv_path.write_text(
+        "NOREK;TGL_TRAN;DESK_TRAN;MUTASI_DEBET;MUTASI_KREDIT;GLSIGN\n"
+        "5.0501E+13;2025-03-02;TRF;0;100000;C\n",
+        encoding='utf-8',
+    )
+    result = detect_statement(str(csv_path))
+
+    assert result['bank_key'] == 'bri'
+    assert result['account_number'] == '50501000000000'
+    assert result['period']['year'] == 2025
+    assert result['period']['month'] == 3
+
+
+def test_pdf_detection_reads_first_page(tmp_path):
+    pdf_path = tmp_path / 'statement.pdf'
+    pdf = canvas.Canvas(str(pdf_path))
+    pdf.drawString(50, 800, "Statement Date : 05 Jan 2025")
+    pdf.drawString(50, 780, "Account Number : 0012345")
+    pdf.drawString(50, 760, "DBS Customer Centre")
+    pdf.showPage()
+    pdf.drawString(50, 800, "REKENING TAHAPAN BCA")
+    pdf.showPage()
+    pdf.save()
+
+    result = detect_statement(str(pdf_path))
+
+    assert result['bank_key'] == 'dbs'
+    assert result['account_number'] == '0012345'
+    assert result['period']['year'] == 2025
+    assert result['layout']['has_text_layer'] is True
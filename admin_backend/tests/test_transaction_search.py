@@ -0,0 +1,152 @@
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+from sqlalchemy import text
+from sqlalchemy.dialects import mysql
+
+from backend.db import session
+from backend.error_handlers import register_error_handlers
+from backend.routes.master_data.mark_bp import mark_bp
+from backend.routes.transactions.history_bp import history_bp
+from backend.services.transactions import transaction_search
+from backend.services.transactions.transaction_search import _mysql_match_sql, repair_search_index, search_join
+
+
+def _build_engine(make_sqlite_engine, run_migration, with_index=True):
+    engine = make_sqlite_engine()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("""
+            CREATE TABLE transactions (
+                id TEXT PRIMARY KEY, parent_id TEXT, description TEXT, amount REAL, db_cr TEXT,
+                txn_date TEXT, mark_id TEXT, company_id TEXT, bank_code TEXT, source_file TEXT,
+                created_at TEXT, updated_at TEXT
+            )
+        """)
+        conn.exec_driver_sql(
+            "CREATE TABLE manual_journal_links (id TEXT PRIMARY KEY, manual_txn_id TEXT, linked_txn_id TEXT)"
+        )
+        conn.exec_driver_sql("""
+            CREATE TABLE marks (
+                id TEXT PRIMARY KEY, internal_report TEXT, personal_use TEXT, tax_report TEXT, updated_at TEXT
+            )
+        """)
+        conn.exec_driver_sql("CREATE TABLE companies (id TEXT PRIMARY KEY, name TEXT, short_name TEXT)")
+        conn.exec_driver_sql("INSERT INTO marks (id, internal_report) VALUES ('m-rent', 'Sewa Gudang')")
+        run_migration(conn, '071_create_report_data_versions_sqlite.sql')
+        run_migration(conn, '072_create_data_change_log_sqlite.sql')
+        conn.exec_driver_sql("""
+            INSERT INTO transactions (id, company_id, txn_date, amount, db_cr, bank_code, source_file, description, mark_id)
+            VALUES
+            ('t1', 'c1', '2025-01-05', 100, 'DB', 'BCA', 'bca.pdf', 'TRSF E-BANKING PT. Sumber Makmur', NULL),
+            ('t2', 'c1', '2025-02-10', 200, 'DB', 'BCA', 'bca.pdf', 'Pembayaran sumber air', NULL),
+            ('t3', 'c2', '2025-03-01', 300, 'DB', 'BCA', 'bca.pdf', 'Sumber Makmur sumber makmur', NULL),
+            ('t4', 'c1', '2025-03-15', 400, 'CR', 'BCA', 'bca.pdf', 'KR OTOMATIS', 'm-rent')
+        """)
+        if with_index:
+            run_migration(conn, '076_create_transaction_search_sqlite.sql')
+    return engine
+
+
+@pytest.fixture
+def engine(make_sqlite_engine, run_migration):
+    return _build_engine(make_sqlite_engine, run_migration)
+
+
+def _client(monkeypatch, engine):
+    monkeypatch.setattr(session, '_db_engine', engine)
+    app = Flask(__name__)
+    register_error_handlers(app)
+    app.register_blueprint(history_bp)
+    app.register_blueprint(mark_bp)
+    return app.test_client()
+
+
+def _linkable(client, **args):
+    response = client.get('/api/transactions/linkable', query_string=args)
+    assert response.status_code == 200
+    return [row['id'] for row in response.get_json()['transactions']]
+
+
+def test_prefix_terms_must_all_match_and_rank_by_relevance(monkeypatch, engine):
+    client = _client(monkeypatch, engine)
+
+    assert _linkable(client, search='sumb makm') == ['t3', 't1']
+    ranked = _linkable(client, search='SUMBER')
+    assert ranked[0] == 't3' and set(ranked) == {'t1', 't2', 't3'}
+    assert _linkable(client, search='e-banking') == ['t1']
+    assert _linkable(client, search='sumber', company_id='c1', start_date='2025-02-01') == ['t2']
+    assert _linkable(client, search='"') == ['t4', 't3', 't2', 't1']
+
+
+def test_mark_names_are_searchable_and_follow_renames(monkeypatch, engine):
+    client = _client(monkeypatch, engine)
+
+    assert _linkable(client, search='gudang') == ['t4']
+    response = client.put('/api/marks/m-rent', json={'internal_report': 'Sewa Kantor'})
+    assert response.status_code == 200
+    assert _linkable(client, search='gudang') == []
+    assert _linkable(client, search='kantor') == ['t4']
+
+    response = client.post('/api/transactions/t1/assign-mark', json={'mark_id': 'm-rent'})
+    assert response.status_code == 200
+    assert _linkable(client, search='kantor') == ['t4', 't1']
+
+    response = client.get('/api/transactions', query_string={'search': 'kantor otomatis'})
+    assert [row['id'] for row in response.get_json()['transactions']] == ['t4']
+
+
+def test_search_falls_back_to_like_without_index(monkeypatch, make_sqlite_engine, run_migration):
+    client = _client(monkeypatch, _build_engine(make_sqlite_engine, run_migration, with_index=False))
+
+    assert _linkable(client, search='sumb makm') == ['t3', 't1']
+    assert _linkable(client, search='gudang') == ['t4']
+    with session._db_engine.connect() as conn:
+        assert search_join(conn, '  ') == ('', {})
+
+
+def test_repair_rebuilds_drifted_index(engine):
+    with engine.begin() as conn:
+        conn.exec_driver_sql("UPDATE transactions SET description = 'Biaya listrik' WHERE id = 't2'")
+        conn.exec_driver_sql("DELETE FROM transaction_search WHERE transaction_id = 't1'")
+
+    with engine.begin() as conn:
+        assert repair_search_index(conn) == 4
+        join_sql, params = search_join(conn, 'listrik')
+        rows = conn.execute(text(f"SELECT t.id FROM transactions t {join_sql}"), params).fetchall()
+    assert [row.id for row in rows] == ['t2']
+
+
+def test_mysql_search_matches_unindexed_terms_as_word_prefixes():
+    match_sql, params = _mysql_match_sql(['pt', 'sumber', 'the', 'cv'], min_token_size=3)
+
+    assert params == {
+        'search_query': '+sumber*',
+        'search_prefix_0': '% pt%',
+        'search_prefix_1': '% the%',
+        'search_prefix_2': '% cv%',
+    }
+    assert match_sql.count("CONCAT(' ', search_text) LIKE") == 3
+    assert 'MATCH(search_text) AGAINST (:search_query IN BOOLEAN MODE) AS search_rank' in match_sql
+
+    match_sql, params = _mysql_match_sql(['pt'], min_token_size=3)
+    assert params == {'search_prefix_0': '% pt%'}
+    assert 'MATCH' not in match_sql and '0 AS search_rank' in match_sql
+
+
+def test_mysql_search_join_renders_fulltext_and_word_prefix_filters(monkeypatch):
+    monkeypatch.setattr(transaction_search, 'search_index_available', lambda conn: True)
+    monkeypatch.setattr(transaction_search, '_mysql_min_token_size', lambda conn: 3)
+    conn = SimpleNamespace(dialect=mysql.dialect())
+
+    join_sql, params = search_join(conn, 'PT. Sumber-Makmur')
+    sql = ' '.join(str(text(f"SELECT t.id FROM transactions t {join_sql}").compile(dialect=conn.dialect)).split())
+
+    assert params == {'search_query': '+sumber* +makmur*', 'search_prefix_0': '% pt%'}
+    assert (
+        "SELECT transaction_id, MATCH(search_text) AGAINST (%s IN BOOLEAN MODE) AS search_rank "
+        "FROM transaction_search "
+        "WHERE MATCH(search_text) AGAINST (%s IN BOOLEAN MODE) "
+        "AND CONCAT(' ', search_text) LIKE %s"
+    ) in sql
+    assert sql.endswith(') search_hits ON search_hits.transaction_id = t.id')